@@ -1,10 +1,33 @@
+import argparse
+import sys
+
 import pygame
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 from config import Config
+from core import savegame
+from engine.game_log import (
+    BEAR_OFF,
+    END_TURN,
+    ENTER,
+    MOVE,
+    ROLL,
+    Event,
+    GameLog,
+    Snapshot,
+    checker_events,
+    move_events,
+)
+from engine.movegen import apply_play, format_play
+from engine.position import Move, Position, from_board, to_board
 from pygame_ui.backgammon_board import BackgammonBoard
 from pygame_ui.button import Button
 from pygame_ui.board_interaction import BoardInteraction
+from pygame_ui.checker_renderer import CheckerRenderer
+from pygame_ui.computer_player import ComputerPlayer
+from pygame_ui.danger_overlay import DangerOverlay
+from pygame_ui.move_animation import MoveAnimation, lift_checker
+from pygame_ui.replay_viewer import ReplayViewer, load_replay
 
 CheckerPos = Tuple[int, int, int, int, str]
 
@@ -74,6 +97,7 @@ class GameUI:
             color=(70, 180, 70),
             hover_color=(100, 210, 100),
         )
+        self.danger_overlay: DangerOverlay = DangerOverlay()
         self.font: pygame.font.Font = pygame.font.Font(None, 36)
 
         # --- Game State Variables ---
@@ -83,6 +107,18 @@ class GameUI:
         self.moves_made: int = 0
         self.max_moves_this_turn: int = 0
         self.running: bool = True
+        self.show_danger: bool = False
+
+        # --- Computer Opponent ---
+        self.computer: Optional[ComputerPlayer] = None
+        self.computer_moves: List[Move] = []
+        self.animation: Optional[MoveAnimation] = None
+        self.position_before_move: Optional[Position] = None
+        self.checker_renderer: CheckerRenderer = CheckerRenderer()
+
+        # --- History (undo/redo) ---
+        self.log: GameLog = GameLog(self.snapshot())
+        self.replay: Optional[ReplayViewer] = None
 
         self.bear_off_area_width: int = 80  # Width of the bear-off area
         # Calculate x position to be on the far right, with a small margin
@@ -129,6 +165,8 @@ class GameUI:
 
             self.clock.tick(60)
 
+        if self.computer is not None:
+            self.computer.stop()
         pygame.quit()  # pylint: disable=no-member
 
     def handle_event(self, event: pygame.event.Event):
@@ -141,6 +179,16 @@ class GameUI:
             self.handle_keydown(event.key)
             return
 
+        # The board only shows the replay until it is closed
+        if self.replay is not None:
+            if self.replay.handle_event(event):
+                self.restore(self.replay.state)
+            return
+
+        # The board belongs to the computer during its turn
+        if self.is_computer_turn():
+            return
+
         # --- Button Events ---
         if self.roll_button.handle_event(event):
             self.do_roll_dice()
@@ -161,22 +209,92 @@ class GameUI:
 
     def handle_keydown(self, key: int):
         """Handles keyboard press events."""
-        if key == pygame.K_ESCAPE:  # pylint: disable=no-member
+        if self.replay is not None:
+            self.handle_replay_key(key)
+        elif key == pygame.K_ESCAPE:  # pylint: disable=no-member
             self.running = False
+        elif key == pygame.K_r:  # pylint: disable=no-member
+            self.do_reset()
+        elif key == pygame.K_d:  # pylint: disable=no-member
+            self.show_danger = not self.show_danger
+        elif key == pygame.K_c:  # pylint: disable=no-member
+            self.toggle_computer()
+        elif self.is_computer_turn():
+            print("The computer is playing, please wait.")
         elif key == pygame.K_SPACE:  # pylint: disable=no-member
             self.do_roll_dice()
         elif key == pygame.K_n:  # pylint: disable=no-member
             self.do_next_turn()
-        elif key == pygame.K_r:  # pylint: disable=no-member
-            self.do_reset()
+        elif key == pygame.K_u:  # pylint: disable=no-member
+            self.do_undo()
+        elif key == pygame.K_y:  # pylint: disable=no-member
+            self.do_redo()
+        elif key == pygame.K_s:  # pylint: disable=no-member
+            self.do_save()
+        elif key == pygame.K_l:  # pylint: disable=no-member
+            self.do_load()
+        elif key == pygame.K_v:  # pylint: disable=no-member
+            self.open_replay(self.log)
+
+    def handle_replay_key(self, key: int):
+        """Handles the keys of the replay viewer."""
+        replay = self.replay
+        if key in (pygame.K_ESCAPE, pygame.K_v):  # pylint: disable=no-member
+            self.close_replay()
+            return
+        if key == pygame.K_SPACE:  # pylint: disable=no-member
+            replay.toggle_play()
+        elif key == pygame.K_RIGHT:  # pylint: disable=no-member
+            replay.step(1)
+        elif key == pygame.K_LEFT:  # pylint: disable=no-member
+            replay.step(-1)
+        elif key == pygame.K_UP:  # pylint: disable=no-member
+            replay.step(10)
+        elif key == pygame.K_DOWN:  # pylint: disable=no-member
+            replay.step(-10)
+        elif key == pygame.K_HOME:  # pylint: disable=no-member
+            replay.step(-replay.plies)
+        elif key == pygame.K_END:  # pylint: disable=no-member
+            replay.step(replay.plies)
+        else:
+            return
+        self.restore(replay.state)
+
+    def open_replay(self, log: GameLog):
+        """
+        Shows a recorded game instead of the game being played.
+
+        Args:
+            log: Game to replay (the current game's log, or one from
+                pygame_ui.replay_viewer.load_replay())
+        """
+        self.stop_computer_turn()
+        self.replay = ReplayViewer(log)
+        self.restore(self.replay.state)
+        print("Replay: SPACE play/pause, arrows step, HOME/END, V or ESC to close")
+
+    def close_replay(self):
+        """Leaves the replay and goes back to the game being played."""
+        self.replay = None
+        self.restore(self.log.state)
+        print("Replay closed")
 
     def do_roll_dice(self):
         """Action for rolling the dice."""
         if not self.dice_rolled:
-            dice = self.backgammon_board.roll_dice()
+            # Undone rolls come back, so undo cannot be used to reroll
+            replayed = self.log.take_roll()
+            if replayed is None:
+                dice = self.backgammon_board.roll_dice()
+            else:
+                dice = list(replayed)
+                self.backgammon_board.set_turn(self.backgammon_board.current_player, dice)
             self.dice_rolled = True
             self.moves_made = 0
             self.max_moves_this_turn = 4 if len(dice) == 4 else 2
+            self.log.record(
+                [Event(ROLL, self.backgammon_board.current_player, dice=tuple(dice))]
+            )
             print(f"{self.backgammon_board.current_player} rolled: {dice}")
         else:
             print("Already rolled! Make your moves or press N for next turn")
@@ -184,16 +302,25 @@ class GameUI:
     def do_reset(self):
         """Action for resetting the game."""
         self.backgammon_board.reset()
+        self.stop_computer_turn()
         self.selected_point = None
         self.bar_selected = False
         self.dice_rolled = False
         self.moves_made = 0
         self.max_moves_this_turn = 0
+        self.log = GameLog(self.snapshot())
         print("Board reset!")
 
-    def do_next_turn(self):
-        """Action for switching to the next turn."""
+    def do_next_turn(self, after_move: bool = False):
+        """Action for switching to the next turn.
+
+        Args:
+            after_move: The turn ends because the last die was played, so
+                undo takes back the move and the end of turn together
+        """
+        color = self.backgammon_board.current_player
         self.backgammon_board.switch_player()
+        self.log.record([Event(END_TURN, color)], join=after_move)
         self.dice_rolled = False
         self.moves_made = 0
         self.max_moves_this_turn = 0
@@ -273,22 +400,30 @@ class GameUI:
                 return
 
             # Attempt to enter from bar
-            if self.backgammon_board.board.move_checker_from_bar(
-                clicked_point, self.backgammon_board.current_player
-            ):
+            player = self.backgammon_board.current_player
+            events = checker_events(
+                self.backgammon_board.board,
+                ENTER,
+                player,
+                -1,
+                clicked_point,
+                matching_dice,
+            )
+            if self.backgammon_board.board.move_checker_from_bar(clicked_point, player):
                 print(
                     f"Entered from bar at point {clicked_point} using dice {matching_dice}"
                 )
                 self.backgammon_board.dice_values.remove(matching_dice)
                 self.moves_made += 1
                 self.bar_selected = False
+                self.log.record(events)
 
                 if (
                     self.moves_made >= self.max_moves_this_turn
                     or not self.backgammon_board.dice_values
                 ):
                     print("✓ Turn complete!")
-                    self.do_next_turn()
+                    self.do_next_turn(after_move=True)
             else:
                 print(f"Cannot enter at point {clicked_point} (blocked)")
 
@@ -345,12 +480,21 @@ class GameUI:
 
                 # Check if exact dice value exists
                 if distance in self.backgammon_board.dice_values:
+                    events = checker_events(
+                        self.backgammon_board.board,
+                        BEAR_OFF,
+                        player,
+                        self.selected_point,
+                        -1,
+                        distance,
+                    )
                     if self.backgammon_board.board.bear_off(
                         player, self.selected_point
                     ):
                         print(f"Bore off from point {self.selected_point}!")
                         self.backgammon_board.dice_values.remove(distance)
                         self.moves_made += 1
+                        self.log.record(events)
                     else:
                         print("Cannot bear off from that point (logic error)!")
 
@@ -390,6 +534,16 @@ class GameUI:
                             )
                             self.backgammon_board.dice_values.remove(used_dice)
                             self.moves_made += 1
+                            self.log.record(
+                                checker_events(
+                                    self.backgammon_board.board,
+                                    BEAR_OFF,
+                                    player,
+                                    self.selected_point,
+                                    -1,
+                                    used_dice,
+                                )
+                            )
                         else:
                             print("Cannot bear off from that point (logic error)!")
                     else:
@@ -411,12 +565,21 @@ class GameUI:
                     clicked_point,
                     self.backgammon_board.current_player,
                 ):
+                    events = checker_events(
+                        self.backgammon_board.board,
+                        MOVE,
+                        player,
+                        self.selected_point,
+                        clicked_point,
+                        distance,
+                    )
                     if self.backgammon_board.move_checker(
                         self.selected_point, clicked_point
                     ):
                         print(f"Moved from {self.selected_point} to {clicked_point}")
                         self.backgammon_board.dice_values.remove(distance)
                         self.moves_made += 1
+                        self.log.record(events)
                     else:
                         print("Invalid move!")
                 else:
@@ -436,11 +599,220 @@ class GameUI:
                     self.do_reset()  # Reset board after win
                 else:
                     print("Turn complete!")
-                    self.do_next_turn()
+                    self.do_next_turn(after_move=True)
+
+    def toggle_computer(self):
+        """Switches the computer opponent (playing Black) on or off."""
+        if self.computer is None:
+            self.computer = ComputerPlayer("B")
+            print("Computer opponent on: it plays Black.")
+        else:
+            self.stop_computer_turn()
+            self.computer.stop()
+            self.computer = None
+            print("Computer opponent off.")
+
+    def is_computer_turn(self) -> bool:
+        """Checks whether the computer plays the current color."""
+        return (
+            self.computer is not None
+            and self.backgammon_board.current_player == self.computer.color
+        )
+
+    def stop_computer_turn(self):
+        """Drops any pending computer play and animation."""
+        if self.computer is not None:
+            self.computer.cancel()
+        self.computer_moves = []
+        self.animation = None
+        self.position_before_move = None
+
+    def update_computer(self):
+        """
+        Advances the computer's turn by one frame.
+
+        The play is chosen on the worker thread; this only rolls, polls
+        the result and animates it one checker at a time, so it never
+        blocks the frame.
+        """
+        if self.animation is not None:
+            if self.animation.step():
+                self.finish_computer_move()
+            return
+
+        if self.computer_moves:
+            self.start_computer_move()
+            return
+
+        if not self.is_computer_turn():
+            return
+
+        if not self.dice_rolled:
+            self.do_roll_dice()
+        if not self.computer.thinking:
+            self.computer.request_play(
+                self.backgammon_board.board, self.backgammon_board.dice_values[:2]
+            )
+            return
+
+        play = self.computer.poll()
+        if play is None:
+            return  # Still thinking
+        print(f"Computer plays: {format_play(play)}")
+        if not play:
+            self.do_next_turn()
+            return
+        self.computer_moves = list(play)
+        self.start_computer_move()
+
+    def start_computer_move(self):
+        """Lifts the checker of the next computer move and starts its slide."""
+        source, destination = self.computer_moves[0]
+        color = self.computer.color
+        board = self.backgammon_board.board
+        before = from_board(board)
+        sign = 1 if color == "W" else -1
+
+        start = self.place_center(source, color, abs(before[source]) - 1)
+        landing = before[destination] * sign if 0 <= destination < 24 else 0
+        end = self.place_center(destination, color, max(landing, 0))
+
+        to_board(lift_checker(before, color, source), board)
+        self.position_before_move = before
+        self.animation = MoveAnimation(color, start, end)
+
+    def finish_computer_move(self):
+        """Lands the moving checker and ends the turn after the last one."""
+        move = self.computer_moves.pop(0)
+        color = self.computer.color
+        board = self.backgammon_board.board
+        to_board(apply_play(self.position_before_move, color, (move,)), board)
+        self.log.record(move_events(self.position_before_move, color, move))
+        self.animation = None
+        self.position_before_move = None
+        self.moves_made += 1
+
+        if self.computer_moves:
+            return
+        if board.borne_off[color] == 15:
+            print(f"🎉 PLAYER {color} WINS! 🎉")
+            self.do_reset()
+        else:
+            self.do_next_turn(after_move=True)
+
+    def snapshot(self) -> Snapshot:
+        """Captures the board, turn and dice for the game log."""
+        dice = tuple(self.backgammon_board.dice_values)
+        return Snapshot(
+            from_board(self.backgammon_board.board),
+            self.backgammon_board.current_player,
+            dice,
+            dice if self.dice_rolled else (),
+            self.dice_rolled,
+        )
+
+    def restore(self, state: Snapshot):
+        """Puts the game back in a state taken from the game log."""
+        to_board(state.position, self.backgammon_board.board)
+        self.backgammon_board.set_turn(state.turn, list(state.dice))
+        self.dice_rolled = state.rolled
+        self.max_moves_this_turn = len(state.roll)
+        self.moves_made = len(state.roll) - len(state.dice)
+        self.selected_point = None
+        self.bar_selected = False
+
+    def do_undo(self):
+        """Takes back the last action, and the computer's turn before it."""
+        self.stop_computer_turn()
+        self.step_history(self.log.undo, "Nothing to undo", "Undone")
+
+    def do_redo(self):
+        """Plays again the last action taken back, with the computer's turn after it."""
+        self.stop_computer_turn()
+        self.step_history(self.log.redo, "Nothing to redo", "Redone")
+
+    def step_history(self, step, empty: str, done: str):
+        """Moves through the log, going on while the computer is on roll."""
+        state = step()
+        if state is None:
+            print(empty)
+            return
+        while state is not None:
+            self.restore(state)
+            if not self.is_computer_turn():
+                break
+            state = step()
+        print(done)
+
+    def do_save(self, path: str = savegame.DEFAULT_SAVE_FILE):
+        """Saves the board, dice and turn to a file."""
+        state = self.snapshot()
+        saved = savegame.capture(
+            self.backgammon_board.board,
+            self.backgammon_board.dice,
+            state.turn,
+            state.rolled,
+            self.log.state.roll if state.rolled else (),
+            state.dice,
+        )
+        try:
+            with open(path, "wb") as file:
+                file.write(savegame.encode(saved))
+        except OSError as error:
+            print(f"Could not save: {error}")
+            return
+        print(f"Game saved to {path}")
+
+    def do_load(self, path: str = savegame.DEFAULT_SAVE_FILE):
+        """Resumes a game saved with do_save()."""
+        try:
+            with open(path, "rb") as file:
+                saved = savegame.decode(file.read())
+        except (OSError, ValueError) as error:
+            print(f"Could not load: {error}")
+            return
+        self.stop_computer_turn()
+        savegame.restore(saved, self.backgammon_board.board, self.backgammon_board.dice)
+        state = Snapshot(
+            from_board(self.backgammon_board.board),
+            saved.color,
+            saved.remaining,
+            saved.original_roll,
+            saved.has_rolled,
+        )
+        self.restore(state)
+        self.log = GameLog(state)
+        print(f"Game loaded from {path}")
+
+    def place_center(self, place: int, color: str, stack: int) -> Tuple[int, int]:
+        """
+        Screen position of a move's source or destination.
+
+        Args:
+            place: Engine index (0-23, or the color's bar/off index)
+            color: Color of the moving checker
+            stack: Height in the stack on a point
+
+        Returns:
+            The (x, y) screen position
+        """
+        bar, off = (24, -1) if color == "W" else (-1, 24)
+        if place == bar:
+            return self.checker_renderer.bar_center(color)
+        if place == off:
+            rect = self.bear_off_rect_w if color == "W" else self.bear_off_rect_b
+            return rect.centerx, rect.centery
+        return self.checker_renderer.checker_center(place, stack)
 
     def update(self):
         """Updates game state logic (e.g., animations)."""
         self.backgammon_board.update()
+        if self.replay is not None:
+            if self.replay.update(pygame.time.get_ticks()):
+                self.restore(self.replay.state)
+            return
+        if self.computer is not None:
+            self.update_computer()
 
     def render(self):
         """Draws the entire game screen."""
@@ -449,10 +821,25 @@ class GameUI:
         # Draw board and pieces
         self.backgammon_board.render(self.screen)
 
-        # Draw buttons
-        self.roll_button.draw(self.screen)
-        self.reset_button.draw(self.screen)
-        self.next_turn_button.draw(self.screen)
+        # Shot counts on the current player's blots
+        if self.show_danger:
+            self.danger_overlay.draw(
+                self.screen,
+                self.backgammon_board.board,
+                self.backgammon_board.current_player,
+            )
+
+        # Checker moved by the computer, in flight
+        if self.animation is not None:
+            self.animation.draw(self.screen, self.checker_renderer)
+
+        # Draw buttons, or the replay slider in their place
+        if self.replay is not None:
+            self.replay.draw(self.screen, self.font)
+        else:
+            self.roll_button.draw(self.screen)
+            self.reset_button.draw(self.screen)
+            self.next_turn_button.draw(self.screen)
 
         # --- Draw Text Info ---
         player_color: str = (
@@ -464,6 +851,12 @@ class GameUI:
         )
         self.screen.blit(text_surface, (580, 750))
 
+        if self.computer is not None and self.computer.thinking:
+            thinking_surface: pygame.Surface = self.font.render(
+                "Computer is thinking...", True, (255, 255, 0)
+            )
+            self.screen.blit(thinking_surface, (580, 780))
+
         # Display bar pieces if any
         bar_pieces = self.backgammon_board.board.bar[
             self.backgammon_board.current_player
@@ -562,13 +955,24 @@ class GameUI:
         pygame.display.flip()
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     """
     Main function to create and run the game.
+
+    Args:
+        argv: Command line arguments (none if None)
     """
+    parser = argparse.ArgumentParser(description="Backgammon game")
+    parser.add_argument("--replay", help="Game record or .mat transcript to review")
+    parser.add_argument("--game", type=int, default=0, help="Game of the file to review")
+    args = parser.parse_args(argv or [])
+    replay = load_replay(args.replay, args.game) if args.replay else None
+
     game = GameUI()
+    if replay is not None:
+        game.open_replay(replay)
     game.run()
 
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1:])
@@ -0,0 +1 @@
+"""Micro-benchmarks of the game's hot paths (run with python -m benchmarks)."""
@@ -0,0 +1,77 @@
+"""
+Run the micro-benchmarks and print ops/sec.
+
+    python -m benchmarks                  all suites
+    python -m benchmarks -k board         benchmarks whose name has "board"
+    python -m benchmarks --json out.json  also write the results as JSON
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import List, Optional
+
+from benchmarks import bench_cli, bench_core, bench_render
+from benchmarks.harness import Benchmark, format_result, run_all
+
+SUITES = {"core": bench_core, "cli": bench_cli, "render": bench_render}
+
+
+def select(suites: List[str], keyword: str = "") -> List[Benchmark]:
+    """
+    Benchmarks of some suites, filtered by name.
+
+    Args:
+        suites: Names of the suites (keys of SUITES)
+        keyword: Text the benchmark name must contain
+
+    Returns:
+        The benchmarks, in suite order
+    """
+    return [
+        benchmark
+        for suite in suites
+        for benchmark in SUITES[suite].BENCHMARKS
+        if keyword in benchmark.name
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Backgammon micro-benchmarks")
+    parser.add_argument(
+        "--suite",
+        action="append",
+        choices=sorted(SUITES),
+        help="Suites to run (all by default)",
+    )
+    parser.add_argument(
+        "-k", "--keyword", default="", help="Only benchmarks whose name contains this"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timed rounds per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per round")
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args(argv)
+
+    benchmarks = select(args.suite or list(SUITES), args.keyword)
+    results = run_all(
+        benchmarks,
+        args.repeat,
+        args.min_time,
+        report=lambda result: print(format_result(result), flush=True),
+    )
+    if args.json:
+        document = {
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": {result.name: result.as_dict() for result in results},
+        }
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(document, file, indent=2)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
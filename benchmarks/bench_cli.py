@@ -0,0 +1,64 @@
+"""Benchmarks of the CLI command loop and board rendering."""
+
+from typing import List
+
+from benchmarks.harness import Benchmark
+from cli.CLI import BackgammonCLI, BoardRenderer, BufferedUserInterface
+from core.BackgammonGame import Game
+from core.Dice import Dice
+
+
+class _FixedDice(Dice):
+    """Dice that always roll 3-1."""
+
+    __slots__ = ()
+
+    def roll(self):
+        self._die1, self._die2 = 3, 1
+        return (3, 1)
+
+
+def _quiet_cli() -> BackgammonCLI:
+    """A CLI with fixed 3-1 rolls whose messages are dropped."""
+    cli = BackgammonCLI()
+    cli.ui = BufferedUserInterface()
+    cli.game.dice = _FixedDice()
+    return cli
+
+
+def _process_turn():
+    """A whole turn and its undo: roll, two moves, three undos."""
+    cli = _quiet_cli()
+    commands = ("roll", "move 7 4", "move 5 4", "undo", "undo", "undo")
+
+    def run():
+        for command in commands:
+            cli.process_input(command)
+        cli.ui.take()
+
+    return run
+
+
+def _process_rejected():
+    """A command refused before any game logic runs."""
+    cli = _quiet_cli()
+
+    def run():
+        cli.process_input("move 7 4")
+        cli.ui.take()
+
+    return run
+
+
+def _render_board():
+    """The text board of the starting position."""
+    renderer = BoardRenderer()
+    game = Game()
+    return lambda: renderer.render_board(game)
+
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark("cli.process_input (turn + undo)", _process_turn, 6),
+    Benchmark("cli.process_input (rejected)", _process_rejected),
+    Benchmark("cli.render_board", _render_board),
+]
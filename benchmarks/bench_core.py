@@ -0,0 +1,96 @@
+"""Benchmarks of core.board and core.BackgammonGame."""
+
+from typing import List
+
+from benchmarks.harness import Benchmark
+from core.BackgammonGame import Game
+from core.board import Board
+from core.Dice import Dice
+from core.dice_stream import DiceStream
+
+
+def _move_checker():
+    """A checker moved out and back, so the board never drifts."""
+    board = Board()
+
+    def run():
+        board.move_checker(5, 4, "W")
+        board.move_checker(4, 5, "W")
+
+    return run
+
+
+def _move_checker_hit():
+    """A hit and the checker put back, the slow path of move_checker."""
+    board = Board()
+    board.points[4] = ["B"]
+
+    def run():
+        board.move_checker(5, 4, "W")
+        board.points[5].append("W")
+        board.points[4] = ["B"]
+        board.bar["B"] -= 1
+
+    return run
+
+
+def _is_valid_move():
+    """Legal, blocked and empty-source checks on the starting board."""
+    board = Board()
+
+    def run():
+        board.is_valid_move(7, 4, "W")
+        board.is_valid_move(23, 18, "W")
+        board.is_valid_move(3, 1, "W")
+
+    return run
+
+
+def _can_bear_off():
+    """A home board that can bear off, scanned to the end."""
+    board = Board()
+    board.points = [[] for _ in range(24)]
+    board.points[18] = ["W"] * 15
+
+    def run():
+        board.can_bear_off("W")
+
+    return run
+
+
+def _can_bear_off_early_exit():
+    """The starting board, which fails on the first outside checker."""
+    board = Board()
+
+    def run():
+        board.can_bear_off("B")
+
+    return run
+
+
+def _get_board():
+    """Point counts of the starting position."""
+    game = Game()
+    return game.get_board
+
+
+def _dice_roll():
+    """A roll from the random module."""
+    return Dice().roll
+
+
+def _dice_roll_stream():
+    """A roll read from a pre-generated dice stream."""
+    return Dice(DiceStream(0)).roll
+
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark("board.move_checker", _move_checker, 2),
+    Benchmark("board.move_checker (hit)", _move_checker_hit),
+    Benchmark("board.is_valid_move", _is_valid_move, 3),
+    Benchmark("board.can_bear_off (all home)", _can_bear_off),
+    Benchmark("board.can_bear_off (early exit)", _can_bear_off_early_exit),
+    Benchmark("game.get_board", _get_board),
+    Benchmark("dice.roll", _dice_roll),
+    Benchmark("dice.roll (stream)", _dice_roll_stream),
+]
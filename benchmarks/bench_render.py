@@ -0,0 +1,92 @@
+"""
+Benchmarks of the pygame renderers, drawing to an offscreen surface.
+
+SDL's dummy video driver is selected when none is set, so this runs
+headless.
+"""
+
+import os
+from typing import List
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+# pylint: disable=wrong-import-position
+import pygame
+
+from benchmarks.harness import Benchmark
+from config import Config
+from core.board import Board
+from pygame_ui.backgammon_board import BackgammonBoard
+from pygame_ui.board_renderer import BoardRenderer
+from pygame_ui.button import Button
+from pygame_ui.checker_renderer import CheckerRenderer
+from pygame_ui.danger_overlay import DangerOverlay
+from pygame_ui.dice_renderer import DiceRenderer
+
+# pylint: disable=no-member
+
+
+def _surface() -> pygame.Surface:
+    """An offscreen surface the size of the window."""
+    pygame.display.init()
+    pygame.font.init()
+    return pygame.Surface((Config.SCREEN_WIDTH, Config.SCREEN_HEIGHT))
+
+
+def _board_renderer():
+    """The static board: border, points and bar."""
+    surface = _surface()
+    renderer = BoardRenderer()
+    return lambda: renderer.draw(surface)
+
+
+def _checker_renderer():
+    """The 30 checkers of the starting position."""
+    surface = _surface()
+    renderer = CheckerRenderer()
+    board = Board()
+    return lambda: renderer.draw(surface, board)
+
+
+def _dice_renderer():
+    """Two dice with their pips."""
+    surface = _surface()
+    renderer = DiceRenderer()
+    return lambda: renderer.draw(surface, [6, 5])
+
+
+def _danger_overlay():
+    """Shot counts of three blots."""
+    surface = _surface()
+    overlay = DangerOverlay()
+    board = Board()
+    board.points[4] = ["W"]
+    board.points[9] = ["W"]
+    board.points[20] = ["W"]
+    return lambda: overlay.draw(surface, board, "W")
+
+
+def _button():
+    """One button with its label."""
+    surface = _surface()
+    button = Button(50, 730, 150, 50, "Roll Dice")
+    return lambda: button.draw(surface)
+
+
+def _full_board():
+    """BackgammonBoard.render: board, checkers and dice together."""
+    surface = _surface()
+    board = BackgammonBoard()
+    board.roll_dice()
+    return lambda: board.render(surface)
+
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark("render.board", _board_renderer),
+    Benchmark("render.checkers", _checker_renderer),
+    Benchmark("render.dice", _dice_renderer),
+    Benchmark("render.danger_overlay", _danger_overlay),
+    Benchmark("render.button", _button),
+    Benchmark("render.backgammon_board", _full_board),
+]
@@ -0,0 +1,124 @@
+"""
+Timing harness for the micro-benchmarks, on top of timeit.
+
+Each benchmark is a factory that builds its fixtures and returns the
+callable to time, so setup never counts. The loop count is calibrated
+with Timer.autorange(), a warmup round is thrown away, then the loop is
+timed repeat times and summarized (best, median, spread).
+"""
+
+import statistics
+import timeit
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+
+class Benchmark(NamedTuple):
+    """A named hot path to time."""
+
+    name: str
+    # Builds the fixtures and returns the function to time
+    make: Callable[[], Callable[[], object]]
+    # Operations done by one call of that function
+    ops_per_call: int = 1
+
+
+class BenchResult(NamedTuple):
+    """Timing of one benchmark."""
+
+    name: str
+    ops_per_sec: float
+    best_ops_per_sec: float
+    stdev_percent: float
+    number: int
+    repeat: int
+
+    def as_dict(self) -> Dict[str, float]:
+        """Fields other than the name, for JSON output."""
+        return {
+            "ops_per_sec": self.ops_per_sec,
+            "best_ops_per_sec": self.best_ops_per_sec,
+            "stdev_percent": self.stdev_percent,
+            "number": self.number,
+            "repeat": self.repeat,
+        }
+
+
+def measure(
+    benchmark: Benchmark,
+    repeat: int = 5,
+    min_time: float = 0.2,
+    number: Optional[int] = None,
+) -> BenchResult:
+    """
+    Time one benchmark.
+
+    Args:
+        benchmark: Benchmark to time
+        repeat: Timed rounds after the warmup
+        min_time: Seconds a round should last when number is calibrated
+        number: Calls per round (calibrated if None)
+
+    Returns:
+        Median and best operations per second, and the spread of the
+        rounds as a percentage of their mean
+    """
+    timer = timeit.Timer(benchmark.make())
+    if number is None:
+        number, elapsed = timer.autorange()
+        if elapsed < min_time:
+            number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    # Warmup: fills caches and lets lazy setup happen outside the rounds
+    timer.timeit(number)
+    ops = number * benchmark.ops_per_call
+    rates = [ops / max(seconds, 1e-12) for seconds in timer.repeat(repeat, number)]
+    mean = statistics.fmean(rates)
+    spread = statistics.stdev(rates) / mean * 100 if len(rates) > 1 else 0.0
+    return BenchResult(
+        benchmark.name, statistics.median(rates), max(rates), spread, number, repeat
+    )
+
+
+def run_all(
+    benchmarks: Iterable[Benchmark],
+    repeat: int = 5,
+    min_time: float = 0.2,
+    number: Optional[int] = None,
+    report: Optional[Callable[[BenchResult], None]] = None,
+) -> List[BenchResult]:
+    """
+    Time several benchmarks in order.
+
+    Args:
+        benchmarks: Benchmarks to time
+        repeat: Timed rounds of each
+        min_time: Seconds per round when calibrating
+        number: Calls per round (calibrated if None)
+        report: Called with each result as soon as it is ready
+
+    Returns:
+        The results
+    """
+    results = []
+    for benchmark in benchmarks:
+        result = measure(benchmark, repeat, min_time, number)
+        if report is not None:
+            report(result)
+        results.append(result)
+    return results
+
+
+def format_result(result: BenchResult) -> str:
+    """
+    One line of the text report.
+
+    Args:
+        result: Result to show
+
+    Returns:
+        Name, median and best ops/sec and spread
+    """
+    return (
+        f"{result.name:<40} {result.ops_per_sec:>14,.0f} ops/s "
+        f"(best {result.best_ops_per_sec:,.0f}, ±{result.stdev_percent:.1f}%, "
+        f"{result.repeat}x{result.number})"
+    )
@@ -3,8 +3,32 @@ Command Line Interface module for Backgammon game,
 refactored for SOLID principles with proper game flow.
 """
 
-from typing import Optional, Tuple, List, Union
+from typing import Callable, Dict, Optional, Tuple, List, Union
 from core.BackgammonGame import Game
+from core.savegame import DEFAULT_SAVE_FILE
+from engine.game_log import (
+    BEAR_OFF,
+    END_TURN,
+    ENTER,
+    MOVE,
+    ROLL,
+    Event,
+    GameLog,
+    Snapshot,
+    checker_events,
+)
+from engine.movegen import format_play
+from engine.position import from_board, pip_counts, to_board
+from engine.search import (
+    DEFAULT_BUDGET,
+    BackgroundSearch,
+    PositionValue,
+    Searcher,
+    SearchResult,
+)
+from engine.shots import blot_shots
+
+DEFAULT_HINTS = 3
 
 
 class BoardRenderer:
@@ -83,6 +107,13 @@ Commands:
   * Use 'bar' for moving from the bar (e.g., 'move bar 20')
   * Use 'off' to bear off (e.g., 'move 3 off')
 - skip: Skip turn if no moves available
+- undo: Take back the last roll, move or end of turn
+- redo: Play again the last action taken back
+- save [file]: Save the game (default backgammon.sav)
+- load [file]: Resume a saved game
+- hint [n]: Show the n best plays for your roll (default 3)
+- analyze: Show the engine's evaluation of the position
+  * Press Ctrl+C to stop a long search and keep its best answer
 - help: Show this help
 - quit: Exit game
 
@@ -146,12 +177,93 @@ Game Rules:
         else:
             self.display_message("✓ All dice used! Turn complete.")
 
+    def display_thinking(self, budget: float) -> None:
+        """Tells the user that the engine is searching."""
+        self.display_message(
+            f"🤔 Thinking (up to {budget:g}s, Ctrl+C to stop)..."
+        )
+
+    def display_hints(self, hints: List[Tuple[str, float]], result: SearchResult) -> None:
+        """Displays the best plays found by the engine."""
+        self.display_message(
+            f"\n💡 Best plays (depth {result.depth}, {result.elapsed:.2f}s"
+            f"{', cancelled' if result.cancelled else ''}):"
+        )
+        for rank, (play, equity) in enumerate(hints, 1):
+            self.display_message(f"  {rank}. {play:<28} equity {equity:+.3f}")
+
+    def display_analysis(
+        self,
+        player: str,
+        value: PositionValue,
+        pips: Tuple[int, int],
+        label: str,
+        shots: Dict[int, int],
+    ) -> None:
+        """Displays the engine's view of the position."""
+        self.display_message(f"\n📊 Analysis for {player.upper()} ({label}):")
+        self.display_message(
+            f"  Win chance: {value.win_probability:.1%}  equity {value.equity:+.3f}"
+            f"  (depth {value.depth}, {value.elapsed:.2f}s)"
+        )
+        self.display_message(f"  Pips - White: {pips[0]} Black: {pips[1]}")
+        if shots:
+            exposed = ", ".join(
+                f"{point}: {count}/36" for point, count in sorted(shots.items())
+            )
+            self.display_message(f"  Shots at your blots - {exposed}")
+        else:
+            self.display_message("  No blots exposed.")
+
     def display_must_move_from_bar(self) -> None:
         """Notify that player must move from bar."""
         self.display_message("⚠ You have pieces on the bar! You must enter them first.")
         self.display_message("   Use: move bar <point>")
 
 
+class BufferedUserInterface(UserInterface):
+    """UserInterface that collects messages and remembers failures."""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.failed = False
+
+    def display_message(self, message: str) -> None:
+        """Stores a message, one entry per line."""
+        self.lines.extend(message.strip("\n").split("\n"))
+
+    def get_input(self, prompt: str) -> str:
+        """Input comes from the socket, never from here."""
+        raise RuntimeError("BufferedUserInterface does not read input")
+
+    def display_error(self, message: str) -> None:
+        """Stores an error and marks the command as failed."""
+        self.failed = True
+        super().display_error(message)
+
+    def display_move_failure(self, reason: str = "Invalid move") -> None:
+        """Stores a move failure and marks the command as failed."""
+        self.failed = True
+        super().display_move_failure(reason)
+
+    def display_must_roll(self) -> None:
+        """Stores the reminder and marks the command as failed."""
+        self.failed = True
+        super().display_must_roll()
+
+    def display_must_move_from_bar(self) -> None:
+        """Stores the reminder and marks the command as failed."""
+        self.failed = True
+        super().display_must_move_from_bar()
+
+    def take(self) -> Tuple[bool, List[str]]:
+        """Returns (failed, lines) of the last command and clears them."""
+        result = (self.failed, self.lines)
+        self.lines = []
+        self.failed = False
+        return result
+
+
 class InputValidator:
     """Handles only input validation logic."""
 
@@ -195,7 +307,19 @@ class CommandParser:
     """Handles only command parsing and routing."""
 
     def __init__(self):
-        self.known_commands = {"move", "roll", "help", "quit", "skip"}
+        self.known_commands = {
+            "move",
+            "roll",
+            "help",
+            "quit",
+            "skip",
+            "hint",
+            "analyze",
+            "undo",
+            "redo",
+            "save",
+            "load",
+        }
 
     def parse_command(self, raw_input: str) -> Tuple[str, List[str]]:
         """
@@ -268,6 +392,10 @@ class BackgammonCLI:
         self.validator = InputValidator()
         self.state_manager = GameStateManager(self.game)
         self.is_running = True
+        self.hint_budget = DEFAULT_BUDGET
+        self.searcher: Optional[Searcher] = None
+        self.search: Optional[BackgroundSearch] = None
+        self.log = GameLog(self.snapshot())
 
     def run(self) -> None:
         """Main game loop."""
@@ -299,6 +427,21 @@ class BackgammonCLI:
             self.handle_roll()
         elif command == "skip":
             self.handle_skip()
+        elif command == "hint":
+            self.handle_hint(args)
+        elif command == "analyze":
+            self.handle_analyze()
+        elif command == "undo":
+            self.handle_undo()
+        elif command == "redo":
+            self.handle_redo()
+        elif command in ("save", "load"):
+            # File names keep their case, unlike the parsed arguments
+            path = command_raw.split(maxsplit=1)[1].strip() if args else DEFAULT_SAVE_FILE
+            if command == "save":
+                self.handle_save(path)
+            else:
+                self.handle_load(path)
         elif command == "help":
             self.ui.display_help()
         elif command == "quit":
@@ -347,13 +490,9 @@ class BackgammonCLI:
                 )
                 return
 
+            events = checker_events(self.game.board, ENTER, color, -1, to_point, required_die)
             if self.game.make_bar_move(to_point):
-                self.state_manager.use_die(required_die)
-                self.ui.display_move_success(from_str, to_str)
-                self.ui.display_remaining_dice(self.state_manager.get_remaining())
-
-                if not self.state_manager.remaining_dice:
-                    self.state_manager.end_turn()
+                self.complete_move(events, required_die, from_str, to_str)
             else:
                 self.ui.display_move_failure(
                     "Cannot enter at that point (occupied by opponent)"
@@ -381,13 +520,9 @@ class BackgammonCLI:
                 self.ui.display_move_failure(f"No die with value {required_die}")
                 return
 
+            events = checker_events(self.game.board, BEAR_OFF, color, from_point, -1, required_die)
             if self.game.bear_off(from_point):
-                self.state_manager.use_die(required_die)
-                self.ui.display_move_success(from_str, to_str)
-                self.ui.display_remaining_dice(self.state_manager.get_remaining())
-
-                if not self.state_manager.remaining_dice:
-                    self.state_manager.end_turn()
+                self.complete_move(events, required_die, from_str, to_str)
             else:
                 self.ui.display_move_failure("Cannot bear off from that point")
             return
@@ -404,16 +539,25 @@ class BackgammonCLI:
             )
             return
 
+        color = self.game.get_current_player_color()
+        events = checker_events(self.game.board, MOVE, color, from_point, to_point, distance)
         if self.game.make_move(from_point, to_point):
-            self.state_manager.use_die(distance)
-            self.ui.display_move_success(from_str, to_str)
-            self.ui.display_remaining_dice(self.state_manager.get_remaining())
-
-            if not self.state_manager.remaining_dice:
-                self.state_manager.end_turn()
+            self.complete_move(events, distance, from_str, to_str)
         else:
             self.ui.display_move_failure("Invalid move!")
 
+    def complete_move(self, events: List[Event], die: int, from_str: str, to_str: str) -> None:
+        """Use the die of a move made on the board, log it and end the turn after the last die."""
+        color = self.game.get_current_player_color()
+        self.state_manager.use_die(die)
+        self.ui.display_move_success(from_str, to_str)
+        self.ui.display_remaining_dice(self.state_manager.get_remaining())
+
+        if not self.state_manager.remaining_dice:
+            self.state_manager.end_turn()
+            events = events + [Event(END_TURN, color)]
+        self.log.record(events)
+
     def handle_roll(self) -> None:
         """Handle roll command."""
         if self.state_manager.has_rolled:
@@ -422,9 +566,15 @@ class BackgammonCLI:
             )
             return
 
-        values_tuple = self.game.dice.roll()
+        # Undone rolls come back, so undo cannot be used to reroll
+        values_tuple = self.log.take_roll()
+        if values_tuple is None:
+            values_tuple = self.game.dice.roll()
+        else:
+            self.game.dice.die1, self.game.dice.die2 = values_tuple
 
         self.state_manager.set_roll(values_tuple)
+        self.log.record([Event(ROLL, self.game.get_current_player_color(), dice=tuple(values_tuple))])
         self.ui.display_roll(values_tuple)
 
     def handle_skip(self) -> None:
@@ -439,9 +589,141 @@ class BackgammonCLI:
                 f"Skipping turn with {len(remaining)} unused dice: {remaining}"
             )
 
+        color = self.game.get_current_player_color()
         self.state_manager.end_turn()
+        self.log.record([Event(END_TURN, color)])
         self.ui.display_message("Turn ended. Next player's turn.")
 
+    def snapshot(self) -> Snapshot:
+        """Capture the board, turn and dice for the game log."""
+        manager = self.state_manager
+        return Snapshot(
+            from_board(self.game.board),
+            self.game.get_current_player_color(),
+            tuple(manager.remaining_dice),
+            tuple(manager.original_roll),
+            manager.has_rolled,
+        )
+
+    def restore(self, state: Snapshot) -> None:
+        """Put the game back in a state taken from the game log."""
+        to_board(state.position, self.game.board)
+        self.game.current_player = "white" if state.turn == "W" else "black"
+        self.state_manager.has_rolled = state.rolled
+        self.state_manager.remaining_dice = list(state.dice)
+        self.state_manager.original_roll = list(state.roll)
+
+    def handle_undo(self) -> None:
+        """Handle undo command: take back the last action."""
+        state = self.log.undo()
+        if state is None:
+            self.ui.display_error("Nothing to undo")
+            return
+        self.restore(state)
+        self.ui.display_message("↶ Undone")
+
+    def handle_redo(self) -> None:
+        """Handle redo command: play again the last action taken back."""
+        state = self.log.redo()
+        if state is None:
+            self.ui.display_error("Nothing to redo")
+            return
+        self.restore(state)
+        self.ui.display_message("↷ Redone")
+
+    def handle_save(self, path: str) -> None:
+        """Handle save command: write the game and turn state to a file."""
+        try:
+            self.game.save(path, self.state_manager)
+        except OSError as error:
+            self.ui.display_error(f"Could not save: {error}")
+            return
+        self.ui.display_message(f"Game saved to {path}")
+
+    def handle_load(self, path: str) -> None:
+        """Handle load command: resume a game saved to a file."""
+        try:
+            self.game = Game.load(path, self.state_manager)
+        except (OSError, ValueError) as error:
+            self.ui.display_error(f"Could not load: {error}")
+            return
+        self.log = GameLog(self.snapshot())
+        self.ui.display_message(f"Game loaded from {path}")
+
+    def get_searcher(self) -> Searcher:
+        """Create the engine on first use, it is not needed to play."""
+        if self.searcher is None:
+            self.searcher = Searcher()
+        return self.searcher
+
+    def run_search(self, search: Callable[..., object], *args) -> object:
+        """
+        Run a search on a worker thread and wait for it.
+
+        Ctrl+C cancels the search, which still returns the deepest
+        result it completed.
+        """
+        self.ui.display_thinking(self.hint_budget)
+        self.search = BackgroundSearch(search, *args)
+        try:
+            return self.search.result()
+        except KeyboardInterrupt:
+            self.search.cancel()
+            return self.search.result()
+        finally:
+            self.search = None
+
+    def handle_hint(self, args: List[str]) -> None:
+        """Handle hint command: rank the plays of the current roll."""
+        if not self.state_manager.has_rolled:
+            self.ui.display_must_roll()
+            return
+
+        remaining = self.state_manager.get_remaining()
+        if not remaining:
+            self.ui.display_error("No dice remaining. Type 'skip' to end turn.")
+            return
+
+        count = DEFAULT_HINTS
+        if args:
+            try:
+                count = int(args[0])
+            except ValueError:
+                count = 0
+            if count < 1:
+                self.ui.display_error("Invalid hint count. Use: hint [n]")
+                return
+
+        # An untouched roll keeps both dice so doubles play four times
+        if remaining == self.state_manager.original_roll:
+            dice = self.state_manager.original_roll
+        else:
+            dice = remaining
+        searcher = self.get_searcher()
+        result = self.run_search(
+            searcher.search,
+            from_board(self.game.board),
+            self.game.get_current_player_color(),
+            dice,
+            self.hint_budget,
+        )
+        hints = [(format_play(play), equity) for play, _, equity in result.plays[:count]]
+        self.ui.display_hints(hints, result)
+
+    def handle_analyze(self) -> None:
+        """Handle analyze command: evaluate the current position."""
+        color = self.game.get_current_player_color()
+        position = from_board(self.game.board)
+        searcher = self.get_searcher()
+        value = self.run_search(searcher.evaluate, position, color, self.hint_budget)
+        self.ui.display_analysis(
+            self.game.current_player,
+            value,
+            pip_counts(position),
+            searcher.evaluator.classifier.classify(position),
+            blot_shots(position, color),
+        )
+
     def handle_quit(self) -> None:
         """Exit the game."""
         self.is_running = False
@@ -63,6 +63,10 @@ class Config:
     DICE_WHITE = (255, 255, 255)
     DICE_DOT = (0, 0, 0)
 
+    # Colors - Danger overlay
+    DANGER_BADGE = (200, 40, 40)
+    DANGER_TEXT = (255, 255, 255)
+
     # Checker dimensions
     CHECKER_RADIUS = 25
     CHECKER_SPACING = 15  # Vertical spacing between stacked checkers
@@ -1,5 +1,6 @@
 """Module containing the main Backgammon game logic."""
 
+from core import savegame
 from core.board import Board
 from core.player import Player
 from core.Dice import Dice
@@ -127,3 +128,101 @@ class Game:
     def get_current_player_color(self) -> str:
         """Get current player's color code."""
         return "W" if self.current_player == "white" else "B"
+
+    def to_bytes(self, manager=None, rng_state: bool = False) -> bytes:
+        """
+        Serialize the game in the compact format of core.savegame.
+
+        Args:
+            manager: Optional turn state (has_rolled, original_roll and
+                remaining_dice, like the CLI GameStateManager)
+            rng_state: Include the state of the random module
+
+        Returns:
+            The saved game
+        """
+        saved = savegame.capture(
+            self.board,
+            self.dice,
+            self.get_current_player_color(),
+            manager.has_rolled if manager else False,
+            manager.original_roll if manager else (),
+            manager.remaining_dice if manager else (),
+            rng_state,
+        )
+        return savegame.encode(saved)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, manager=None) -> "Game":
+        """
+        Rebuild a game from to_bytes() output.
+
+        Args:
+            data: Saved game
+            manager: Optional turn state to restore too; it is attached
+                to the new game
+
+        Returns:
+            The game
+
+        Raises:
+            ValueError: If the data is not a valid saved game
+        """
+        return cls.from_saved(savegame.decode(data), manager)
+
+    @classmethod
+    def from_saved(cls, saved: savegame.SavedGame, manager=None) -> "Game":
+        """
+        Rebuild a game from a decoded saved game.
+
+        Args:
+            saved: Saved game
+            manager: Optional turn state to restore too; it is attached
+                to the new game
+
+        Returns:
+            The game
+
+        Raises:
+            ValueError: If a die value is out of range
+        """
+        game = cls()
+        savegame.restore(saved, game.board, game.dice)
+        game.current_player = "white" if saved.color == "W" else "black"
+        if manager is not None:
+            manager.game = game
+            manager.has_rolled = saved.has_rolled
+            manager.original_roll = list(saved.original_roll)
+            manager.remaining_dice = list(saved.remaining)
+        return game
+
+    def save(self, path: str, manager=None, rng_state: bool = False) -> None:
+        """
+        Save the game to a file.
+
+        Args:
+            path: File to write
+            manager: Optional turn state, see to_bytes()
+            rng_state: Include the state of the random module
+        """
+        with open(path, "wb") as file:
+            file.write(self.to_bytes(manager, rng_state))
+
+    @classmethod
+    def load(cls, path: str, manager=None) -> "Game":
+        """
+        Load a game saved with save().
+
+        Args:
+            path: File to read
+            manager: Optional turn state to restore, see from_bytes()
+
+        Returns:
+            The game
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a valid saved game
+        """
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read(), manager)
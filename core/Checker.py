@@ -6,6 +6,8 @@ from typing import Union, Dict, List, Optional
 class Checker:
     """Represents a single checker piece in Backgammon."""
 
+    __slots__ = ("color", "position", "is_on_bar", "is_borne_off")
+
     def __init__(self, color: str, position: Union[int, str]) -> None:
         """Initialize a checker piece.
 
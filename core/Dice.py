@@ -1,40 +1,57 @@
-from typing import Tuple, List, Optional
+from typing import Iterator, Tuple, List, Optional
 import random
 
 
 class Dice:
     """Simple dice class for Backgammon."""
 
-    def __init__(self):
-        """Initialize with two dice set to 1."""
+    __slots__ = ("_die1", "_die2", "_mock_values", "_mock_index", "_source")
+
+    def __init__(self, source: Optional[Iterator[Tuple[int, int]]] = None):
+        """Initialize with two dice set to 1.
+
+        Args:
+            source: Rolls to use instead of the random module (see set_source)
+        """
         self._die1 = 1
         self._die2 = 1
         self._mock_values: Optional[List[Tuple[int, int]]] = None
         self._mock_index = 0
+        self._source = source
 
     def roll(self) -> Tuple[int, int]:
         """Roll both dice or return next mock value if set."""
         if self._mock_values and self._mock_index < len(self._mock_values):
             self.die1, self.die2 = self._mock_values[self._mock_index]
             self._mock_index += 1
-        else:
-            self.die1 = random.randint(1, 6)
-            self.die2 = random.randint(1, 6)
-        return self.get_values()
+            return (self._die1, self._die2)
+        if self._source is not None:
+            try:
+                roll = self._die1, self._die2 = next(self._source)
+            except StopIteration:
+                raise EOFError("The dice source has no more rolls") from None
+            return roll
+        return self._roll_random()
+
+    def _roll_random(self) -> Tuple[int, int]:
+        """Roll both dice, skipping the setters: randint() is always 1-6."""
+        die1 = self._die1 = random.randint(1, 6)
+        die2 = self._die2 = random.randint(1, 6)
+        return (die1, die2)
 
     def get_values(self) -> Tuple[int, int]:
         """Get current dice values."""
-        return (self.die1, self.die2)
+        return (self._die1, self._die2)
 
     def is_double(self) -> bool:
         """Check if dice show same value."""
-        return self.die1 == self.die2
+        return self._die1 == self._die2
 
     def get_moves(self) -> List[int]:
         """Get available moves based on dice values."""
-        if self.is_double():
-            return [self.die1] * 4
-        return [self.die1, self.die2]
+        if self._die1 == self._die2:
+            return [self._die1] * 4
+        return [self._die1, self._die2]
 
     @property
     def die1(self) -> int:
@@ -64,14 +81,33 @@ class Dice:
             raise ValueError("Die value must be between 1 and 6")
         self._die2 = value
 
-    def set_mock_rolls(self, values: Optional[List[Tuple[int, int]]]) -> None:
+    @property
+    def mock_rolls(self) -> Optional[List[Tuple[int, int]]]:
+        """Get the mock roll sequence (None if not set)."""
+        return self._mock_values
+
+    @property
+    def mock_index(self) -> int:
+        """Get the number of mock rolls already used."""
+        return self._mock_index
+
+    @property
+    def source(self) -> Optional[Iterator[Tuple[int, int]]]:
+        """Get the source of the rolls (None for the random module)."""
+        return self._source
+
+    def set_mock_rolls(
+        self, values: Optional[List[Tuple[int, int]]], index: int = 0
+    ) -> None:
         """Set predetermined roll values for testing.
 
         Args:
             values: List of tuples containing dice values
+            index: Number of rolls of the sequence already used
 
         Raises:
-            ValueError: If values is None, empty, or contains invalid dice values
+            ValueError: If values is None, empty, or contains invalid dice
+                values, or index is out of range
         """
         if values is None:
             raise ValueError("Mock values cannot be None")
@@ -84,9 +120,27 @@ class Dice:
             v1, v2 = value
             if not (1 <= v1 <= 6 and 1 <= v2 <= 6):
                 raise ValueError("Die values must be between 1 and 6")
+        if not 0 <= index <= len(values):
+            raise ValueError("Mock index out of range")
 
         self._mock_values = values
-        self._mock_index = 0
+        self._mock_index = index
+
+    def set_source(self, source: Optional[Iterator[Tuple[int, int]]]) -> None:
+        """Take rolls from a source instead of the random module.
+
+        The rolls are not validated again, so the source must only give
+        values from 1 to 6, like a core.dice_stream.DiceStream or a
+        core.dice_tape.DiceTape (which checks each roll as it is read).
+        Mock rolls still come first.
+
+        Args:
+            source: Iterator of rolls, or None for the random module
+
+        Note:
+            roll() raises EOFError once the source runs out.
+        """
+        self._source = source
 
     def clear_mock(self) -> None:
         """Clear mock values and return to random rolling."""
@@ -94,7 +148,8 @@ class Dice:
         self._mock_index = 0
 
     def reset(self) -> None:
-        """Reset dice to initial state."""
+        """Reset dice to initial state, rolling from the random module."""
         self.die1 = 1
         self.die2 = 1
         self.clear_mock()
+        self._source = None
@@ -4,6 +4,8 @@ from typing import List, Dict
 class Board:
     """Backgammon board representation."""
 
+    __slots__ = ("points", "bar", "borne_off")
+
     def __init__(self):
         """Initialize empty board."""
         self.points: List[List[str]] = [[] for _ in range(24)]
@@ -102,6 +104,9 @@ class Board:
         if not self.can_bear_off(color):
             return False
 
+        if not 0 <= point < 24:
+            return False
+
         if not self.points[point] or self.points[point][0] != color:
             return False
 
@@ -165,6 +170,30 @@ class Board:
                 return False
         return True
 
+    def has_contact(self) -> bool:
+        """Check if the two sides can still hit or block each other.
+
+        White moves from point 23 towards point 0 and Black the other way,
+        so there is no contact once every White checker is below every
+        Black checker and nobody is on the bar.
+
+        Returns:
+            bool: True if the position is not a pure race
+        """
+        if self.bar["W"] > 0 or self.bar["B"] > 0:
+            return True
+
+        highest_white = -1
+        lowest_black = 24
+        for i, point in enumerate(self.points):
+            if not point:
+                continue
+            if point[0] == "W":
+                highest_white = i
+            elif lowest_black == 24:
+                lowest_black = i
+        return highest_white > lowest_black
+
     def move_checker_from_bar(self, to_point: int, color: str) -> bool:
         """Move checker from bar to home board.
 
@@ -0,0 +1,221 @@
+"""
+Dice tapes: rolls streamed from a file or an iterator.
+
+A tape file is a short header followed by one byte per roll (die1 in the
+high nibble, as in core.savegame and core.dice_stream)::
+
+    b"BGDT", version (uint8), then the rolls
+
+Tapes are read a chunk at a time and each roll is checked when it is
+taken, so a tape of millions of rolls never sits in memory as a list of
+tuples. Since a roll is one byte, any worker can open the same file at
+any roll in constant time: give every policy of a duplicate-dice match
+its own DiceTape over the same range and they all see identical dice.
+For the same reason a saved game (core.savegame) only needs the path
+and position of a tape opened from a path to pick it up again.
+
+Create a tape from a seed with::
+
+    python -m core.dice_tape --seed 7 --rolls 1000000 match.tape
+"""
+
+import argparse
+import os
+import struct
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple, Union
+
+from core.dice_stream import ROLLS, DiceStream
+
+_MAGIC = b"BGDT"
+_VERSION = 1
+_HEADER = struct.Struct("<4sB")
+
+DEFAULT_CHUNK_SIZE = 65536
+
+TapeSource = Union[str, os.PathLike, BinaryIO, Iterable[Tuple[int, int]]]
+
+
+def _check_roll(value, index: int) -> Tuple[int, int]:
+    """Validate one roll of an iterator source."""
+    if not isinstance(value, tuple) or len(value) != 2:
+        raise ValueError(f"Roll {index} must be a tuple of length 2")
+    die1, die2 = value
+    if not (isinstance(die1, int) and isinstance(die2, int)):
+        raise ValueError(f"Roll {index} must hold integers")
+    if not (1 <= die1 <= 6 and 1 <= die2 <= 6):
+        raise ValueError(f"Die values of roll {index} must be between 1 and 6")
+    return value
+
+
+class DiceTape:
+    """Rolls read lazily from a tape file or an iterator, checked one by one."""
+
+    def __init__(
+        self,
+        source: TapeSource,
+        start: int = 0,
+        count: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        """
+        Open a tape.
+
+        Args:
+            source: Tape file (path or binary file object) or iterator of rolls
+            start: Number of rolls to skip
+            count: Rolls to give at most (up to the end of the tape if None)
+            chunk_size: Bytes read from the file at a time
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a dice tape
+        """
+        self.position = start
+        self.end = None if count is None else start + count
+        self.path: Optional[str] = None
+        self._chunk_size = chunk_size
+        self._chunk = b""
+        self._index = 0
+        self._rolls: Optional[Iterator] = None
+        self._file: Optional[BinaryIO] = None
+        self._owns_file = False
+        if isinstance(source, (str, os.PathLike)):
+            self.path = os.fspath(source)
+            self._file = open(source, "rb")  # pylint: disable=consider-using-with
+            self._owns_file = True
+        elif hasattr(source, "read"):
+            self._file = source
+        else:
+            self._rolls = islice(iter(source), start, None)
+            return
+        try:
+            self._open_file(start)
+        except (OSError, ValueError):
+            self.close()
+            raise
+
+    def _open_file(self, start: int) -> None:
+        """Check the header and move to the first roll."""
+        header = self._file.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError("Not a dice tape")
+        magic, version = _HEADER.unpack(header)
+        if magic != _MAGIC:
+            raise ValueError("Not a dice tape")
+        if version != _VERSION:
+            raise ValueError(f"Unsupported dice tape version {version}")
+        if start and self._file.seekable():
+            self._file.seek(start, os.SEEK_CUR)
+        else:
+            while start > 0:
+                skipped = len(self._file.read(min(start, self._chunk_size)))
+                if not skipped:
+                    break
+                start -= skipped
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        """Tapes are their own iterator."""
+        return self
+
+    def __next__(self) -> Tuple[int, int]:
+        """
+        Next roll of the tape.
+
+        Raises:
+            StopIteration: At the end of the tape or of its range
+            ValueError: If the roll is not valid
+        """
+        if self.end is not None and self.position >= self.end:
+            raise StopIteration
+        if self._rolls is not None:
+            roll = _check_roll(next(self._rolls), self.position)
+        else:
+            if self._index >= len(self._chunk):
+                self._chunk = self._file.read(self._chunk_size)
+                self._index = 0
+                if not self._chunk:
+                    raise StopIteration
+            byte = self._chunk[self._index]
+            roll = ROLLS[byte]
+            if roll is None:
+                raise ValueError(f"Invalid roll byte {byte:#04x} at roll {self.position}")
+            self._index += 1
+        self.position += 1
+        return roll
+
+    def close(self) -> None:
+        """Close the file if the tape opened it."""
+        if self._owns_file and self._file is not None:
+            self._file.close()
+        self._file = None
+        self._chunk = b""
+
+    def __enter__(self) -> "DiceTape":
+        """Use the tape in a with block."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Close the tape at the end of the with block."""
+        self.close()
+
+
+def write_tape(
+    path: Union[str, os.PathLike],
+    rolls: Iterable[Tuple[int, int]],
+    count: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    Write rolls to a tape file, a chunk at a time.
+
+    Args:
+        path: File to write
+        rolls: Rolls to write (a DiceStream is copied in bulk)
+        count: Rolls to write at most (all of them if None; required for
+            endless sources such as a DiceStream)
+        chunk_size: Rolls encoded at a time
+
+    Returns:
+        Number of rolls written
+
+    Raises:
+        ValueError: If a roll is not valid, or count is missing for a
+            DiceStream
+    """
+    written = 0
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(_MAGIC, _VERSION))
+        if isinstance(rolls, DiceStream):
+            if count is None:
+                raise ValueError("A dice stream is endless: give a count")
+            while written < count:
+                data = rolls.take(min(chunk_size, count - written))
+                file.write(data)
+                written += len(data)
+            return written
+        source = iter(rolls) if count is None else islice(rolls, count)
+        while True:
+            chunk = bytearray()
+            for roll in islice(source, chunk_size):
+                die1, die2 = _check_roll(roll, written + len(chunk))
+                chunk.append(die1 << 4 | die2)
+            if not chunk:
+                return written
+            file.write(chunk)
+            written += len(chunk)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point: write a tape from a seeded dice stream."""
+    parser = argparse.ArgumentParser(description="Write a dice tape from a seed")
+    parser.add_argument("path", help="Tape file to write")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rolls", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+    written = write_tape(args.path, DiceStream(args.seed), args.rolls)
+    print(f"Wrote {written:,} rolls to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
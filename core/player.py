@@ -1,6 +1,18 @@
 class Player:
     """Player in Backgammon game."""
 
+    __slots__ = (
+        "name",
+        "color",
+        "points",
+        "pieces_in_home_board",
+        "pieces_on_bar",
+        "current_position",
+        "pieces_at_point",
+        "pieces",
+        "pieces_removed",
+    )
+
     def __init__(self, name: str, color: str):
         """Create new player."""
         self.name = name
@@ -0,0 +1,327 @@
+"""
+Compact binary format for games in progress.
+
+A saved game holds the board, the dice (with any mock roll sequence),
+the color on roll and the turn state (rolled or not, dice left to play,
+original roll). It takes 42 bytes plus one per mock roll and die in
+play, so thousands of games are written and read back in a fraction of
+a second.
+
+The state of the random module can be added on request. Dice draw from
+the module-level generator, which every game of the process shares, so
+restoring it is only meaningful for a single game (2.5 KB more).
+
+Dice that draw from a core.dice_stream.DiceStream are saved with the
+stream's seed and the number of rolls it gave, and dice that read a
+core.dice_tape.DiceTape opened from a path with the path and the roll
+range left, so the restored game goes on with the same rolls. Other roll
+sources (iterators, tapes over open files) cannot be saved.
+
+Layout (little endian)::
+
+    b"BGSV", version (uint8), flags (uint8)
+    24 signed bytes (White positive), bar W/B, borne off W/B (uint8)
+    die1, die2 (uint8)
+    mock rolls: count (uint16), next index (uint16), one byte per roll
+    original roll: count (uint8) + values, remaining dice: count + values
+    [random state, if flags & RNG_STATE]
+    [dice stream, if flags & DICE_STREAM: seed length (uint8), seed
+     (signed), block size (uint32), rolls consumed (uint64)]
+    [dice tape, if flags & DICE_TAPE: path length (uint16), UTF-8 path,
+     position (uint64), end (int64, -1 for the end of the tape)]
+"""
+
+import random
+import struct
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+from core.board import Board
+from core.Dice import Dice
+from core.dice_stream import DiceStream
+from core.dice_tape import DiceTape
+
+DEFAULT_SAVE_FILE = "backgammon.sav"
+
+_MAGIC = b"BGSV"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBB")
+_BOARD = struct.Struct("<24b4B")
+_DICE = struct.Struct("<2BHH")
+_RNG = struct.Struct("<B625I")
+_GAUSS = struct.Struct("<d")
+_STREAM = struct.Struct("<IQ")
+_TAPE_PATH = struct.Struct("<H")
+_TAPE = struct.Struct("<Qq")
+
+BLACK_TO_PLAY = 1
+ROLLED = 2
+RNG_STATE = 4
+HAS_GAUSS = 8
+DICE_STREAM = 16
+DICE_TAPE = 32
+
+
+class StreamPosition(NamedTuple):
+    """Where a DiceStream is, enough to rebuild it."""
+
+    seed: int
+    block_size: int
+    consumed: int
+
+
+class TapePosition(NamedTuple):
+    """Where a DiceTape opened from a path is, enough to reopen it."""
+
+    path: str
+    position: int
+    end: Optional[int] = None
+
+
+SourcePosition = Union[StreamPosition, TapePosition]
+
+
+class SavedGame(NamedTuple):
+    """Everything needed to resume a game."""
+
+    points: Tuple[int, ...]
+    bar: Tuple[int, int]
+    borne_off: Tuple[int, int]
+    color: str
+    dice: Tuple[int, int]
+    mock_rolls: Optional[List[Tuple[int, int]]] = None
+    mock_index: int = 0
+    has_rolled: bool = False
+    original_roll: Tuple[int, ...] = ()
+    remaining: Tuple[int, ...] = ()
+    rng_state: Optional[tuple] = None
+    dice_source: Optional[SourcePosition] = None
+
+
+def _source_position(source) -> Optional[SourcePosition]:
+    """Position of the roll source of some dice, for saving."""
+    if source is None:
+        return None
+    if isinstance(source, DiceStream):
+        return StreamPosition(source.seed, source.block_size, source.consumed)
+    if isinstance(source, DiceTape) and source.path is not None:
+        return TapePosition(source.path, source.position, source.end)
+    raise ValueError(f"Cannot save dice that roll from a {type(source).__name__}")
+
+
+def _open_source(position: SourcePosition) -> Union[DiceStream, DiceTape]:
+    """Rebuild a saved roll source at the roll where it was saved."""
+    if isinstance(position, TapePosition):
+        count = None if position.end is None else position.end - position.position
+        return DiceTape(position.path, position.position, count)
+    stream = DiceStream(position.seed, position.block_size)
+    stream.skip(position.consumed)
+    return stream
+
+
+def capture(
+    board: Board,
+    dice: Dice,
+    color: str,
+    has_rolled: bool = False,
+    original_roll: Tuple[int, ...] = (),
+    remaining: Tuple[int, ...] = (),
+    rng_state: bool = False,
+) -> SavedGame:
+    """
+    Take a SavedGame from live objects.
+
+    Args:
+        board: Board to save
+        dice: Dice to save
+        color: Color on roll ('W' or 'B')
+        has_rolled: Whether the dice were rolled this turn
+        original_roll: Dice rolled this turn
+        remaining: Dice still to play
+        rng_state: Include the state of the random module
+
+    Returns:
+        SavedGame
+
+    Raises:
+        ValueError: If the dice roll from a source that cannot be saved
+    """
+    points = tuple(
+        (len(point) if point[0] == "W" else -len(point)) if point else 0
+        for point in board.points
+    )
+    mock = dice.mock_rolls
+    return SavedGame(
+        points,
+        (board.bar["W"], board.bar["B"]),
+        (board.borne_off["W"], board.borne_off["B"]),
+        color,
+        dice.get_values(),
+        list(mock) if mock else None,
+        dice.mock_index,
+        has_rolled,
+        tuple(original_roll),
+        tuple(remaining),
+        random.getstate() if rng_state else None,
+        _source_position(dice.source),
+    )
+
+
+def restore(saved: SavedGame, board: Board, dice: Dice) -> None:
+    """
+    Write a SavedGame into a board and dice (and the random module, if
+    its state was saved). The dice roll from the saved source, if any,
+    and from the random module otherwise. A DiceTape the dice were
+    reading from a path is closed once it is replaced.
+
+    Args:
+        saved: Game to restore
+        board: Board to overwrite
+        dice: Dice to overwrite
+
+    Raises:
+        OSError: If the saved dice tape cannot be opened
+        ValueError: If the saved dice tape is not a dice tape
+    """
+    board.points = [
+        ["W"] * count if count > 0 else ["B"] * -count for count in saved.points
+    ]
+    board.bar = {"W": saved.bar[0], "B": saved.bar[1]}
+    board.borne_off = {"W": saved.borne_off[0], "B": saved.borne_off[1]}
+    dice.die1, dice.die2 = saved.dice
+    if saved.mock_rolls:
+        dice.set_mock_rolls(saved.mock_rolls, saved.mock_index)
+    else:
+        dice.clear_mock()
+    source = None if saved.dice_source is None else _open_source(saved.dice_source)
+    replaced = dice.source
+    dice.set_source(source)
+    if isinstance(replaced, DiceTape) and replaced.path is not None:
+        replaced.close()
+    if saved.rng_state is not None:
+        random.setstate(saved.rng_state)
+
+
+def _pack_roll(roll: Tuple[int, int]) -> int:
+    """One byte per roll: die1 in the high nibble."""
+    return roll[0] << 4 | roll[1]
+
+
+def encode(saved: SavedGame) -> bytes:
+    """
+    Serialize a SavedGame.
+
+    Args:
+        saved: Game to serialize
+
+    Returns:
+        The bytes
+    """
+    flags = BLACK_TO_PLAY if saved.color == "B" else 0
+    if saved.has_rolled:
+        flags |= ROLLED
+    if saved.rng_state is not None:
+        flags |= RNG_STATE
+        if saved.rng_state[2] is not None:
+            flags |= HAS_GAUSS
+    if isinstance(saved.dice_source, TapePosition):
+        flags |= DICE_TAPE
+    elif saved.dice_source is not None:
+        flags |= DICE_STREAM
+    mock = saved.mock_rolls or []
+    parts = [
+        _HEADER.pack(_MAGIC, _VERSION, flags),
+        _BOARD.pack(*saved.points, *saved.bar, *saved.borne_off),
+        _DICE.pack(*saved.dice, len(mock), saved.mock_index),
+        bytes(_pack_roll(roll) for roll in mock),
+        bytes([len(saved.original_roll), *saved.original_roll]),
+        bytes([len(saved.remaining), *saved.remaining]),
+    ]
+    if saved.rng_state is not None:
+        version, internal, gauss = saved.rng_state
+        parts.append(_RNG.pack(version, *internal))
+        if gauss is not None:
+            parts.append(_GAUSS.pack(gauss))
+    if isinstance(saved.dice_source, TapePosition):
+        path, position, end = saved.dice_source
+        path_bytes = path.encode("utf-8")
+        parts.append(_TAPE_PATH.pack(len(path_bytes)) + path_bytes)
+        parts.append(_TAPE.pack(position, -1 if end is None else end))
+    elif saved.dice_source is not None:
+        seed, block_size, consumed = saved.dice_source
+        seed_bytes = seed.to_bytes((seed.bit_length() + 8) // 8, "little", signed=True)
+        parts.append(bytes([len(seed_bytes)]) + seed_bytes)
+        parts.append(_STREAM.pack(block_size, consumed))
+    return b"".join(parts)
+
+
+def decode(data: bytes) -> SavedGame:
+    """
+    Read a SavedGame back.
+
+    Args:
+        data: Bytes from encode()
+
+    Returns:
+        SavedGame
+
+    Raises:
+        ValueError: If the data is not a saved game of a known version
+    """
+    try:
+        magic, version, flags = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC:
+            raise ValueError("Not a saved game")
+        if version != _VERSION:
+            raise ValueError(f"Unsupported saved game version {version}")
+        offset = _HEADER.size
+        board = _BOARD.unpack_from(data, offset)
+        offset += _BOARD.size
+        die1, die2, mock_count, mock_index = _DICE.unpack_from(data, offset)
+        offset += _DICE.size
+        mock = [(byte >> 4, byte & 15) for byte in data[offset : offset + mock_count]]
+        offset += mock_count
+        rolls = []
+        for _ in range(2):
+            count = data[offset]
+            rolls.append(tuple(data[offset + 1 : offset + 1 + count]))
+            offset += 1 + count
+        rng_state = None
+        if flags & RNG_STATE:
+            values = _RNG.unpack_from(data, offset)
+            offset += _RNG.size
+            gauss = _GAUSS.unpack_from(data, offset)[0] if flags & HAS_GAUSS else None
+            rng_state = (values[0], values[1:], gauss)
+            offset += _GAUSS.size if flags & HAS_GAUSS else 0
+        dice_source = None
+        if flags & DICE_STREAM:
+            length = data[offset]
+            if len(data) < offset + 1 + length:
+                raise ValueError("Truncated saved game")
+            seed = int.from_bytes(data[offset + 1 : offset + 1 + length], "little", signed=True)
+            offset += 1 + length
+            dice_source = StreamPosition(seed, *_STREAM.unpack_from(data, offset))
+        elif flags & DICE_TAPE:
+            (length,) = _TAPE_PATH.unpack_from(data, offset)
+            offset += _TAPE_PATH.size
+            if len(data) < offset + length:
+                raise ValueError("Truncated saved game")
+            path = data[offset : offset + length].decode("utf-8")
+            offset += length
+            position, end = _TAPE.unpack_from(data, offset)
+            dice_source = TapePosition(path, position, None if end < 0 else end)
+    except (struct.error, IndexError) as error:
+        raise ValueError("Truncated saved game") from error
+    return SavedGame(
+        board[:24],
+        board[24:26],
+        board[26:28],
+        "B" if flags & BLACK_TO_PLAY else "W",
+        (die1, die2),
+        mock or None,
+        mock_index,
+        bool(flags & ROLLED),
+        rolls[0],
+        rolls[1],
+        rng_state,
+        dice_source,
+    )
@@ -0,0 +1 @@
+"""Game engine: compact positions, move generation and evaluators."""
@@ -0,0 +1,238 @@
+"""
+Exact bear-off evaluation from one-sided databases.
+
+For a home board (checker counts on the six home points) the database
+holds the probability of bearing everything off in exactly 1, 2, 3...
+rolls when playing to minimise the expected number of rolls. Entries are
+computed on first use and cached, for home boards of up to max_checkers
+checkers.
+
+With both sides bearing off the two distributions give the exact chance
+of winning; with only one side home its exact expected rolls replace the
+effective pip count in the race formula.
+"""
+
+from typing import Dict, List, Sequence, Set, Tuple
+
+import numpy as np
+
+from engine.evaluator import Evaluator
+from engine.movegen import DISTINCT_ROLLS
+from engine.position import BLACK_OFF, CHECKERS_PER_SIDE, WHITE_OFF, Position
+from engine.race import PIPS_PER_ROLL, effective_pip_count, race_win_probability
+
+DEFAULT_MAX_CHECKERS = 8
+
+Home = Tuple[int, int, int, int, int, int]
+
+def _pack(home: Sequence[int]) -> int:
+    """Pack six checker counts into one int, four bits per point."""
+    packed = 0
+    for point in range(6):
+        packed |= home[point] << (4 * point)
+    return packed
+
+
+def _moves(state: int, die: int, max_src: int) -> List[Tuple[int, int]]:
+    """Single bear-off moves of one die on a packed home board."""
+    highest = -1
+    for point in range(5, -1, -1):
+        if (state >> (4 * point)) & 15:
+            highest = point
+            break
+    moves = []
+    for point in range(min(highest, max_src), -1, -1):
+        if not (state >> (4 * point)) & 15:
+            continue
+        target = point - die
+        if target >= 0:
+            moves.append((point, state - (1 << (4 * point)) + (1 << (4 * target))))
+        elif target == -1 or point == highest:
+            moves.append((point, state - (1 << (4 * point))))
+    return moves
+
+
+def _successors(state: int, roll: Tuple[int, int]) -> Set[int]:
+    """Home boards reachable with one roll."""
+    die1, die2 = roll
+    results: Set[int] = set()
+    if die1 == die2:
+        frontier = [(state, 5)]
+        for _ in range(4):
+            following = []
+            for current, max_src in frontier:
+                moves = _moves(current, die1, max_src)
+                if not moves:
+                    results.add(current)
+                following.extend((after, point) for point, after in moves)
+            frontier = following
+        results.update(current for current, _ in frontier)
+        return results
+    for first, second in ((die1, die2), (die2, die1)):
+        moves = _moves(state, first, 5)
+        if not moves:
+            results.add(state)
+        for _, after in moves:
+            follow = _moves(after, second, 5)
+            if not follow:
+                results.add(after)
+            results.update(final for _, final in follow)
+    return results
+
+
+class BearoffDatabase:
+    """One-sided bear-off distributions, computed lazily and cached."""
+
+    def __init__(self, max_checkers: int = DEFAULT_MAX_CHECKERS):
+        """Create an empty database.
+
+        Args:
+            max_checkers: Largest number of checkers the database covers
+        """
+        self.max_checkers = max_checkers
+        self._distributions: Dict[int, Tuple[float, ...]] = {0: (1.0,)}
+        self._expected: Dict[int, float] = {0: 0.0}
+
+    def covers(self, home: Sequence[int]) -> bool:
+        """Check if a home board is small enough for the database."""
+        return sum(home) <= self.max_checkers
+
+    def distribution(self, home: Sequence[int]) -> Tuple[float, ...]:
+        """Probability of finishing in exactly n rolls, for n = 0, 1, 2...
+
+        Raises:
+            ValueError: If the home board has more than max_checkers checkers
+        """
+        if not self.covers(home):
+            raise ValueError(f"Bear-off database covers up to {self.max_checkers} checkers")
+        return self._distribution(_pack(home))
+
+    def expected_rolls(self, home: Sequence[int]) -> float:
+        """Expected number of rolls to bear off every checker."""
+        state = _pack(home)
+        self.distribution(home)
+        return self._expected[state]
+
+    def _distribution(self, state: int) -> Tuple[float, ...]:
+        """Compute (or fetch) the distribution of a packed home board."""
+        cached = self._distributions.get(state)
+        if cached is not None:
+            return cached
+        totals: List[float] = []
+        for roll, weight in DISTINCT_ROLLS:
+            best = None
+            best_expected = 0.0
+            for after in _successors(state, roll):
+                self._distribution(after)
+                if best is None or self._expected[after] < best_expected:
+                    best, best_expected = after, self._expected[after]
+            best_distribution = self._distributions[best]
+            if len(totals) <= len(best_distribution):
+                totals.extend([0.0] * (len(best_distribution) + 1 - len(totals)))
+            for rolls, prob in enumerate(best_distribution):
+                totals[rolls + 1] += weight * prob
+        while totals[-1] == 0.0:
+            totals.pop()
+        result = tuple(total / 36.0 for total in totals)
+        self._distributions[state] = result
+        self._expected[state] = sum(rolls * prob for rolls, prob in enumerate(result))
+        return result
+
+    def __len__(self) -> int:
+        """Number of home boards computed so far."""
+        return len(self._distributions)
+
+
+def white_home(position: Position) -> Home:
+    """White's checkers on points 0-5 (its 1 to 6 points)."""
+    return tuple(max(position[point], 0) for point in range(6))
+
+
+def black_home(position: Position) -> Home:
+    """Black's checkers on points 23-18 (its 1 to 6 points)."""
+    return tuple(max(-position[23 - point], 0) for point in range(6))
+
+
+def is_home(position: Position, color: str) -> bool:
+    """Check if every checker of a side left on the board is in its home."""
+    home = white_home(position) if color == "W" else black_home(position)
+    off = position[WHITE_OFF] if color == "W" else position[BLACK_OFF]
+    return sum(home) + off == CHECKERS_PER_SIDE
+
+
+def first_to_finish(on_roll: Sequence[float], other: Sequence[float]) -> float:
+    """Chance that the side on roll finishes first.
+
+    The side on roll wins if it needs no more rolls than the other side,
+    because it gets its n-th roll before the other side's n-th roll.
+    """
+    other_cdf = np.cumsum(other)
+    total = 0.0
+    for rolls, prob in enumerate(on_roll):
+        if rolls == 0:
+            total += prob
+            continue
+        done_before = other_cdf[min(rolls - 1, len(other_cdf) - 1)]
+        total += prob * (1.0 - done_before)
+    return total
+
+
+class BearoffEvaluator(Evaluator):
+    """Scores bear-off positions from one-sided databases."""
+
+    def __init__(self, database: BearoffDatabase = None):
+        """Create the evaluator.
+
+        Args:
+            database: Database to use (a new default one if None)
+        """
+        self.database = database if database is not None else BearoffDatabase()
+
+    def two_sided(self, position: Position, turn: str) -> float:
+        """Exact chance that White wins when both sides are bearing off."""
+        white = self.database.distribution(white_home(position))
+        black = self.database.distribution(black_home(position))
+        if turn == "W":
+            return first_to_finish(white, black)
+        return 1.0 - first_to_finish(black, white)
+
+    def one_sided(self, position: Position, turn: str) -> float:
+        """Chance that White wins when only one side is bearing off.
+
+        The side in its home board uses its exact expected rolls as an
+        effective pip count; the other side uses the race formula.
+        """
+        if is_home(position, "W") and self.database.covers(white_home(position)):
+            white = self.database.expected_rolls(white_home(position)) * PIPS_PER_ROLL
+        else:
+            white = effective_pip_count(position, "W")
+        if is_home(position, "B") and self.database.covers(black_home(position)):
+            black = self.database.expected_rolls(black_home(position)) * PIPS_PER_ROLL
+        else:
+            black = effective_pip_count(position, "B")
+        if turn == "W":
+            return race_win_probability(white, black)
+        return 1.0 - race_win_probability(black, white)
+
+    def win_probability(self, position: Position, turn: str) -> float:
+        """Get the probability that White wins one bear-off position."""
+        if position[WHITE_OFF] == CHECKERS_PER_SIDE:
+            return 1.0
+        if position[BLACK_OFF] == CHECKERS_PER_SIDE:
+            return 0.0
+        if (
+            is_home(position, "W")
+            and is_home(position, "B")
+            and self.database.covers(white_home(position))
+            and self.database.covers(black_home(position))
+        ):
+            return self.two_sided(position, turn)
+        return self.one_sided(position, turn)
+
+    def win_probabilities(self, positions: Sequence[Position], turn: str) -> np.ndarray:
+        """Get the probability that White wins for a batch of positions."""
+        return np.fromiter(
+            (self.win_probability(position, turn) for position in positions),
+            dtype=np.float64,
+            count=len(positions),
+        )
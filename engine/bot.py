@@ -0,0 +1,53 @@
+"""
+Computer player that combines the opening book and the engine.
+"""
+
+from typing import Optional, Sequence
+
+from engine.engine import Engine
+from engine.opening_book import OpeningBook
+from engine.position import Play, Position
+
+
+class Bot:
+    """Chooses plays: book moves when known, otherwise the engine's best play.
+
+    The book is only followed when it was built with the engine's own
+    network, checked at every book hit so new weights are noticed; any
+    other book would override the engine with plays it would not choose.
+
+    A Bot is callable with the same arguments as choose_play(), so it can
+    be passed as a policy to HeadlessGame.
+    """
+
+    def __init__(self, engine: Optional[Engine] = None, book: Optional[OpeningBook] = None):
+        """Create the bot.
+
+        Args:
+            engine: Engine used outside the book (a default one if None)
+            book: Opening book (the default one if None)
+        """
+        self.engine = engine if engine is not None else Engine()
+        self.book = book if book is not None else OpeningBook.default()
+        self.book_hits = 0
+
+    def choose_play(self, position: Position, color: str, roll: Sequence[int]) -> Play:
+        """Pick a play for a roll.
+
+        Args:
+            position: Position before the play
+            color: Side to move
+            roll: The two dice values
+
+        Returns:
+            The chosen play
+        """
+        play = self.book.lookup(position, color, roll)
+        if play is not None and self.book.matches(self.engine):
+            self.book_hits += 1
+            return play
+        return self.engine.best_play(position, color, roll)
+
+    def __call__(self, position: Position, color: str, roll: Sequence[int]) -> Play:
+        """Same as choose_play()."""
+        return self.choose_play(position, color, roll)
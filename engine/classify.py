@@ -0,0 +1,91 @@
+"""
+Position classes used to pick the cheapest correct evaluator.
+
+Classes, from cheapest to most expensive:
+
+- terminal: one side has borne off every checker
+- bearoff2: no contact, both sides in their home boards and covered by
+  the bear-off database
+- bearoff1: no contact, one side in its home board and covered by the
+  bear-off database
+- race: no contact otherwise
+- contact: the sides can still hit or block each other
+"""
+
+from typing import Dict
+
+from core.board import Board
+from engine.bearoff import DEFAULT_MAX_CHECKERS, black_home, is_home, white_home
+from engine.position import Position, from_board, has_contact, winner
+
+TERMINAL = "terminal"
+BEAROFF_TWO_SIDED = "bearoff2"
+BEAROFF_ONE_SIDED = "bearoff1"
+RACE = "race"
+CONTACT = "contact"
+
+CLASSES = (TERMINAL, BEAROFF_TWO_SIDED, BEAROFF_ONE_SIDED, RACE, CONTACT)
+
+DEFAULT_CACHE_SIZE = 200_000
+
+
+class PositionClassifier:
+    """Labels positions with their class, caching results by position."""
+
+    def __init__(
+        self,
+        bearoff_checkers: int = DEFAULT_MAX_CHECKERS,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ):
+        """Create the classifier.
+
+        Args:
+            bearoff_checkers: Largest home board covered by the bear-off database
+            cache_size: Entries kept before the cache is cleared
+        """
+        self.bearoff_checkers = bearoff_checkers
+        self.cache_size = cache_size
+        self._cache: Dict[Position, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def classify(self, position: Position) -> str:
+        """Get the class of a position.
+
+        The position tuple itself is the cache key, so lookups cost one
+        hash of the tuple.
+        """
+        label = self._cache.get(position)
+        if label is not None:
+            self.hits += 1
+            return label
+        self.misses += 1
+        label = self._classify(position)
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[position] = label
+        return label
+
+    def classify_board(self, board: Board) -> str:
+        """Get the class of a Board's position."""
+        return self.classify(from_board(board))
+
+    def _classify(self, position: Position) -> str:
+        """Classify without the cache."""
+        if winner(position):
+            return TERMINAL
+        if has_contact(position):
+            return CONTACT
+        white = is_home(position, "W") and sum(white_home(position)) <= self.bearoff_checkers
+        black = is_home(position, "B") and sum(black_home(position)) <= self.bearoff_checkers
+        if white and black:
+            return BEAROFF_TWO_SIDED
+        if white or black:
+            return BEAROFF_ONE_SIDED
+        return RACE
+
+    def clear(self) -> None:
+        """Empty the cache and reset the hit counters."""
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,104 @@
+"""
+Engine entry point that routes positions to the right evaluator.
+
+Every position is classified (see engine.classify) and sent to the
+cheapest evaluator that is correct for its class: finished games are
+scored exactly, bear-offs from the bear-off database, races from pip
+counts, and only contact positions reach the neural network. The number
+of positions and the time spent in each class are recorded.
+"""
+
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from engine.bearoff import BearoffDatabase, BearoffEvaluator
+from engine.classify import (
+    BEAROFF_ONE_SIDED,
+    BEAROFF_TWO_SIDED,
+    CLASSES,
+    RACE,
+    TERMINAL,
+    PositionClassifier,
+)
+from engine.evaluator import Evaluator
+from engine.neural import NeuralEvaluator
+from engine.position import Position, winner
+from engine.race import RaceEvaluator
+
+
+class Engine(Evaluator):
+    """Dispatches each position to the cheapest evaluator that handles it."""
+
+    def __init__(
+        self,
+        neural: Optional[NeuralEvaluator] = None,
+        race: Optional[RaceEvaluator] = None,
+        bearoff: Optional[BearoffEvaluator] = None,
+        classifier: Optional[PositionClassifier] = None,
+    ):
+        """Create the engine.
+
+        Args:
+            neural: Evaluator for contact positions (a default one if None)
+            race: Evaluator for races (a default one if None)
+            bearoff: Evaluator for bear-offs (a default one if None)
+            classifier: Position classifier (one matching the bear-off
+                database if None)
+        """
+        self.neural = neural if neural is not None else NeuralEvaluator()
+        self.race = race if race is not None else RaceEvaluator()
+        self.bearoff = bearoff if bearoff is not None else BearoffEvaluator(BearoffDatabase())
+        if classifier is None:
+            classifier = PositionClassifier(self.bearoff.database.max_checkers)
+        self.classifier = classifier
+        self.counts: Dict[str, int] = {}
+        self.timings: Dict[str, float] = {}
+        self.reset_stats()
+
+    def win_probabilities(self, positions: Sequence[Position], turn: str) -> np.ndarray:
+        """Get the probability that White wins, one evaluator per class."""
+        groups: Dict[str, List[int]] = {}
+        for index, position in enumerate(positions):
+            groups.setdefault(self.classifier.classify(position), []).append(index)
+
+        probs = np.empty(len(positions), dtype=np.float64)
+        for label, indexes in groups.items():
+            start = time.perf_counter()
+            batch = [positions[index] for index in indexes]
+            probs[indexes] = self._evaluate(label, batch, turn)
+            self.timings[label] += time.perf_counter() - start
+            self.counts[label] += len(indexes)
+        return probs
+
+    def _evaluate(self, label: str, batch: List[Position], turn: str) -> np.ndarray:
+        """Evaluate positions that all belong to one class."""
+        if label == TERMINAL:
+            return np.asarray([1.0 if winner(p) == "W" else 0.0 for p in batch])
+        if label in (BEAROFF_TWO_SIDED, BEAROFF_ONE_SIDED):
+            return self.bearoff.win_probabilities(batch, turn)
+        if label == RACE:
+            return self.race.win_probabilities(batch, turn)
+        return self.neural.win_probabilities(batch, turn)
+
+    def stats(self) -> Dict[str, Tuple[int, float]]:
+        """Positions evaluated and seconds spent, per class."""
+        return {label: (self.counts[label], self.timings[label]) for label in CLASSES}
+
+    def report(self) -> str:
+        """Table of the per class counters and timings."""
+        lines = [f"{'class':10} {'positions':>10} {'seconds':>9} {'us/pos':>8}"]
+        for label, (count, seconds) in self.stats().items():
+            per_position = seconds / count * 1e6 if count else 0.0
+            lines.append(f"{label:10} {count:10d} {seconds:9.3f} {per_position:8.1f}")
+        lines.append(
+            f"classifier cache: {self.classifier.hits} hits, "
+            f"{self.classifier.misses} misses"
+        )
+        return "\n".join(lines)
+
+    def reset_stats(self) -> None:
+        """Set every counter and timing back to zero."""
+        self.counts = {label: 0 for label in CLASSES}
+        self.timings = {label: 0.0 for label in CLASSES}
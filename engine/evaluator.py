@@ -0,0 +1,71 @@
+"""
+Common interface of the position evaluators.
+
+Subclasses only implement win_probabilities() for a batch of positions;
+equities and play ranking are built on top of it.
+"""
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from engine.movegen import legal_plays
+from engine.position import Play, Position, opponent
+
+RankedPlay = Tuple[Play, Position, float]
+
+
+class Evaluator:
+    """Base class for evaluators that score batches of positions."""
+
+    def win_probabilities(self, positions: Sequence[Position], turn: str) -> np.ndarray:
+        """Get the probability that White wins for a batch of positions.
+
+        Args:
+            positions: Position tuples
+            turn: Side to move in every position
+
+        Returns:
+            Array of shape (len(positions),)
+        """
+        raise NotImplementedError
+
+    def equities(self, positions: Sequence[Position], color: str, turn: str) -> np.ndarray:
+        """Get equities (-1 to 1) of a batch of positions for one side.
+
+        Args:
+            positions: Position tuples
+            color: Side whose equity is wanted
+            turn: Side to move in every position
+
+        Returns:
+            Array of shape (len(positions),)
+        """
+        probs = self.win_probabilities(positions, turn)
+        if color == "B":
+            probs = 1.0 - probs
+        return 2.0 * probs - 1.0
+
+    def rank_plays(self, position: Position, color: str, roll: Sequence[int]) -> List[RankedPlay]:
+        """Score every legal play of a roll in a single batch.
+
+        Args:
+            position: Position before the play
+            color: Side to move
+            roll: The two dice values
+
+        Returns:
+            List of (play, resulting position, equity) sorted best first
+        """
+        candidates = legal_plays(position, color, roll)
+        scores = self.equities(
+            [result for _, result in candidates], color, opponent(color)
+        )
+        order = np.argsort(-scores, kind="stable")
+        return [
+            (candidates[i][0], candidates[i][1], float(scores[i])) for i in order
+        ]
+
+    def best_play(self, position: Position, color: str, roll: Sequence[int]) -> Play:
+        """Get the highest scoring play for a roll."""
+        return self.rank_plays(position, color, roll)[0][0]
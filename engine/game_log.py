@@ -0,0 +1,340 @@
+"""
+Event-sourced game history with keyframe snapshots.
+
+A game is an append-only list of events (roll, move, hit, enter, bear
+off, end turn). Every few events a keyframe stores the whole state as a
+compact position tuple plus the turn and dice, so the state after any
+event is rebuilt by replaying at most keyframe_interval events from the
+keyframe before it. Nothing is copied after a single move.
+
+Events are grouped into actions (one roll, one checker move with its
+hit, one end of turn...), which are the steps of undo() and redo(). A
+new action recorded after an undo drops the undone ones. Rolls that are
+undone are kept, and take_roll() hands them out again in order, so
+undoing a roll never gives a player new dice.
+
+Points are board indices (0-23). The bar and borne off are given by the
+event kind, so their src or dst is -1.
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from core.board import Board
+from engine.position import (
+    BLACK_BAR,
+    BLACK_OFF,
+    WHITE_BAR,
+    WHITE_OFF,
+    Move,
+    Position,
+    opponent,
+)
+
+DEFAULT_KEYFRAME_INTERVAL = 32
+
+ROLL = "roll"
+MOVE = "move"
+HIT = "hit"
+ENTER = "enter"
+BEAR_OFF = "bear_off"
+END_TURN = "end_turn"
+
+
+class Event(NamedTuple):
+    """One change to a game.
+
+    kind is one of the constants above and color the side it applies to
+    (for HIT, the side whose checker is sent to the bar). dice holds the
+    roll for ROLL and the die used, if any, for checker moves.
+    """
+
+    kind: str
+    color: str
+    src: int = -1
+    dst: int = -1
+    dice: Tuple[int, ...] = ()
+
+
+class Snapshot(NamedTuple):
+    """Full state of a game between two events."""
+
+    position: Position
+    turn: str
+    dice: Tuple[int, ...] = ()
+    roll: Tuple[int, ...] = ()
+    rolled: bool = False
+
+
+def apply_event(state: Snapshot, event: Event) -> Snapshot:
+    """
+    Get the state after one event.
+
+    Args:
+        state: State before the event
+        event: Event to apply
+
+    Returns:
+        State after the event
+    """
+    if event.kind == ROLL:
+        return state._replace(dice=event.dice, roll=event.dice, rolled=True)
+    if event.kind == END_TURN:
+        return Snapshot(state.position, opponent(event.color))
+
+    values = list(state.position)
+    sign = 1 if event.color == "W" else -1
+    bar, off = (WHITE_BAR, WHITE_OFF) if event.color == "W" else (BLACK_BAR, BLACK_OFF)
+    if event.kind == HIT:
+        values[event.dst] = 0
+        values[bar] += 1
+    else:
+        if event.kind == ENTER:
+            values[bar] -= 1
+        else:
+            values[event.src] -= sign
+        if event.kind == BEAR_OFF:
+            values[off] += 1
+        else:
+            values[event.dst] += sign
+
+    dice = state.dice
+    if event.dice and event.dice[0] in dice:
+        remaining = list(dice)
+        remaining.remove(event.dice[0])
+        dice = tuple(remaining)
+    return state._replace(position=tuple(values), dice=dice)
+
+
+def checker_events(board: Board, kind: str, color: str, src: int, dst: int, die: int = 0) -> List[Event]:
+    """
+    Events of a checker move about to be made on a board, with its hit.
+
+    Call it before the board is changed, so a blot on the destination is
+    still there to be seen.
+
+    Args:
+        board: Board before the move
+        kind: MOVE, ENTER or BEAR_OFF
+        color: Side that moves
+        src: Source point (-1 for ENTER)
+        dst: Destination point (-1 for BEAR_OFF)
+        die: Die used (0 if none)
+
+    Returns:
+        A HIT event if a blot is hit, then the move event
+    """
+    events = []
+    if kind != BEAR_OFF and 0 <= dst < 24:
+        target = board.points[dst]
+        if len(target) == 1 and target[0] != color:
+            events.append(Event(HIT, target[0], dst=dst))
+    events.append(Event(kind, color, src, dst, (die,) if die else ()))
+    return events
+
+
+def move_events(position: Position, color: str, move: Move, die: int = 0) -> List[Event]:
+    """
+    Events of an engine move (see engine.position) about to be made.
+
+    Args:
+        position: Position before the move
+        color: Side that moves
+        move: (source, destination) with the color's bar and off indices
+        die: Die used (0 if none)
+
+    Returns:
+        A HIT event if a blot is hit, then the move event
+    """
+    src, dst = move
+    bar, off = (WHITE_BAR, -1) if color == "W" else (-1, WHITE_BAR)
+    kind = ENTER if src == bar else BEAR_OFF if dst == off else MOVE
+    events = []
+    if kind != BEAR_OFF and position[dst] * (1 if color == "W" else -1) == -1:
+        events.append(Event(HIT, opponent(color), dst=dst))
+    src = -1 if kind == ENTER else src
+    dst = -1 if kind == BEAR_OFF else dst
+    events.append(Event(kind, color, src, dst, (die,) if die else ()))
+    return events
+
+
+def play_events(position: Position, color: str, roll: Sequence[int], play: Sequence[Move]) -> List[Event]:
+    """
+    Events of a whole engine play: the roll, then each move with its hits.
+
+    Args:
+        position: Position before the play
+        color: Side that plays
+        roll: Dice rolled
+        play: Moves, in order
+
+    Returns:
+        The events, without the end of turn
+    """
+    events = [Event(ROLL, color, dice=tuple(roll))]
+    state = Snapshot(position, color)
+    for move in play:
+        moved = move_events(state.position, color, move)
+        for event in moved:
+            state = apply_event(state, event)
+        events.extend(moved)
+    return events
+
+
+class GameLog:
+    """Append-only event list with keyframes and an undo cursor."""
+
+    def __init__(self, start: Snapshot, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL):
+        """
+        Start a history.
+
+        Args:
+            start: State before the first event
+            keyframe_interval: Events between two keyframes
+        """
+        self.keyframe_interval = keyframe_interval
+        self.events: List[Event] = []
+        self.keyframes: Dict[int, Snapshot] = {0: start}
+        # Number of events at the end of each action
+        self._ends: List[int] = []
+        self.cursor = 0
+        self._state = start
+        # Dice of undone rolls, oldest first, to be rolled again
+        self._undone_rolls: List[Tuple[int, ...]] = []
+
+    @property
+    def state(self) -> Snapshot:
+        """State after the last action that was not undone."""
+        return self._state
+
+    @property
+    def actions(self) -> int:
+        """Number of recorded actions, undone ones included."""
+        return len(self._ends)
+
+    def can_undo(self) -> bool:
+        """Check if there is an action to undo."""
+        return self.cursor > 0
+
+    def can_redo(self) -> bool:
+        """Check if there is an undone action to redo."""
+        return self.cursor < len(self._ends)
+
+    def record(self, events: Sequence[Event], join: bool = False) -> Snapshot:
+        """
+        Append an action, dropping any undone ones.
+
+        Args:
+            events: Events of the action
+            join: Add the events to the last action instead (for an end
+                of turn that follows a move automatically)
+
+        Returns:
+            State after the action
+        """
+        if not events:
+            return self._state
+        end = self._ends[self.cursor - 1] if self.cursor else 0
+        if end < len(self.events):
+            del self.events[end:]
+            del self._ends[self.cursor :]
+            for index in [index for index in self.keyframes if index > end]:
+                del self.keyframes[index]
+
+        state = self._state
+        for event in events:
+            state = apply_event(state, event)
+            self.events.append(event)
+            if len(self.events) % self.keyframe_interval == 0:
+                self.keyframes[len(self.events)] = state
+        self._state = state
+
+        if join and self._ends:
+            self._ends[-1] = len(self.events)
+        else:
+            self._ends.append(len(self.events))
+            self.cursor += 1
+        return state
+
+    def state_at(self, index: int) -> Snapshot:
+        """
+        Rebuild the state after a number of events.
+
+        Args:
+            index: Number of events applied (0 for the start)
+
+        Returns:
+            The state, replayed from the nearest keyframe before it
+
+        Raises:
+            IndexError: If index is outside the recorded events
+        """
+        if not 0 <= index <= len(self.events):
+            raise IndexError(f"No event {index} in a log of {len(self.events)}")
+        base = index - index % self.keyframe_interval
+        state = self.keyframes[base]
+        for event in self.events[base:index]:
+            state = apply_event(state, event)
+        return state
+
+    def state_after(self, actions: int) -> Snapshot:
+        """
+        Rebuild the state after a number of actions.
+
+        Args:
+            actions: Number of actions applied (0 for the start)
+
+        Returns:
+            The state
+        """
+        if not 0 <= actions <= len(self._ends):
+            raise IndexError(f"No action {actions} in a log of {len(self._ends)}")
+        return self.state_at(self._ends[actions - 1] if actions else 0)
+
+    def _action_roll(self, action: int) -> Optional[Tuple[int, ...]]:
+        """Dice of the roll in an action, or None if it has no roll."""
+        start = self._ends[action - 1] if action else 0
+        for event in self.events[start : self._ends[action]]:
+            if event.kind == ROLL:
+                return event.dice
+        return None
+
+    def take_roll(self) -> Optional[Tuple[int, ...]]:
+        """
+        Get the dice of the oldest undone roll, to roll them again.
+
+        Returns:
+            The dice as recorded, or None if no roll was undone (roll
+            new dice then)
+        """
+        return self._undone_rolls.pop(0) if self._undone_rolls else None
+
+    def undo(self) -> Optional[Snapshot]:
+        """
+        Step back one action. An undone roll is kept for take_roll().
+
+        Returns:
+            The state to restore, or None if there is nothing to undo
+        """
+        if not self.can_undo():
+            return None
+        self.cursor -= 1
+        roll = self._action_roll(self.cursor)
+        if roll is not None:
+            self._undone_rolls.insert(0, roll)
+        self._state = self.state_after(self.cursor)
+        return self._state
+
+    def redo(self) -> Optional[Snapshot]:
+        """
+        Step forward one undone action.
+
+        Returns:
+            The state to restore, or None if there is nothing to redo
+        """
+        if not self.can_redo():
+            return None
+        if self._action_roll(self.cursor) is not None:
+            self._undone_rolls.pop(0)
+        self.cursor += 1
+        self._state = self.state_after(self.cursor)
+        return self._state
@@ -0,0 +1,284 @@
+"""
+Compact binary game records.
+
+Games are appended to a stream one turn at a time, so a simulator can log
+millions of games without holding them, and read back lazily with
+generators. A turn takes one byte for the roll and the number of moves
+plus one byte per checker moved, about 3 bytes per turn on average.
+
+File format (little endian)::
+
+    header: b"BGGR", version (uint16), seed of the run (uint64)
+    game:   b"G", seed of the game (uint64), flags (uint8)
+            [28 signed bytes: starting position, if flags & CUSTOM_START]
+            turns...
+            0xFF, winner (uint8: 0 none, 1 White, 2 Black)
+    turn:   move count * 36 + (die1 - 1) * 6 + (die2 - 1)  (uint8)
+            one byte per move: source seen from the mover's side
+            (0-23, 24 for the bar) + 32 * 0 or 1 for the die used
+
+The player on roll alternates from White (or Black with BLACK_FIRST).
+Destinations are not stored: they follow from the source and the die.
+"""
+
+import struct
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from core.board import Board
+from engine.movegen import apply_play
+from engine.position import Play, Position, initial_position, opponent, to_board
+from engine.selfplay import SelfPlayResult
+
+_MAGIC = b"BGGR"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHQ")
+_GAME = struct.Struct("<cQB")
+_START = struct.Struct("<28b")
+_END = 0xFF
+_WINNERS = ("", "W", "B")
+
+CUSTOM_START = 1
+BLACK_FIRST = 2
+
+Roll = Tuple[int, int]
+Turn = Tuple[Roll, Play]
+
+
+class RecordedGame(NamedTuple):
+    """One game read back from a record stream."""
+
+    seed: int
+    start: Position
+    first: str
+    turns: List[Turn]
+    winner: str
+
+
+def _to_white(color: str, place: int) -> int:
+    """Index of a source or destination seen from the mover's side."""
+    return place if color == "W" else 23 - place
+
+
+def encode_turn(color: str, roll: Sequence[int], play: Play) -> bytes:
+    """Pack one turn.
+
+    Args:
+        color: Side that played
+        roll: The two dice values, in the order rolled
+        play: The moves played
+
+    Returns:
+        1 to 5 bytes
+
+    Raises:
+        ValueError: If the play has more than four moves or a move that
+            none of the dice can make
+    """
+    if len(play) > 4:
+        raise ValueError(f"A turn has at most four moves, got {len(play)}")
+    die1, die2 = roll
+    out = bytearray([len(play) * 36 + (die1 - 1) * 6 + (die2 - 1)])
+    unused = [die1, die2] * (2 if die1 == die2 else 1)
+    for src, dst in play:
+        src_w, dst_w = _to_white(color, src), _to_white(color, dst)
+        distance = src_w - max(dst_w, -1)
+        if distance in unused:
+            die = distance
+        else:
+            # Bearing off with a larger die than needed
+            larger = [value for value in unused if value > distance and dst_w < 0]
+            if not larger:
+                raise ValueError(f"No die of {roll} moves {src}/{dst}")
+            die = min(larger)
+        unused.remove(die)
+        slot = 0 if die == die1 else 1
+        out.append(src_w + 32 * slot)
+    return bytes(out)
+
+
+def decode_turn(color: str, data: bytes) -> Tuple[Roll, Play]:
+    """Unpack one turn.
+
+    Args:
+        color: Side that played
+        data: The turn bytes (roll byte first)
+
+    Returns:
+        (roll, play) as given to encode_turn()
+    """
+    count, roll_index = divmod(data[0], 36)
+    roll = (roll_index // 6 + 1, roll_index % 6 + 1)
+    moves = []
+    for byte in data[1 : 1 + count]:
+        src_w = byte % 32
+        die = roll[byte // 32]
+        dst_w = max(src_w - die, -1)
+        if color == "W":
+            moves.append((src_w, dst_w))
+        else:
+            moves.append((23 - src_w, 23 - dst_w))
+    return roll, tuple(moves)
+
+
+class GameRecordWriter:
+    """Appends games to a binary stream, one turn at a time."""
+
+    def __init__(self, stream: BinaryIO, seed: int = 0):
+        """Write the file header.
+
+        Args:
+            stream: Binary stream opened for writing
+            seed: Seed of the whole run, stored in the header
+        """
+        self.stream = stream
+        self.games = 0
+        self._color: Optional[str] = None
+        stream.write(_HEADER.pack(_MAGIC, _VERSION, seed))
+
+    def begin_game(self, seed: int = 0, start: Optional[Position] = None, first: str = "W") -> None:
+        """Start a game.
+
+        Args:
+            seed: Seed of the game's dice
+            start: Starting position (the standard one if None)
+            first: Side that rolls first
+
+        Raises:
+            RuntimeError: If the previous game was not ended
+        """
+        if self._color is not None:
+            raise RuntimeError("end_game() must be called before the next game")
+        flags = (CUSTOM_START if start is not None else 0) | (
+            BLACK_FIRST if first == "B" else 0
+        )
+        self.stream.write(_GAME.pack(b"G", seed, flags))
+        if start is not None:
+            self.stream.write(_START.pack(*start))
+        self._color = first
+
+    def add_turn(self, roll: Sequence[int], play: Play) -> None:
+        """Append the next turn; the side on roll alternates.
+
+        Args:
+            roll: The two dice values
+            play: The moves played
+        """
+        if self._color is None:
+            raise RuntimeError("begin_game() must be called first")
+        self.stream.write(encode_turn(self._color, roll, play))
+        self._color = opponent(self._color)
+
+    def end_game(self, winner: str = "") -> None:
+        """Close the current game.
+
+        Args:
+            winner: 'W', 'B' or '' for an abandoned game
+        """
+        if self._color is None:
+            raise RuntimeError("begin_game() must be called first")
+        self.stream.write(bytes([_END, _WINNERS.index(winner)]))
+        self._color = None
+        self.games += 1
+
+    def write_game(self, result: SelfPlayResult, seed: int = 0) -> None:
+        """Append a whole self-play game.
+
+        Args:
+            result: Game returned by HeadlessGame.play()
+            seed: Seed of the game's dice
+        """
+        start = result.positions[0]
+        first = result.turns[0] if result.turns else "W"
+        self.begin_game(seed, None if start == initial_position() else start, first)
+        for roll, play in zip(result.rolls, result.plays):
+            self.add_turn(roll, play)
+        self.end_game(result.winner)
+
+    def close(self) -> None:
+        """Flush and close the stream."""
+        self.stream.close()
+
+    def __enter__(self) -> "GameRecordWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _read_exact(stream: BinaryIO, size: int) -> bytes:
+    """Read exactly size bytes or raise ValueError on a truncated stream."""
+    data = stream.read(size)
+    if len(data) != size:
+        raise ValueError("Truncated game record")
+    return data
+
+
+def read_header(stream: BinaryIO) -> int:
+    """Read the file header.
+
+    Returns:
+        Seed of the run
+
+    Raises:
+        ValueError: If the stream is not a game record file
+    """
+    magic, version, seed = _HEADER.unpack(_read_exact(stream, _HEADER.size))
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("Not a game record stream")
+    return seed
+
+
+def read_games(stream: BinaryIO) -> Iterator[RecordedGame]:
+    """Yield the games of a record stream one at a time.
+
+    Args:
+        stream: Binary stream positioned at the file header
+
+    Yields:
+        RecordedGame
+    """
+    read_header(stream)
+    while True:
+        head = stream.read(_GAME.size)
+        if not head:
+            return
+        if len(head) != _GAME.size:
+            raise ValueError("Truncated game record")
+        tag, seed, flags = _GAME.unpack(head)
+        if tag != b"G":
+            raise ValueError("Corrupt game record")
+        start = initial_position()
+        if flags & CUSTOM_START:
+            start = _START.unpack(_read_exact(stream, _START.size))
+        first = "B" if flags & BLACK_FIRST else "W"
+        color = first
+        turns: List[Turn] = []
+        while True:
+            head_byte = _read_exact(stream, 1)
+            if head_byte[0] == _END:
+                winner = _WINNERS[_read_exact(stream, 1)[0]]
+                break
+            moves = _read_exact(stream, head_byte[0] // 36)
+            turns.append(decode_turn(color, head_byte + moves))
+            color = opponent(color)
+        yield RecordedGame(seed, start, first, turns, winner)
+
+
+def read_turns(stream: BinaryIO) -> Iterator[Tuple[Board, Roll, Play]]:
+    """Yield every turn of a record stream with the board it was played on.
+
+    Boards are only built as the generator is consumed.
+
+    Args:
+        stream: Binary stream positioned at the file header
+
+    Yields:
+        (Board before the turn, roll, play)
+    """
+    for game in read_games(stream):
+        position = game.start
+        color = game.first
+        for roll, play in game.turns:
+            yield to_board(position), roll, play
+            position = apply_play(position, color, play)
+            color = opponent(color)
@@ -0,0 +1,397 @@
+"""
+Import of plain-text match transcripts (.mat files).
+
+A transcript lists the games of a match, two columns per line, one per
+player, each numbering the points from its own side (1 to 24, 'bar' or
+25, 'off' or 0)::
+
+     7 point match
+
+     Game 1
+     Alice : 0                          Bob : 0
+      1)                             52: 13/8 13/11
+      2) 31: 8/5 6/5                 63: 24/18 13/10
+      3) 64: 24/18* 13/9             Doubles => 2
+      4)  Takes                      ...
+     ...
+     30) 21: 2/off 1/off             Wins 2 points
+
+The left player is White and the right player is Black. Games start from
+the standard position (midpoints on each side's 13-point), which is not
+the one Board.reset() sets up.
+
+Archives are read line by line and split into games as they stream in;
+the games are replayed and checked against the rules in a process pool,
+with only a bounded window of them in flight at any time.
+
+Run from the project root::
+
+    python -m engine.matfile games.mat --workers 4
+"""
+
+import argparse
+import collections
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+
+from core.board import Board
+from engine.movegen import legal_plays
+from engine.position import (
+    BLACK_BAR,
+    WHITE_BAR,
+    WHITE_OFF,
+    Play,
+    Position,
+    flip,
+    to_board,
+)
+
+# Standard starting position: midpoints on each side's 13-point
+STANDARD_START: Position = (
+    (-2, 0, 0, 0, 0, 5, 0, 3, 0, 0, 0, -5)
+    + (5, 0, 0, 0, -3, 0, -5, 0, 0, 0, 0, 2)
+    + (0, 0, 0, 0)
+)
+
+# Games in flight per worker when streaming an archive
+WINDOW_PER_WORKER = 4
+
+_MATCH_LENGTH = re.compile(r"^\s*(\d+)\s+point\s+match", re.IGNORECASE)
+_GAME = re.compile(r"^\s*Game\s+(\d+)", re.IGNORECASE)
+_SCORE = re.compile(r"^\s*(.+?)\s*:\s*(\d+)\s+(.+?)\s*:\s*(\d+)\s*$")
+_TURN = re.compile(r"^\s*\d+\)(.*)$")
+_ENTRY = re.compile(r"\d\d:|Doubles|Takes|Drops|Beavers|Raccoons|Wins|Resigns", re.IGNORECASE)
+_MOVE = re.compile(r"^([0-9a-z*/]+?)(?:\((\d)\))?$", re.IGNORECASE)
+_WINS = re.compile(r"Wins\s+(\d+)", re.IGNORECASE)
+
+# Indentation after "n)" that means the left column is empty
+_EMPTY_COLUMN = 4
+
+
+class TranscriptError(ValueError):
+    """A transcript that cannot be read or breaks the rules."""
+
+
+class TranscriptTurn(NamedTuple):
+    """One checker play of a transcript."""
+
+    color: str
+    roll: Tuple[int, int]
+    play: Play
+    notation: str
+
+
+class TranscriptGame(NamedTuple):
+    """One game of a transcript, replayed on the engine's positions."""
+
+    number: int
+    match_length: int
+    players: Tuple[str, str]
+    score: Tuple[int, int]
+    turns: List[TranscriptTurn]
+    positions: List[Position]
+    winner: str
+    points: int
+    error: str = ""
+
+
+class GameText(NamedTuple):
+    """Raw lines of one game, as split from an archive."""
+
+    number: int
+    match_length: int
+    lines: List[str]
+
+
+def _parse_point(text: str) -> int:
+    """Index of a point in White's frame (24 for the bar, -1 for off)."""
+    text = text.lower()
+    if text in ("bar", "25"):
+        return WHITE_BAR
+    if text in ("off", "0"):
+        return -1
+    if not text.isdigit() or not 1 <= int(text) <= 24:
+        raise TranscriptError(f"Invalid point: {text!r}")
+    return int(text) - 1
+
+
+def parse_moves(notation: str) -> List[List[int]]:
+    """
+    Split move notation into checker paths in the mover's own frame.
+
+    Args:
+        notation: Moves such as '13/9 6/5*', 'bar/20', '24/18*/13' or
+            '8/4(2)'
+
+    Returns:
+        One list of points per checker moved (24 for the bar, -1 for off)
+
+    Raises:
+        TranscriptError: If a move cannot be read
+    """
+    paths = []
+    for token in notation.split():
+        match = _MOVE.match(token)
+        if match is None or "/" not in match.group(1):
+            raise TranscriptError(f"Invalid move: {token!r}")
+        path = [_parse_point(part.rstrip("*")) for part in match.group(1).split("/")]
+        paths.extend([path] * int(match.group(2) or 1))
+    return paths
+
+
+def apply_notation(position: Position, color: str, notation: str) -> Position:
+    """
+    Move the checkers named by a transcript play, hitting any blot a
+    checker stops on.
+
+    Args:
+        position: Position before the play
+        color: Side that plays
+        notation: The play as written in the transcript
+
+    Returns:
+        Position after the play (not checked against the dice)
+
+    Raises:
+        TranscriptError: If a move starts from an empty point or lands on
+            a point the opponent holds
+    """
+    pts = list(position if color == "W" else flip(position))
+    for path in parse_moves(notation):
+        for src, dst in zip(path, path[1:]):
+            if pts[src] <= 0 or (dst >= src and src != WHITE_BAR):
+                raise TranscriptError(f"No checker can move from {src + 1} to {dst + 1}")
+            pts[src] -= 1
+            if dst < 0:
+                pts[WHITE_OFF] += 1
+                continue
+            if pts[dst] < -1:
+                raise TranscriptError(f"Point {dst + 1} is blocked")
+            if pts[dst] == -1:
+                pts[dst] = 0
+                pts[BLACK_BAR] += 1
+            pts[dst] += 1
+    result = tuple(pts)
+    return result if color == "W" else flip(result)
+
+
+def _split_columns(rest: str) -> Tuple[str, str]:
+    """Split the text after 'n)' into the left and right entries."""
+    stripped = rest.lstrip()
+    if not stripped:
+        return "", ""
+    if len(rest) - len(stripped) > _EMPTY_COLUMN:
+        return "", stripped.strip()
+    starts = [match.start() for match in _ENTRY.finditer(stripped)]
+    if len(starts) < 2:
+        return stripped.strip(), ""
+    return stripped[: starts[1]].strip(), stripped[starts[1] :].strip()
+
+
+def replay_game(text: GameText) -> TranscriptGame:
+    """
+    Replay one game and check every play against the rules.
+
+    A play is legal when it leads to one of the positions the legal plays
+    of its roll lead to, so it must use as much of the roll as possible.
+
+    Args:
+        text: Lines of the game
+
+    Returns:
+        The replayed game
+
+    Raises:
+        TranscriptError: If the game cannot be read or a play is illegal
+    """
+    players: Optional[Tuple[str, str]] = None
+    score = (0, 0)
+    position = STANDARD_START
+    positions = [position]
+    turns: List[TranscriptTurn] = []
+    winner = ""
+    points = 0
+
+    for line_number, line in enumerate(text.lines, 1):
+        if players is None:
+            match = _SCORE.match(line)
+            if match:
+                players = (match.group(1), match.group(3))
+                score = (int(match.group(2)), int(match.group(4)))
+            continue
+        match = _TURN.match(line)
+        if match is None:
+            continue
+        for color, entry in zip("WB", _split_columns(match.group(1))):
+            if not entry:
+                continue
+            wins = _WINS.match(entry)
+            if wins:
+                winner, points = color, int(wins.group(1))
+                continue
+            if ":" not in entry or not entry[:2].isdigit():
+                continue  # Cube action or resignation
+            roll = (int(entry[0]), int(entry[1]))
+            if not all(1 <= die <= 6 for die in roll):
+                raise TranscriptError(f"Game {text.number}, line {line_number}: bad roll {entry[:2]}")
+            notation = entry[3:].strip()
+            try:
+                result = apply_notation(position, color, notation)
+            except TranscriptError as error:
+                raise TranscriptError(
+                    f"Game {text.number}, line {line_number}: {error}"
+                ) from error
+            for play, candidate in legal_plays(position, color, roll):
+                if candidate == result:
+                    break
+            else:
+                raise TranscriptError(
+                    f"Game {text.number}, line {line_number}: illegal play {notation!r} "
+                    f"for {color} with {roll[0]}{roll[1]}"
+                )
+            turns.append(TranscriptTurn(color, roll, play, notation))
+            position = result
+            positions.append(position)
+
+    if players is None:
+        raise TranscriptError(f"Game {text.number}: no player line")
+    return TranscriptGame(
+        text.number, text.match_length, players, score, turns, positions, winner, points
+    )
+
+
+def _replay_or_report(text: GameText) -> TranscriptGame:
+    """Replay a game, turning a rule error into the game's error field."""
+    try:
+        return replay_game(text)
+    except TranscriptError as error:
+        return TranscriptGame(text.number, text.match_length, ("", ""), (0, 0), [], [], "", 0, str(error))
+
+
+def split_games(lines: Iterable[str]) -> Iterator[GameText]:
+    """
+    Group the lines of an archive into games, as they are read.
+
+    Several matches may follow each other; the last 'n point match' line
+    applies to the games after it. Lines starting with ';' are comments.
+
+    Args:
+        lines: Lines of one or more transcripts
+
+    Yields:
+        GameText for every game
+    """
+    match_length = 0
+    current: Optional[GameText] = None
+    for line in lines:
+        if line.startswith(";"):
+            continue
+        length = _MATCH_LENGTH.match(line)
+        game = _GAME.match(line)
+        if length or game:
+            if current is not None:
+                yield current
+                current = None
+            if length:
+                match_length = int(length.group(1))
+            else:
+                current = GameText(int(game.group(1)), match_length, [])
+        elif current is not None:
+            current.lines.append(line.rstrip("\n"))
+    if current is not None:
+        yield current
+
+
+def read_games(stream: TextIO, workers: int = 0, strict: bool = False) -> Iterator[TranscriptGame]:
+    """
+    Stream the games of an archive, replayed in a process pool.
+
+    Games come back in file order. At most WINDOW_PER_WORKER games per
+    worker are in flight, so memory does not grow with the archive.
+
+    Args:
+        stream: Text stream of the archive
+        workers: Worker processes (0 replays in this process)
+        strict: Raise on the first invalid game instead of yielding it
+            with its error set
+
+    Yields:
+        TranscriptGame for every game
+
+    Raises:
+        TranscriptError: In strict mode, for the first invalid game
+    """
+    texts = split_games(stream)
+    if workers == 0:
+        games: Iterator[TranscriptGame] = map(_replay_or_report, texts)
+        yield from _checked(games, strict)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = collections.deque()
+        window = workers * WINDOW_PER_WORKER
+
+        def results() -> Iterator[TranscriptGame]:
+            for text in texts:
+                pending.append(executor.submit(_replay_or_report, text))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+        try:
+            yield from _checked(results(), strict)
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _checked(games: Iterator[TranscriptGame], strict: bool) -> Iterator[TranscriptGame]:
+    """Pass games through, raising on the first error in strict mode."""
+    for game in games:
+        if strict and game.error:
+            raise TranscriptError(game.error)
+        yield game
+
+
+def read_file(path: str, workers: int = 0, strict: bool = False) -> Iterator[TranscriptGame]:
+    """Same as read_games() for a file path."""
+    with open(path, encoding="utf-8", errors="replace") as stream:
+        yield from read_games(stream, workers, strict)
+
+
+def game_boards(game: TranscriptGame) -> Iterator[Board]:
+    """
+    Boards of a replayed game, built only as the generator is consumed.
+
+    Args:
+        game: Replayed game
+
+    Yields:
+        Board before the first play and after every play
+    """
+    for position in game.positions:
+        yield to_board(position)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Check match transcripts")
+    parser.add_argument("paths", nargs="+", help=".mat files")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    games = invalid = plays = 0
+    for path in args.paths:
+        for game in read_file(path, args.workers):
+            games += 1
+            plays += len(game.turns)
+            if game.error:
+                invalid += 1
+                print(f"{path}: {game.error}")
+    print(f"{games} games, {plays} plays, {invalid} invalid")
+
+
+if __name__ == "__main__":
+    main()
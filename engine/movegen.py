@@ -0,0 +1,261 @@
+"""
+Legal play generation on compact positions.
+
+Plays are generated from White's point of view; Black positions are
+mirrored with position.flip() before and after generation.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+from engine.position import (
+    BLACK_BAR,
+    WHITE_BAR,
+    WHITE_OFF,
+    Play,
+    Position,
+    flip,
+    flip_play,
+)
+
+Candidate = Tuple[Play, Position]
+
+# White's own bar and bear-off targets, as stored in a play
+_BAR = 24
+_OFF = -1
+
+# The 21 distinct rolls with their weight out of 36
+DISTINCT_ROLLS: List[Tuple[Tuple[int, int], int]] = [
+    ((die1, die2), 1 if die1 == die2 else 2)
+    for die1 in range(1, 7)
+    for die2 in range(die1, 7)
+]
+
+
+def expand_roll(roll: Sequence[int]) -> Tuple[int, ...]:
+    """Turn a roll of two dice into the list of dice to play.
+
+    Args:
+        roll: The two dice values, or the dice still to play in a turn
+            that has already started
+
+    Returns:
+        Four dice for doubles, otherwise the dice as given
+    """
+    if len(roll) == 2 and roll[0] == roll[1]:
+        return (roll[0],) * 4
+    return tuple(roll)
+
+
+def _apply(pts: List[int], src: int, dst: int) -> bool:
+    """Apply a White move in place and return True if it hit a blot."""
+    if src == _BAR:
+        pts[WHITE_BAR] -= 1
+    else:
+        pts[src] -= 1
+    if dst == _OFF:
+        pts[WHITE_OFF] += 1
+        return False
+    hit = pts[dst] == -1
+    if hit:
+        pts[dst] = 0
+        pts[BLACK_BAR] += 1
+    pts[dst] += 1
+    return hit
+
+
+def _undo(pts: List[int], src: int, dst: int, hit: bool) -> None:
+    """Revert a move applied with _apply()."""
+    if dst == _OFF:
+        pts[WHITE_OFF] -= 1
+    else:
+        pts[dst] -= 1
+        if hit:
+            pts[dst] = -1
+            pts[BLACK_BAR] -= 1
+    if src == _BAR:
+        pts[WHITE_BAR] += 1
+    else:
+        pts[src] += 1
+
+
+def _single_moves(pts: List[int], die: int, max_src: int) -> List[Tuple[int, int]]:
+    """List every legal single White move for one die.
+
+    Args:
+        pts: Position as a mutable list (White to move)
+        die: Die value
+        max_src: Highest source point allowed (used to skip duplicate
+            orderings when playing doubles)
+
+    Returns:
+        List of (source, destination) moves
+    """
+    if pts[WHITE_BAR] > 0:
+        dst = _BAR - die
+        if pts[dst] >= -1:
+            return [(_BAR, dst)]
+        return []
+
+    highest = -1
+    for i in range(23, -1, -1):
+        if pts[i] > 0:
+            highest = i
+            break
+    all_home = highest < 6
+
+    moves = []
+    for src in range(min(max_src, highest), -1, -1):
+        if pts[src] <= 0:
+            continue
+        dst = src - die
+        if dst >= 0:
+            if pts[dst] >= -1:
+                moves.append((src, dst))
+        elif all_home and (dst == _OFF or src == highest):
+            moves.append((src, _OFF))
+    return moves
+
+
+def _search(
+    pts: List[int],
+    dice: Tuple[int, ...],
+    play: Play,
+    used: Tuple[int, ...],
+    max_src: int,
+    out: List[Tuple[Play, Tuple[int, ...], Position]],
+) -> None:
+    """Depth-first search over move sequences for the remaining dice.
+
+    With doubles every ordering of the same moves reaches the same
+    position, so moves are only generated in non-increasing source order
+    (max_src). With two different dice both orders are tried.
+    """
+    moved = False
+    tried = set()
+    for index, die in enumerate(dice):
+        if die in tried:
+            continue
+        tried.add(die)
+        rest = dice[:index] + dice[index + 1 :]
+        for src, dst in _single_moves(pts, die, max_src):
+            hit = _apply(pts, src, dst)
+            next_max = src if die in rest else _BAR
+            _search(pts, rest, play + ((src, dst),), used + (die,), next_max, out)
+            _undo(pts, src, dst, hit)
+            moved = True
+    if not moved:
+        out.append((play, used, tuple(pts)))
+
+
+def _plays_all(pts: List[int], dice: Tuple[int, ...]) -> bool:
+    """Depth-first search that stops at the first sequence using every die."""
+    if not dice:
+        return True
+    for index, die in enumerate(dice):
+        if die in dice[:index]:
+            continue
+        rest = dice[:index] + dice[index + 1 :]
+        for src, dst in _single_moves(pts, die, _BAR):
+            hit = _apply(pts, src, dst)
+            done = _plays_all(pts, rest)
+            _undo(pts, src, dst, hit)
+            if done:
+                return True
+    return False
+
+
+def _white_plays(position: Position, dice: Tuple[int, ...]) -> List[Candidate]:
+    """Generate the legal plays for White."""
+    leaves: List[Tuple[Play, Tuple[int, ...], Position]] = []
+    _search(list(position), dice, (), (), _BAR, leaves)
+
+    most = max(len(play) for play, _, _ in leaves)
+    if most == 1 and len(dice) == 2 and dice[0] != dice[1]:
+        # Only one die can be played: the larger one must be used if possible
+        larger = max(dice)
+        if any(used[0] == larger for _, used, _ in leaves if used):
+            most_leaves = [leaf for leaf in leaves if leaf[1] == (larger,)]
+        else:
+            most_leaves = [leaf for leaf in leaves if len(leaf[0]) == 1]
+    else:
+        most_leaves = [leaf for leaf in leaves if len(leaf[0]) == most]
+
+    unique: Dict[Position, Play] = {}
+    for play, _, result in most_leaves:
+        if result not in unique:
+            unique[result] = play
+    return [(play, result) for result, play in unique.items()]
+
+
+def legal_plays(position: Position, color: str, roll: Sequence[int]) -> List[Candidate]:
+    """Generate every legal play for a roll.
+
+    Plays that lead to the same position are returned once. When no move
+    is possible the single empty play is returned, so callers always get
+    at least one candidate.
+
+    Args:
+        position: Position tuple
+        color: Side to move ('W' or 'B')
+        roll: The two dice values (or the dice still to play)
+
+    Returns:
+        List of (play, resulting position) pairs
+    """
+    dice = expand_roll(roll)
+    if color == "W":
+        return _white_plays(position, dice)
+    candidates = _white_plays(flip(position), dice)
+    return [(flip_play(play), flip(result)) for play, result in candidates]
+
+
+def can_play_all(position: Position, color: str, dice: Sequence[int]) -> bool:
+    """Check that every die can be played, without generating every play.
+
+    Args:
+        position: Position tuple
+        color: Side to move ('W' or 'B')
+        dice: Dice to play (a roll of doubles is not expanded)
+
+    Returns:
+        True if some legal sequence of moves uses all the dice
+    """
+    pts = list(position if color == "W" else flip(position))
+    return _plays_all(pts, tuple(dice))
+
+
+def apply_play(position: Position, color: str, play: Play) -> Position:
+    """Apply a play without checking that it is legal.
+
+    Args:
+        position: Position tuple
+        color: Side that plays ('W' or 'B')
+        play: Moves to apply
+
+    Returns:
+        Resulting position tuple
+    """
+    if color == "W":
+        pts = list(position)
+        for src, dst in play:
+            _apply(pts, src, dst)
+        return tuple(pts)
+    pts = list(flip(position))
+    for src, dst in flip_play(play):
+        _apply(pts, src, dst)
+    return flip(tuple(pts))
+
+
+def format_play(play: Play) -> str:
+    """Format a play as 'from/to' pairs of board indices.
+
+    Bar and borne off are spelled out, so the text works for both colors.
+    """
+    if not play:
+        return "(no move)"
+    parts = []
+    for src, dst in play:
+        src_text = "bar" if src in (-1, 24) else str(src)
+        dst_text = "off" if dst in (-1, 24) else str(dst)
+        parts.append(f"{src_text}/{dst_text}")
+    return " ".join(parts)
@@ -0,0 +1,213 @@
+"""
+Neural network position evaluator written with NumPy.
+
+Positions are encoded with the TD-Gammon input layout and scored by a
+small multilayer perceptron. Every method works on batches, so all the
+candidate plays of a roll (or thousands of positions) are scored with a
+couple of matrix multiplications instead of one Python call each.
+"""
+
+import hashlib
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from engine.evaluator import Evaluator
+from engine.position import (
+    BLACK_BAR,
+    BLACK_OFF,
+    CHECKERS_PER_SIDE,
+    WHITE_BAR,
+    WHITE_OFF,
+    Position,
+)
+
+# 24 points x 4 units x 2 colors + bar (2) + borne off (2) + side to move (2)
+INPUT_SIZE = 198
+DEFAULT_HIDDEN = 40
+
+
+def _point_units(counts: np.ndarray) -> np.ndarray:
+    """Truncated unary encoding of checker counts (N, 24) -> (N, 96)."""
+    units = np.empty(counts.shape + (4,), dtype=np.float32)
+    units[..., 0] = counts >= 1
+    units[..., 1] = counts >= 2
+    units[..., 2] = counts >= 3
+    units[..., 3] = np.maximum(counts - 3, 0) / 2.0
+    return units.reshape(counts.shape[0], -1)
+
+
+def encode_positions(positions: Sequence[Position], turn: str) -> np.ndarray:
+    """Encode a batch of positions as network inputs.
+
+    Args:
+        positions: Position tuples
+        turn: Side to move in every position ('W' or 'B')
+
+    Returns:
+        Float32 array of shape (len(positions), INPUT_SIZE)
+    """
+    table = np.asarray(positions, dtype=np.int16).reshape(-1, 28)
+    return encode_array(table, np.full(len(table), turn == "W"))
+
+
+def encode_array(table: np.ndarray, white_to_move: np.ndarray) -> np.ndarray:
+    """Encode an (N, 28) integer array of positions as network inputs.
+
+    Args:
+        table: Positions, one per row
+        white_to_move: Boolean array, True where White is on roll
+
+    Returns:
+        Float32 array of shape (N, INPUT_SIZE)
+    """
+    points = table[:, :24]
+    features = np.empty((len(table), INPUT_SIZE), dtype=np.float32)
+    features[:, 0:96] = _point_units(np.maximum(points, 0))
+    features[:, 96:192] = _point_units(np.maximum(-points, 0))
+    features[:, 192] = table[:, WHITE_BAR] / 2.0
+    features[:, 193] = table[:, BLACK_BAR] / 2.0
+    features[:, 194] = table[:, WHITE_OFF] / float(CHECKERS_PER_SIDE)
+    features[:, 195] = table[:, BLACK_OFF] / float(CHECKERS_PER_SIDE)
+    features[:, 196] = white_to_move
+    features[:, 197] = ~np.asarray(white_to_move, dtype=bool)
+    return features
+
+
+def _sigmoid(values: np.ndarray) -> np.ndarray:
+    """Logistic function."""
+    return 1.0 / (1.0 + np.exp(-values))
+
+
+class NeuralNet:
+    """Two-layer perceptron that outputs the probability that White wins."""
+
+    def __init__(self, hidden: int = DEFAULT_HIDDEN, seed: Optional[int] = None):
+        """Create a network with small random weights.
+
+        Args:
+            hidden: Number of hidden units
+            seed: Seed for the weight initialization
+        """
+        rng = np.random.default_rng(seed)
+        self.hidden = hidden
+        self.w1 = rng.normal(0.0, 0.1, (INPUT_SIZE, hidden)).astype(np.float32)
+        self.b1 = np.zeros(hidden, dtype=np.float32)
+        self.w2 = rng.normal(0.0, 0.1, hidden).astype(np.float32)
+        self.b2 = np.zeros(1, dtype=np.float32)
+
+    @property
+    def size(self) -> int:
+        """Total number of parameters."""
+        return self.w1.size + self.b1.size + self.w2.size + self.b2.size
+
+    def forward(self, features: np.ndarray) -> np.ndarray:
+        """Evaluate a batch of encoded positions.
+
+        Args:
+            features: Array of shape (N, INPUT_SIZE)
+
+        Returns:
+            Array of shape (N,) with the probability that White wins
+        """
+        hidden = _sigmoid(features @ self.w1 + self.b1)
+        return _sigmoid(hidden @ self.w2 + self.b2[0])
+
+    def gradients(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Evaluate a batch and get the gradient of each output.
+
+        Args:
+            features: Array of shape (N, INPUT_SIZE)
+
+        Returns:
+            Tuple of (outputs of shape (N,), gradients of shape (N, size))
+            where gradients are laid out like get_weights()
+        """
+        hidden = _sigmoid(features @ self.w1 + self.b1)
+        output = _sigmoid(hidden @ self.w2 + self.b2[0])
+        d_out = output * (1.0 - output)
+        d_hidden = d_out[:, None] * self.w2 * hidden * (1.0 - hidden)
+        grad_w1 = features[:, :, None] * d_hidden[:, None, :]
+        grads = np.concatenate(
+            [
+                grad_w1.reshape(len(features), -1),
+                d_hidden,
+                d_out[:, None] * hidden,
+                d_out[:, None],
+            ],
+            axis=1,
+        )
+        return output, grads
+
+    def get_weights(self) -> np.ndarray:
+        """Get all parameters as one flat float32 vector."""
+        return np.concatenate(
+            [self.w1.ravel(), self.b1, self.w2, self.b2]
+        ).astype(np.float32)
+
+    def set_weights(self, flat: np.ndarray) -> None:
+        """Load parameters from a flat vector made by get_weights().
+
+        Raises:
+            ValueError: If the vector has the wrong size
+        """
+        if flat.size != self.size:
+            raise ValueError(f"Expected {self.size} weights, got {flat.size}")
+        split1 = self.w1.size
+        split2 = split1 + self.hidden
+        split3 = split2 + self.hidden
+        self.w1 = flat[:split1].reshape(INPUT_SIZE, self.hidden).astype(np.float32)
+        self.b1 = flat[split1:split2].astype(np.float32)
+        self.w2 = flat[split2:split3].astype(np.float32)
+        self.b2 = flat[split3:].astype(np.float32)
+
+    def fingerprint(self) -> int:
+        """Stable 64-bit hash of the layout and weights, to tell networks apart."""
+        data = self.hidden.to_bytes(4, "little") + self.get_weights().tobytes()
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+    def save(self, path: str) -> None:
+        """Save the weights to a .npz file."""
+        np.savez(path, w1=self.w1, b1=self.b1, w2=self.w2, b2=self.b2)
+
+    @classmethod
+    def load(cls, path: str) -> "NeuralNet":
+        """Load a network saved with save()."""
+        with np.load(path) as data:
+            net = cls(hidden=data["b1"].size)
+            net.w1 = data["w1"]
+            net.b1 = data["b1"]
+            net.w2 = data["w2"]
+            net.b2 = data["b2"]
+        return net
+
+
+class NeuralEvaluator(Evaluator):
+    """Scores positions and candidate plays with a NeuralNet."""
+
+    def __init__(self, net: Optional[NeuralNet] = None):
+        """Create the evaluator.
+
+        Args:
+            net: Network to use (a new seeded one if None)
+        """
+        self.net = net if net is not None else NeuralNet(seed=0)
+
+    def win_probabilities(self, positions: Sequence[Position], turn: str) -> np.ndarray:
+        """Get the probability that White wins for a batch of positions.
+
+        Finished games get an exact 1.0 or 0.0.
+
+        Args:
+            positions: Position tuples
+            turn: Side to move in every position
+
+        Returns:
+            Array of shape (len(positions),)
+        """
+        table = np.asarray(positions, dtype=np.int16).reshape(-1, 28)
+        probs = self.net.forward(
+            encode_array(table, np.full(len(table), turn == "W"))
+        )
+        probs = np.where(table[:, WHITE_OFF] == CHECKERS_PER_SIDE, 1.0, probs)
+        return np.where(table[:, BLACK_OFF] == CHECKERS_PER_SIDE, 0.0, probs)
@@ -0,0 +1,232 @@
+"""
+Opening book: best plays for the first moves of every game.
+
+Every game starts from Board.reset() with White on roll, so the first
+plays and the replies to them can be computed once and looked up
+instead of searched. The default book, shipped in
+engine/data/opening_book.bin, is built for the default network of
+Engine() and read the first time it is used.
+
+A book records the fingerprint of the network that built it (see
+NeuralNet.fingerprint()), and a Bot only follows it when its own engine
+uses that network, so the book never overrides other weights.
+
+File format (little endian)::
+
+    header: b"BGOB", version (uint16), entry count (uint32),
+            source network fingerprint (uint64)
+    entry:  position hash (uint64), roll (uint8, die1 * 16 + die2),
+            move count (uint8), 4 moves of 2 bytes (source + 1,
+            destination + 1; unused moves are zero)
+
+Rebuild it for the default network, or build one for trained weights,
+with::
+
+    python -m engine.opening_book
+    python -m engine.opening_book --weights checkpoints/latest.npz --output book.bin
+"""
+
+import argparse
+import os
+import struct
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from engine.engine import Engine
+from engine.evaluator import Evaluator
+from engine.movegen import DISTINCT_ROLLS
+from engine.neural import NeuralEvaluator, NeuralNet
+from engine.position import Play, Position, initial_position, opponent, position_hash
+
+BOOK_PATH = os.path.join(os.path.dirname(__file__), "data", "opening_book.bin")
+DEFAULT_DEPTH = 2
+
+_MAGIC = b"BGOB"
+_VERSION = 2
+_HEADER = struct.Struct("<4sHIQ")
+_ENTRY = struct.Struct("<QBB8B")
+
+BookKey = Tuple[int, int]
+
+
+def _roll_byte(roll: Sequence[int]) -> int:
+    """Pack a roll into one byte, smaller die first."""
+    return min(roll) * 16 + max(roll)
+
+
+def pack_entry(key: BookKey, play: Play) -> bytes:
+    """Encode one book entry."""
+    moves = [0] * 8
+    for index, (src, dst) in enumerate(play):
+        moves[2 * index] = src + 1
+        moves[2 * index + 1] = dst + 1
+    return _ENTRY.pack(key[0], key[1], len(play), *moves)
+
+
+def unpack_entry(data: bytes) -> Tuple[BookKey, Play]:
+    """Decode one book entry."""
+    fields = _ENTRY.unpack(data)
+    count = fields[2]
+    moves = fields[3:]
+    play = tuple((moves[2 * i] - 1, moves[2 * i + 1] - 1) for i in range(count))
+    return (fields[0], fields[1]), play
+
+
+class OpeningBook:
+    """Lookup table from (position hash, roll) to the best play."""
+
+    _default: Optional["OpeningBook"] = None
+
+    def __init__(self, path: str = BOOK_PATH):
+        """Create a book backed by a file; nothing is read until needed.
+
+        Args:
+            path: Book file
+        """
+        self.path = path
+        self._entries: Optional[Dict[BookKey, Play]] = None
+        self._source: Optional[int] = None
+
+    @classmethod
+    def default(cls) -> "OpeningBook":
+        """Shared book loaded from the file shipped with the package."""
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    @property
+    def entries(self) -> Dict[BookKey, Play]:
+        """All entries, reading the file on first access.
+
+        A missing file gives an empty book.
+        """
+        if self._entries is None:
+            self._entries = {}
+            if os.path.exists(self.path):
+                with open(self.path, "rb") as handle:
+                    data = handle.read()
+                self._source = read_source(data)
+                self._entries = dict(read_entries(data))
+        return self._entries
+
+    @property
+    def source(self) -> Optional[int]:
+        """Fingerprint of the network that built the book (None if empty)."""
+        return self._source if self.entries else None
+
+    def matches(self, evaluator: Evaluator) -> bool:
+        """Check if the book was built with the network of an evaluator.
+
+        Args:
+            evaluator: An Engine or NeuralEvaluator (anything else never
+                matches)
+
+        Returns:
+            True if the book's plays are the evaluator's own choices
+        """
+        neural = getattr(evaluator, "neural", evaluator)
+        net = getattr(neural, "net", None)
+        if self.source is None or not isinstance(net, NeuralNet):
+            return False
+        return net.fingerprint() == self.source
+
+    def lookup(self, position: Position, turn: str, roll: Sequence[int]) -> Optional[Play]:
+        """Get the book play for a position and roll.
+
+        Returns:
+            The play, or None if the position is not in the book
+        """
+        return self.entries.get((position_hash(position, turn), _roll_byte(roll)))
+
+    def __len__(self) -> int:
+        """Number of entries."""
+        return len(self.entries)
+
+
+def _read_header(data: bytes) -> Tuple[int, int]:
+    """Entry count and source fingerprint of a book file."""
+    if len(data) < _HEADER.size:
+        raise ValueError("Not an opening book file")
+    magic, version, count, source = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("Not an opening book file")
+    return count, source
+
+
+def read_source(data: bytes) -> int:
+    """Get the fingerprint of the network that built a book file.
+
+    Raises:
+        ValueError: If the header is not a supported book header
+    """
+    return _read_header(data)[1]
+
+
+def read_entries(data: bytes) -> Iterator[Tuple[BookKey, Play]]:
+    """Parse the entries of a book file.
+
+    Raises:
+        ValueError: If the header is not a supported book header
+    """
+    count, _ = _read_header(data)
+    offset = _HEADER.size
+    for _ in range(count):
+        yield unpack_entry(data[offset : offset + _ENTRY.size])
+        offset += _ENTRY.size
+
+
+def write_book(path: str, entries: Dict[BookKey, Play], source: int) -> None:
+    """Write entries to a book file, sorted by key.
+
+    Args:
+        path: File to write
+        entries: Entries from build_book()
+        source: Fingerprint of the network that chose the plays
+    """
+    with open(path, "wb") as handle:
+        handle.write(_HEADER.pack(_MAGIC, _VERSION, len(entries), source))
+        for key in sorted(entries):
+            handle.write(pack_entry(key, entries[key]))
+
+
+def build_book(evaluator: Evaluator, depth: int = DEFAULT_DEPTH) -> Dict[BookKey, Play]:
+    """Compute the book entries by evaluating every early roll.
+
+    Args:
+        evaluator: Evaluator that picks the plays
+        depth: Number of plies to cover (1 = White's first play only,
+            2 = also Black's reply to every first play, ...)
+
+    Returns:
+        Mapping of (position hash, roll byte) to play
+    """
+    entries: Dict[BookKey, Play] = {}
+    frontier: List[Tuple[Position, str]] = [(initial_position(), "W")]
+    for _ in range(depth):
+        following: List[Tuple[Position, str]] = []
+        for position, turn in frontier:
+            key_hash = position_hash(position, turn)
+            for roll, _ in DISTINCT_ROLLS:
+                play, result, _ = evaluator.rank_plays(position, turn, roll)[0]
+                entries[(key_hash, _roll_byte(roll))] = play
+                following.append((result, opponent(turn)))
+        frontier = list(dict.fromkeys(following))
+    return entries
+
+
+def main() -> None:
+    """Command line entry point: rebuild the shipped book."""
+    parser = argparse.ArgumentParser(description="Build the opening book")
+    parser.add_argument("--weights", help="network weights (.npz; the default network if unset)")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH)
+    parser.add_argument("--output", default=BOOK_PATH)
+    args = parser.parse_args()
+
+    net = NeuralNet.load(args.weights) if args.weights else NeuralEvaluator().net
+    entries = build_book(Engine(NeuralEvaluator(net)), args.depth)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    write_book(args.output, entries, net.fingerprint())
+    print(f"Wrote {len(entries)} entries for network {net.fingerprint():016x} to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Compact position representation used by the engine.
+
+A position is a tuple of 28 integers:
+
+- indices 0-23: checkers on each point, positive for White, negative for Black
+- index 24: White checkers on the bar
+- index 25: Black checkers on the bar
+- index 26: White checkers borne off
+- index 27: Black checkers borne off
+
+White moves from point 23 towards point 0 (enters from the bar at 24 - die
+and bears off from points 0-5). Black moves the other way (enters at
+die - 1 and bears off from points 18-23). Moves are stored as
+``(source, destination)`` pairs of board indices, where White uses 24 for
+the bar and -1 for borne off, and Black uses -1 for the bar and 24 for
+borne off.
+"""
+
+import hashlib
+from typing import List, Tuple
+
+from core.board import Board
+
+Position = Tuple[int, ...]
+Move = Tuple[int, int]
+Play = Tuple[Move, ...]
+
+WHITE_BAR = 24
+BLACK_BAR = 25
+WHITE_OFF = 26
+BLACK_OFF = 27
+CHECKERS_PER_SIDE = 15
+
+
+def from_board(board: Board) -> Position:
+    """Build a compact position from a Board.
+
+    Args:
+        board: Board to read
+
+    Returns:
+        Position tuple
+    """
+    values: List[int] = []
+    for point in board.points:
+        if not point:
+            values.append(0)
+        elif point[0] == "W":
+            values.append(len(point))
+        else:
+            values.append(-len(point))
+    values.append(board.bar["W"])
+    values.append(board.bar["B"])
+    values.append(board.borne_off["W"])
+    values.append(board.borne_off["B"])
+    return tuple(values)
+
+
+def to_board(position: Position, board: Board = None) -> Board:
+    """Write a compact position into a Board.
+
+    Args:
+        position: Position tuple
+        board: Board to overwrite (a new one is created if None)
+
+    Returns:
+        The updated Board
+    """
+    if board is None:
+        board = Board()
+    points = []
+    for count in position[:24]:
+        if count > 0:
+            points.append(["W"] * count)
+        elif count < 0:
+            points.append(["B"] * -count)
+        else:
+            points.append([])
+    board.points = points
+    board.bar = {"W": position[WHITE_BAR], "B": position[BLACK_BAR]}
+    board.borne_off = {"W": position[WHITE_OFF], "B": position[BLACK_OFF]}
+    return board
+
+
+def initial_position() -> Position:
+    """Get the position produced by Board.reset()."""
+    return from_board(Board())
+
+
+def flip(position: Position) -> Position:
+    """Mirror a position so Black and White swap roles.
+
+    Point i becomes point 23 - i with the sign of its checkers reversed.
+
+    Args:
+        position: Position tuple
+
+    Returns:
+        Mirrored position tuple
+    """
+    points = tuple(-position[23 - i] for i in range(24))
+    return points + (
+        position[BLACK_BAR],
+        position[WHITE_BAR],
+        position[BLACK_OFF],
+        position[WHITE_OFF],
+    )
+
+
+def flip_play(play: Play) -> Play:
+    """Mirror the moves of a play (point i becomes point 23 - i)."""
+    return tuple((23 - src, 23 - dst) for src, dst in play)
+
+
+def pip_counts(position: Position) -> Tuple[int, int]:
+    """Get the pip counts of both sides.
+
+    Returns:
+        Tuple of (white pips, black pips)
+    """
+    white = position[WHITE_BAR] * 25
+    black = position[BLACK_BAR] * 25
+    for i in range(24):
+        count = position[i]
+        if count > 0:
+            white += count * (i + 1)
+        elif count < 0:
+            black -= count * (24 - i)
+    return white, black
+
+
+def has_contact(position: Position) -> bool:
+    """Check if the sides can still hit each other (see Board.has_contact)."""
+    if position[WHITE_BAR] or position[BLACK_BAR]:
+        return True
+    highest_white = -1
+    for i in range(23, -1, -1):
+        if position[i] > 0:
+            highest_white = i
+            break
+    for i in range(highest_white):
+        if position[i] < 0:
+            return True
+    return False
+
+
+def position_hash(position: Position, turn: str) -> int:
+    """Stable 64-bit hash of a position and the side to move.
+
+    Unlike hash(), the value is the same on every run and platform, so it
+    can be stored in files.
+    """
+    data = bytes(count + 128 for count in position) + turn.encode("ascii")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+def winner(position: Position) -> str:
+    """Get the color that has borne off every checker.
+
+    Returns:
+        'W', 'B' or '' if the game is not over
+    """
+    if position[WHITE_OFF] == CHECKERS_PER_SIDE:
+        return "W"
+    if position[BLACK_OFF] == CHECKERS_PER_SIDE:
+        return "B"
+    return ""
+
+
+def opponent(color: str) -> str:
+    """Get the other color."""
+    return "B" if color == "W" else "W"
@@ -0,0 +1,244 @@
+"""
+SQLite store of positions seen in games and rollouts.
+
+Every position is keyed by its 10-byte GNU Backgammon key and the side on
+roll, and holds how often it was seen, how the games through it ended
+and, once computed, a cached equity (White's point of view, as the
+evaluators return it) with the name of what computed it.
+
+Writes are buffered and applied in batches, one transaction per batch,
+so recording the positions of a game costs one dict update each. The
+database runs in WAL mode, so readers on other threads (each taking a
+connection from a small pool) never wait for the writer. Reads only see
+what has been flushed.
+"""
+
+import contextlib
+import queue
+import sqlite3
+import threading
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from engine.position import Position
+from engine.position_id import position_key
+from engine.selfplay import SelfPlayResult
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_POOL_SIZE = 4
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS positions (
+    key BLOB NOT NULL,
+    turn TEXT NOT NULL,
+    seen INTEGER NOT NULL DEFAULT 0,
+    white_wins INTEGER NOT NULL DEFAULT 0,
+    black_wins INTEGER NOT NULL DEFAULT 0,
+    equity REAL,
+    source TEXT,
+    PRIMARY KEY (key, turn)
+) WITHOUT ROWID
+"""
+
+_UPSERT_COUNTS = """
+INSERT INTO positions (key, turn, seen, white_wins, black_wins)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (key, turn) DO UPDATE SET
+    seen = seen + excluded.seen,
+    white_wins = white_wins + excluded.white_wins,
+    black_wins = black_wins + excluded.black_wins
+"""
+
+_UPSERT_EQUITY = """
+INSERT INTO positions (key, turn, equity, source)
+VALUES (?, ?, ?, ?)
+ON CONFLICT (key, turn) DO UPDATE SET
+    equity = excluded.equity,
+    source = excluded.source
+"""
+
+Key = Tuple[bytes, str]
+
+
+class PositionStats(NamedTuple):
+    """What the store knows about a position."""
+
+    seen: int
+    white_wins: int
+    black_wins: int
+    equity: Optional[float]
+    source: Optional[str]
+
+
+class ConnectionPool:
+    """A fixed set of SQLite connections shared between threads."""
+
+    def __init__(self, path: str, size: int = DEFAULT_POOL_SIZE):
+        """
+        Open the connections.
+
+        Args:
+            path: Database file
+            size: Number of connections
+        """
+        self._idle: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._all: List[sqlite3.Connection] = []
+        for _ in range(size):
+            connection = sqlite3.connect(path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._all.append(connection)
+            self._idle.put(connection)
+
+    @contextlib.contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection, waiting for one if all are in use."""
+        connection = self._idle.get()
+        try:
+            yield connection
+        finally:
+            self._idle.put(connection)
+
+    def close(self) -> None:
+        """Close every connection."""
+        for connection in self._all:
+            connection.close()
+        self._all = []
+
+
+class PositionDB:
+    """Position store with batched writes and pooled readers."""
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        pool_size: int = DEFAULT_POOL_SIZE,
+    ):
+        """
+        Open (or create) a database.
+
+        Args:
+            path: Database file
+            batch_size: Buffered updates that trigger a flush
+            pool_size: Connections available to readers and the writer
+        """
+        self.batch_size = batch_size
+        self.pool = ConnectionPool(path, pool_size)
+        self._lock = threading.Lock()
+        self._counts: Dict[Key, List[int]] = {}
+        self._equities: Dict[Key, Tuple[float, str]] = {}
+        with self.pool.connection() as connection:
+            connection.execute(_SCHEMA)
+            connection.commit()
+
+    def record(self, position: Position, turn: str, winner: str = "") -> None:
+        """
+        Count one occurrence of a position.
+
+        Args:
+            position: Position tuple
+            turn: Side on roll
+            winner: Winner of the game it was seen in ('' if unknown)
+        """
+        key = (position_key(position, turn), turn)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0, 0, 0])
+            counts[0] += 1
+            if winner == "W":
+                counts[1] += 1
+            elif winner == "B":
+                counts[2] += 1
+            pending = len(self._counts) + len(self._equities)
+        if pending >= self.batch_size:
+            self.flush()
+
+    def record_game(self, result: SelfPlayResult) -> None:
+        """
+        Count every position of a finished game with its result.
+
+        Args:
+            result: Game returned by HeadlessGame.play()
+        """
+        for position, turn in zip(result.positions, result.turns):
+            self.record(position, turn, result.winner)
+
+    def cache_equity(self, position: Position, turn: str, equity: float, source: str = "") -> None:
+        """
+        Store the equity of a position, replacing any older one.
+
+        Args:
+            position: Position tuple
+            turn: Side on roll
+            equity: Equity for White
+            source: What computed it (e.g. 'rollout', '2-ply')
+        """
+        key = (position_key(position, turn), turn)
+        with self._lock:
+            self._equities[key] = (equity, source)
+            pending = len(self._counts) + len(self._equities)
+        if pending >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write the buffered updates in one transaction.
+
+        Returns:
+            Number of updates written
+        """
+        with self._lock:
+            counts, self._counts = self._counts, {}
+            equities, self._equities = self._equities, {}
+        if not counts and not equities:
+            return 0
+        with self.pool.connection() as connection:
+            with connection:
+                connection.executemany(
+                    _UPSERT_COUNTS,
+                    ((key, turn, *values) for (key, turn), values in counts.items()),
+                )
+                connection.executemany(
+                    _UPSERT_EQUITY,
+                    ((key, turn, *values) for (key, turn), values in equities.items()),
+                )
+        return len(counts) + len(equities)
+
+    def lookup(self, position: Position, turn: str) -> Optional[PositionStats]:
+        """
+        Read what is stored about a position.
+
+        Args:
+            position: Position tuple
+            turn: Side on roll
+
+        Returns:
+            PositionStats, or None if the position was never flushed
+        """
+        with self.pool.connection() as connection:
+            row = connection.execute(
+                "SELECT seen, white_wins, black_wins, equity, source FROM positions "
+                "WHERE key = ? AND turn = ?",
+                (position_key(position, turn), turn),
+            ).fetchone()
+        return PositionStats(*row) if row else None
+
+    def cached_equity(self, position: Position, turn: str) -> Optional[float]:
+        """Get the stored equity of a position, or None."""
+        stats = self.lookup(position, turn)
+        return stats.equity if stats else None
+
+    def __len__(self) -> int:
+        """Number of positions flushed to the database."""
+        with self.pool.connection() as connection:
+            return connection.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+
+    def close(self) -> None:
+        """Flush and close every connection."""
+        self.flush()
+        self.pool.close()
+
+    def __enter__(self) -> "PositionDB":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,300 @@
+"""
+GNU Backgammon position IDs and match IDs.
+
+A position ID is a 14-character base64 string of an 80-bit key. For each
+player, first the one *not* on roll and then the one on roll, the key
+lists every point from that player's own 1-point to 24-point and then the
+bar: one 1 bit per checker followed by a 0 bit. Bits fill each byte from
+the least significant end. Checkers not on the board are borne off.
+
+A match ID is a 12-character base64 string of 66 bits holding the cube,
+the player on roll, the dice and the score (see MatchState).
+
+Player 0 is White and player 1 is Black. White's 1-point is board index
+0 and Black's is board index 23, as in engine.position.
+"""
+
+import base64
+import binascii
+from typing import List, NamedTuple, Optional
+
+from core.board import Board
+from engine.position import (
+    BLACK_BAR,
+    BLACK_OFF,
+    CHECKERS_PER_SIDE,
+    WHITE_BAR,
+    WHITE_OFF,
+    Position,
+    from_board,
+    opponent,
+    to_board,
+)
+
+KEY_BYTES = 10
+POSITION_ID_LENGTH = 14
+MATCH_ID_BYTES = 9
+MATCH_ID_LENGTH = 12
+
+PLAYERS = ("W", "B")
+CENTERED = 3
+
+# Game states of a match ID
+NO_GAME = 0
+PLAYING = 1
+GAME_OVER = 2
+RESIGNED = 3
+DROPPED = 4
+
+
+def _player_points(position: Position, color: str) -> List[int]:
+    """Checker counts of one side from its 1-point to its bar."""
+    if color == "W":
+        return [max(count, 0) for count in position[:24]] + [position[WHITE_BAR]]
+    return [max(-count, 0) for count in reversed(position[:24])] + [position[BLACK_BAR]]
+
+
+def position_key(position: Position, turn: str) -> bytes:
+    """Build the 10-byte GNU Backgammon key of a position.
+
+    Args:
+        position: Position tuple
+        turn: Side on roll
+
+    Returns:
+        The key
+    """
+    key = bytearray(KEY_BYTES)
+    bit = 0
+    for color in (opponent(turn), turn):
+        for count in _player_points(position, color):
+            for _ in range(count):
+                key[bit >> 3] |= 1 << (bit & 7)
+                bit += 1
+            bit += 1
+    return bytes(key)
+
+
+def position_from_key(key: bytes, turn: str) -> Position:
+    """Rebuild a position from its 10-byte key.
+
+    Args:
+        key: Position key
+        turn: Side on roll
+
+    Returns:
+        Position tuple
+
+    Raises:
+        ValueError: If the key does not describe a valid position
+    """
+    if len(key) != KEY_BYTES:
+        raise ValueError(f"A position key has {KEY_BYTES} bytes")
+    bits = [(key[index >> 3] >> (index & 7)) & 1 for index in range(8 * KEY_BYTES)]
+    counts: List[List[int]] = []
+    index = 0
+    for _ in range(2):
+        points = []
+        for _ in range(25):
+            count = 0
+            while index < len(bits) and bits[index]:
+                count += 1
+                index += 1
+            index += 1
+            points.append(count)
+        if sum(points) > CHECKERS_PER_SIDE:
+            raise ValueError("More than 15 checkers for one player")
+        counts.append(points)
+    if index > len(bits) or any(bits[index:]):
+        raise ValueError("Invalid position key")
+
+    values = [0] * 28
+    for color, points in zip((opponent(turn), turn), counts):
+        for point in range(24):
+            if points[point] == 0:
+                continue
+            if color == "W":
+                target, signed = point, points[point]
+            else:
+                target, signed = 23 - point, -points[point]
+            if values[target]:
+                raise ValueError("Both players on the same point")
+            values[target] = signed
+        bar, off = (WHITE_BAR, WHITE_OFF) if color == "W" else (BLACK_BAR, BLACK_OFF)
+        values[bar] = points[24]
+        values[off] = CHECKERS_PER_SIDE - sum(points)
+    return tuple(values)
+
+
+def _b64encode(data: bytes) -> str:
+    """Base64 without padding."""
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+
+def _b64decode(text: str, size: int) -> bytes:
+    """Decode unpadded base64 of a known byte size."""
+    try:
+        data = base64.b64decode(text + "=" * (-len(text) % 4), validate=True)
+    except (binascii.Error, ValueError) as error:
+        raise ValueError(f"Invalid base64: {text!r}") from error
+    if len(data) != size:
+        raise ValueError(f"Expected {size} bytes, got {len(data)}")
+    return data
+
+
+def encode_position_id(position: Position, turn: str) -> str:
+    """Get the 14-character position ID of a position.
+
+    Args:
+        position: Position tuple
+        turn: Side on roll
+
+    Returns:
+        Position ID (e.g. '4HPwATDgc/ABMA' for the starting position)
+    """
+    return _b64encode(position_key(position, turn))
+
+
+def decode_position_id(position_id: str, turn: str) -> Position:
+    """Rebuild a position from its position ID.
+
+    Args:
+        position_id: 14-character position ID
+        turn: Side on roll
+
+    Returns:
+        Position tuple
+
+    Raises:
+        ValueError: If the ID is malformed
+    """
+    if len(position_id) != POSITION_ID_LENGTH:
+        raise ValueError(f"A position ID has {POSITION_ID_LENGTH} characters")
+    return position_from_key(_b64decode(position_id, KEY_BYTES), turn)
+
+
+def board_position_id(board: Board, turn: str) -> str:
+    """Same as encode_position_id() for a Board."""
+    return encode_position_id(from_board(board), turn)
+
+
+def board_from_position_id(position_id: str, turn: str, board: Optional[Board] = None) -> Board:
+    """Same as decode_position_id(), written into a Board.
+
+    Args:
+        position_id: 14-character position ID
+        turn: Side on roll
+        board: Board to overwrite (a new one if None)
+
+    Returns:
+        The Board
+    """
+    return to_board(decode_position_id(position_id, turn), board)
+
+
+class MatchState(NamedTuple):
+    """Fields of a GNU Backgammon match ID."""
+
+    cube: int = 1
+    cube_owner: int = CENTERED
+    on_roll: str = "W"
+    crawford: bool = False
+    game_state: int = PLAYING
+    turn: str = "W"
+    double_offered: bool = False
+    resignation: int = 0
+    dice: tuple = (0, 0)
+    match_length: int = 0
+    score: tuple = (0, 0)
+
+
+# (field, bits) in the order they are packed
+_MATCH_FIELDS = (
+    ("cube", 4),
+    ("cube_owner", 2),
+    ("on_roll", 1),
+    ("crawford", 1),
+    ("game_state", 3),
+    ("turn", 1),
+    ("double_offered", 1),
+    ("resignation", 2),
+    ("die1", 3),
+    ("die2", 3),
+    ("match_length", 15),
+    ("score0", 15),
+    ("score1", 15),
+)
+
+
+def encode_match_id(state: MatchState) -> str:
+    """Get the 12-character match ID of a match state.
+
+    Args:
+        state: Match state (cube is the cube value, e.g. 2, not its log)
+
+    Returns:
+        Match ID (e.g. 'cAkAAAAAAAAA')
+
+    Raises:
+        ValueError: If the cube is not a power of two
+    """
+    if state.cube < 1 or state.cube & (state.cube - 1):
+        raise ValueError("The cube value must be a power of two")
+    values = {
+        "cube": state.cube.bit_length() - 1,
+        "cube_owner": state.cube_owner,
+        "on_roll": PLAYERS.index(state.on_roll),
+        "crawford": int(state.crawford),
+        "game_state": state.game_state,
+        "turn": PLAYERS.index(state.turn),
+        "double_offered": int(state.double_offered),
+        "resignation": state.resignation,
+        "die1": state.dice[0],
+        "die2": state.dice[1],
+        "match_length": state.match_length,
+        "score0": state.score[0],
+        "score1": state.score[1],
+    }
+    number = 0
+    shift = 0
+    for name, width in _MATCH_FIELDS:
+        value = values[name]
+        if not 0 <= value < 1 << width:
+            raise ValueError(f"{name} out of range: {value}")
+        number |= value << shift
+        shift += width
+    return _b64encode(number.to_bytes(MATCH_ID_BYTES, "little"))
+
+
+def decode_match_id(match_id: str) -> MatchState:
+    """Read the fields of a match ID.
+
+    Args:
+        match_id: 12-character match ID
+
+    Returns:
+        MatchState
+
+    Raises:
+        ValueError: If the ID is malformed
+    """
+    if len(match_id) != MATCH_ID_LENGTH:
+        raise ValueError(f"A match ID has {MATCH_ID_LENGTH} characters")
+    number = int.from_bytes(_b64decode(match_id, MATCH_ID_BYTES), "little")
+    values = {}
+    for name, width in _MATCH_FIELDS:
+        values[name] = number & ((1 << width) - 1)
+        number >>= width
+    return MatchState(
+        cube=1 << values["cube"],
+        cube_owner=values["cube_owner"],
+        on_roll=PLAYERS[values["on_roll"]],
+        crawford=bool(values["crawford"]),
+        game_state=values["game_state"],
+        turn=PLAYERS[values["turn"]],
+        double_offered=bool(values["double_offered"]),
+        resignation=values["resignation"],
+        dice=(values["die1"], values["die2"]),
+        match_length=values["match_length"],
+        score=(values["score0"], values["score1"]),
+    )
@@ -0,0 +1,288 @@
+"""
+Time-limited play search with iterative deepening.
+
+Depth 1 ranks the plays of a roll by the static evaluation of the
+resulting positions. Each further depth looks one more roll ahead: the
+side to move answers every one of the 21 rolls with its best play (picked
+by static evaluation) and the results are averaged. Deeper searches only
+re-score the best few plays of the previous depth, and a depth that
+cannot finish before the deadline is dropped, so the answer is always the
+deepest complete ranking. Past depth 1 the ranking only holds the plays
+that were searched, so every equity in it is on the same scale.
+
+BackgroundSearch runs any of these searches on a worker thread, so a
+prompt or an event loop can keep going and cancel it.
+"""
+
+import threading
+import time
+from typing import Callable, List, NamedTuple, Optional, Sequence
+
+from engine.engine import Engine
+from engine.evaluator import Evaluator, RankedPlay
+from engine.movegen import DISTINCT_ROLLS, legal_plays
+from engine.position import Position, opponent, winner
+
+DEFAULT_BUDGET = 2.0
+DEFAULT_MAX_DEPTH = 3
+DEFAULT_WIDTH = 5
+
+
+class SearchResult(NamedTuple):
+    """Outcome of a play search."""
+
+    plays: List[RankedPlay]
+    depth: int
+    elapsed: float
+    cancelled: bool
+
+
+class PositionValue(NamedTuple):
+    """Outcome of a position evaluation."""
+
+    equity: float
+    depth: int
+    elapsed: float
+    cancelled: bool
+
+    @property
+    def win_probability(self) -> float:
+        """Probability of winning for the side the equity belongs to."""
+        return (self.equity + 1.0) / 2.0
+
+
+class _Stop(Exception):
+    """Raised inside a search when the deadline passes or it is cancelled."""
+
+
+class _Clock:
+    """Deadline and cancel flag shared by one search."""
+
+    def __init__(self, budget: float, cancel: Optional[threading.Event]):
+        self.start = time.perf_counter()
+        self.deadline = self.start + budget
+        self.cancel = cancel
+
+    def check(self) -> None:
+        """Stop the search if time is up or it was cancelled."""
+        if time.perf_counter() > self.deadline or self.stopped_by_user():
+            raise _Stop()
+
+    def stopped_by_user(self) -> bool:
+        """Check the cancel flag."""
+        return self.cancel is not None and self.cancel.is_set()
+
+    def elapsed(self) -> float:
+        """Seconds since the search started."""
+        return time.perf_counter() - self.start
+
+
+class Searcher:
+    """Iterative deepening over the dice on top of an evaluator."""
+
+    def __init__(
+        self,
+        evaluator: Optional[Evaluator] = None,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        width: int = DEFAULT_WIDTH,
+    ):
+        """
+        Args:
+            evaluator: Static evaluator (a default Engine if None)
+            max_depth: Deepest search, in plies (1 is static ranking)
+            width: Plays re-scored (and returned) at each deeper ply
+        """
+        self.evaluator = evaluator if evaluator is not None else Engine()
+        self.max_depth = max_depth
+        self.width = width
+
+    def search(
+        self,
+        position: Position,
+        color: str,
+        roll: Sequence[int],
+        budget: float = DEFAULT_BUDGET,
+        cancel: Optional[threading.Event] = None,
+    ) -> SearchResult:
+        """Rank the plays of a roll as deeply as the budget allows.
+
+        Depth 1 always completes, so there is always a ranking.
+
+        Args:
+            position: Position before the play
+            color: Side to move
+            roll: The two dice values (or the dice still to play)
+            budget: Seconds available
+            cancel: Event that stops the search when set
+
+        Returns:
+            SearchResult with the plays sorted best first (past depth 1,
+            only the plays that were searched)
+        """
+        clock = _Clock(budget, cancel)
+        ranking = self.evaluator.rank_plays(position, color, roll)
+        depth = 1
+        for next_depth in range(2, self.max_depth + 1):
+            if len(ranking) < 2:
+                break
+            try:
+                ranking = self._deepen(ranking, color, next_depth, clock)
+            except _Stop:
+                break
+            depth = next_depth
+        return SearchResult(ranking, depth, clock.elapsed(), clock.stopped_by_user())
+
+    def evaluate(
+        self,
+        position: Position,
+        turn: str,
+        budget: float = DEFAULT_BUDGET,
+        cancel: Optional[threading.Event] = None,
+    ) -> PositionValue:
+        """Equity of the side to move, as deeply as the budget allows.
+
+        Args:
+            position: Position tuple
+            turn: Side to move, whose equity is returned
+            budget: Seconds available
+            cancel: Event that stops the search when set
+
+        Returns:
+            PositionValue of the deepest complete evaluation
+        """
+        clock = _Clock(budget, cancel)
+        equity = self._static(position, turn)
+        depth = 0
+        for next_depth in range(1, self.max_depth):
+            try:
+                equity = self._white_value(position, turn, next_depth, clock)
+            except _Stop:
+                break
+            depth = next_depth
+        if turn == "B":
+            equity = -equity
+        return PositionValue(equity, depth, clock.elapsed(), clock.stopped_by_user())
+
+    def _deepen(
+        self, ranking: List[RankedPlay], color: str, depth: int, clock: _Clock
+    ) -> List[RankedPlay]:
+        """Re-score the best plays of a ranking one ply deeper, dropping the rest."""
+        sign = 1.0 if color == "W" else -1.0
+        rescored = []
+        for play, result, _ in ranking[: self.width]:
+            value = self._white_value(result, opponent(color), depth - 1, clock)
+            rescored.append((play, result, sign * value))
+        rescored.sort(key=lambda item: -item[2])
+        return rescored
+
+    def _static(self, position: Position, turn: str) -> float:
+        """Static equity of White."""
+        return 2.0 * float(self.evaluator.win_probabilities([position], turn)[0]) - 1.0
+
+    def _white_value(
+        self, position: Position, turn: str, plies: int, clock: _Clock
+    ) -> float:
+        """Equity of White averaged over the next `plies` rolls.
+
+        Args:
+            position: Position tuple
+            turn: Side about to roll
+            plies: Rolls to look ahead (0 is the static evaluation)
+            clock: Deadline of the search
+
+        Returns:
+            Equity of White (-1 to 1)
+        """
+        done = winner(position)
+        if done:
+            return 1.0 if done == "W" else -1.0
+        if plies == 0:
+            return self._static(position, turn)
+        sign = 1.0 if turn == "W" else -1.0
+        total = 0.0
+        for roll, weight in DISTINCT_ROLLS:
+            clock.check()
+            candidates = legal_plays(position, turn, roll)
+            scores = self.evaluator.win_probabilities(
+                [result for _, result in candidates], opponent(turn)
+            )
+            best = int((sign * scores).argmax())
+            if plies == 1:
+                value = 2.0 * float(scores[best]) - 1.0
+            else:
+                value = self._white_value(
+                    candidates[best][1], opponent(turn), plies - 1, clock
+                )
+            total += weight * value
+        return total / 36.0
+
+
+class BackgroundSearch:
+    """Run a search on a daemon thread and collect its result later.
+
+    The search function must accept a `cancel` keyword argument with the
+    threading.Event that cancel() sets, like Searcher.search() and
+    Searcher.evaluate() do.
+    """
+
+    def __init__(
+        self,
+        search: Callable[..., object],
+        *args,
+        on_done: Optional[Callable[[object], None]] = None,
+        **kwargs,
+    ):
+        """
+        Args:
+            search: Function to run
+            *args: Positional arguments for the function
+            on_done: Called on the worker thread with the result
+            **kwargs: Keyword arguments for the function
+        """
+        self._cancel = threading.Event()
+        self._finished = threading.Event()
+        self._result: object = None
+        self._error: Optional[BaseException] = None
+        self._on_done = on_done
+        kwargs["cancel"] = self._cancel
+        self._thread = threading.Thread(
+            target=self._run, args=(search, args, kwargs), daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, search: Callable[..., object], args: tuple, kwargs: dict) -> None:
+        """Worker thread body."""
+        try:
+            self._result = search(*args, **kwargs)
+        except Exception as error:  # pylint: disable=broad-except
+            self._error = error
+        finally:
+            self._finished.set()
+        if self._on_done is not None and self._error is None:
+            self._on_done(self._result)
+
+    def cancel(self) -> None:
+        """Ask the search to stop at the next check."""
+        self._cancel.set()
+
+    def done(self) -> bool:
+        """Check whether the search has finished."""
+        return self._finished.is_set()
+
+    def result(self, timeout: Optional[float] = None) -> object:
+        """Wait for the search and return its result.
+
+        Args:
+            timeout: Seconds to wait (forever if None)
+
+        Returns:
+            The result, or None if the search is still running
+
+        Raises:
+            Exception: Whatever the search raised
+        """
+        if not self._finished.wait(timeout):
+            return None
+        if self._error is not None:
+            raise self._error
+        return self._result
@@ -0,0 +1,77 @@
+"""
+Headless game loop used for self-play, training and simulations.
+
+The loop drives a core Game (its dice and current player) without any
+user interface. Checker moves are applied to a compact position and
+written back to the Game's board once the game is over.
+"""
+
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from core.BackgammonGame import Game
+from engine.movegen import apply_play
+from engine.position import Play, Position, from_board, to_board, winner
+
+Policy = Callable[[Position, str, Tuple[int, int]], Play]
+
+# Safety net against games that never finish with a broken policy
+MAX_TURNS = 2000
+
+
+class SelfPlayResult(NamedTuple):
+    """Outcome and trajectory of a finished game."""
+
+    winner: str
+    positions: List[Position]
+    turns: List[str]
+    rolls: List[Tuple[int, int]]
+    plays: List[Play]
+
+
+class HeadlessGame:
+    """Plays a Game to the end by asking a policy for every play."""
+
+    def __init__(self, game: Optional[Game] = None, max_turns: int = MAX_TURNS):
+        """Create the loop.
+
+        Args:
+            game: Game to play (a new one if None)
+            max_turns: Turns after which the game is abandoned
+        """
+        self.game = game if game is not None else Game()
+        self.max_turns = max_turns
+
+    def play(self, white: Policy, black: Optional[Policy] = None) -> SelfPlayResult:
+        """Play the game until one side has borne off every checker.
+
+        Args:
+            white: Policy for White
+            black: Policy for Black (same as White if None)
+
+        Returns:
+            SelfPlayResult; winner is '' if max_turns was reached
+        """
+        policies = {"W": white, "B": black if black is not None else white}
+        position = from_board(self.game.board)
+        positions: List[Position] = []
+        turns: List[str] = []
+        rolls: List[Tuple[int, int]] = []
+        plays: List[Play] = []
+
+        while not winner(position) and len(turns) < self.max_turns:
+            color = self.game.get_current_player_color()
+            roll = self.game.dice.roll()
+            play = policies[color](position, color, roll)
+
+            positions.append(position)
+            turns.append(color)
+            rolls.append(roll)
+            plays.append(play)
+
+            position = apply_play(position, color, play)
+            if not winner(position):
+                self.game.switch_player()
+
+        to_board(position, self.game.board)
+        positions.append(position)
+        return SelfPlayResult(winner(position), positions, turns, rolls, plays)
@@ -0,0 +1,236 @@
+"""
+Hitting-shot counts: how many of the 36 rolls hit each blot.
+
+The paths a single checker can take to cover a distance with each roll
+(direct shots, combination shots and doubles) are computed once at import
+time. Counting the shots on a blot then only checks, for each attacking
+checker, whether the landing points of those paths are open, instead of
+generating every play of every roll.
+
+Shots count a roll once even if several checkers can hit with it, and
+respect the rule that checkers on the bar must enter first. A hit must
+also be part of a legal play, which uses as many dice as possible: when
+a hit leaves dice over, the rest of the roll is played out after it, and
+only if that fails is the hit checked against every legal play of the
+roll.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from core.board import Board
+from engine.movegen import DISTINCT_ROLLS, apply_play, can_play_all, expand_roll, legal_plays
+from engine.position import WHITE_BAR, Position, flip, from_board
+
+# A path is (landing points before the blot, as distances from the
+# source; number of dice it uses). For a non-double with both dice, the
+# checker may land on either die first, so both orders are listed.
+Path = Tuple[Tuple[int, ...], int]
+
+
+def _build_paths() -> List[List[Tuple[int, List[Path]]]]:
+    """Build PATHS[distance] = [(roll index, paths), ...]."""
+    table: List[List[Tuple[int, List[Path]]]] = [[] for _ in range(25)]
+    for index, ((die1, die2), _) in enumerate(DISTINCT_ROLLS):
+        if die1 == die2:
+            for steps in range(1, 5):
+                distance = die1 * steps
+                if distance <= 24:
+                    stops = tuple(die1 * k for k in range(1, steps))
+                    table[distance].append((index, [(stops, steps)]))
+            continue
+        by_distance: Dict[int, List[Path]] = {}
+        by_distance.setdefault(die1, []).append(((), 1))
+        by_distance.setdefault(die2, []).append(((), 1))
+        by_distance.setdefault(die1 + die2, []).extend([((die1,), 2), ((die2,), 2)])
+        for distance, paths in by_distance.items():
+            table[distance].append((index, paths))
+    return table
+
+
+PATHS = _build_paths()
+
+
+def _open(position: Position, point: int) -> bool:
+    """Check that White may land on a point (Black has fewer than two)."""
+    return position[point] >= -1
+
+
+def _dice_allowed(position: Position) -> Tuple[List[int], List[int]]:
+    """Dice White may spend on the hitting checker, per roll.
+
+    Returns:
+        Two lists indexed by roll: dice available to a checker coming from
+        the bar, and dice available to a checker already on the board
+        (0 means it cannot hit with that roll)
+    """
+    on_bar = position[WHITE_BAR]
+    if on_bar == 0:
+        return [4] * len(DISTINCT_ROLLS), [4] * len(DISTINCT_ROLLS)
+    from_bar = []
+    from_board_point = []
+    for (die1, die2), _ in DISTINCT_ROLLS:
+        if die1 == die2:
+            if not _open(position, 24 - die1):
+                from_bar.append(0)
+                from_board_point.append(0)
+                continue
+            from_bar.append(max(4 - (on_bar - 1), 0))
+            from_board_point.append(max(4 - on_bar, 0))
+        elif on_bar == 1:
+            from_bar.append(2)
+            from_board_point.append(1)
+        else:
+            from_bar.append(1)
+            from_board_point.append(0)
+    return from_bar, from_board_point
+
+
+def _enters_with_other_die(position: Position, index: int, distance: int) -> bool:
+    """With one checker on the bar and a non-double, check that the die a
+    board checker does not use for the hit can bring the bar checker in."""
+    (die1, die2), _ = DISTINCT_ROLLS[index]
+    other = die2 if distance == die1 else die1
+    return _open(position, 24 - other)
+
+
+def _moves_elsewhere(position: Position, source: int, die: int) -> bool:
+    """Quick check that a checker other than the hitter can move a die
+    within the board (the hit only opens points, so it still can after)."""
+    for point in range(die, 24):
+        count = position[point] - (point == source)
+        if count > 0 and position[point - die] >= -1:
+            return True
+    return False
+
+
+def _rest_is_played(
+    position: Position, source: int, blot: int, stops: Tuple[int, ...], index: int
+) -> bool:
+    """Check that a hitting path is part of a play that uses every die.
+
+    Checkers left on the bar enter first with the dice the path does not
+    use, then the dice left over after the hit must all be played.
+    """
+    dice = list(expand_roll(DISTINCT_ROLLS[index][0]))
+    entering = position[WHITE_BAR] - (source == WHITE_BAR)
+    if len(stops) + 1 == len(dice) and not entering:
+        return True
+    points = [source] + [source - stop for stop in stops] + [blot]
+    for start, end in zip(points, points[1:]):
+        dice.remove(start - end)
+    if len(dice) == 1 and not entering and _moves_elsewhere(position, source, dice[0]):
+        return True
+    moves = []
+    for _ in range(entering):
+        die = next((die for die in dice if _open(position, 24 - die)), None)
+        if die is None:
+            return False
+        dice.remove(die)
+        moves.append((WHITE_BAR, 24 - die))
+    moves.extend(zip(points, points[1:]))
+    return can_play_all(apply_play(position, "W", tuple(moves)), "W", dice)
+
+
+def _legal_hit(
+    position: Position, blot: int, index: int, plays: Dict[int, List[Position]]
+) -> bool:
+    """Check against every legal play of a roll that one of them hits a blot."""
+    results = plays.get(index)
+    if results is None:
+        results = [result for _, result in legal_plays(position, "W", DISTINCT_ROLLS[index][0])]
+        plays[index] = results
+    return any(result[blot] >= 0 for result in results)
+
+
+def _hit_mask(
+    position: Position,
+    blot: int,
+    limits: Tuple[List[int], List[int]],
+    plays: Optional[Dict[int, List[Position]]] = None,
+) -> int:
+    """Bit mask of the rolls (by index) with which White hits a blot.
+
+    Args:
+        position: Position tuple, White attacking
+        blot: Point of the Black blot
+        limits: Dice allowed per roll, from _dice_allowed()
+        plays: Legal play results per roll index already generated for
+            this position (filled in as needed)
+    """
+    if plays is None:
+        plays = {}
+    from_bar, from_board_point = limits
+    one_on_bar = position[WHITE_BAR] == 1
+    mask = 0
+    sources = [WHITE_BAR] if position[WHITE_BAR] else []
+    sources += [point for point in range(blot + 1, 24) if position[point] > 0]
+    for source in sources:
+        on_board = source != WHITE_BAR
+        allowed = from_board_point if on_board else from_bar
+        distance = source - blot
+        for index, paths in PATHS[distance]:
+            if mask >> index & 1 or not allowed[index]:
+                continue
+            (die1, die2), _ = DISTINCT_ROLLS[index]
+            if on_board and one_on_bar and die1 != die2:
+                if not _enters_with_other_die(position, index, distance):
+                    continue
+            for stops, dice in paths:
+                if dice <= allowed[index] and all(
+                    _open(position, source - stop) for stop in stops
+                ):
+                    if _rest_is_played(
+                        position, source, blot, stops, index
+                    ) or _legal_hit(position, blot, index, plays):
+                        mask |= 1 << index
+                    break
+    return mask
+
+
+def _white_attacks(position: Position) -> Dict[int, int]:
+    """Masks of hitting rolls for every Black blot, White attacking."""
+    limits = _dice_allowed(position)
+    plays: Dict[int, List[Position]] = {}
+    return {
+        point: _hit_mask(position, point, limits, plays)
+        for point in range(24)
+        if position[point] == -1
+    }
+
+
+def _count(mask: int) -> int:
+    """Number of the 36 rolls in a mask of roll indexes."""
+    return sum(weight for index, (_, weight) in enumerate(DISTINCT_ROLLS) if mask >> index & 1)
+
+
+def _masks(position: Position, color: str) -> Dict[int, int]:
+    """Hitting roll masks for every blot of color, keyed by board point."""
+    if color == "B":
+        return _white_attacks(position)
+    return {23 - point: mask for point, mask in _white_attacks(flip(position)).items()}
+
+
+def blot_shots(position: Position, color: str) -> Dict[int, int]:
+    """Number of the 36 rolls that hit each blot of one side.
+
+    Args:
+        position: Position tuple
+        color: Owner of the blots ('W' or 'B'); the other side is rolling
+
+    Returns:
+        Mapping of board point to number of hitting rolls (0-36)
+    """
+    return {point: _count(mask) for point, mask in _masks(position, color).items()}
+
+
+def total_shots(position: Position, color: str) -> int:
+    """Number of the 36 rolls that hit at least one blot of one side."""
+    union = 0
+    for mask in _masks(position, color).values():
+        union |= mask
+    return _count(union)
+
+
+def board_blot_shots(board: Board, color: str) -> Dict[int, int]:
+    """Same as blot_shots() for a Board."""
+    return blot_shots(from_board(board), color)
@@ -0,0 +1,318 @@
+"""
+TD(lambda) self-play training across worker processes.
+
+Worker processes play games against themselves with the latest network
+weights, which the learner publishes through shared memory. The learner
+(the process that calls TDTrainer.run) receives the finished games on a
+queue, applies TD(lambda) updates and saves checkpoints to disk.
+
+Run from the project root::
+
+    python -m engine.training --games 10000 --workers 4 --checkpoint-dir checkpoints
+"""
+
+import argparse
+import multiprocessing
+import os
+import queue
+import random
+import time
+from multiprocessing import shared_memory
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from core.BackgammonGame import Game
+from core.dice_stream import DiceStream
+from engine.neural import DEFAULT_HIDDEN, NeuralEvaluator, NeuralNet, encode_array
+from engine.selfplay import HeadlessGame
+
+# Seconds a worker waits before checking the stop flag again
+_POLL_INTERVAL = 0.05
+
+
+class TrainingStats(NamedTuple):
+    """Throughput figures of a training run."""
+
+    games: int
+    positions: int
+    elapsed: float
+
+    @property
+    def games_per_hour(self) -> float:
+        """Finished games per hour."""
+        return self.games * 3600.0 / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def positions_per_second(self) -> float:
+        """Trained positions per second."""
+        return self.positions / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        """One-line report of the figures."""
+        return (
+            f"{self.games} games, {self.positions} positions in "
+            f"{self.elapsed:.1f}s ({self.games_per_hour:.0f} games/hour, "
+            f"{self.positions_per_second:.0f} positions/sec)"
+        )
+
+
+class SharedWeights:
+    """Flat weight vector plus a version number kept in shared memory.
+
+    Slot 0 holds the version, the remaining slots hold the weights.
+    """
+
+    def __init__(self, size: int, name: Optional[str] = None):
+        """Create a new block, or attach to an existing one by name.
+
+        Args:
+            size: Number of weights
+            name: Name of an existing block (None creates a new one)
+        """
+        nbytes = (size + 1) * np.dtype(np.float64).itemsize
+        self.owner = name is None
+        self.memory = shared_memory.SharedMemory(
+            name=name, create=self.owner, size=nbytes
+        )
+        self.array = np.ndarray((size + 1,), dtype=np.float64, buffer=self.memory.buf)
+        if self.owner:
+            self.array[:] = 0.0
+
+    @property
+    def name(self) -> str:
+        """Name used by other processes to attach."""
+        return self.memory.name
+
+    def publish(self, weights: np.ndarray, lock) -> int:
+        """Write new weights and bump the version.
+
+        Returns:
+            The new version number
+        """
+        with lock:
+            self.array[1:] = weights
+            self.array[0] += 1
+            return int(self.array[0])
+
+    def read(self, lock) -> Tuple[int, np.ndarray]:
+        """Copy out the current version and weights."""
+        with lock:
+            return int(self.array[0]), self.array[1:].astype(np.float32)
+
+    def version(self) -> int:
+        """Get the current version without copying the weights."""
+        return int(self.array[0])
+
+    def close(self) -> None:
+        """Detach from the block, and free it if this object created it."""
+        del self.array
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+
+def self_play_worker(
+    memory_name: str, hidden: int, lock, games_queue, stop_event, seed: int
+) -> None:
+    """Worker process: play games with the newest weights until stopped.
+
+    Each finished game is sent to the learner as an int8 array of the
+    positions met at the start of every turn, a bool array telling
+    whether White was on roll, and the winner. The dice come from a
+    DiceStream of the seed, so each worker has its own reproducible rolls.
+    """
+    random.seed(seed)
+    dice = DiceStream(seed)
+    net = NeuralNet(hidden=hidden)
+    shared = SharedWeights(net.size, name=memory_name)
+    evaluator = NeuralEvaluator(net)
+    version = -1
+    try:
+        while not stop_event.is_set():
+            if shared.version() != version:
+                version, weights = shared.read(lock)
+                net.set_weights(weights)
+            game = Game()
+            game.dice.set_source(dice)
+            result = HeadlessGame(game).play(evaluator.best_play)
+            if not result.winner:
+                continue
+            positions = np.asarray(result.positions[:-1], dtype=np.int8)
+            white_to_move = np.asarray([turn == "W" for turn in result.turns])
+            games_queue.put((positions, white_to_move, result.winner))
+    finally:
+        shared.close()
+
+
+class TDTrainer:
+    """Learner that applies TD(lambda) updates to self-play games."""
+
+    def __init__(
+        self,
+        net: Optional[NeuralNet] = None,
+        alpha: float = 0.1,
+        lam: float = 0.7,
+        checkpoint_dir: Optional[str] = None,
+    ):
+        """Create the learner.
+
+        Args:
+            net: Network to train (a new one if None)
+            alpha: Learning rate
+            lam: Trace decay (lambda)
+            checkpoint_dir: Folder for weight checkpoints (None disables them)
+        """
+        self.net = net if net is not None else NeuralNet(seed=0)
+        self.alpha = alpha
+        self.lam = lam
+        self.checkpoint_dir = checkpoint_dir
+        self.games = 0
+        self.positions = 0
+        self.log: Callable[[str], None] = print
+
+    def train_on_game(
+        self, positions: np.ndarray, white_to_move: np.ndarray, winner: str
+    ) -> None:
+        """Apply one offline TD(lambda) update for a finished game.
+
+        Args:
+            positions: Int array (T, 28) of positions, one per turn
+            white_to_move: Bool array (T,) with the side on roll
+            winner: 'W' or 'B'
+        """
+        features = encode_array(positions.astype(np.int16), white_to_move)
+        values, grads = self.net.gradients(features)
+        targets = np.append(values[1:], 1.0 if winner == "W" else 0.0)
+        deltas = targets - values
+
+        trace = np.zeros(self.net.size, dtype=np.float64)
+        update = np.zeros(self.net.size, dtype=np.float64)
+        for step in range(len(values)):
+            trace = self.lam * trace + grads[step]
+            update += deltas[step] * trace
+
+        self.net.set_weights(self.net.get_weights() + self.alpha * update)
+        self.games += 1
+        self.positions += len(values)
+
+    def checkpoint(self) -> Optional[str]:
+        """Save the weights to the checkpoint folder.
+
+        Returns:
+            Path of the saved file, or None if checkpoints are disabled
+        """
+        if self.checkpoint_dir is None:
+            return None
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        path = os.path.join(self.checkpoint_dir, f"weights_{self.games:08d}.npz")
+        self.net.save(path)
+        self.net.save(os.path.join(self.checkpoint_dir, "latest.npz"))
+        return path
+
+    def run(
+        self,
+        games: int,
+        workers: int = 2,
+        publish_every: int = 10,
+        checkpoint_every: int = 1000,
+        report_every: int = 100,
+    ) -> TrainingStats:
+        """Train on self-play games generated by worker processes.
+
+        Args:
+            games: Number of games to train on
+            workers: Number of self-play processes
+            publish_every: Games between weight publications
+            checkpoint_every: Games between checkpoints
+            report_every: Games between throughput reports
+
+        Returns:
+            TrainingStats for this run
+        """
+        lock = multiprocessing.Lock()
+        games_queue = multiprocessing.Queue()
+        stop_event = multiprocessing.Event()
+        shared = SharedWeights(self.net.size)
+        shared.publish(self.net.get_weights(), lock)
+
+        processes: List[multiprocessing.Process] = []
+        streams = DiceStream(int(time.time() * 1000)).spawn(workers)
+        for stream in streams:
+            process = multiprocessing.Process(
+                target=self_play_worker,
+                args=(shared.name, self.net.hidden, lock, games_queue, stop_event,
+                      stream.seed),
+                daemon=True,
+            )
+            process.start()
+            processes.append(process)
+
+        start = time.perf_counter()
+        start_games, start_positions = self.games, self.positions
+        try:
+            trained = 0
+            while trained < games:
+                try:
+                    positions, white_to_move, winner = games_queue.get(
+                        timeout=_POLL_INTERVAL
+                    )
+                except queue.Empty:
+                    continue
+                self.train_on_game(positions, white_to_move, winner)
+                trained += 1
+                if trained % publish_every == 0:
+                    shared.publish(self.net.get_weights(), lock)
+                if trained % checkpoint_every == 0:
+                    self.checkpoint()
+                if trained % report_every == 0:
+                    self.log(self._stats(start, start_games, start_positions).summary())
+        finally:
+            stop_event.set()
+            _drain(games_queue)
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+            shared.close()
+
+        self.checkpoint()
+        return self._stats(start, start_games, start_positions)
+
+    def _stats(self, start: float, games: int, positions: int) -> TrainingStats:
+        """Build the stats since the given starting counters."""
+        return TrainingStats(
+            self.games - games, self.positions - positions, time.perf_counter() - start
+        )
+
+
+def _drain(games_queue) -> None:
+    """Empty the queue so workers blocked on put() can exit."""
+    try:
+        while True:
+            games_queue.get_nowait()
+    except queue.Empty:
+        pass
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="TD(lambda) self-play training")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--hidden", type=int, default=DEFAULT_HIDDEN)
+    parser.add_argument("--alpha", type=float, default=0.1)
+    parser.add_argument("--lam", type=float, default=0.7)
+    parser.add_argument("--checkpoint-dir", default="checkpoints")
+    parser.add_argument("--checkpoint-every", type=int, default=1000)
+    parser.add_argument("--resume", help="weights file to start from")
+    args = parser.parse_args()
+
+    net = NeuralNet.load(args.resume) if args.resume else NeuralNet(hidden=args.hidden)
+    trainer = TDTrainer(net, args.alpha, args.lam, args.checkpoint_dir)
+    stats = trainer.run(args.games, args.workers, checkpoint_every=args.checkpoint_every)
+    print(stats.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Randomized invariant fuzzing of Board and Game (run with python -m fuzz)."""
@@ -0,0 +1,127 @@
+"""
+Fuzz Board and Game over many seeds, spread over processes.
+
+    python -m fuzz                           one minute on every core
+    python -m fuzz --seconds 600 --steps 50000
+    python -m fuzz --seed 1234 --seeds 1     replay a single seed
+
+Each seed is a run of --steps random operations on a new game. On the
+first failure the run is minimized and printed as a Python script.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, NamedTuple, Optional
+
+from fuzz.fuzzer import Failure, fuzz_seeds, minimize, reproducer
+
+
+class FuzzReport(NamedTuple):
+    """Outcome of a fuzzing session."""
+
+    seeds: int
+    operations: int
+    seconds: float
+    failure: Optional[Failure]
+
+
+def run(
+    first: int,
+    steps: int,
+    workers: int,
+    seconds: float,
+    seeds: Optional[int] = None,
+    chunk: int = 1,
+) -> FuzzReport:
+    """
+    Fuzz consecutive seeds until time runs out, they are done or one fails.
+
+    Args:
+        first: First seed
+        steps: Operations per seed
+        workers: Number of processes (0 runs everything in-process)
+        seconds: Time budget
+        seeds: Number of seeds (no limit if None)
+        chunk: Seeds per task sent to a process
+
+    Returns:
+        The report, with the minimized failure if any
+    """
+    start = time.perf_counter()
+    deadline = start + seconds
+    limit = first + seeds if seeds is not None else None
+    executor = ProcessPoolExecutor(max_workers=workers) if workers else None
+    next_seed = first
+    operations = 0
+    failure = None
+    try:
+        while failure is None and time.perf_counter() < deadline:
+            if limit is not None and next_seed >= limit:
+                break
+            jobs = []
+            for _ in range(max(1, workers)):
+                count = chunk if limit is None else min(chunk, limit - next_seed)
+                if count > 0:
+                    jobs.append((next_seed, count, steps))
+                    next_seed += count
+            if executor is None:
+                results = [fuzz_seeds(*job) for job in jobs]
+            else:
+                results = list(executor.map(fuzz_seeds, *zip(*jobs)))
+            for done, found in results:
+                operations += done
+                if found is not None and failure is None:
+                    failure = found
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    seeds_done = next_seed - first
+    if failure is not None:
+        failure = minimize(failure)
+    return FuzzReport(seeds_done, operations, time.perf_counter() - start, failure)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line entry point.
+
+    Args:
+        argv: Command line arguments (sys.argv if None)
+
+    Returns:
+        Exit status: 1 if an invariant broke, else 0
+    """
+    parser = argparse.ArgumentParser(description="Fuzz the Board and Game invariants")
+    parser.add_argument("--seed", type=int, default=0, help="First seed")
+    parser.add_argument("--seeds", type=int, help="Number of seeds (until --seconds if unset)")
+    parser.add_argument("--steps", type=int, default=10000, help="Operations per seed")
+    parser.add_argument("--seconds", type=float, default=60.0, help="Time budget")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--output", help="Write the reproducer of a failure here")
+    args = parser.parse_args(argv)
+
+    report = run(args.seed, args.steps, args.workers, args.seconds, args.seeds)
+    rate = report.operations / report.seconds * 60 if report.seconds else 0.0
+    print(
+        f"{report.seeds} seeds, {report.operations:,} operations "
+        f"in {report.seconds:.1f}s ({rate:,.0f} per minute)"
+    )
+    if report.failure is None:
+        return 0
+    script = reproducer(report.failure)
+    print(
+        f"Seed {report.failure.seed} failed, minimized to "
+        f"{len(report.failure.operations)} operations:"
+    )
+    print(script)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(script)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
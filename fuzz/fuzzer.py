@@ -0,0 +1,475 @@
+"""
+Differential fuzzer for Board and Game.
+
+A seeded random.Random draws operations, legal or not: board moves with
+any points and colors, bar entries, bear-offs, game moves for the side to
+play, rolls and player switches. Each operation is applied both to a Game
+and to a small reference model over the compact engine position, and
+after every step the fuzzer checks that:
+
+- each side has 15 checkers between the points, the bar and borne off;
+- no point mixes colors (Board.is_valid) and points only hold "W"/"B";
+- bar and borne-off counters are in range and match the model;
+- every derived view agrees: the position counters (from_board and
+  Game.get_board), the position key round trip and has_contact;
+- results of the operations and the dice match the model.
+
+A run depends on its seed alone, so seeds can be spread over processes
+and any failure replayed. Failing runs are cut down with delta debugging
+to a short list of operations, printed as Python statements.
+"""
+
+import random
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from core.BackgammonGame import Game
+from engine.position import (
+    BLACK_BAR,
+    BLACK_OFF,
+    CHECKERS_PER_SIDE,
+    WHITE_BAR,
+    WHITE_OFF,
+    Position,
+    from_board,
+    has_contact,
+    initial_position,
+)
+from engine.position_id import position_from_key, position_key
+
+# (kind, arguments...)
+Operation = Tuple
+
+# Kinds of operation and how often they are drawn
+OPERATIONS = (
+    ("move", 30),
+    ("enter", 8),
+    ("bear_off", 8),
+    ("play", 20),
+    ("play_bar", 6),
+    ("game_bear_off", 6),
+    ("roll", 10),
+    ("switch", 10),
+    ("reset", 1),
+)
+_KINDS = [kind for kind, _ in OPERATIONS]
+_WEIGHTS = [weight for _, weight in OPERATIONS]
+_CUMULATIVE = [sum(_WEIGHTS[: index + 1]) for index in range(len(_WEIGHTS))]
+
+# Points drawn include a couple outside the board on each side
+_LOWEST_POINT = -2
+_HIGHEST_POINT = 25
+
+_BAR = {"W": WHITE_BAR, "B": BLACK_BAR}
+_OFF = {"W": WHITE_OFF, "B": BLACK_OFF}
+_SIGN = {"W": 1, "B": -1}
+# Home boards and entry points of the Board class
+_HOME = {"W": range(18, 24), "B": range(0, 6)}
+_OUTSIDE = {"W": range(0, 18), "B": range(6, 24)}
+_COLOR = {"white": "W", "black": "B"}
+
+
+class Failure(NamedTuple):
+    """A broken invariant and the operations that lead to it."""
+
+    seed: int
+    invariant: str
+    detail: str
+    operations: Tuple[Operation, ...]
+
+    @property
+    def step(self) -> int:
+        """Index of the operation after which the invariant broke."""
+        return len(self.operations) - 1
+
+
+class InvariantError(Exception):
+    """Raised when the game and the model disagree."""
+
+    def __init__(self, invariant: str, detail: str) -> None:
+        super().__init__(f"{invariant}: {detail}")
+        self.invariant = invariant
+        self.detail = detail
+
+
+class Model:
+    """Reference implementation of the Board and Game rules."""
+
+    def __init__(self) -> None:
+        """Starts at the initial position with White to play."""
+        self.position = list(initial_position())
+        self.color = "W"
+        self.dice = (1, 1)
+
+    def owns(self, point: int, color: str) -> bool:
+        """Check if a color has checkers on a point."""
+        return self.position[point] * _SIGN[color] > 0
+
+    def _blocked(self, point: int, color: str) -> bool:
+        return self.position[point] * _SIGN[color] <= -2
+
+    def _land(self, point: int, color: str) -> None:
+        """Put a checker on a point, hitting a lone opponent."""
+        if self.position[point] == -_SIGN[color]:
+            self.position[point] = 0
+            self.position[_BAR["B" if color == "W" else "W"]] += 1
+        self.position[point] += _SIGN[color]
+
+    def move(self, src: int, dst: int, color: str) -> bool:
+        """Board.move_checker()."""
+        if not (0 <= src < 24 and 0 <= dst < 24):
+            return False
+        if self.position[_BAR[color]] or not self.owns(src, color):
+            return False
+        if self._blocked(dst, color):
+            return False
+        self.position[src] -= _SIGN[color]
+        self._land(dst, color)
+        return True
+
+    def enter(self, dst: int, color: str) -> bool:
+        """Board.move_checker_from_bar()."""
+        if not self.position[_BAR[color]] or dst not in _HOME[color]:
+            return False
+        if self._blocked(dst, color):
+            return False
+        self.position[_BAR[color]] -= 1
+        self._land(dst, color)
+        return True
+
+    def bear_off(self, color: str, point: int) -> bool:
+        """Board.bear_off()."""
+        if self.position[_BAR[color]]:
+            return False
+        if any(self.owns(index, color) for index in _OUTSIDE[color]):
+            return False
+        if not 0 <= point < 24 or not self.owns(point, color):
+            return False
+        self.position[point] -= _SIGN[color]
+        self.position[_OFF[color]] += 1
+        return True
+
+    def apply(self, operation: Operation) -> object:
+        """
+        Expected result of an operation, updating the model.
+
+        Args:
+            operation: Operation as drawn by random_operation()
+
+        Returns:
+            What the Game or Board call should return
+        """
+        kind = operation[0]
+        if kind == "move":
+            return self.move(*operation[1:])
+        if kind == "enter":
+            return self.enter(*operation[1:])
+        if kind == "bear_off":
+            return self.bear_off(*operation[1:])
+        if kind == "play":
+            return self.move(operation[1], operation[2], self.color)
+        if kind == "play_bar":
+            die = operation[1]
+            return self.enter(24 - die if self.color == "W" else die - 1, self.color)
+        if kind == "game_bear_off":
+            return self.bear_off(self.color, operation[1])
+        if kind == "roll":
+            self.dice = operation[1:]
+            return [operation[1]] * 4 if operation[1] == operation[2] else list(self.dice)
+        if kind == "switch":
+            self.color = "B" if self.color == "W" else "W"
+            return None
+        self.position = list(initial_position())
+        return None
+
+
+def execute(game: Game, operation: Operation) -> object:
+    """
+    Apply an operation to a game.
+
+    Args:
+        game: Game to change
+        operation: Operation as drawn by random_operation()
+
+    Returns:
+        What the Game or Board call returned
+    """
+    kind = operation[0]
+    if kind == "move":
+        return game.board.move_checker(*operation[1:])
+    if kind == "enter":
+        return game.board.move_checker_from_bar(*operation[1:])
+    if kind == "bear_off":
+        return game.board.bear_off(*operation[1:])
+    if kind == "play":
+        return game.make_move(*operation[1:])
+    if kind == "play_bar":
+        return game.make_bar_move(game.get_entry_point_for_dice(operation[1]))
+    if kind == "game_bear_off":
+        return game.bear_off(operation[1])
+    if kind == "roll":
+        game.dice.set_mock_rolls([tuple(operation[1:])])
+        return game.roll_dice()
+    if kind == "switch":
+        return game.switch_player()
+    return game.board.reset()
+
+
+def statement(operation: Operation) -> str:
+    """
+    Python source of an operation on a Game named game.
+
+    Args:
+        operation: Operation as drawn by random_operation()
+
+    Returns:
+        One line of code
+    """
+    kind, args = operation[0], operation[1:]
+    if kind == "move":
+        return f"game.board.move_checker({args[0]}, {args[1]}, {args[2]!r})"
+    if kind == "enter":
+        return f"game.board.move_checker_from_bar({args[0]}, {args[1]!r})"
+    if kind == "bear_off":
+        return f"game.board.bear_off({args[0]!r}, {args[1]})"
+    if kind == "play":
+        return f"game.make_move({args[0]}, {args[1]})"
+    if kind == "play_bar":
+        return f"game.make_bar_move(game.get_entry_point_for_dice({args[0]}))"
+    if kind == "game_bear_off":
+        return f"game.bear_off({args[0]})"
+    if kind == "roll":
+        return f"game.dice.set_mock_rolls([({args[0]}, {args[1]})]); game.roll_dice()"
+    if kind == "switch":
+        return "game.switch_player()"
+    return "game.board.reset()"
+
+
+def reproducer(failure: Failure) -> str:
+    """
+    Python script that replays a failure.
+
+    Args:
+        failure: Failure to replay
+
+    Returns:
+        The script, ending at the operation that breaks the invariant
+    """
+    lines = [
+        f"# seed {failure.seed}: {failure.invariant}: {failure.detail}",
+        "from core.BackgammonGame import Game",
+        "",
+        "game = Game()",
+    ]
+    lines.extend(statement(operation) for operation in failure.operations)
+    return "\n".join(lines) + "\n"
+
+
+def random_operation(rng: random.Random, model: Model) -> Operation:
+    """
+    Draw an operation, mostly on checkers that exist.
+
+    Args:
+        rng: Source of randomness
+        model: Current state, to aim moves at occupied points
+
+    Returns:
+        The operation
+    """
+    kind = rng.choices(_KINDS, cum_weights=_CUMULATIVE)[0]
+    color = model.color if kind in ("play", "game_bear_off") else rng.choice("WB")
+    if kind in ("move", "play", "bear_off", "game_bear_off"):
+        owned = [point for point in range(24) if model.owns(point, color)]
+        if owned and rng.random() < 0.8:
+            src = rng.choice(owned)
+        else:
+            src = rng.randint(_LOWEST_POINT, _HIGHEST_POINT)
+        if kind == "bear_off":
+            return (kind, color, src)
+        if kind == "game_bear_off":
+            return (kind, src)
+        if rng.random() < 0.5:
+            dst = rng.choice(_HOME[color])
+        else:
+            dst = rng.randint(_LOWEST_POINT, _HIGHEST_POINT)
+        return ("move", src, dst, color) if kind == "move" else (kind, src, dst)
+    if kind == "enter":
+        if rng.random() < 0.8:
+            return (kind, rng.choice(_HOME[color]), color)
+        return (kind, rng.randint(_LOWEST_POINT, _HIGHEST_POINT), color)
+    if kind == "play_bar":
+        return (kind, rng.randint(1, 6))
+    if kind == "roll":
+        return (kind, rng.randint(1, 6), rng.randint(1, 6))
+    return (kind,)
+
+
+def check_invariants(
+    game: Game, model: Model, previous: Optional[Position] = None
+) -> Position:
+    """
+    Check a game against the model.
+
+    The derived views (position key, has_contact) only depend on the
+    position, so they are skipped when it has not changed.
+
+    Args:
+        game: Game after an operation
+        model: Model after the same operation
+        previous: Position returned by the previous check, if any
+
+    Returns:
+        The position of the game
+
+    Raises:
+        InvariantError: On the first invariant that does not hold
+    """
+    board = game.board
+    if not board.is_valid():
+        raise InvariantError("mixed point", "Board.is_valid() is False")
+    for index, point in enumerate(board.points):
+        if point and point[0] not in ("W", "B"):
+            raise InvariantError("checkers", f"point {index} holds {point!r}")
+
+    position = from_board(board)
+    if position != tuple(model.position):
+        raise InvariantError("counters", f"board {position} != model {model.position}")
+    if position == previous:
+        return position
+    for color, sign in _SIGN.items():
+        bar, off = position[_BAR[color]], position[_OFF[color]]
+        if not 0 <= bar <= CHECKERS_PER_SIDE or not 0 <= off <= CHECKERS_PER_SIDE:
+            raise InvariantError("bar/borne off", f"{color} bar {bar}, off {off}")
+        total = sum(max(count * sign, 0) for count in position[:24]) + bar + off
+        if total != CHECKERS_PER_SIDE:
+            raise InvariantError("checker count", f"{color} has {total} checkers")
+    if game.get_board() != list(position[:24]):
+        raise InvariantError("counters", f"get_board() {game.get_board()}")
+    if position_from_key(position_key(position, model.color), model.color) != position:
+        raise InvariantError("position key", "round trip changed the position")
+    if board.has_contact() != has_contact(position):
+        raise InvariantError("has_contact", f"board says {board.has_contact()}")
+    return position
+
+
+def _step(
+    game: Game, model: Model, operation: Operation, previous: Optional[Position]
+) -> Position:
+    """Apply an operation to both sides and compare them."""
+    expected = model.apply(operation)
+    result = execute(game, operation)
+    if result != expected:
+        raise InvariantError("result", f"{statement(operation)} gave {result!r}")
+    if _COLOR.get(game.current_player) != model.color:
+        raise InvariantError("turn", f"current_player {game.current_player!r}")
+    if game.dice.get_values() != tuple(model.dice):
+        raise InvariantError("dice", f"{game.dice.get_values()} != {model.dice}")
+    return check_invariants(game, model, previous)
+
+
+def _failure(seed: int, operations: Sequence[Operation], error: Exception) -> Failure:
+    """Failure for an error raised by the last operation."""
+    if isinstance(error, InvariantError):
+        return Failure(seed, error.invariant, error.detail, tuple(operations))
+    return Failure(seed, "exception", f"{type(error).__name__}: {error}", tuple(operations))
+
+
+def replay(operations: Sequence[Operation], seed: int = -1) -> Optional[Failure]:
+    """
+    Apply fixed operations to a new game.
+
+    Args:
+        operations: Operations in order
+        seed: Seed to report in the failure
+
+    Returns:
+        The first failure, cut after its operation, or None
+    """
+    game, model = Game(), Model()
+    position = None
+    for index, operation in enumerate(operations):
+        try:
+            position = _step(game, model, operation, position)
+        except Exception as error:  # pylint: disable=broad-except
+            return _failure(seed, operations[: index + 1], error)
+    return None
+
+
+def fuzz_seed(seed: int, steps: int) -> Optional[Failure]:
+    """
+    Run random operations on a new game.
+
+    Args:
+        seed: Seed of the run
+        steps: Number of operations
+
+    Returns:
+        The first failure, or None
+    """
+    rng = random.Random(seed)
+    game, model = Game(), Model()
+    operations: List[Operation] = []
+    position = None
+    for _ in range(steps):
+        operation = random_operation(rng, model)
+        operations.append(operation)
+        try:
+            position = _step(game, model, operation, position)
+        except Exception as error:  # pylint: disable=broad-except
+            return _failure(seed, operations, error)
+    return None
+
+
+def fuzz_seeds(first: int, count: int, steps: int) -> Tuple[int, Optional[Failure]]:
+    """
+    Run consecutive seeds until one fails.
+
+    Args:
+        first: First seed
+        count: Number of seeds
+        steps: Operations per seed
+
+    Returns:
+        Operations run and the first failure (or None)
+    """
+    done = 0
+    for seed in range(first, first + count):
+        failure = fuzz_seed(seed, steps)
+        if failure is not None:
+            return done + len(failure.operations), failure
+        done += steps
+    return done, None
+
+
+def minimize(failure: Failure, max_replays: int = 20000) -> Failure:
+    """
+    Shrink a failure to fewer operations that break the same invariant.
+
+    Chunks of operations are dropped, from halves down to single
+    operations, as long as the invariant still breaks.
+
+    Args:
+        failure: Failure to shrink
+        max_replays: Bound on the number of replays
+
+    Returns:
+        The smallest failure found
+    """
+    best = failure
+    chunk = max(1, len(best.operations) // 2)
+    replays = 0
+    while replays < max_replays:
+        shrunk = False
+        start = 0
+        while start < len(best.operations) and replays < max_replays:
+            operations = best.operations[:start] + best.operations[start + chunk :]
+            replays += 1
+            result = replay(operations, failure.seed) if operations else None
+            if result is not None and result.invariant == failure.invariant:
+                best = result
+                shrunk = True
+            else:
+                start += chunk
+        if chunk == 1 and not shrunk:
+            break
+        chunk = max(1, chunk // 2)
+    return best
@@ -1,12 +1,211 @@
+"""
+Stitch the coverage, pylint and performance reports into REPORTS.md.
+
+The micro-benchmarks (python -m benchmarks) are run in-process and each
+run is appended to benchmark_history.jsonl. Results are compared against
+benchmark_baseline.json, which the first run creates (or
+--update-baseline replaces). A benchmark is flagged when it moves by
+more than the noise threshold, widened by the spread of both runs.
+"""
+
+import argparse
+import json
 import os
+import platform
+import sys
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+HISTORY_FILE = "benchmark_history.jsonl"
+BASELINE_FILE = "benchmark_baseline.json"
+NOISE_THRESHOLD = 10.0
+
+REGRESSION = "REGRESSION"
+IMPROVED = "improved"
+UNCHANGED = "ok"
+NEW = "new"
+
+
+class Comparison(NamedTuple):
+    """A benchmark against its baseline."""
+
+    name: str
+    baseline: Optional[float]
+    current: float
+    delta_percent: Optional[float]
+    threshold: float
+    status: str
+
+
 def read_file(filepath):
     if not os.path.exists(filepath):
         return f"Error: Report file not found at {filepath}"
     with open(filepath, "r") as f:
         return f.read()
-coverage_report = read_file("coverage_report.txt")
-pylint_report = read_file("pylint_report.txt")
-reports_content = f"""# Automated Reports
+
+
+def run_benchmarks(repeat: int = 5, min_time: float = 0.2) -> Dict[str, Dict[str, float]]:
+    """
+    Run every benchmark suite.
+
+    Args:
+        repeat: Timed rounds per benchmark
+        min_time: Seconds per round
+
+    Returns:
+        Result fields by benchmark name (see BenchResult.as_dict())
+    """
+    # Imported here so the other reports do not need pygame
+    from benchmarks.__main__ import SUITES, select  # pylint: disable=import-outside-toplevel
+    from benchmarks.harness import run_all  # pylint: disable=import-outside-toplevel
+
+    results = run_all(select(list(SUITES)), repeat, min_time)
+    return {result.name: result.as_dict() for result in results}
+
+
+def append_history(path: str, results: Dict[str, Dict[str, float]]) -> dict:
+    """
+    Append a run to the history file, one JSON document per line.
+
+    Args:
+        path: History file
+        results: Results of the run
+
+    Returns:
+        The document written
+    """
+    run = {
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(path, "a", encoding="utf-8") as file:
+        file.write(json.dumps(run) + "\n")
+    return run
+
+
+def load_baseline(path: str) -> Optional[dict]:
+    """
+    Read the baseline run.
+
+    Args:
+        path: Baseline file
+
+    Returns:
+        The run, or None if there is no baseline yet
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_baseline(path: str, run: dict) -> None:
+    """
+    Make a run the baseline.
+
+    Args:
+        path: Baseline file
+        run: Run to store
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(run, file, indent=2)
+
+
+def compare(
+    current: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    noise_threshold: float = NOISE_THRESHOLD,
+) -> List[Comparison]:
+    """
+    Compare a run against the baseline.
+
+    Args:
+        current: Results of the run
+        baseline: Results of the baseline
+        noise_threshold: Smallest change in percent that is not noise
+
+    Returns:
+        One comparison per benchmark of the run, in its order
+    """
+    rows = []
+    for name, result in current.items():
+        rate = result["ops_per_sec"]
+        base = baseline.get(name)
+        if base is None:
+            rows.append(Comparison(name, None, rate, None, noise_threshold, NEW))
+            continue
+        delta = (rate - base["ops_per_sec"]) / base["ops_per_sec"] * 100
+        threshold = max(
+            noise_threshold, result["stdev_percent"] + base["stdev_percent"]
+        )
+        if delta < -threshold:
+            status = REGRESSION
+        elif delta > threshold:
+            status = IMPROVED
+        else:
+            status = UNCHANGED
+        rows.append(
+            Comparison(name, base["ops_per_sec"], rate, delta, threshold, status)
+        )
+    return rows
+
+
+def performance_report(rows: List[Comparison]) -> str:
+    """
+    Markdown table of a comparison.
+
+    Args:
+        rows: Comparisons from compare()
+
+    Returns:
+        The table, preceded by the number of regressions
+    """
+    regressions = [row.name for row in rows if row.status == REGRESSION]
+    if regressions:
+        summary = f"**{len(regressions)} regression(s):** {', '.join(regressions)}"
+    else:
+        summary = "No regressions."
+    lines = [
+        summary,
+        "",
+        "| Benchmark | Baseline ops/s | Current ops/s | Delta | Threshold | Status |",
+        "|---|---:|---:|---:|---:|---|",
+    ]
+    for row in rows:
+        baseline = "-" if row.baseline is None else f"{row.baseline:,.0f}"
+        delta = "-" if row.delta_percent is None else f"{row.delta_percent:+.1f}%"
+        status = f"**{row.status}**" if row.status == REGRESSION else row.status
+        lines.append(
+            f"| {row.name} | {baseline} | {row.current:,.0f} | {delta} "
+            f"| ±{row.threshold:.1f}% | {status} |"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Write REPORTS.md.
+
+    Args:
+        argv: Command line arguments (none if None)
+
+    Returns:
+        Exit status: 1 with --fail-on-regression and a regression, else 0
+    """
+    parser = argparse.ArgumentParser(description="Generate REPORTS.md")
+    parser.add_argument("--skip-benchmarks", action="store_true")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=NOISE_THRESHOLD)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--history", default=HISTORY_FILE)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    args = parser.parse_args(argv or [])
+
+    coverage_report = read_file("coverage_report.txt")
+    pylint_report = read_file("pylint_report.txt")
+    reports_content = f"""# Automated Reports
 ## Coverage Report
 ```text
 {coverage_report}
@@ -16,5 +215,24 @@ reports_content = f"""# Automated Reports
 {pylint_report}
 ```
 """
-with open("REPORTS.md", "w") as f:
-    f.write(reports_content)
+
+    regressions = 0
+    if not args.skip_benchmarks:
+        run = append_history(args.history, run_benchmarks())
+        baseline = None if args.update_baseline else load_baseline(args.baseline)
+        if baseline is None:
+            save_baseline(args.baseline, run)
+            baseline = run
+        rows = compare(run["results"], baseline["results"], args.threshold)
+        regressions = sum(row.status == REGRESSION for row in rows)
+        reports_content += f"""## Performance Report
+{performance_report(rows)}
+"""
+
+    with open("REPORTS.md", "w") as f:
+        f.write(reports_content)
+    return 1 if args.fail_on_regression and regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
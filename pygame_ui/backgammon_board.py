@@ -57,6 +57,16 @@ class BackgammonBoard:
         """
         return self.__board__
 
+    @property
+    def dice(self) -> Dice:
+        """
+        Get the dice.
+
+        Returns:
+            Dice object used for rolls
+        """
+        return self.__dice__
+
     @property
     def current_player(self) -> str:
         """
@@ -180,3 +190,19 @@ class BackgammonBoard:
         """
         self.__current_player__ = "B" if self.__current_player__ == "W" else "W"
         self.__dice_values__ = []
+
+    def set_turn(self, player: str, dice_values: List[int]) -> None:
+        """
+        Set the player on roll and the dice left to play.
+
+        Used to restore a state from the game history.
+
+        Args:
+            player: 'W' for White or 'B' for Black
+            dice_values: Dice values still available
+
+        Returns:
+            None
+        """
+        self.__current_player__ = player
+        self.__dice_values__ = dice_values
@@ -156,6 +156,53 @@ class CheckerRenderer:
                 y_pos = self._inner_top + 100 + (row * Config.CHECKER_SPACING)
                 self._draw_single_checker(surface, panel_center_x, y_pos, "B")
 
+    def checker_center(self, point_index: int, stack_index: int) -> Tuple[int, int]:
+        """
+        Screen position of a checker on a point.
+
+        Args:
+            point_index: The index of the point (0-23).
+            stack_index: Position in the stack (0 is nearest the edge).
+
+        Returns:
+            The (x, y) center used when drawing that checker.
+        """
+        x_pos = self._get_point_x_center(point_index)
+        if point_index >= 12:
+            y_pos = self._inner_top + 20 + (stack_index * Config.CHECKER_SPACING)
+        else:
+            y_pos = self._inner_bottom - 20 - (stack_index * Config.CHECKER_SPACING)
+        return int(x_pos), y_pos
+
+    def bar_center(self, color: str) -> Tuple[int, int]:
+        """
+        Screen position of the first checker on the bar for a color.
+
+        Args:
+            color: The color of the checker ("W" or "B").
+
+        Returns:
+            The (x, y) center of that checker.
+        """
+        bar_center_x = Config.BAR_X + Config.BAR_WIDTH // 2
+        if color == "W":
+            return bar_center_x, self._inner_top + 50
+        return bar_center_x, self._inner_bottom - 50
+
+    def draw_checker(
+        self, surface: pygame.Surface, x: float, y: float, color: str
+    ) -> None:
+        """
+        Draws a single checker anywhere on the screen (e.g. while moving).
+
+        Args:
+            surface: The pygame.Surface to draw on.
+            x: The center x-coordinate.
+            y: The center y-coordinate.
+            color: The color of the checker ("W" or "B").
+        """
+        self._draw_single_checker(surface, x, y, color)
+
     def _draw_single_checker(
         self, surface: pygame.Surface, x: float, y: float, color: str
     ) -> None:
@@ -0,0 +1,135 @@
+"""
+Computer opponent that thinks on a worker thread.
+
+The render loop hands requests to the worker through one queue and polls
+the chosen plays from another, so the window keeps drawing at full frame
+rate while the engine searches.
+"""
+
+import queue
+import threading
+from typing import Callable, Optional, Sequence, Tuple
+
+from core.board import Board
+from engine.bot import Bot
+from engine.position import Play, Position, from_board
+
+Policy = Callable[[Position, str, Sequence[int]], Play]
+
+
+class ComputerPlayer:
+    """
+    Plays one color with a Bot running on a daemon thread.
+
+    Results of requests that were cancelled (e.g. after a reset) are
+    dropped when polled, so a slow answer never lands on a new game.
+    """
+
+    def __init__(
+        self, color: str = "B", bot_factory: Callable[[], Policy] = Bot
+    ) -> None:
+        """
+        Initialize the player and start its worker thread.
+
+        Args:
+            color: Color played by the computer ('W' or 'B')
+            bot_factory: Builds the policy on the worker thread, so loading
+                         the engine does not block the window either
+
+        Returns:
+            None
+        """
+        self.color = color
+        self._bot_factory = bot_factory
+        self._requests: "queue.Queue[Optional[Tuple[int, Position, Tuple[int, ...]]]]" = (
+            queue.Queue()
+        )
+        self._results: "queue.Queue[Tuple[int, Play]]" = queue.Queue()
+        self._request_id = 0
+        self._thinking = False
+        self._thread = threading.Thread(target=self._work, daemon=True)
+        self._thread.start()
+
+    @property
+    def thinking(self) -> bool:
+        """
+        Check whether a play has been requested and not yet polled.
+
+        Returns:
+            True while waiting for the worker
+        """
+        return self._thinking
+
+    def request_play(self, board: Board, roll: Sequence[int]) -> None:
+        """
+        Ask the worker for a play.
+
+        Args:
+            board: Current board (copied, the worker never touches it)
+            roll: The two dice values
+
+        Returns:
+            None
+        """
+        self._request_id += 1
+        self._thinking = True
+        self._requests.put((self._request_id, from_board(board), tuple(roll)))
+
+    def poll(self) -> Optional[Play]:
+        """
+        Get the answer to the last request without waiting.
+
+        Returns:
+            The chosen play, or None if it is not ready yet
+        """
+        while True:
+            try:
+                request_id, play = self._results.get_nowait()
+            except queue.Empty:
+                return None
+            if request_id == self._request_id and self._thinking:
+                self._thinking = False
+                return play
+
+    def cancel(self) -> None:
+        """
+        Forget the pending request; its answer will be ignored.
+
+        Returns:
+            None
+        """
+        self._request_id += 1
+        self._thinking = False
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """
+        Stop the worker thread.
+
+        Args:
+            timeout: Seconds to wait for the thread
+
+        Returns:
+            None
+        """
+        self.cancel()
+        self._requests.put(None)
+        self._thread.join(timeout)
+
+    def _work(self) -> None:
+        """Worker thread body: answer requests until stopped."""
+        bot: Optional[Policy] = None
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+            request_id, position, roll = request
+            if request_id != self._request_id:
+                continue  # Superseded before we got to it
+            try:
+                if bot is None:
+                    bot = self._bot_factory()
+                play = bot(position, self.color, roll)
+            except Exception as error:  # pylint: disable=broad-except
+                print(f"Computer player failed: {error}")
+                play = ()
+            self._results.put((request_id, play))
@@ -0,0 +1,99 @@
+"""
+Danger overlay: shows how many of the 36 rolls hit each blot.
+
+The counts come from engine.shots, which uses precomputed shot tables, so
+the overlay can be recomputed every frame without generating plays.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+from config import Config
+from core.board import Board
+from engine.shots import board_blot_shots
+
+# pylint: disable=no-member
+
+
+class DangerOverlay:
+    """Draws a badge with the number of hitting rolls next to each blot."""
+
+    def __init__(self, font: Optional[pygame.font.Font] = None) -> None:
+        """
+        Initializes the overlay.
+
+        Args:
+            font: Font for the badge numbers (a small default font if None)
+        """
+        self._inner_left = Config.BOARD_X + Config.BORDER_THICKNESS
+        self._inner_top = Config.BOARD_Y + Config.BORDER_THICKNESS
+        self._inner_bottom = (
+            Config.BOARD_Y + Config.BOARD_HEIGHT - Config.BORDER_THICKNESS
+        )
+        self._point_width = (Config.BAR_X - self._inner_left) // 6
+        self._radius = Config.CHECKER_RADIUS // 2
+        self._font = font if font is not None else pygame.font.Font(None, 22)
+        self.last_shots: Dict[int, int] = {}
+
+    def draw(self, surface: pygame.Surface, board: Board, color: str) -> Dict[int, int]:
+        """
+        Draws the shot count of every blot of one player.
+
+        Args:
+            surface: The pygame.Surface to draw on
+            board: Current board
+            color: Player whose blots are shown ('W' or 'B')
+
+        Returns:
+            Mapping of point index to number of hitting rolls
+        """
+        self.last_shots = board_blot_shots(board, color)
+        for point, shots in self.last_shots.items():
+            if shots:
+                self._draw_badge(surface, self.badge_center(point), shots)
+        return self.last_shots
+
+    def badge_center(self, point_index: int) -> Tuple[int, int]:
+        """
+        Screen position of the badge for a blot, just past the checker.
+
+        Args:
+            point_index: The index of the point (0-23)
+
+        Returns:
+            (x, y) center of the badge
+        """
+        # Same point layout as CheckerRenderer
+        if 0 <= point_index <= 5:
+            x = Config.BAR_X + Config.BAR_WIDTH + (5 - point_index) * self._point_width
+        elif 6 <= point_index <= 11:
+            x = self._inner_left + (11 - point_index) * self._point_width
+        elif 12 <= point_index <= 17:
+            x = self._inner_left + (point_index - 12) * self._point_width
+        else:
+            x = Config.BAR_X + Config.BAR_WIDTH + (point_index - 18) * self._point_width
+        x += self._point_width // 2
+
+        offset = 20 + Config.CHECKER_RADIUS + self._radius + 4
+        if point_index >= 12:
+            y = self._inner_top + offset
+        else:
+            y = self._inner_bottom - offset
+        return int(x), int(y)
+
+    def _draw_badge(
+        self, surface: pygame.Surface, center: Tuple[int, int], shots: int
+    ) -> None:
+        """
+        Draws one badge.
+
+        Args:
+            surface: The pygame.Surface to draw on
+            center: Badge center
+            shots: Number to show
+        """
+        pygame.draw.circle(surface, Config.DANGER_BADGE, center, self._radius)
+        pygame.draw.circle(surface, Config.DANGER_TEXT, center, self._radius, 1)
+        text = self._font.render(str(shots), True, Config.DANGER_TEXT)
+        surface.blit(text, text.get_rect(center=center))
@@ -0,0 +1,121 @@
+"""
+Animation of a single checker sliding from one place to another.
+"""
+
+from typing import Tuple
+
+import pygame
+
+from engine.position import BLACK_BAR, WHITE_BAR, Position
+from pygame_ui.checker_renderer import CheckerRenderer
+
+
+def lift_checker(position: Position, color: str, source: int) -> Position:
+    """
+    Take the moving checker off its source while it is in the air.
+
+    Args:
+        position: Position before the move
+        color: Color of the moving checker ('W' or 'B')
+        source: Source of the move in engine indices (bar is 24 for White
+                and -1 for Black)
+
+    Returns:
+        Position without that checker
+    """
+    values = list(position)
+    if color == "W":
+        if source == 24:
+            values[WHITE_BAR] -= 1
+        else:
+            values[source] -= 1
+    elif source == -1:
+        values[BLACK_BAR] -= 1
+    else:
+        values[source] += 1
+    return tuple(values)
+
+
+class MoveAnimation:
+    """
+    Slides one checker in a straight line over a fixed number of frames.
+
+    The animation only draws; the caller applies the move to the board
+    when it has finished.
+    """
+
+    def __init__(
+        self,
+        color: str,
+        start: Tuple[int, int],
+        end: Tuple[int, int],
+        frames: int = 20,
+    ) -> None:
+        """
+        Initialize the animation.
+
+        Args:
+            color: Color of the moving checker ('W' or 'B')
+            start: Screen position where it starts
+            end: Screen position where it lands
+            frames: Number of frames the slide lasts
+
+        Returns:
+            None
+        """
+        self.color = color
+        self.start = start
+        self.end = end
+        self.frames = max(frames, 1)
+        self.frame = 0
+
+    @property
+    def finished(self) -> bool:
+        """
+        Check whether the checker has landed.
+
+        Returns:
+            True after the last frame
+        """
+        return self.frame >= self.frames
+
+    @property
+    def position(self) -> Tuple[float, float]:
+        """
+        Get the current screen position of the checker.
+
+        Returns:
+            (x, y) interpolated between start and end
+        """
+        t = min(self.frame / self.frames, 1.0)
+        # Ease out so the checker slows down before landing
+        t = 1.0 - (1.0 - t) ** 2
+        return (
+            self.start[0] + (self.end[0] - self.start[0]) * t,
+            self.start[1] + (self.end[1] - self.start[1]) * t,
+        )
+
+    def step(self) -> bool:
+        """
+        Advance one frame.
+
+        Returns:
+            True if the animation has finished
+        """
+        if not self.finished:
+            self.frame += 1
+        return self.finished
+
+    def draw(self, surface: pygame.Surface, renderer: CheckerRenderer) -> None:
+        """
+        Draw the moving checker.
+
+        Args:
+            surface: Pygame surface to draw on
+            renderer: Renderer used to draw the checker
+
+        Returns:
+            None
+        """
+        x, y = self.position
+        renderer.draw_checker(surface, x, y, self.color)
@@ -0,0 +1,256 @@
+"""
+Replay viewer: steps, plays and seeks through a recorded game.
+
+A recorded game is turned into a GameLog with one action per ply (the
+roll and the checkers moved), so the board of any ply is rebuilt from the
+keyframe before it plus a few events. Seeking across a session of
+hundreds of turns costs the same as a single step.
+
+Games are read from binary game records (engine.game_record) or .mat
+transcripts (engine.matfile).
+"""
+
+from typing import Iterable, Optional, Sequence, Tuple
+
+import pygame
+
+from config import Config
+from engine import game_record, matfile
+from engine.game_log import END_TURN, Event, GameLog, Snapshot, play_events
+from engine.movegen import apply_play
+from engine.position import Move, Position, opponent
+
+# pylint: disable=no-member
+
+DEFAULT_KEYFRAME_INTERVAL = 16
+DEFAULT_PLIES_PER_SECOND = 2.0
+
+# Turns as (color, roll, play)
+ReplayTurn = Tuple[str, Sequence[int], Sequence[Move]]
+
+
+def record_turns(
+    start: Position,
+    first: str,
+    turns: Iterable[ReplayTurn],
+    keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+) -> GameLog:
+    """
+    Build a game log with one action per ply.
+
+    The end of each turn is recorded with the roll of the next one, so
+    the state after a ply still shows the dice that were played.
+
+    Args:
+        start: Position before the first turn
+        first: Color of the first turn
+        turns: Plays in order
+        keyframe_interval: Events between two keyframes
+
+    Returns:
+        The game log, with its cursor after the last ply
+    """
+    log = GameLog(Snapshot(start, first), keyframe_interval)
+    position = start
+    previous: Optional[str] = None
+    for color, roll, play in turns:
+        events = [Event(END_TURN, previous)] if previous else []
+        events.extend(play_events(position, color, roll, play))
+        log.record(events)
+        position = apply_play(position, color, play)
+        previous = color
+    return log
+
+
+def load_replay(
+    path: str, game: int = 0, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL
+) -> GameLog:
+    """
+    Read one game of a record file or .mat transcript.
+
+    Args:
+        path: File to read (.mat for transcripts, game records otherwise)
+        game: Index of the game in the file
+        keyframe_interval: Events between two keyframes
+
+    Returns:
+        The game log of that game
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is invalid or has fewer games
+    """
+    if path.lower().endswith(".mat"):
+        for index, transcript in enumerate(matfile.read_file(path, strict=True)):
+            if index == game:
+                turns = [(turn.color, turn.roll, turn.play) for turn in transcript.turns]
+                first = turns[0][0] if turns else "W"
+                return record_turns(transcript.positions[0], first, turns, keyframe_interval)
+    else:
+        with open(path, "rb") as stream:
+            for index, recorded in enumerate(game_record.read_games(stream)):
+                if index == game:
+                    return record_turns(
+                        recorded.start,
+                        recorded.first,
+                        _alternate(recorded.first, recorded.turns),
+                        keyframe_interval,
+                    )
+    raise ValueError(f"No game {game} in {path}")
+
+
+def _alternate(first: str, turns: Iterable[game_record.Turn]) -> Iterable[ReplayTurn]:
+    """Add the color to turns that alternate from first."""
+    color = first
+    for roll, play in turns:
+        yield color, roll, play
+        color = opponent(color)
+
+
+class ReplayViewer:
+    """Play/pause, step and seek controls over a game log."""
+
+    def __init__(
+        self,
+        log: GameLog,
+        plies_per_second: float = DEFAULT_PLIES_PER_SECOND,
+        rect: Optional[pygame.Rect] = None,
+    ) -> None:
+        """
+        Initializes the viewer at the start of the game.
+
+        Args:
+            log: Game to view; it is only read
+            plies_per_second: Playback speed
+            rect: Area of the seek slider (in place of the buttons if None)
+        """
+        self.log = log
+        self.plies_per_second = plies_per_second
+        self.rect = rect if rect is not None else pygame.Rect(50, 730, 500, 26)
+        self.ply = 0
+        self.playing = False
+        self.dragging = False
+        self._next_tick: Optional[int] = None
+
+    @property
+    def plies(self) -> int:
+        """Number of plies of the game."""
+        return self.log.actions
+
+    @property
+    def state(self) -> Snapshot:
+        """State after the current ply."""
+        return self.log.state_after(self.ply)
+
+    def seek(self, ply: int) -> Snapshot:
+        """
+        Jump to a ply, clamped to the game.
+
+        Args:
+            ply: Number of plies played (0 for the start)
+
+        Returns:
+            State after that ply
+        """
+        self.ply = max(0, min(ply, self.plies))
+        return self.state
+
+    def step(self, plies: int) -> Snapshot:
+        """
+        Move forward (or back, if negative) and pause.
+
+        Args:
+            plies: Plies to move
+
+        Returns:
+            The new state
+        """
+        self.playing = False
+        return self.seek(self.ply + plies)
+
+    def toggle_play(self) -> None:
+        """Start or pause playback, from the start if at the end."""
+        if not self.playing and self.ply >= self.plies:
+            self.ply = 0
+        self.playing = not self.playing
+        self._next_tick = None
+
+    def update(self, now: int) -> bool:
+        """
+        Advance playback.
+
+        Args:
+            now: Current time in milliseconds (pygame.time.get_ticks())
+
+        Returns:
+            True if the ply changed
+        """
+        if not self.playing:
+            return False
+        interval = int(1000 / self.plies_per_second)
+        if self._next_tick is None:
+            self._next_tick = now + interval
+            return False
+        if now < self._next_tick:
+            return False
+        self._next_tick = now + interval
+        self.seek(self.ply + 1)
+        if self.ply >= self.plies:
+            self.playing = False
+        return True
+
+    def ply_at(self, x: int) -> int:
+        """
+        Ply under a horizontal position of the slider.
+
+        Args:
+            x: Screen x coordinate
+
+        Returns:
+            The nearest ply
+        """
+        fraction = (x - self.rect.left) / max(1, self.rect.width)
+        return round(max(0.0, min(1.0, fraction)) * self.plies)
+
+    def handle_event(self, event: pygame.event.Event) -> bool:
+        """
+        Seeks with clicks and drags on the slider.
+
+        Args:
+            event: A mouse event
+
+        Returns:
+            True if the ply changed
+        """
+        if event.type == pygame.MOUSEBUTTONDOWN and self.rect.collidepoint(event.pos):
+            self.dragging = True
+        elif event.type == pygame.MOUSEBUTTONUP:
+            self.dragging = False
+            return False
+        elif event.type != pygame.MOUSEMOTION or not self.dragging:
+            return False
+        before = self.ply
+        self.playing = False
+        self.seek(self.ply_at(event.pos[0]))
+        return self.ply != before
+
+    def draw(self, surface: pygame.Surface, font: pygame.font.Font) -> None:
+        """
+        Draws the slider with its handle, and the ply counter.
+
+        Args:
+            surface: The pygame.Surface to draw on
+            font: Font of the counter
+        """
+        track = self.rect.inflate(0, -self.rect.height + 6)
+        pygame.draw.rect(surface, Config.LIGHT_TAN, track, 0, 3)
+        fraction = self.ply / self.plies if self.plies else 0.0
+        handle = (int(self.rect.left + fraction * self.rect.width), self.rect.centery)
+        pygame.draw.circle(surface, Config.BRASS, handle, self.rect.height // 2)
+
+        status = "Playing" if self.playing else "Paused"
+        text = f"Replay {status}: ply {self.ply}/{self.plies}"
+        surface.blit(
+            font.render(text, True, (255, 255, 255)),
+            (self.rect.left, self.rect.bottom + 8),
+        )
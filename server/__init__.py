@@ -0,0 +1 @@
+"""Network game server hosting many Backgammon tables in one process."""
@@ -0,0 +1,443 @@
+"""
+Write-ahead journal that autosaves hosted games in the background.
+
+Every game has two files in the autosave directory:
+
+    <id>.snap   event count it covers (uint32) + a core.savegame record
+    <id>.log    event count before its first record (uint32) + events
+
+append() only puts the events on a queue, so the game loop never waits
+for the disk. A writer thread takes everything queued, waits up to
+commit_interval for more, then appends each game's events with one
+write and one fsync per game (group commit). Once a journal holds
+compact_interval events, the writer replays them onto the snapshot it
+keeps in memory, writes a new snapshot and starts an empty journal.
+
+After a crash, recover() reads each snapshot and replays the events of
+its journal that the snapshot does not cover already. A record torn by
+the crash is ignored.
+"""
+
+import os
+import queue
+import struct
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from core import savegame
+from core.BackgammonGame import Game
+from engine.game_log import (
+    BEAR_OFF,
+    END_TURN,
+    ENTER,
+    HIT,
+    MOVE,
+    ROLL,
+    Event,
+    Snapshot,
+    apply_event,
+)
+from engine.position import BLACK_BAR, BLACK_OFF, WHITE_BAR, WHITE_OFF
+
+DEFAULT_COMMIT_INTERVAL = 0.05
+DEFAULT_COMPACT_INTERVAL = 256
+
+SNAPSHOT_SUFFIX = ".snap"
+JOURNAL_SUFFIX = ".log"
+
+_KINDS = (ROLL, MOVE, HIT, ENTER, BEAR_OFF, END_TURN)
+_COLORS = ("W", "B")
+_COUNT = struct.Struct("<I")
+# kind, color, src, dst, number of dice
+_EVENT = struct.Struct("<BBbbB")
+
+
+def encode_events(events: Sequence[Event]) -> bytes:
+    """
+    Serialize events as journal records.
+
+    Args:
+        events: Events to write
+
+    Returns:
+        The records
+    """
+    parts = []
+    for event in events:
+        parts.append(
+            _EVENT.pack(
+                _KINDS.index(event.kind),
+                _COLORS.index(event.color),
+                event.src,
+                event.dst,
+                len(event.dice),
+            )
+        )
+        parts.append(bytes(event.dice))
+    return b"".join(parts)
+
+
+def decode_events(data: bytes, offset: int = 0) -> Iterator[Event]:
+    """
+    Read journal records, stopping at a torn record at the end.
+
+    Args:
+        data: Journal records
+        offset: Position of the first record
+
+    Yields:
+        Events in order
+
+    Raises:
+        ValueError: If a record holds an unknown kind or color
+    """
+    while offset + _EVENT.size <= len(data):
+        kind, color, src, dst, count = _EVENT.unpack_from(data, offset)
+        offset += _EVENT.size
+        if offset + count > len(data):
+            return
+        try:
+            yield Event(_KINDS[kind], _COLORS[color], src, dst, tuple(data[offset : offset + count]))
+        except IndexError as error:
+            raise ValueError(f"Corrupt journal record at {offset - _EVENT.size}") from error
+        offset += count
+
+
+def to_saved(state: Snapshot) -> savegame.SavedGame:
+    """
+    Convert a game log state to a saved game.
+
+    Args:
+        state: State to convert
+
+    Returns:
+        SavedGame with the same board, turn and dice
+    """
+    position = state.position
+    return savegame.SavedGame(
+        tuple(position[:24]),
+        (position[WHITE_BAR], position[BLACK_BAR]),
+        (position[WHITE_OFF], position[BLACK_OFF]),
+        state.turn,
+        tuple(state.roll[:2]) if state.roll else (1, 1),
+        has_rolled=state.rolled,
+        original_roll=tuple(state.roll),
+        remaining=tuple(state.dice),
+    )
+
+
+def from_saved(saved: savegame.SavedGame) -> Snapshot:
+    """
+    Convert a saved game to a game log state.
+
+    Args:
+        saved: Saved game to convert
+
+    Returns:
+        Snapshot with the same board, turn and dice
+    """
+    return Snapshot(
+        tuple(saved.points) + tuple(saved.bar) + tuple(saved.borne_off),
+        saved.color,
+        tuple(saved.remaining),
+        tuple(saved.original_roll),
+        saved.has_rolled,
+    )
+
+
+def restore_game(state: Snapshot, manager=None) -> Game:
+    """
+    Build a Game from a recovered state.
+
+    Args:
+        state: State from recover()
+        manager: Optional turn state to restore too (see Game.from_saved)
+
+    Returns:
+        The game
+    """
+    return Game.from_saved(to_saved(state), manager)
+
+
+class _Journal:
+    """What the writer knows about one game."""
+
+    def __init__(self, state: Snapshot, base: int):
+        self.state = state
+        # Events covered by the snapshot, and events written after them
+        self.base = base
+        self.logged = 0
+        # A write failed: the files lag behind state until a snapshot
+        self.broken = False
+
+
+class Autosave:
+    """Background writer of per-game journals and snapshots."""
+
+    def __init__(
+        self,
+        directory: str,
+        commit_interval: float = DEFAULT_COMMIT_INTERVAL,
+        compact_interval: int = DEFAULT_COMPACT_INTERVAL,
+    ):
+        """
+        Start the writer thread.
+
+        Args:
+            directory: Directory of the journals (created if missing)
+            commit_interval: Seconds the writer waits to group writes
+                into one fsync
+            compact_interval: Journal events that trigger a new snapshot
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.commit_interval = commit_interval
+        self.compact_interval = compact_interval
+        self.fsyncs = 0
+        self.compactions = 0
+        self.errors = 0
+        self._queue: "queue.SimpleQueue[tuple]" = queue.SimpleQueue()
+        self._journals: Dict[str, _Journal] = {}
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def start(self, game_id: str, state: Snapshot) -> None:
+        """
+        Begin the journal of a game, replacing any previous one.
+
+        Args:
+            game_id: Name of the game (used in file names)
+            state: State of the game now
+        """
+        self._queue.put(("start", game_id, state))
+
+    def append(self, game_id: str, events: Sequence[Event]) -> None:
+        """
+        Queue events of a started game. Never waits for the disk.
+
+        Args:
+            game_id: Name of the game
+            events: Events since the last append
+        """
+        if events:
+            self._queue.put(("events", game_id, tuple(events)))
+
+    def remove(self, game_id: str) -> None:
+        """
+        Delete the files of a game that is over or gone.
+
+        Args:
+            game_id: Name of the game
+        """
+        self._queue.put(("remove", game_id, None))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until everything queued so far is on disk.
+
+        Args:
+            timeout: Most seconds to wait (no limit if None)
+
+        Returns:
+            True if the writer caught up in time
+        """
+        done = threading.Event()
+        self._queue.put(("flush", None, done))
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """Write everything queued and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(("stop", None, None))
+            self._thread.join()
+
+    def __enter__(self) -> "Autosave":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _path(self, game_id: str, suffix: str) -> str:
+        """File of a game."""
+        return os.path.join(self.directory, game_id + suffix)
+
+    def _remove(self, game_id: str, suffix: str) -> None:
+        """Delete a file of a game, if it exists."""
+        try:
+            os.remove(self._path(game_id, suffix))
+        except FileNotFoundError:
+            pass
+
+    def _run(self) -> None:
+        """Writer loop: take a group of requests, write them, fsync once."""
+        stopping = False
+        while not stopping:
+            requests = [self._queue.get()]
+            deadline = time.monotonic() + self.commit_interval
+            while requests[-1][0] not in ("flush", "stop"):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    requests.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            stopping = self._write(requests)
+
+    def _write(self, requests: List[tuple]) -> bool:
+        """
+        Apply a group of requests to the files.
+
+        Returns:
+            True if a stop request was among them
+        """
+        pending: Dict[str, List[Event]] = {}
+        waiters = []
+        stopping = False
+        for action, game_id, payload in requests:
+            if action == "start":
+                pending.pop(game_id, None)
+                # The journal of an earlier game of that name must not be
+                # replayed onto the new snapshot
+                journal = self._journals[game_id] = _Journal(payload, 0)
+                journal.broken = True
+                try:
+                    self._remove(game_id, JOURNAL_SUFFIX)
+                    self._write_snapshot(game_id, _Journal(payload, 0))
+                except OSError:
+                    self.errors += 1
+            elif action == "events":
+                if game_id in self._journals:
+                    pending.setdefault(game_id, []).extend(payload)
+            elif action == "remove":
+                pending.pop(game_id, None)
+                self._journals.pop(game_id, None)
+                try:
+                    self._remove(game_id, SNAPSHOT_SUFFIX)
+                    self._remove(game_id, JOURNAL_SUFFIX)
+                except OSError:
+                    self.errors += 1
+            elif action == "flush":
+                waiters.append(payload)
+            else:
+                stopping = True
+
+        for game_id, events in pending.items():
+            self._append(game_id, events)
+
+        for waiter in waiters:
+            waiter.set()
+        return stopping
+
+    def _append(self, game_id: str, events: List[Event]) -> None:
+        """Append events to a journal, compacting it once it is long."""
+        journal = self._journals[game_id]
+        for event in events:
+            journal.state = apply_event(journal.state, event)
+        if not journal.broken:
+            try:
+                with open(self._path(game_id, JOURNAL_SUFFIX), "ab") as file:
+                    file.write(encode_events(events))
+                    file.flush()
+                    os.fsync(file.fileno())
+                self.fsyncs += 1
+            except OSError:
+                self.errors += 1
+                journal.broken = True
+        journal.logged += len(events)
+        if journal.broken or journal.logged >= self.compact_interval:
+            self._save(game_id, journal)
+
+    def _save(self, game_id: str, journal: _Journal) -> None:
+        """
+        Replace the files of a game by a snapshot of its state.
+
+        If the disk fails, the game stays broken and is saved again with
+        its next events, so its journal never has a gap.
+        """
+        try:
+            self._write_snapshot(game_id, _Journal(journal.state, journal.base + journal.logged))
+            self.compactions += 1
+        except OSError:
+            self.errors += 1
+
+    def _write_snapshot(self, game_id: str, journal: _Journal) -> None:
+        """
+        Write a snapshot, then start an empty journal after it.
+
+        The snapshot is renamed into place before the journal is replaced,
+        and records the events it covers, so a crash in between replays
+        nothing twice.
+        """
+        path = self._path(game_id, SNAPSHOT_SUFFIX)
+        temporary = path + ".tmp"
+        with open(temporary, "wb") as file:
+            file.write(_COUNT.pack(journal.base) + savegame.encode(to_saved(journal.state)))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+        with open(self._path(game_id, JOURNAL_SUFFIX), "wb") as file:
+            file.write(_COUNT.pack(journal.base))
+            file.flush()
+            os.fsync(file.fileno())
+        self.fsyncs += 3
+        self._journals[game_id] = journal
+
+
+def recover_game(directory: str, game_id: str) -> Snapshot:
+    """
+    Rebuild the state of one game from its snapshot and journal.
+
+    Args:
+        directory: Autosave directory
+        game_id: Name of the game
+
+    Returns:
+        State after the last complete journal record
+
+    Raises:
+        OSError: If the snapshot cannot be read
+        ValueError: If the snapshot or journal is corrupt
+    """
+    with open(os.path.join(directory, game_id + SNAPSHOT_SUFFIX), "rb") as file:
+        data = file.read()
+    if len(data) < _COUNT.size:
+        raise ValueError(f"Truncated snapshot of {game_id}")
+    (covered,) = _COUNT.unpack_from(data, 0)
+    state = from_saved(savegame.decode(data[_COUNT.size :]))
+    try:
+        with open(os.path.join(directory, game_id + JOURNAL_SUFFIX), "rb") as file:
+            data = file.read()
+    except FileNotFoundError:
+        return state
+    if len(data) < _COUNT.size:
+        return state
+    (base,) = _COUNT.unpack_from(data, 0)
+    for index, event in enumerate(decode_events(data, _COUNT.size), base):
+        if index >= covered:
+            state = apply_event(state, event)
+    return state
+
+
+def recover(directory: str) -> Dict[str, Snapshot]:
+    """
+    Rebuild every game of an autosave directory.
+
+    Args:
+        directory: Autosave directory
+
+    Returns:
+        State of each game by name (games that cannot be read are left out)
+    """
+    if not os.path.isdir(directory):
+        return {}
+    states = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(SNAPSHOT_SUFFIX):
+            game_id = name[: -len(SNAPSHOT_SUFFIX)]
+            try:
+                states[game_id] = recover_game(directory, game_id)
+            except (OSError, ValueError):
+                continue
+    return states
@@ -0,0 +1,392 @@
+"""
+Load generator for the game server.
+
+Opens many simulated client connections, each of which creates a table
+and plays random moves through the wire protocol (a move the server
+rejects is simply replaced by another candidate, and the turn is skipped
+when none is left). It reports command latency percentiles, sessions per
+second and the server memory used per open session, as JSON.
+
+By default a server is started in a subprocess on a free port, so its
+memory can be measured on its own; --port targets a running server
+instead (memory is then not measured).
+
+Run with: python -m server.loadtest --sessions 2000 --concurrency 500
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_SESSIONS = 1000
+DEFAULT_CONCURRENCY = 200
+DEFAULT_TURNS = 20
+DEFAULT_OUTPUT = "loadtest.json"
+
+
+def percentile(ordered: Sequence[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of sorted values.
+
+    Args:
+        ordered: Values sorted ascending
+        fraction: Percentile as a fraction (0.99 for p99)
+
+    Returns:
+        The value, or 0.0 for no values
+    """
+    if not ordered:
+        return 0.0
+    rank = max(math.ceil(fraction * len(ordered)), 1)
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def parse_state(line: str) -> Dict[str, str]:
+    """
+    Split a 'state' reply into its fields.
+
+    Args:
+        line: 'key=value' pairs separated by spaces
+
+    Returns:
+        Mapping of field name to raw value
+    """
+    return dict(field.split("=", 1) for field in line.split())
+
+
+def candidate_moves(state: Dict[str, str]) -> List[str]:
+    """
+    Moves worth trying for the side to move, in CLI syntax.
+
+    The list is built from the dice and the board only; the server has
+    the last word on legality.
+
+    Args:
+        state: Parsed 'state' reply
+
+    Returns:
+        'move <from> <to>' command lines
+    """
+    color = state["turn"]
+    dice = sorted({int(die) for die in state["dice"].split(",") if die})
+    points = [int(count) for count in state["points"].split(",")]
+    bar = dict(zip("WB", (int(count) for count in state["bar"].split(","))))
+    sign = 1 if color == "W" else -1
+    direction = -1 if color == "W" else 1
+
+    if bar[color]:
+        entries = [25 - die if color == "W" else die - 1 for die in dice]
+        return [f"move bar {point}" for point in entries if 0 <= point <= 23]
+
+    moves = []
+    for source, count in enumerate(points):
+        if count * sign <= 0:
+            continue
+        for die in dice:
+            target = source + direction * die
+            if 0 <= target <= 23:
+                if points[target] * sign >= -1:
+                    moves.append(f"move {source} {target}")
+            else:
+                moves.append(f"move {source} off")
+    return moves
+
+
+class LoadClient:
+    """One simulated player connection."""
+
+    def __init__(self, latencies: List[float]):
+        """
+        Args:
+            latencies: List that receives every command latency (seconds)
+        """
+        self.latencies = latencies
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.commands = 0
+        self.rejected = 0
+
+    async def connect(self, host: str, port: int) -> None:
+        """Open the connection and read the welcome reply."""
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        await self._read_reply()
+
+    async def _read_reply(self) -> Tuple[str, List[str]]:
+        """Read one framed reply."""
+        status = (await self.reader.readline()).decode("utf-8").strip()
+        if not status:
+            raise ConnectionError("server closed the connection")
+        lines = []
+        while True:
+            line = (await self.reader.readline()).decode("utf-8").rstrip("\n")
+            if line == ".":
+                return status, lines
+            lines.append(line[1:] if line.startswith("..") else line)
+
+    async def command(self, line: str) -> Tuple[bool, List[str]]:
+        """
+        Send a command and time its reply.
+
+        Returns:
+            (ok, message lines)
+        """
+        start = time.perf_counter()
+        self.writer.write(line.encode("utf-8") + b"\n")
+        await self.writer.drain()
+        status, lines = await self._read_reply()
+        self.latencies.append(time.perf_counter() - start)
+        self.commands += 1
+        if status != "OK":
+            self.rejected += 1
+        return status == "OK", lines
+
+    async def play(self, rng: random.Random, turns: int) -> None:
+        """Create a table and play random moves for both sides."""
+        await self.command("new")
+        for _ in range(turns):
+            await self.command("roll")
+            while True:
+                ok, lines = await self.command("state")
+                state = parse_state(lines[0]) if ok else {}
+                if state.get("rolled") != "1":
+                    break  # The turn ended with the last die
+                moves = candidate_moves(state)
+                rng.shuffle(moves)
+                for move in moves:
+                    ok, lines = await self.command(move)
+                    if ok:
+                        break
+                else:
+                    await self.command("skip")
+                    break
+                if lines and lines[-1].startswith("Game over"):
+                    return
+
+    async def close(self) -> None:
+        """Quit and close the connection."""
+        try:
+            await self.command("quit")
+        except ConnectionError:
+            pass
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def run_load(
+    host: str,
+    port: int,
+    sessions: int,
+    concurrency: int,
+    turns: int,
+    seed: int = 0,
+) -> Dict[str, object]:
+    """
+    Play `sessions` games with at most `concurrency` open at once.
+
+    Args:
+        host: Server host
+        port: Server port
+        sessions: Number of client sessions to run
+        concurrency: Most sessions connected at the same time
+        turns: Turns played per session
+        seed: Seed of the random move choices
+
+    Returns:
+        Throughput and latency measurements
+    """
+    latencies: List[float] = []
+    limit = asyncio.Semaphore(concurrency)
+    totals = {"commands": 0, "rejected": 0, "failed": 0}
+
+    async def session(index: int) -> None:
+        async with limit:
+            client = LoadClient(latencies)
+            try:
+                await client.connect(host, port)
+                await client.play(random.Random(seed * 1000003 + index), turns)
+                await client.close()
+            except (ConnectionError, OSError):
+                totals["failed"] += 1
+            totals["commands"] += client.commands
+            totals["rejected"] += client.rejected
+
+    start = time.perf_counter()
+    await asyncio.gather(*(session(index) for index in range(sessions)))
+    duration = time.perf_counter() - start
+
+    ordered = sorted(latencies)
+    completed = sessions - totals["failed"]
+    return {
+        "sessions": sessions,
+        "failed_sessions": totals["failed"],
+        "concurrency": concurrency,
+        "turns_per_session": turns,
+        "commands": totals["commands"],
+        "rejected_commands": totals["rejected"],
+        "duration_s": duration,
+        "sessions_per_second": completed / duration if duration else 0.0,
+        "commands_per_second": totals["commands"] / duration if duration else 0.0,
+        "latency_ms": {
+            "mean": 1000 * sum(ordered) / len(ordered) if ordered else 0.0,
+            "p50": 1000 * percentile(ordered, 0.50),
+            "p95": 1000 * percentile(ordered, 0.95),
+            "p99": 1000 * percentile(ordered, 0.99),
+            "max": 1000 * ordered[-1] if ordered else 0.0,
+        },
+    }
+
+
+def process_rss(pid: int) -> Optional[int]:
+    """
+    Resident memory of a process in bytes (Linux only).
+
+    Returns:
+        Bytes, or None where /proc is not available
+    """
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+async def measure_memory(host: str, port: int, pid: int, sessions: int) -> Dict[str, object]:
+    """
+    Server memory growth with `sessions` connections seated at new tables.
+
+    Args:
+        host: Server host
+        port: Server port
+        pid: Server process id
+        sessions: Connections to hold open
+
+    Returns:
+        RSS before and after, and the difference per session
+    """
+    before = process_rss(pid)
+    clients = []
+    for _ in range(sessions):
+        client = LoadClient([])
+        await client.connect(host, port)
+        await client.command("new")
+        clients.append(client)
+    after = process_rss(pid)
+    for client in clients:
+        await client.close()
+    per_session = None
+    if before is not None and after is not None and sessions:
+        per_session = (after - before) / sessions
+    return {
+        "sessions": sessions,
+        "server_rss_before_bytes": before,
+        "server_rss_after_bytes": after,
+        "memory_per_session_bytes": per_session,
+    }
+
+
+def start_server(idle_timeout: float = 60.0) -> Tuple[subprocess.Popen, int]:
+    """
+    Start a game server subprocess on a free local port.
+
+    Returns:
+        (process, port)
+
+    Raises:
+        RuntimeError: If the server does not report its address
+    """
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-u",
+            "-m",
+            "server.server",
+            "--port",
+            "0",
+            "--idle-timeout",
+            str(idle_timeout),
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    line = process.stdout.readline()
+    match = re.search(r"(\d+)\)", line)
+    if match is None:
+        process.kill()
+        raise RuntimeError(f"Server did not start: {line!r}")
+    return process, int(match.group(1))
+
+
+def raise_file_limit() -> None:
+    """Allow as many open sockets as the hard limit permits."""
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, object]:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Load test the game server")
+    parser.add_argument("--sessions", type=int, default=DEFAULT_SESSIONS)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--turns", type=int, default=DEFAULT_TURNS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="Use a running server")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args(argv)
+
+    raise_file_limit()
+    process = None
+    port = args.port
+    if port is None:
+        process, port = start_server()
+    try:
+        results = asyncio.run(
+            run_load(
+                args.host, port, args.sessions, args.concurrency, args.turns, args.seed
+            )
+        )
+        if process is not None:
+            results["memory"] = asyncio.run(
+                measure_memory(args.host, port, process.pid, args.concurrency)
+            )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    results["python"] = platform.python_version()
+    results["timestamp"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(results, output, indent=2)
+    latency = results["latency_ms"]
+    print(
+        f"{results['sessions_per_second']:.1f} sessions/s, "
+        f"p50 {latency['p50']:.2f} ms, p95 {latency['p95']:.2f} ms, "
+        f"p99 {latency['p99']:.2f} ms -> {args.output}"
+    )
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,480 @@
+"""
+Asyncio server hosting many Backgammon tables over TCP or Unix sockets.
+
+The protocol is line based. A client sends one command per line: the CLI
+game commands (roll, move <from> <to>, skip, help) plus the table
+commands below. Every reply is a status line ("OK" or "ERR"), the message
+lines, and a line with a single "." (message lines starting with "." get
+another "." in front, as in SMTP).
+
+    new             create a table and sit at it
+    join <id>       sit at an existing table
+    leave           stand up from the table
+    state           one-line machine readable game state
+    board           the board as drawn by the CLI
+    tables          number of tables and connected clients
+    quit            close the connection
+
+Connections that send nothing for idle_timeout seconds are closed, and
+tables nobody sits at are evicted once they have been idle that long.
+
+With --state-file, the games of every table are written to that file
+on shutdown and restored from it on start, so a restart keeps them.
+With --autosave-dir, every move is also journaled in the background
+(see server.autosave), so a crash loses at most the last fraction of a
+second of play.
+
+Run with: python -m server.server --port 4000 (or --unix /path/to/socket)
+"""
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import os
+import struct
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from server.autosave import Autosave, recover
+from server.table import Table
+
+DEFAULT_PORT = 4000
+DEFAULT_IDLE_TIMEOUT = 300.0
+DEFAULT_SWEEP_INTERVAL = 30.0
+DEFAULT_MAX_TABLES = 100000
+# Longest command line accepted, in bytes; longer lines close the session
+MAX_LINE_LENGTH = 4096
+
+WELCOME = (
+    "Welcome to Backgammon. Commands: new, join <id>, leave, state, board, "
+    "tables, roll, move <from> <to>, skip, help, quit"
+)
+
+Reply = Tuple[bool, List[str], bool]
+
+# Table file: magic, version, table count, then per table the id length,
+# the id, the saved game length and the saved game (core.savegame).
+TABLES_MAGIC = b"BGST"
+TABLES_VERSION = 1
+_TABLES_HEADER = struct.Struct("<4sBI")
+_TABLE_ID = struct.Struct("<B")
+_TABLE_GAME = struct.Struct("<H")
+
+
+class Session:
+    """State of one client connection."""
+
+    def __init__(self):
+        self.table: Optional[Table] = None
+
+
+def encode_reply(ok: bool, lines: List[str]) -> bytes:
+    """
+    Frame a reply for the wire.
+
+    Args:
+        ok: Whether the command succeeded
+        lines: Message lines
+
+    Returns:
+        UTF-8 bytes: status line, dot-stuffed lines, terminating "."
+    """
+    out = ["OK" if ok else "ERR"]
+    out.extend("." + line if line.startswith(".") else line for line in lines)
+    out.append(".")
+    return ("\n".join(out) + "\n").encode("utf-8")
+
+
+class GameServer:
+    """Hosts tables and dispatches the commands of every connection."""
+
+    def __init__(
+        self,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        sweep_interval: float = DEFAULT_SWEEP_INTERVAL,
+        max_tables: int = DEFAULT_MAX_TABLES,
+        clock: Callable[[], float] = time.monotonic,
+        autosave: Optional[Autosave] = None,
+    ):
+        """
+        Args:
+            idle_timeout: Seconds of silence before a connection is closed
+                and an empty table is evicted
+            sweep_interval: Seconds between evictions of idle tables
+            max_tables: Most tables hosted at once
+            clock: Time source (monotonic seconds)
+            autosave: Journal writer of the table games, if any
+        """
+        self.idle_timeout = idle_timeout
+        self.sweep_interval = sweep_interval
+        self.max_tables = max_tables
+        self.clock = clock
+        self.autosave = autosave
+        self.tables: Dict[str, Table] = {}
+        self.sessions = 0
+        self.evicted = 0
+        self._table_ids = itertools.count(1)
+        self._servers: List[asyncio.AbstractServer] = []
+        self._sweeper: Optional[asyncio.Task] = None
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        """
+        Listen on a TCP port.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+
+        Returns:
+            The asyncio server
+        """
+        server = await asyncio.start_server(
+            self.handle_client, host, port, limit=MAX_LINE_LENGTH
+        )
+        return self._started(server)
+
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        """
+        Listen on a Unix socket.
+
+        Args:
+            path: Socket file path
+
+        Returns:
+            The asyncio server
+        """
+        server = await asyncio.start_unix_server(
+            self.handle_client, path, limit=MAX_LINE_LENGTH
+        )
+        return self._started(server)
+
+    def _started(self, server: asyncio.AbstractServer) -> asyncio.AbstractServer:
+        """Track a listening server and start the sweeper once."""
+        self._servers.append(server)
+        if self._sweeper is None:
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep())
+        return server
+
+    async def close(self) -> None:
+        """Stop listening and stop the sweeper."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._sweeper
+            self._sweeper = None
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers = []
+
+    async def _sweep(self) -> None:
+        """Evict idle tables every sweep_interval seconds."""
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            self.evict_idle()
+
+    def evict_idle(self, now: Optional[float] = None) -> List[str]:
+        """
+        Remove the tables nobody sits at that have been idle too long.
+
+        Args:
+            now: Current time (the server clock if None)
+
+        Returns:
+            Ids of the evicted tables
+        """
+        now = self.clock() if now is None else now
+        idle = [
+            table_id
+            for table_id, table in self.tables.items()
+            if table.clients == 0 and now - table.last_active >= self.idle_timeout
+        ]
+        for table_id in idle:
+            del self.tables[table_id]
+            if self.autosave is not None:
+                self.autosave.remove(table_id)
+        self.evicted += len(idle)
+        return idle
+
+    def create_table(self) -> Table:
+        """
+        Create a new table.
+
+        Returns:
+            The table
+
+        Raises:
+            RuntimeError: If the server already hosts max_tables tables
+        """
+        if len(self.tables) >= self.max_tables:
+            raise RuntimeError("Server is full")
+        table_id = str(next(self._table_ids))
+        table = Table(table_id, self.clock())
+        self._add(table)
+        return table
+
+    def _add(self, table: Table) -> None:
+        """Host a table, journaling its game if autosave is on."""
+        self.tables[table.table_id] = table
+        if self.autosave is not None:
+            table.attach(self.autosave)
+
+    def save_tables(self, path: str) -> int:
+        """
+        Write the games of every table to a file.
+
+        The file is written next to path and renamed over it, so a crash
+        while saving leaves the previous file intact.
+
+        Args:
+            path: File to write
+
+        Returns:
+            Number of tables saved
+        """
+        parts = [_TABLES_HEADER.pack(TABLES_MAGIC, TABLES_VERSION, len(self.tables))]
+        for table_id, table in self.tables.items():
+            name = table_id.encode()
+            game = table.to_bytes()
+            parts.extend((_TABLE_ID.pack(len(name)), name, _TABLE_GAME.pack(len(game)), game))
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(b"".join(parts))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+        return len(self.tables)
+
+    def load_tables(self, path: str, replace: bool = True) -> int:
+        """
+        Restore the tables saved with save_tables(). New table ids
+        continue after the restored ones.
+
+        Args:
+            path: File to read
+            replace: Replace hosted tables of the same id (else keep them)
+
+        Returns:
+            Number of tables restored
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a valid table file
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        try:
+            magic, version, count = _TABLES_HEADER.unpack_from(data, 0)
+            if magic != TABLES_MAGIC or version != TABLES_VERSION:
+                raise ValueError("Not a table file of a known version")
+            offset = _TABLES_HEADER.size
+            now = self.clock()
+            restored = {}
+            for _ in range(count):
+                (length,) = _TABLE_ID.unpack_from(data, offset)
+                offset += _TABLE_ID.size
+                table_id = data[offset : offset + length].decode()
+                offset += length
+                (length,) = _TABLE_GAME.unpack_from(data, offset)
+                offset += _TABLE_GAME.size
+                game = data[offset : offset + length]
+                offset += length
+                if replace or table_id not in self.tables:
+                    restored[table_id] = Table.from_bytes(table_id, game, now)
+        except struct.error as error:
+            raise ValueError("Truncated table file") from error
+        self._restore(restored.values())
+        return len(restored)
+
+    def recover_tables(self) -> int:
+        """
+        Restore the tables journaled by autosave before a crash or restart.
+
+        Returns:
+            Number of tables restored
+        """
+        if self.autosave is None:
+            return 0
+        now = self.clock()
+        states = recover(self.autosave.directory)
+        self._restore(Table.from_state(table_id, state, now) for table_id, state in states.items())
+        return len(states)
+
+    def restore_tables(self, state_file: Optional[str] = None) -> int:
+        """
+        Restore the tables on start.
+
+        The state file is only written on a clean shutdown, while the
+        autosave journals follow every move, so journaled tables win and
+        the state file only adds the tables that have no journal.
+
+        Args:
+            state_file: File written by save_tables() (skipped if missing)
+
+        Returns:
+            Number of tables restored
+
+        Raises:
+            OSError: If the state file cannot be read
+            ValueError: If the state file is not a valid table file
+        """
+        restored = self.recover_tables()
+        if state_file and os.path.exists(state_file):
+            restored += self.load_tables(state_file, replace=self.autosave is None)
+        return restored
+
+    def _restore(self, tables: Iterable[Table]) -> None:
+        """Host restored tables; new table ids continue after theirs."""
+        for table in tables:
+            self._add(table)
+        numbers = [int(table_id) for table_id in self.tables if table_id.isdigit()]
+        self._table_ids = itertools.count(max(numbers, default=0) + 1)
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serve one connection until it quits, disconnects or idles out.
+
+        Args:
+            reader: Stream of the client's commands
+            writer: Stream for the replies
+        """
+        session = Session()
+        self.sessions += 1
+        try:
+            writer.write(encode_reply(True, [WELCOME]))
+            await writer.drain()
+            while True:
+                try:
+                    raw = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    writer.write(encode_reply(False, ["Idle timeout, closing"]))
+                    await writer.drain()
+                    break
+                except (ValueError, asyncio.LimitOverrunError):
+                    writer.write(encode_reply(False, ["Line too long, closing"]))
+                    await writer.drain()
+                    break
+                if not raw:
+                    break
+                line = raw.decode("utf-8", "replace").strip()
+                if not line:
+                    continue
+                ok, lines, keep_open = self.dispatch(session, line)
+                writer.write(encode_reply(ok, lines))
+                await writer.drain()
+                if not keep_open:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._leave(session)
+            self.sessions -= 1
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    def dispatch(self, session: Session, line: str) -> Reply:
+        """
+        Run one command for a session.
+
+        Args:
+            session: Connection state
+            line: Command line
+
+        Returns:
+            (ok, message lines, keep the connection open)
+        """
+        parts = line.split()
+        command = parts[0].lower()
+        args = parts[1:]
+
+        if command == "quit":
+            return True, ["Thanks for playing!"], False
+        if command == "new":
+            try:
+                table = self.create_table()
+            except RuntimeError as error:
+                return False, [str(error)], True
+            return self._join(session, table)
+        if command == "join":
+            table = self.tables.get(args[0]) if args else None
+            if table is None:
+                return False, ["No such table. Use: join <id>"], True
+            return self._join(session, table)
+        if command == "tables":
+            return True, [f"tables={len(self.tables)} sessions={self.sessions}"], True
+
+        table = session.table
+        if table is None:
+            return False, ["Not at a table. Use 'new' or 'join <id>'"], True
+        if command == "leave":
+            self._leave(session)
+            return True, [f"Left table {table.table_id}"], True
+        if command == "state":
+            return True, [table.state()], True
+        if command == "board":
+            return True, table.board(), True
+
+        ok, lines = table.execute(line, self.clock())
+        if table.is_over():
+            winner = "W" if table.cli.game.board.borne_off["W"] == 15 else "B"
+            lines.append(f"Game over: {winner} wins")
+        return ok, lines, True
+
+    def _join(self, session: Session, table: Table) -> Reply:
+        """Seat a session at a table, leaving its previous one."""
+        self._leave(session)
+        session.table = table
+        table.clients += 1
+        table.last_active = self.clock()
+        return True, [f"table {table.table_id}"], True
+
+    def _leave(self, session: Session) -> None:
+        """Stand a session up from its table, if any."""
+        if session.table is not None:
+            session.table.clients -= 1
+            session.table.last_active = self.clock()
+            session.table = None
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """Run a server until interrupted."""
+    autosave = Autosave(args.autosave_dir) if args.autosave_dir else None
+    server = GameServer(args.idle_timeout, args.sweep_interval, args.max_tables, autosave=autosave)
+    if autosave is not None or args.state_file:
+        print(f"Restored {server.restore_tables(args.state_file)} tables")
+    if args.unix:
+        listener = await server.start_unix(args.unix)
+    else:
+        listener = await server.start_tcp(args.host, args.port)
+    addresses = ", ".join(str(sock.getsockname()) for sock in listener.sockets)
+    print(f"Serving Backgammon on {addresses}")
+    try:
+        await listener.serve_forever()
+    finally:
+        await server.close()
+        if args.state_file:
+            server.save_tables(args.state_file)
+        if autosave is not None:
+            autosave.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Backgammon game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="Unix socket path (instead of TCP)")
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT)
+    parser.add_argument("--sweep-interval", type=float, default=DEFAULT_SWEEP_INTERVAL)
+    parser.add_argument("--max-tables", type=int, default=DEFAULT_MAX_TABLES)
+    parser.add_argument("--state-file", help="Save tables here on shutdown and restore them on start")
+    parser.add_argument("--autosave-dir", help="Journal every table here and recover them on start")
+    args = parser.parse_args(argv)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve(args))
+
+
+if __name__ == "__main__":
+    main()
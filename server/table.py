@@ -0,0 +1,148 @@
+"""
+One game table of the server.
+
+A table wraps a BackgammonCLI whose user interface writes into a buffer
+(cli.CLI.BufferedUserInterface) instead of the console, so the CLI
+commands and their messages become the wire protocol unchanged.
+"""
+
+import time
+from typing import List, Optional, Tuple
+
+from cli.CLI import BackgammonCLI, BufferedUserInterface
+from core.BackgammonGame import Game
+from engine.game_log import GameLog, Snapshot
+from server.autosave import Autosave, restore_game
+
+# CLI commands that may be sent over the network. hint and analyze are
+# left out: they search for seconds and would stall every other table.
+GAME_COMMANDS = {"roll", "move", "skip", "help"}
+
+
+class Table:
+    """A game with its own CLI state, shared by the clients that join it."""
+
+    def __init__(self, table_id: str, now: Optional[float] = None):
+        """
+        Args:
+            table_id: Name of the table
+            now: Creation time (time.monotonic() if None)
+        """
+        self.table_id = table_id
+        self.ui = BufferedUserInterface()
+        self.cli = BackgammonCLI()
+        self.cli.ui = self.ui
+        self.clients = 0
+        self.last_active = time.monotonic() if now is None else now
+        self.autosave: Optional[Autosave] = None
+        self._journaled = 0
+
+    def to_bytes(self) -> bytes:
+        """The game and turn state in the format of core.savegame."""
+        return self.cli.game.to_bytes(self.cli.state_manager)
+
+    @classmethod
+    def from_bytes(cls, table_id: str, data: bytes, now: Optional[float] = None) -> "Table":
+        """
+        Rebuild a table saved with to_bytes(), with nobody sitting at it.
+
+        Args:
+            table_id: Name of the table
+            data: Saved game
+            now: Restore time (time.monotonic() if None)
+
+        Returns:
+            The table
+
+        Raises:
+            ValueError: If data is not a valid saved game
+        """
+        table = cls(table_id, now)
+        table.cli.game = Game.from_bytes(data, table.cli.state_manager)
+        table.cli.log = GameLog(table.cli.snapshot())
+        return table
+
+    @classmethod
+    def from_state(cls, table_id: str, state: Snapshot, now: Optional[float] = None) -> "Table":
+        """
+        Rebuild a table from a state recovered from its autosave journal.
+
+        Args:
+            table_id: Name of the table
+            state: Recovered state
+            now: Restore time (time.monotonic() if None)
+
+        Returns:
+            The table
+        """
+        table = cls(table_id, now)
+        table.cli.game = restore_game(state, table.cli.state_manager)
+        table.cli.log = GameLog(table.cli.snapshot())
+        return table
+
+    def attach(self, autosave: Autosave) -> None:
+        """
+        Journal the game of this table from now on.
+
+        Args:
+            autosave: Journal writer
+        """
+        self.autosave = autosave
+        self._journaled = len(self.cli.log.events)
+        autosave.start(self.table_id, self.cli.log.state)
+
+    def execute(self, line: str, now: Optional[float] = None) -> Tuple[bool, List[str]]:
+        """
+        Run one CLI command on this table.
+
+        Args:
+            line: Raw command line
+            now: Time of the command (time.monotonic() if None)
+
+        Returns:
+            (ok, message lines)
+        """
+        self.last_active = time.monotonic() if now is None else now
+        command, _ = self.cli.parser.parse_command(line)
+        if command not in GAME_COMMANDS:
+            return False, [f"Unknown command: {line.strip()}"]
+        self.cli.process_input(line)
+        if self.autosave is not None:
+            events = self.cli.log.events
+            self.autosave.append(self.table_id, events[self._journaled :])
+            self._journaled = len(events)
+        failed, lines = self.ui.take()
+        return not failed, lines
+
+    def state(self) -> str:
+        """
+        One-line machine readable state of the game.
+
+        Returns:
+            'turn=<W|B> rolled=<0|1> dice=<d,d> bar=<w>,<b> off=<w>,<b>
+            points=<24 signed counts, White positive>'
+        """
+        game = self.cli.game
+        manager = self.cli.state_manager
+        board = game.board
+        dice = ",".join(str(die) for die in manager.get_remaining())
+        return (
+            f"turn={game.get_current_player_color()} "
+            f"rolled={int(manager.has_rolled)} dice={dice} "
+            f"bar={board.bar['W']},{board.bar['B']} "
+            f"off={board.borne_off['W']},{board.borne_off['B']} "
+            f"points={','.join(str(count) for count in game.get_board())}"
+        )
+
+    def board(self) -> List[str]:
+        """
+        The board as drawn by the CLI.
+
+        Returns:
+            Lines of the rendered board
+        """
+        return self.cli.renderer.render_board(self.cli.game).strip("\n").split("\n")
+
+    def is_over(self) -> bool:
+        """Check whether a player has borne off every checker."""
+        return 15 in self.cli.game.board.borne_off.values()
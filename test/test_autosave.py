@@ -0,0 +1,154 @@
+"""Tests for the background autosave journal."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from cli.CLI import GameStateManager
+from core.BackgammonGame import Game
+from engine.game_log import END_TURN, MOVE, ROLL, Event, GameLog, Snapshot
+from engine.position import from_board, initial_position
+from server.autosave import (
+    JOURNAL_SUFFIX,
+    Autosave,
+    decode_events,
+    encode_events,
+    from_saved,
+    recover,
+    recover_game,
+    restore_game,
+    to_saved,
+)
+
+TURN = [
+    Event(ROLL, "W", dice=(3, 1)),
+    Event(MOVE, "W", 7, 4, (3,)),
+    Event(MOVE, "W", 5, 4, (1,)),
+    Event(END_TURN, "W"),
+]
+
+
+def start_state() -> Snapshot:
+    """State of a new game."""
+    return Snapshot(initial_position(), "W")
+
+
+def replay(events) -> Snapshot:
+    """State after events, through a game log."""
+    log = GameLog(start_state())
+    log.record(events)
+    return log.state
+
+
+class TestRecords(unittest.TestCase):
+    """Tests for the journal records and state conversions."""
+
+    def test_events_round_trip(self):
+        """Test that events survive encoding, and a torn tail is dropped."""
+        data = encode_events(TURN)
+        self.assertEqual(list(decode_events(data)), TURN)
+        self.assertEqual(list(decode_events(data[:-1])), TURN[:-1])
+        self.assertEqual(list(decode_events(data[:7])), TURN[:1])
+        self.assertEqual(list(decode_events(data[:6])), [])
+
+    def test_corrupt_record(self):
+        """Test that an unknown event kind is refused."""
+        with self.assertRaises(ValueError):
+            list(decode_events(b"\x09\x00\x00\x00\x00"))
+
+    def test_saved_round_trip(self):
+        """Test the conversion between game log states and saved games."""
+        state = replay(TURN[:2])
+        self.assertEqual(from_saved(to_saved(state)), state)
+
+    def test_restore_game(self):
+        """Test that a Game and its turn state are rebuilt."""
+        manager = GameStateManager(Game())
+        game = restore_game(replay(TURN[:2]), manager)
+        self.assertEqual(from_board(game.board), replay(TURN[:2]).position)
+        self.assertIs(manager.game, game)
+        self.assertEqual(manager.get_remaining(), [1])
+        self.assertEqual(game.dice.get_values(), (3, 1))
+
+
+class TestAutosave(unittest.TestCase):
+    """Tests for Autosave and recover()."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.autosave = Autosave(self.directory.name, commit_interval=0.01, compact_interval=6)
+
+    def tearDown(self):
+        self.autosave.close()
+        self.directory.cleanup()
+
+    def test_recover_after_appends(self):
+        """Test that the journal replays onto the snapshot."""
+        self.autosave.start("1", start_state())
+        self.autosave.append("1", TURN[:3])
+        self.assertTrue(self.autosave.flush(timeout=5))
+        self.assertEqual(recover(self.directory.name), {"1": replay(TURN[:3])})
+
+    def test_compaction(self):
+        """Test that a long journal is folded into a new snapshot."""
+        self.autosave.start("1", start_state())
+        for event in TURN * 2:
+            self.autosave.append("1", [event])
+        self.autosave.flush(timeout=5)
+        self.assertEqual(self.autosave.compactions, 1)
+        path = os.path.join(self.directory.name, "1" + JOURNAL_SUFFIX)
+        self.assertLess(os.path.getsize(path), len(encode_events(TURN)))
+        self.assertEqual(recover_game(self.directory.name, "1"), replay(TURN * 2))
+
+    def test_crash_between_snapshot_and_journal(self):
+        """Test that events already in a snapshot are not replayed twice."""
+        self.autosave.start("1", start_state())
+        self.autosave.append("1", TURN)
+        self.autosave.flush(timeout=5)
+        path = os.path.join(self.directory.name, "1" + JOURNAL_SUFFIX)
+        with open(path, "rb") as file:
+            old_journal = file.read()
+        self.autosave.append("1", TURN[:2])
+        self.autosave.flush(timeout=5)
+        # Put back the journal as it was before the compaction
+        with open(path, "wb") as file:
+            file.write(old_journal + encode_events(TURN[:2]))
+        self.assertEqual(recover_game(self.directory.name, "1"), replay(TURN + TURN[:2]))
+
+    def test_restart_and_remove(self):
+        """Test that a restarted game drops its journal and remove() its files."""
+        self.autosave.start("1", start_state())
+        self.autosave.append("1", TURN)
+        self.autosave.start("1", start_state())
+        self.autosave.start("2", start_state())
+        self.autosave.remove("2")
+        self.autosave.flush(timeout=5)
+        self.assertEqual(recover(self.directory.name), {"1": start_state()})
+
+    def test_close_writes_queue(self):
+        """Test that close() writes what is still queued."""
+        self.autosave.start("1", start_state())
+        self.autosave.append("1", TURN)
+        self.autosave.close()
+        self.assertEqual(recover(self.directory.name)["1"], replay(TURN))
+
+    def test_disk_failure_is_saved_later(self):
+        """Test that a failed append is caught up by a snapshot."""
+        self.autosave.start("1", start_state())
+        self.autosave.flush(timeout=5)
+        with patch("server.autosave.os.fsync", side_effect=OSError("disk full")):
+            self.autosave.append("1", TURN[:1])
+            self.autosave.flush(timeout=5)
+        self.assertEqual(self.autosave.errors, 2)
+        self.autosave.append("1", TURN[1:2])
+        self.autosave.flush(timeout=5)
+        self.assertEqual(recover_game(self.directory.name, "1"), replay(TURN[:2]))
+
+    def test_recover_missing_directory(self):
+        """Test that there is nothing to recover without a directory."""
+        self.assertEqual(recover(os.path.join(self.directory.name, "missing")), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""Tests for the bear-off database and evaluator."""
+
+import unittest
+
+from engine.bearoff import (
+    BearoffDatabase,
+    BearoffEvaluator,
+    black_home,
+    first_to_finish,
+    is_home,
+    white_home,
+)
+
+
+def bearoff_position(white: tuple, black: tuple) -> tuple:
+    """Build a position from the two home boards (1 point first)."""
+    position = [0] * 28
+    for point in range(6):
+        position[point] = white[point]
+        position[23 - point] = -black[point]
+    position[26] = 15 - sum(white)
+    position[27] = 15 - sum(black)
+    return tuple(position)
+
+
+class TestBearoffDatabase(unittest.TestCase):
+    """Tests for BearoffDatabase."""
+
+    def setUp(self):
+        """Create a small database."""
+        self.database = BearoffDatabase(max_checkers=4)
+
+    def test_single_checker(self):
+        """Test known values for one checker."""
+        self.assertEqual(self.database.distribution((1, 0, 0, 0, 0, 0)), (0.0, 1.0))
+        # A checker on the 6 point misses with 1-1, 2-1, 3-1, 4-1 and 3-2,
+        # so 27 of the 36 rolls bear it off at once.
+        distribution = self.database.distribution((0, 0, 0, 0, 0, 1))
+        self.assertAlmostEqual(distribution[1], 27 / 36)
+        self.assertAlmostEqual(self.database.expected_rolls((0, 0, 0, 0, 0, 1)), 1.25)
+
+    def test_distribution_sums_to_one(self):
+        """Test that every distribution is a probability distribution."""
+        for home in ((2, 1, 0, 0, 1, 0), (0, 0, 0, 0, 0, 4), (1, 1, 1, 1, 0, 0)):
+            self.assertAlmostEqual(sum(self.database.distribution(home)), 1.0)
+
+    def test_more_pips_take_longer(self):
+        """Test that expected rolls grow with the pip count."""
+        self.assertLess(
+            self.database.expected_rolls((2, 0, 0, 0, 0, 0)),
+            self.database.expected_rolls((0, 0, 0, 0, 0, 2)),
+        )
+
+    def test_long_bear_offs(self):
+        """Test boards that need more rolls than there are checkers."""
+        database = BearoffDatabase(max_checkers=9)
+        distribution = database.distribution((0, 0, 0, 0, 0, 9))
+        self.assertGreater(len(distribution), 17)
+        self.assertAlmostEqual(sum(distribution), 1.0)
+        self.assertGreater(database.expected_rolls((0, 0, 0, 0, 0, 9)), 7.0)
+
+    def test_too_many_checkers(self):
+        """Test that boards above the limit are rejected."""
+        self.assertFalse(self.database.covers((5, 0, 0, 0, 0, 0)))
+        with self.assertRaises(ValueError):
+            self.database.distribution((5, 0, 0, 0, 0, 0))
+
+    def test_entries_are_cached(self):
+        """Test that computed entries stay in the database."""
+        self.database.expected_rolls((0, 0, 1, 0, 0, 1))
+        size = len(self.database)
+        self.database.expected_rolls((0, 0, 1, 0, 0, 1))
+        self.assertEqual(len(self.database), size)
+
+
+class TestBearoffEvaluator(unittest.TestCase):
+    """Tests for BearoffEvaluator."""
+
+    def setUp(self):
+        """Create an evaluator with a small database."""
+        self.evaluator = BearoffEvaluator(BearoffDatabase(max_checkers=4))
+
+    def test_homes(self):
+        """Test reading both home boards."""
+        position = bearoff_position((1, 2, 0, 0, 0, 0), (0, 0, 3, 0, 0, 0))
+        self.assertEqual(white_home(position), (1, 2, 0, 0, 0, 0))
+        self.assertEqual(black_home(position), (0, 0, 3, 0, 0, 0))
+        self.assertTrue(is_home(position, "W"))
+        self.assertTrue(is_home(position, "B"))
+
+    def test_first_to_finish(self):
+        """Test the two-sided race of distributions."""
+        self.assertEqual(first_to_finish((0.0, 1.0), (0.0, 1.0)), 1.0)
+        self.assertEqual(first_to_finish((0.0, 0.0, 1.0), (0.0, 1.0)), 0.0)
+
+    def test_two_sided_exact(self):
+        """Test that one checker each on the 1 point wins for the side on roll."""
+        position = bearoff_position((1, 0, 0, 0, 0, 0), (1, 0, 0, 0, 0, 0))
+        self.assertEqual(self.evaluator.win_probability(position, "W"), 1.0)
+        self.assertEqual(self.evaluator.win_probability(position, "B"), 0.0)
+
+    def test_one_sided(self):
+        """Test a bear-off against a side still racing home."""
+        position = list(bearoff_position((1, 1, 0, 0, 0, 0), (0, 0, 0, 0, 0, 0)))
+        position[27] = 13
+        position[10] = -2
+        probs = self.evaluator.win_probabilities([tuple(position)], "B")
+        self.assertGreater(probs[0], 0.9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""Tests for the micro-benchmark harness and suites."""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from benchmarks import bench_cli, bench_core
+from benchmarks.__main__ import SUITES, main, select
+from benchmarks.harness import Benchmark, BenchResult, format_result, measure, run_all
+from cli.CLI import BackgammonCLI
+from core.board import Board
+from engine.position import from_board
+
+
+class TestHarness(unittest.TestCase):
+    """Tests for measure() and run_all()."""
+
+    def test_measure_counts_calls(self):
+        """Test warmup, rounds and the operations of each call."""
+        calls = []
+        benchmark = Benchmark("count", lambda: lambda: calls.append(1), ops_per_call=2)
+        result = measure(benchmark, repeat=3, number=10)
+        # One warmup round and three timed rounds
+        self.assertEqual(len(calls), 40)
+        self.assertEqual((result.number, result.repeat), (10, 3))
+        self.assertGreater(result.ops_per_sec, 0)
+        self.assertGreaterEqual(result.best_ops_per_sec, result.ops_per_sec)
+
+    def test_calibration(self):
+        """Test that the loop count is calibrated when not given."""
+        result = measure(Benchmark("noop", lambda: lambda: None), repeat=2, min_time=0.01)
+        self.assertGreater(result.number, 1)
+
+    def test_run_all_reports(self):
+        """Test that each result is reported as soon as it is ready."""
+        reported = []
+        benchmarks = [Benchmark(name, lambda: lambda: None) for name in ("a", "b")]
+        results = run_all(benchmarks, repeat=2, number=5, report=reported.append)
+        self.assertEqual([result.name for result in results], ["a", "b"])
+        self.assertEqual(reported, results)
+
+    def test_format_result(self):
+        """Test the text line of a result."""
+        line = format_result(BenchResult("board", 1234567.8, 1300000.0, 2.5, 1000, 5))
+        self.assertIn("1,234,568 ops/s", line)
+        self.assertIn("±2.5%", line)
+
+
+class TestSuites(unittest.TestCase):
+    """Tests that every benchmark runs and keeps its fixtures steady."""
+
+    def test_every_benchmark_runs(self):
+        """Test one call of every benchmark of every suite."""
+        for benchmark in select(list(SUITES)):
+            with self.subTest(benchmark.name):
+                run = benchmark.make()
+                run()
+                run()
+
+    def test_board_benchmarks_are_steady(self):
+        """Test that the move benchmarks put the checkers back."""
+        for benchmark in bench_core.BENCHMARKS[:2]:
+            boards = []
+
+            def make_board():
+                boards.append(Board())
+                return boards[-1]
+
+            with patch("benchmarks.bench_core.Board", side_effect=make_board):
+                run = benchmark.make()
+            before = from_board(boards[0])
+            run()
+            run()
+            self.assertEqual(from_board(boards[0]), before, benchmark.name)
+
+    def test_cli_turn_is_undone(self):
+        """Test that the CLI benchmark ends where it started."""
+        clis = []
+
+        def make_cli():
+            clis.append(BackgammonCLI())
+            return clis[-1]
+
+        with patch("benchmarks.bench_cli.BackgammonCLI", side_effect=make_cli):
+            run = bench_cli.BENCHMARKS[0].make()
+        run()
+        self.assertEqual(from_board(clis[0].game.board), from_board(Board()))
+        self.assertFalse(clis[0].state_manager.has_rolled)
+        self.assertEqual(clis[0].log.actions, 3)
+
+
+class TestMain(unittest.TestCase):
+    """Tests for the command line."""
+
+    def test_json_output(self):
+        """Test a filtered run written as JSON."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bench.json")
+            with patch("builtins.print"):
+                main(
+                    [
+                        "--suite",
+                        "core",
+                        "-k",
+                        "get_board",
+                        "--repeat",
+                        "2",
+                        "--min-time",
+                        "0.01",
+                        "--json",
+                        path,
+                    ]
+                )
+            with open(path, encoding="utf-8") as file:
+                document = json.load(file)
+        self.assertEqual(list(document["results"]), ["game.get_board"])
+        self.assertIn("ops_per_sec", document["results"]["game.get_board"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -294,6 +294,14 @@ class TestBackgammonBoard(unittest.TestCase):
         self.assertEqual(self.board.borne_off["B"], 1)
         self.assertEqual(len(self.board.points[5]), 14)
 
+    def test_bear_off_outside_board(self):
+        """Test that bear_off refuses points off the board instead of raising."""
+        self.board.points = [[] for _ in range(24)]
+        self.board.points[0] = ["B"] * 15
+        self.assertFalse(self.board.bear_off("B", 24))
+        self.assertFalse(self.board.bear_off("B", -24))
+        self.assertEqual(self.board.borne_off["B"], 0)
+
     def test_bear_off_not_eligible(self):
         """Test that bear_off fails if can_bear_off is false."""
         # Initial setup: pieces outside home board
@@ -302,6 +310,27 @@ class TestBackgammonBoard(unittest.TestCase):
         self.assertFalse(self.board.bear_off("W", 23))
         self.assertEqual(self.board.borne_off["W"], 0)
 
+    def test_has_contact(self):
+        """Test the contact check used to detect pure races."""
+        self.assertTrue(self.board.has_contact())
+
+        self.board.points = [[] for _ in range(24)]
+        self.board.points[3] = ["W"] * 15
+        self.board.points[20] = ["B"] * 15
+        self.assertFalse(self.board.has_contact())
+
+        self.board.points[21] = ["W"]
+        self.assertTrue(self.board.has_contact())
+
+        self.board.points[21] = []
+        self.board.bar["B"] = 1
+        self.assertTrue(self.board.has_contact())
+
+    def test_slots(self):
+        """Test that boards have a fixed layout and no instance dict."""
+        self.assertFalse(hasattr(self.board, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.board.extra = 1
 
 if __name__ == "__main__":
     unittest.main(argv=["first-arg-is-ignored"], exit=False)
@@ -191,5 +191,11 @@ class TestChecker(unittest.TestCase):
         self.assertTrue(self.black_checker.can_bear_off(True))
 
 
+    def test_slots(self):
+        """Test that checkers have a fixed layout and no instance dict."""
+        self.assertFalse(hasattr(self.white_checker, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.white_checker.extra = 1
+
 if __name__ == "__main__":
     unittest.main()
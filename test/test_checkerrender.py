@@ -320,5 +320,31 @@ class TestCheckerRenderer(unittest.TestCase):
         self.assertEqual(checker_positions, [])
 
 
+    def test_checker_center(self) -> None:
+        """Prueba que `checker_center` apila desde el borde de cada fila."""
+        x_top, y_top = self.renderer.checker_center(12, 0)
+        self.assertEqual(x_top, int(self.renderer._get_point_x_center(12)))
+        self.assertEqual(y_top, self.renderer._inner_top + 20)
+        self.assertEqual(self.renderer.checker_center(12, 2)[1], y_top + 2 * 45)
+        self.assertEqual(
+            self.renderer.checker_center(0, 1)[1], self.renderer._inner_bottom - 20 - 45
+        )
+
+    def test_bar_center(self) -> None:
+        """Prueba la posición de la primera ficha en la barra."""
+        self.assertEqual(
+            self.renderer.bar_center("W"), (425, self.renderer._inner_top + 50)
+        )
+        self.assertEqual(
+            self.renderer.bar_center("B"), (425, self.renderer._inner_bottom - 50)
+        )
+
+    @patch.object(CheckerRenderer, "_draw_single_checker")
+    def test_draw_checker(self, mock_draw_single: Mock) -> None:
+        """Prueba que `draw_checker` dibuja una ficha suelta."""
+        self.renderer.draw_checker(self.surface, 10.5, 20.0, "B")
+        mock_draw_single.assert_called_once_with(self.surface, 10.5, 20.0, "B")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,68 @@
+"""Tests for the position classifier."""
+
+import unittest
+
+from core.board import Board
+from engine.classify import (
+    BEAROFF_ONE_SIDED,
+    BEAROFF_TWO_SIDED,
+    CONTACT,
+    RACE,
+    TERMINAL,
+    PositionClassifier,
+)
+from engine.position import initial_position
+from test.test_bearoff import bearoff_position
+
+
+class TestPositionClassifier(unittest.TestCase):
+    """Tests for PositionClassifier."""
+
+    def setUp(self):
+        """Create a classifier covering bear-offs of up to 4 checkers."""
+        self.classifier = PositionClassifier(bearoff_checkers=4)
+
+    def test_contact(self):
+        """Test that the start position is a contact position."""
+        self.assertEqual(self.classifier.classify(initial_position()), CONTACT)
+        self.assertEqual(self.classifier.classify_board(Board()), CONTACT)
+
+    def test_terminal(self):
+        """Test that finished games are terminal."""
+        position = bearoff_position((0, 0, 0, 0, 0, 0), (2, 0, 0, 0, 0, 0))
+        self.assertEqual(self.classifier.classify(position), TERMINAL)
+
+    def test_bearoff_classes(self):
+        """Test the one-sided and two-sided bear-off classes."""
+        both = bearoff_position((1, 1, 0, 0, 0, 0), (0, 2, 0, 0, 0, 0))
+        self.assertEqual(self.classifier.classify(both), BEAROFF_TWO_SIDED)
+
+        one = list(both)
+        one[12] = -1
+        one[27] -= 1
+        self.assertEqual(self.classifier.classify(tuple(one)), BEAROFF_ONE_SIDED)
+
+    def test_large_bearoff_is_a_race(self):
+        """Test that home boards beyond the database are races."""
+        position = bearoff_position((3, 3, 0, 0, 0, 0), (0, 5, 0, 0, 0, 0))
+        self.assertEqual(self.classifier.classify(position), RACE)
+
+    def test_cache(self):
+        """Test that repeated lookups hit the cache."""
+        self.classifier.classify(initial_position())
+        self.classifier.classify(initial_position())
+        self.assertEqual(self.classifier.misses, 1)
+        self.assertEqual(self.classifier.hits, 1)
+        self.classifier.clear()
+        self.assertEqual(self.classifier.hits, 0)
+
+    def test_cache_size_limit(self):
+        """Test that the cache is emptied when it is full."""
+        classifier = PositionClassifier(cache_size=1)
+        classifier.classify(initial_position())
+        classifier.classify(bearoff_position((1, 0, 0, 0, 0, 0), (1, 0, 0, 0, 0, 0)))
+        self.assertEqual(len(classifier._cache), 1)  # pylint: disable=protected-access
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,7 @@
 """Test module for the refactored Backgammon CLI interface."""
 
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 from io import StringIO
@@ -7,12 +9,16 @@ from io import StringIO
 from cli.CLI import (
     BackgammonCLI,
     BoardRenderer,
+    BufferedUserInterface,
     UserInterface,
     InputValidator,
     CommandParser,
     GameStateManager,
 )
 from core.BackgammonGame import Game
+from core.Dice import Dice
+from engine.game_log import GameLog
+from engine.position import from_board
 
 
 class TestBoardRenderer(unittest.TestCase):
@@ -96,6 +102,29 @@ class TestUserInterface(unittest.TestCase):
         self.assertIn("Moved from 1 to 5", mock_stdout.getvalue())
 
 
+class TestBufferedUserInterface(unittest.TestCase):
+    """Tests for BufferedUserInterface."""
+
+    def test_collects_lines_and_failures(self):
+        """Test that messages are buffered and errors flagged."""
+        ui = BufferedUserInterface()
+        ui.display_roll((3, 5))
+        failed, lines = ui.take()
+        self.assertFalse(failed)
+        self.assertIn("📋 Available moves: [3, 5]", lines)
+
+        ui.display_must_roll()
+        failed, lines = ui.take()
+        self.assertTrue(failed)
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(ui.take(), (False, []))
+
+    def test_no_console_input(self):
+        """Test that reading input is refused."""
+        with self.assertRaises(RuntimeError):
+            BufferedUserInterface().get_input("> ")
+
+
 class TestInputValidator(unittest.TestCase):
     """Tests for the InputValidator class."""
 
@@ -148,6 +177,11 @@ class TestCommandParser(unittest.TestCase):
         self.assertEqual(command, "unknown")
         self.assertEqual(args, [])
 
+    def test_parse_engine_commands(self):
+        """Test parsing the hint and analyze commands."""
+        self.assertEqual(self.parser.parse_command("hint 5"), ("hint", ["5"]))
+        self.assertEqual(self.parser.parse_command("ANALYZE"), ("analyze", []))
+
     def test_parse_empty_input(self):
         """Test parsing empty input."""
         command, args = self.parser.parse_command("")
@@ -506,5 +540,206 @@ class TestBackgammonCLI(unittest.TestCase):
         self.assertIn("Thanks for playing!", output)
 
 
+class TestEngineCommands(unittest.TestCase):
+    """Tests for the hint and analyze commands on a real game."""
+
+    def setUp(self):
+        """Set up a CLI with a real game and a mocked UI."""
+        self.cli = BackgammonCLI()
+        self.cli.ui = MagicMock(spec=UserInterface)
+        self.cli.hint_budget = 0.0
+
+    def test_hint_must_roll(self):
+        """Test that hints need a roll."""
+        self.cli.handle_hint([])
+        self.cli.ui.display_must_roll.assert_called_once()
+        self.assertIsNone(self.cli.searcher)
+
+    def test_hint_invalid_count(self):
+        """Test hint with a bad count."""
+        self.cli.state_manager.set_roll((3, 1))
+        for args in (["x"], ["0"]):
+            self.cli.handle_hint(args)
+        self.assertEqual(self.cli.ui.display_error.call_count, 2)
+
+    def test_hint_lists_best_plays(self):
+        """Test that hint shows n ranked plays."""
+        self.cli.state_manager.set_roll((3, 1))
+        self.cli.process_input("hint 2")
+
+        self.cli.ui.display_thinking.assert_called_once_with(0.0)
+        hints, result = self.cli.ui.display_hints.call_args[0]
+        self.assertEqual(len(hints), 2)
+        self.assertEqual(result.depth, 1)
+        self.assertGreaterEqual(hints[0][1], hints[1][1])
+        self.assertIsInstance(hints[0][0], str)
+        self.assertIsNone(self.cli.search)
+
+    def test_hint_remaining_dice(self):
+        """Test hints for the dice left after a move."""
+        self.cli.state_manager.set_roll((3, 1))
+        self.cli.state_manager.use_die(3)
+        self.cli.handle_hint(["10"])
+        hints, _ = self.cli.ui.display_hints.call_args[0]
+        self.assertTrue(all(" " not in play for play, _ in hints))
+
+    def test_hint_no_dice_left(self):
+        """Test hint once the dice are used."""
+        self.cli.state_manager.set_roll((3, 1))
+        self.cli.state_manager.remaining_dice = []
+        self.cli.handle_hint([])
+        self.cli.ui.display_error.assert_called_once()
+
+    def test_analyze(self):
+        """Test the position analysis."""
+        self.cli.process_input("analyze")
+        player, value, pips, label, shots = self.cli.ui.display_analysis.call_args[0]
+        self.assertEqual(player, "white")
+        self.assertEqual(value.depth, 0)
+        self.assertEqual(pips[0], pips[1])
+        self.assertEqual(label, "contact")
+        self.assertEqual(shots, {})
+
+    def test_run_search_cancelled(self):
+        """Test that Ctrl+C cancels the search and keeps its answer."""
+        with patch("cli.CLI.BackgroundSearch") as mock_search_cls:
+            search = mock_search_cls.return_value
+            search.result.side_effect = [KeyboardInterrupt, "partial"]
+            self.assertEqual(self.cli.run_search(print, 1), "partial")
+        search.cancel.assert_called_once()
+        self.assertIsNone(self.cli.search)
+
+
+class TestHistoryCommands(unittest.TestCase):
+    """Tests for the undo and redo commands on a real game."""
+
+    def setUp(self):
+        """Set up a CLI with a real game, fixed dice and a mocked UI."""
+        self.cli = BackgammonCLI()
+        self.cli.ui = MagicMock(spec=UserInterface)
+        patcher = patch.object(Dice, "roll", return_value=(3, 1))
+        self.roll = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.start = from_board(self.cli.game.board)
+
+    def play_turn(self):
+        """Roll 3-1 and play 7/4 5/4 for White."""
+        for line in ("roll", "move 7 4", "move 5 4"):
+            self.cli.process_input(line)
+
+    def test_nothing_to_undo(self):
+        """Test undo and redo on a new game."""
+        self.cli.process_input("undo")
+        self.cli.process_input("redo")
+        self.assertEqual(self.cli.ui.display_error.call_count, 2)
+
+    def test_undo_moves_and_roll(self):
+        """Test that every action is taken back in order."""
+        self.play_turn()
+        self.assertEqual(self.cli.game.current_player, "black")
+
+        self.cli.process_input("undo")
+        self.assertEqual(self.cli.game.current_player, "white")
+        self.assertEqual(self.cli.state_manager.get_remaining(), [1])
+        self.assertEqual(len(self.cli.game.board.points[4]), 1)
+
+        self.cli.process_input("undo")
+        self.assertEqual(self.cli.state_manager.get_remaining(), [3, 1])
+        self.cli.process_input("undo")
+        self.assertFalse(self.cli.state_manager.has_rolled)
+        self.assertEqual(from_board(self.cli.game.board), self.start)
+
+    def test_undo_does_not_reroll(self):
+        """Test that rolling after undoing a roll gives the same dice."""
+        self.roll.side_effect = [(5, 2), (6, 4), (2, 2)]
+        self.cli.process_input("roll")
+        for _ in range(3):
+            self.cli.process_input("undo")
+            self.assertFalse(self.cli.state_manager.has_rolled)
+            self.cli.process_input("roll")
+            self.assertEqual(self.cli.state_manager.get_remaining(), [5, 2])
+            self.assertEqual(self.cli.game.dice.get_values(), (5, 2))
+        self.assertEqual(self.roll.call_count, 1)
+
+    def test_redo(self):
+        """Test that undone actions are played again."""
+        self.play_turn()
+        after = from_board(self.cli.game.board)
+        for _ in range(3):
+            self.cli.process_input("undo")
+        for _ in range(3):
+            self.cli.process_input("redo")
+        self.assertEqual(from_board(self.cli.game.board), after)
+        self.assertEqual(self.cli.game.current_player, "black")
+        self.assertFalse(self.cli.state_manager.has_rolled)
+
+    def test_new_action_drops_redo(self):
+        """Test that a move after an undo cannot be redone over."""
+        self.play_turn()
+        self.cli.process_input("undo")
+        self.cli.process_input("skip")
+        self.assertFalse(self.cli.log.can_redo())
+
+    def test_undo_hit(self):
+        """Test that undoing a hit takes the checker back from the bar."""
+        self.cli.game.board.points[4] = ["B"]
+        self.cli.game.board.points[0] = ["B"]
+        self.cli.log = GameLog(self.cli.snapshot())
+        self.cli.process_input("roll")
+        self.cli.process_input("move 7 4")
+        self.assertEqual(self.cli.game.board.bar["B"], 1)
+        self.cli.process_input("undo")
+        self.assertEqual(self.cli.game.board.bar["B"], 0)
+        self.assertEqual(self.cli.game.board.points[4], ["B"])
+
+
+class TestSaveLoadCommands(unittest.TestCase):
+    """Tests for the save and load commands."""
+
+    def setUp(self):
+        """Set up a CLI with fixed dice and a mocked UI."""
+        self.cli = BackgammonCLI()
+        self.cli.ui = MagicMock(spec=UserInterface)
+        self.cli.game.dice.set_mock_rolls([(3, 1)])
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "Game.sav")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_save_and_load(self):
+        """Test that a game in the middle of a turn is resumed."""
+        for line in ("roll", "move 7 4", f"save {self.path}"):
+            self.cli.process_input(line)
+        board = self.cli.game.get_board()
+
+        other = BackgammonCLI()
+        other.ui = MagicMock(spec=UserInterface)
+        other.process_input(f"load {self.path}")
+        other.ui.display_error.assert_not_called()
+        self.assertEqual(other.game.get_board(), board)
+        self.assertIs(other.state_manager.game, other.game)
+        self.assertEqual(other.state_manager.get_remaining(), [1])
+        self.assertFalse(other.log.can_undo())
+
+    def test_default_file(self):
+        """Test that save and load without a file use the default one."""
+        with patch.object(Game, "save") as mock_save, patch.object(Game, "load") as mock_load:
+            self.cli.process_input("save")
+            self.cli.process_input("load")
+        self.assertEqual(mock_save.call_args[0][0], "backgammon.sav")
+        self.assertEqual(mock_load.call_args[0][0], "backgammon.sav")
+
+    def test_load_errors(self):
+        """Test that missing and invalid files are reported."""
+        with open(self.path, "wb") as file:
+            file.write(b"not a game")
+        game = self.cli.game
+        self.cli.process_input(f"load {self.path}")
+        self.cli.process_input(f"load {self.path}.missing")
+        self.assertEqual(self.cli.ui.display_error.call_count, 2)
+        self.assertIs(self.cli.game, game)
+
+
 if __name__ == "__main__":
     unittest.main()
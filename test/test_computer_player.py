@@ -0,0 +1,91 @@
+"""
+Unit tests for pygame_ui/computer_player.py
+"""
+
+import threading
+import time
+import unittest
+
+from core.board import Board
+from engine.position import from_board
+from pygame_ui.computer_player import ComputerPlayer
+
+
+def wait_for_play(player: ComputerPlayer, timeout: float = 5.0):
+    """Poll like the render loop does until a play arrives."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        play = player.poll()
+        if play is not None:
+            return play
+        time.sleep(0.001)
+    raise AssertionError("no play received")
+
+
+class TestComputerPlayer(unittest.TestCase):
+    """Tests for ComputerPlayer."""
+
+    def setUp(self):
+        """Create a player with a recording policy."""
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+        def policy(position, color, roll):
+            self.release.wait(5)
+            self.calls.append((position, color, roll))
+            return ((0, roll[0]),)
+
+        self.player = ComputerPlayer("B", bot_factory=lambda: policy)
+        self.addCleanup(self.player.stop)
+
+    def test_request_and_poll(self):
+        """Test that the worker answers through the queue."""
+        board = Board()
+        self.assertIsNone(self.player.poll())
+        self.player.request_play(board, [3, 5])
+        self.assertTrue(self.player.thinking)
+
+        self.assertEqual(wait_for_play(self.player), ((0, 3),))
+        self.assertFalse(self.player.thinking)
+        self.assertEqual(self.calls, [(from_board(board), "B", (3, 5))])
+
+    def test_poll_does_not_block(self):
+        """Test that polling returns at once while the worker thinks."""
+        self.release.clear()
+        self.player.request_play(Board(), [1, 2])
+        start = time.perf_counter()
+        self.assertIsNone(self.player.poll())
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.release.set()
+        self.assertEqual(wait_for_play(self.player), ((0, 1),))
+
+    def test_cancelled_result_is_dropped(self):
+        """Test that the answer to a cancelled request is ignored."""
+        self.release.clear()
+        self.player.request_play(Board(), [6, 6])
+        self.player.cancel()
+        self.assertFalse(self.player.thinking)
+        self.player.request_play(Board(), [2, 1])
+        self.release.set()
+        self.assertEqual(wait_for_play(self.player), ((0, 2),))
+
+    def test_failing_policy_passes(self):
+        """Test that an error in the policy gives an empty play."""
+
+        def broken(position, color, roll):
+            raise RuntimeError("engine crashed")
+
+        player = ComputerPlayer("W", bot_factory=lambda: broken)
+        self.addCleanup(player.stop)
+        player.request_play(Board(), [4, 2])
+        self.assertEqual(wait_for_play(player), ())
+
+    def test_stop(self):
+        """Test that stop() ends the worker thread."""
+        self.player.stop()
+        self.assertFalse(self.player._thread.is_alive())  # pylint: disable=protected-access
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Unit tests for pygame_ui/danger_overlay.py
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from config import Config
+from core.board import Board
+from pygame_ui.danger_overlay import DangerOverlay
+
+# pylint: disable=no-member
+
+
+class TestDangerOverlay(unittest.TestCase):
+    """Tests for DangerOverlay."""
+
+    def setUp(self) -> None:
+        """Create an overlay with a mocked font and surface."""
+        self.font = MagicMock()
+        self.overlay = DangerOverlay(font=self.font)
+        self.surface = MagicMock()
+        self.board = Board()
+        self.board.points = [[] for _ in range(24)]
+        self.board.borne_off = {"W": 13, "B": 13}
+
+    @patch("pygame_ui.danger_overlay.pygame.draw.circle")
+    def test_draw_badges(self, mock_circle):
+        """Test one badge per exposed blot of the given player."""
+        self.board.points[10] = ["W"]
+        self.board.points[4] = ["B"]
+        self.board.points[20] = ["B"]
+
+        shots = self.overlay.draw(self.surface, self.board, "B")
+
+        self.assertEqual(shots, {4: 17, 20: 0})
+        self.assertEqual(self.overlay.last_shots, shots)
+        # One filled circle and one outline for the single badge
+        self.assertEqual(mock_circle.call_count, 2)
+        mock_circle.assert_any_call(
+            self.surface,
+            Config.DANGER_BADGE,
+            self.overlay.badge_center(4),
+            Config.CHECKER_RADIUS // 2,
+        )
+        self.font.render.assert_called_once_with("17", True, Config.DANGER_TEXT)
+        self.surface.blit.assert_called_once()
+
+    @patch("pygame_ui.danger_overlay.pygame.draw.circle")
+    def test_no_blots(self, mock_circle):
+        """Test that nothing is drawn without blots."""
+        self.board.points[10] = ["W", "W"]
+        self.assertEqual(self.overlay.draw(self.surface, self.board, "W"), {})
+        mock_circle.assert_not_called()
+
+    def test_badge_center(self):
+        """Test the badge sides and that points in a row are spaced evenly."""
+        top_x, top_y = self.overlay.badge_center(12)
+        bottom_x, bottom_y = self.overlay.badge_center(11)
+        self.assertEqual(top_x, bottom_x)
+        self.assertLess(top_y, bottom_y)
+        step = self.overlay.badge_center(13)[0] - top_x
+        self.assertGreater(step, 0)
+        self.assertEqual(self.overlay.badge_center(14)[0] - top_x, 2 * step)
+        # Across the bar, point 5 lies right of point 6
+        self.assertGreater(
+            self.overlay.badge_center(5)[0], self.overlay.badge_center(6)[0]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
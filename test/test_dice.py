@@ -127,6 +127,16 @@ class TestDice(unittest.TestCase):
         self.assertTrue(1 <= v1 <= 6)
         self.assertTrue(1 <= v2 <= 6)
 
+    def test_mock_accessors(self):
+        """Test the mock sequence and index getters."""
+        self.assertIsNone(self.dice.mock_rolls)
+        self.dice.set_mock_rolls([(1, 2), (3, 4), (5, 6)], index=2)
+        self.assertEqual(self.dice.mock_index, 2)
+        self.assertEqual(self.dice.roll(), (5, 6))
+        self.assertEqual(self.dice.mock_rolls, [(1, 2), (3, 4), (5, 6)])
+        with self.assertRaises(ValueError):
+            self.dice.set_mock_rolls([(1, 2)], index=2)
+
     def test_invalid_mock_values(self):
         """Test setting invalid mock values."""
         with self.assertRaises(ValueError):
@@ -180,5 +190,25 @@ class TestDice(unittest.TestCase):
         self.assertTrue(found_different, "Consecutive rolls should eventually differ")
 
 
+    def test_slots(self):
+        """Test that dice have a fixed layout and no instance dict."""
+        self.assertFalse(hasattr(self.dice, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.dice.extra = 1
+
+    @patch("random.randint", side_effect=[6, 3])
+    def test_roll_skips_setters(self, _):
+        """Test that random rolls do not go through the validating setters."""
+        # A property without a setter raises if roll() assigns die1
+        with patch.object(Dice, "die1", new_callable=property):
+            self.assertEqual(self.dice.roll(), (6, 3))
+        self.assertEqual(self.dice.get_moves(), [6, 3])
+
+    def test_mock_rolls_still_validated(self):
+        """Test that mock values keep the type check of the setters."""
+        self.dice.set_mock_rolls([(2.0, 3)])
+        with self.assertRaises(TypeError):
+            self.dice.roll()
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,105 @@
+"""Tests for core/dice_stream.py"""
+
+import unittest
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from unittest.mock import patch
+
+from core.Dice import Dice
+from core.dice_stream import ROLL_BYTES, ROLLS, DiceStream, derive_seed
+
+
+def first_rolls(seed: int, count: int):
+    """Rolls of a new stream, for the pool test."""
+    return list(islice(DiceStream(seed), count))
+
+
+class TestDiceStream(unittest.TestCase):
+    """Tests for DiceStream."""
+
+    def test_reproducible_and_fair(self):
+        """Test that a seed always gives the same valid, evenly spread rolls."""
+        rolls = list(islice(DiceStream(5, block_size=1000), 36000))
+        self.assertEqual(rolls, list(islice(DiceStream(5), 36000)))
+        counts = Counter(rolls)
+        self.assertEqual(len(counts), 36)
+        self.assertTrue(all(800 < count < 1200 for count in counts.values()))
+        self.assertNotEqual(rolls[:50], list(islice(DiceStream(6), 50)))
+
+    def test_take_matches_iteration(self):
+        """Test bulk reads across block boundaries."""
+        stream = DiceStream(3, block_size=5)
+        next(stream)
+        data = stream.take(12)
+        self.assertEqual(len(data), 12)
+        self.assertEqual(stream.consumed, 13)
+        self.assertEqual([ROLLS[byte] for byte in data], first_rolls(3, 13)[1:])
+        self.assertEqual(next(stream), first_rolls(3, 14)[13])
+
+    def test_spawn(self):
+        """Test that children are independent, numbered and reproducible."""
+        parent = DiceStream(9)
+        children = parent.spawn(2) + parent.spawn(1)
+        seeds = [child.seed for child in children]
+        self.assertEqual(seeds, [derive_seed(9, index) for index in range(3)])
+        self.assertEqual(len(set(seeds + [9])), 4)
+        self.assertEqual(first_rolls(9, 20), list(islice(parent, 20)))
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            remote = executor.submit(first_rolls, seeds[1], 20).result()
+        self.assertEqual(remote, list(islice(children[1], 20)))
+
+    def test_tables(self):
+        """Test the byte encoding of rolls."""
+        self.assertEqual(len(ROLL_BYTES), 36)
+        self.assertEqual(ROLLS[0x36], (3, 6))
+        self.assertIsNone(ROLLS[0x07])
+        self.assertIsNone(ROLLS[0x61 + 0x10])
+
+    def test_skip_matches_iteration(self):
+        """Test that skipped rolls are the ones iteration would give."""
+        stream = DiceStream(8, block_size=16)
+        stream.skip(40)
+        self.assertEqual(stream.consumed, 40)
+        self.assertEqual(list(islice(stream, 5)), first_rolls(8, 45)[40:])
+
+    def test_block_size(self):
+        """Test that a block holds at least one roll."""
+        with self.assertRaises(ValueError):
+            DiceStream(1, block_size=0)
+
+
+class TestDiceSource(unittest.TestCase):
+    """Tests for Dice with a roll source."""
+
+    def test_rolls_from_stream(self):
+        """Test that Dice.roll() takes the stream's rolls in order."""
+        dice = Dice(DiceStream(4))
+        rolls = [dice.roll() for _ in range(10)]
+        self.assertEqual(rolls, first_rolls(4, 10))
+        self.assertEqual(dice.get_values(), rolls[-1])
+
+    @patch("random.randint", side_effect=[2, 5])
+    def test_mocks_first_and_back_to_random(self, _):
+        """Test that mock rolls come first and None restores random rolls."""
+        dice = Dice()
+        dice.set_source(DiceStream(4))
+        dice.set_mock_rolls([(6, 6)])
+        self.assertEqual(dice.roll(), (6, 6))
+        self.assertEqual(dice.roll(), first_rolls(4, 1)[0])
+        dice.set_source(None)
+        self.assertEqual(dice.roll(), (2, 5))
+
+    def test_reset_detaches_stream(self):
+        """Test that reset goes back to the random module."""
+        stream = DiceStream(4)
+        dice = Dice(stream)
+        self.assertIs(dice.source, stream)
+        dice.reset()
+        self.assertIsNone(dice.source)
+        dice.roll()
+        self.assertEqual(stream.consumed, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+"""Tests for core/dice_tape.py"""
+
+import io
+import itertools
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from core.BackgammonGame import Game
+from core.Dice import Dice
+from core.dice_stream import DiceStream
+from core.dice_tape import DiceTape, main, write_tape
+from core.savegame import TapePosition, capture, decode, encode, restore
+
+ROLLS = [(3, 1), (6, 6), (2, 5), (4, 4), (1, 6)]
+
+
+class Unseekable(io.RawIOBase):
+    """A binary stream that can only be read forward, like a pipe."""
+
+    def __init__(self, data: bytes):
+        self.data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        return self.data.read(size)
+
+
+class TestDiceTape(unittest.TestCase):
+    """Tests for DiceTape and write_tape()."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "rolls.tape")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        """Test that a tape gives back its rolls, one byte each."""
+        self.assertEqual(write_tape(self.path, iter(ROLLS)), 5)
+        self.assertEqual(os.path.getsize(self.path), 5 + 5)
+        with DiceTape(self.path, chunk_size=2) as tape:
+            self.assertEqual(list(tape), ROLLS)
+            self.assertEqual(tape.position, 5)
+
+    def test_stream_to_tape(self):
+        """Test that a dice stream is copied in bulk."""
+        self.assertEqual(write_tape(self.path, DiceStream(2), 1000, chunk_size=300), 1000)
+        with DiceTape(self.path) as tape:
+            self.assertEqual(list(tape), list(itertools.islice(DiceStream(2), 1000)))
+        with self.assertRaises(ValueError):
+            write_tape(self.path, DiceStream(2))
+
+    def test_ranges_are_shared(self):
+        """Test that tapes over the same file give the same rolls."""
+        write_tape(self.path, ROLLS)
+        with DiceTape(self.path, start=1, count=3) as first:
+            with DiceTape(self.path, start=1, count=3) as second:
+                self.assertEqual(list(first), ROLLS[1:4])
+                self.assertEqual(list(second), ROLLS[1:4])
+        with open(self.path, "rb") as file:
+            data = file.read()
+        self.assertEqual(list(DiceTape(Unseekable(data), start=3)), ROLLS[3:])
+        self.assertEqual(list(DiceTape(iter(ROLLS), start=2, count=2)), ROLLS[2:4])
+
+    def test_incremental_validation(self):
+        """Test that a bad roll fails when it is reached, not before."""
+        write_tape(self.path, ROLLS)
+        with open(self.path, "r+b") as file:
+            file.seek(5 + 3)
+            file.write(b"\x47")
+        with DiceTape(self.path) as tape:
+            self.assertEqual([next(tape) for _ in range(3)], ROLLS[:3])
+            with self.assertRaisesRegex(ValueError, "0x47 at roll 3"):
+                next(tape)
+
+        rolls = DiceTape(iter([(1, 2), (3, 4), (7, 1)]))
+        self.assertEqual(next(rolls), (1, 2))
+        self.assertEqual(next(rolls), (3, 4))
+        with self.assertRaisesRegex(ValueError, "roll 2"):
+            next(rolls)
+        with self.assertRaises(ValueError):
+            write_tape(self.path, [(1, 2), [3, 4]])
+
+    def test_endless_iterator(self):
+        """Test that an iterator source is never materialized."""
+        tape = DiceTape(itertools.cycle(ROLLS))
+        self.assertEqual(list(itertools.islice(tape, 12)), (ROLLS * 3)[:12])
+
+    def test_not_a_tape(self):
+        """Test the header checks."""
+        with open(self.path, "wb") as file:
+            file.write(b"BGSV\x01")
+        with self.assertRaisesRegex(ValueError, "Not a dice tape"):
+            DiceTape(self.path)
+        with self.assertRaisesRegex(ValueError, "version 9"):
+            DiceTape(io.BytesIO(b"BGDT\x09"))
+        with self.assertRaises(ValueError):
+            DiceTape(io.BytesIO(b"BG"))
+
+    def test_main(self):
+        """Test the command line tape writer."""
+        with patch("builtins.print"):
+            main([self.path, "--seed", "4", "--rolls", "50"])
+        with DiceTape(self.path) as tape:
+            self.assertEqual(list(tape), list(itertools.islice(DiceStream(4), 50)))
+
+
+class TestDiceWithTape(unittest.TestCase):
+    """Tests for Dice reading a tape."""
+
+    def test_rolls_then_end(self):
+        """Test that Dice.roll() plays the tape and stops at its end."""
+        dice = Dice(DiceTape(iter(ROLLS[:2])))
+        self.assertEqual(dice.roll(), (3, 1))
+        self.assertEqual(dice.roll(), (6, 6))
+        self.assertEqual(dice.get_moves(), [6, 6, 6, 6])
+        with self.assertRaises(EOFError):
+            dice.roll()
+
+
+class TestSavedTape(unittest.TestCase):
+    """Tests for saving a game that rolls from a tape."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "rolls.tape")
+        write_tape(self.path, ROLLS)
+        self.game = Game()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_saved_game_resumes_tape(self):
+        """Test that a restored game reads the rest of the tape range."""
+        with DiceTape(self.path, start=1, count=3) as tape:
+            self.game.dice.set_source(tape)
+            self.assertEqual(self.game.dice.roll(), (6, 6))
+            saved = decode(encode(capture(self.game.board, self.game.dice, "W")))
+        self.assertEqual(saved.dice_source, TapePosition(self.path, 2, 4))
+
+        other = Game()
+        restore(saved, other.board, other.dice)
+        self.assertEqual([other.dice.roll() for _ in range(2)], ROLLS[2:4])
+        with self.assertRaises(EOFError):
+            other.dice.roll()
+        other.dice.source.close()
+
+    def test_whole_tape(self):
+        """Test a tape without a range."""
+        with DiceTape(self.path) as tape:
+            self.game.dice.set_source(tape)
+            saved = decode(encode(capture(self.game.board, self.game.dice, "W")))
+        self.assertEqual(saved.dice_source, TapePosition(self.path, 0))
+        restore(saved, self.game.board, self.game.dice)
+        self.assertEqual(list(self.game.dice.source), ROLLS)
+        self.game.dice.source.close()
+
+    def test_restore_closes_replaced_tape(self):
+        """Test that restoring a game closes the tape it replaces."""
+        saved = capture(self.game.board, self.game.dice, "W")
+        tape = DiceTape(self.path)
+        file = tape._file  # pylint: disable=protected-access
+        self.game.dice.set_source(tape)
+        restore(saved, self.game.board, self.game.dice)
+        self.assertIsNone(self.game.dice.source)
+        self.assertTrue(file.closed)
+
+    def test_unsaved_tapes_are_refused(self):
+        """Test that tapes without a path cannot be saved."""
+        with open(self.path, "rb") as file:
+            for tape in (DiceTape(file), DiceTape(iter(ROLLS))):
+                self.game.dice.set_source(tape)
+                with self.assertRaises(ValueError):
+                    capture(self.game.board, self.game.dice, "W")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""Tests for the evaluator dispatching Engine."""
+
+import unittest
+from unittest.mock import patch
+
+from engine.engine import Engine
+from engine.neural import NeuralEvaluator, NeuralNet
+from engine.position import has_contact, initial_position
+from test.test_race import race_position
+
+
+class TestEngine(unittest.TestCase):
+    """Tests for Engine."""
+
+    def setUp(self):
+        """Create an engine with a small network."""
+        self.engine = Engine(NeuralEvaluator(NeuralNet(hidden=4, seed=0)))
+
+    def test_has_contact(self):
+        """Test the contact check on compact positions."""
+        self.assertTrue(has_contact(initial_position()))
+        self.assertFalse(has_contact(race_position()))
+
+    def test_race_skips_network(self):
+        """Test that race positions never reach the network."""
+        with patch.object(self.engine.neural, "win_probabilities") as neural:
+            ranked = self.engine.rank_plays(race_position(), "W", (6, 2))
+        neural.assert_not_called()
+        self.assertTrue(ranked)
+
+    def test_mixed_batch(self):
+        """Test that a mixed batch is split between evaluators."""
+        positions = [initial_position(), race_position()]
+        probs = self.engine.win_probabilities(positions, "W")
+        self.assertAlmostEqual(
+            probs[0], self.engine.neural.win_probabilities([positions[0]], "W")[0]
+        )
+        self.assertAlmostEqual(
+            probs[1], self.engine.race.win_probability(positions[1], "W")
+        )
+
+    def test_best_play_in_contact(self):
+        """Test that contact positions are ranked by the network."""
+        play = self.engine.best_play(initial_position(), "W", (3, 1))
+        self.assertEqual(play, self.engine.neural.best_play(initial_position(), "W", (3, 1)))
+
+    def test_stats_per_class(self):
+        """Test that positions and timings are counted per class."""
+        self.engine.win_probabilities([initial_position(), race_position()], "W")
+        stats = self.engine.stats()
+        self.assertEqual(stats["contact"][0], 1)
+        self.assertEqual(stats["race"][0] + stats["bearoff1"][0], 1)
+        self.assertGreaterEqual(stats["contact"][1], 0.0)
+        self.assertIn("classifier cache", self.engine.report())
+        self.engine.reset_stats()
+        self.assertEqual(self.engine.stats()["contact"], (0, 0.0))
+
+    def test_terminal_is_exact(self):
+        """Test that finished games never reach an evaluator."""
+        position = [0] * 28
+        position[27] = 15
+        position[5] = 3
+        position[26] = 12
+        with patch.object(self.engine.race, "win_probabilities") as race:
+            probs = self.engine.win_probabilities([tuple(position)], "W")
+        race.assert_not_called()
+        self.assertEqual(probs[0], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
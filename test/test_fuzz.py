@@ -0,0 +1,115 @@
+"""Tests for the Board and Game fuzzer."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from core.BackgammonGame import Game
+from core.board import Board
+from engine.position import BLACK_BAR, from_board
+from fuzz.__main__ import main, run
+from fuzz.fuzzer import (
+    Model,
+    execute,
+    fuzz_seed,
+    fuzz_seeds,
+    minimize,
+    replay,
+    reproducer,
+)
+
+ORIGINAL_IS_VALID_MOVE = Board.is_valid_move
+
+
+def ignore_blocks(board, from_point, to_point, color):
+    """A bug: moves onto points the opponent holds are allowed."""
+    if 0 <= to_point < 24 and len(board.points[to_point]) >= 2:
+        return 0 <= from_point < 24 and bool(board.points[from_point])
+    return ORIGINAL_IS_VALID_MOVE(board, from_point, to_point, color)
+
+
+class TestFuzzer(unittest.TestCase):
+    """Tests for the runs, the model and minimization."""
+
+    def test_clean_seeds(self):
+        """Test that the current Board and Game hold every invariant."""
+        self.assertEqual(fuzz_seeds(0, 5, 1000), (5000, None))
+
+    def test_model_matches_operations(self):
+        """Test hits, the bar and bearing off in the model and the game."""
+        operations = [
+            ("move", 0, 4, "B"),
+            ("move", 5, 4, "W"),
+            ("enter", 19, "B"),
+            ("enter", 2, "B"),
+            ("roll", 4, 4),
+            ("switch",),
+            ("play", 0, 1),
+            ("bear_off", "B", 30),
+            ("reset",),
+        ]
+        self.assertIsNone(replay(operations))
+        model = Model()
+        for operation in operations[:4]:
+            model.apply(operation)
+        self.assertEqual(model.position[:6], [-1, 0, -1, 0, 1, 4])
+        self.assertEqual(model.position[BLACK_BAR], 0)
+
+    def test_failure_is_found_and_minimized(self):
+        """Test that a broken rule is caught and cut down to one move."""
+        with patch.object(Board, "is_valid_move", ignore_blocks):
+            failure = fuzz_seed(1, 1000)
+            self.assertIsNotNone(failure)
+            self.assertEqual(fuzz_seed(1, 1000), failure)
+            small = minimize(failure)
+            self.assertLessEqual(len(small.operations), 2)
+            self.assertEqual(small.invariant, failure.invariant)
+            self.assertEqual(replay(small.operations, small.seed), small)
+
+            namespace = {}
+            exec(reproducer(small), namespace)  # pylint: disable=exec-used
+        model = Model()
+        for operation in small.operations:
+            model.apply(operation)
+        self.assertNotEqual(list(from_board(namespace["game"].board)), model.position)
+
+    def test_exception_is_a_failure(self):
+        """Test that an exception in the game is reported."""
+        with patch.object(Board, "bear_off", side_effect=RuntimeError("boom")):
+            failure = replay([("switch",), ("bear_off", "W", 3)], seed=3)
+        self.assertEqual(failure.invariant, "exception")
+        self.assertEqual(failure.detail, "RuntimeError: boom")
+        self.assertEqual(failure.step, 1)
+
+    def test_execute_roll(self):
+        """Test that rolls go through the game dice."""
+        model, game = Model(), Game()
+        self.assertEqual(execute(game, ("roll", 2, 2)), model.apply(("roll", 2, 2)))
+        self.assertEqual(game.dice.get_values(), (2, 2))
+
+
+class TestMain(unittest.TestCase):
+    """Tests for run() and the command line."""
+
+    def test_run_counts_seeds(self):
+        """Test an in-process session over a fixed number of seeds."""
+        report = run(10, 200, workers=0, seconds=60, seeds=3)
+        self.assertEqual((report.seeds, report.operations), (3, 600))
+        self.assertIsNone(report.failure)
+
+    def test_main_writes_reproducer(self):
+        """Test the exit status and the reproducer file."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "repro.py")
+            argv = ["--workers", "0", "--seeds", "4", "--steps", "500", "--output", path]
+            with patch("builtins.print"):
+                self.assertEqual(main(argv[:6]), 0)
+                with patch.object(Board, "is_valid_move", ignore_blocks):
+                    self.assertEqual(main(argv), 1)
+            with open(path, encoding="utf-8") as file:
+                self.assertIn("game = Game()", file.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+"""Tests for the event-sourced game log."""
+
+import unittest
+
+from core.board import Board
+from engine.game_log import (
+    BEAR_OFF,
+    END_TURN,
+    ENTER,
+    HIT,
+    MOVE,
+    ROLL,
+    Event,
+    GameLog,
+    Snapshot,
+    apply_event,
+    checker_events,
+    move_events,
+)
+from engine.position import initial_position
+from test.test_shots import shot_position
+
+
+def start_state() -> Snapshot:
+    """State of a new game."""
+    return Snapshot(initial_position(), "W")
+
+
+class TestEvents(unittest.TestCase):
+    """Tests for apply_event() and the event builders."""
+
+    def test_roll_and_end_turn(self):
+        """Test that rolls set the dice and ends of turn clear them."""
+        state = apply_event(start_state(), Event(ROLL, "W", dice=(6, 5)))
+        self.assertEqual((state.dice, state.roll, state.rolled), ((6, 5), (6, 5), True))
+        state = apply_event(state, Event(END_TURN, "W"))
+        self.assertEqual(state, Snapshot(initial_position(), "B"))
+
+    def test_move_uses_die(self):
+        """Test a checker move and the die it uses."""
+        state = start_state()._replace(dice=(3, 1), roll=(3, 1), rolled=True)
+        state = apply_event(state, Event(MOVE, "W", 7, 4, (3,)))
+        self.assertEqual(state.position[7], 2)
+        self.assertEqual(state.position[4], 1)
+        self.assertEqual(state.dice, (1,))
+
+    def test_hit_enter_and_bear_off(self):
+        """Test the bar and borne off counters of both colors."""
+        state = Snapshot(shot_position({2: 1}, {4: 1}, white_bar=1), "W")
+        for event in (Event(HIT, "B", dst=4), Event(ENTER, "W", dst=4)):
+            state = apply_event(state, event)
+        self.assertEqual((state.position[4], state.position[24], state.position[25]), (1, 0, 1))
+        state = apply_event(state, Event(BEAR_OFF, "W", src=2))
+        self.assertEqual((state.position[2], state.position[26]), (0, 14))
+
+    def test_checker_events_hit(self):
+        """Test that a blot on the destination is reported as a hit."""
+        board = Board()
+        board.points[4] = ["B"]
+        events = checker_events(board, MOVE, "W", 7, 4, 3)
+        self.assertEqual(events, [Event(HIT, "B", dst=4), Event(MOVE, "W", 7, 4, (3,))])
+        self.assertEqual(checker_events(board, MOVE, "W", 7, 6), [Event(MOVE, "W", 7, 6)])
+
+    def test_move_events(self):
+        """Test engine moves of both colors, from the bar and off."""
+        position = shot_position({2: 1, 4: 1}, {20: 1, 5: 1}, white_bar=1)
+        self.assertEqual(move_events(position, "W", (24, 20))[-1], Event(ENTER, "W", -1, 20))
+        self.assertEqual(move_events(position, "W", (2, -1)), [Event(BEAR_OFF, "W", 2, -1)])
+        self.assertEqual(
+            move_events(position, "B", (-1, 4)),
+            [Event(HIT, "W", dst=4), Event(ENTER, "B", -1, 4)],
+        )
+        self.assertEqual(move_events(position, "B", (20, 24)), [Event(BEAR_OFF, "B", 20, -1)])
+
+
+class TestGameLog(unittest.TestCase):
+    """Tests for GameLog."""
+
+    def setUp(self):
+        self.log = GameLog(start_state(), keyframe_interval=4)
+
+    def play(self, turns: int) -> None:
+        """Record turns of rolls, two moves and an end of turn."""
+        for _ in range(turns):
+            color = self.log.state.turn
+            src = 7 if color == "W" else 16
+            step = -1 if color == "W" else 1
+            self.log.record([Event(ROLL, color, dice=(1, 2))])
+            self.log.record([Event(MOVE, color, src, src + step, (1,))])
+            self.log.record(
+                [Event(MOVE, color, src, src + 2 * step, (2,)), Event(END_TURN, color)]
+            )
+
+    def test_keyframes(self):
+        """Test that keyframes are taken every few events only."""
+        self.play(4)
+        self.assertEqual(len(self.log.events), 16)
+        self.assertEqual(sorted(self.log.keyframes), [0, 4, 8, 12, 16])
+
+    def test_state_at_matches_replay(self):
+        """Test that seeking equals replaying from the start."""
+        self.play(3)
+        state = start_state()
+        for index, event in enumerate(self.log.events, 1):
+            state = apply_event(state, event)
+            self.assertEqual(self.log.state_at(index), state)
+        self.assertEqual(self.log.state, state)
+        with self.assertRaises(IndexError):
+            self.log.state_at(len(self.log.events) + 1)
+
+    def test_undo_redo(self):
+        """Test stepping back and forward one action at a time."""
+        self.play(2)
+        end = self.log.state
+        self.assertEqual(self.log.undo(), self.log.state_after(5))
+        self.assertEqual(self.log.undo().dice, (1, 2))
+        self.assertEqual(self.log.redo(), self.log.state_after(5))
+        self.assertEqual(self.log.redo(), end)
+        self.assertIsNone(self.log.redo())
+
+    def test_undo_to_start(self):
+        """Test that undo stops at the start."""
+        self.play(1)
+        for _ in range(3):
+            self.log.undo()
+        self.assertEqual(self.log.state, start_state())
+        self.assertIsNone(self.log.undo())
+
+    def test_record_drops_undone_actions(self):
+        """Test that recording after an undo truncates the history."""
+        self.play(2)
+        for _ in range(4):
+            self.log.undo()
+        self.log.record([Event(END_TURN, "W")])
+        self.assertEqual(self.log.actions, 3)
+        self.assertFalse(self.log.can_redo())
+        self.assertEqual(len(self.log.events), 3)
+        self.assertEqual(sorted(self.log.keyframes), [0])
+        self.assertEqual(self.log.state.turn, "B")
+
+    def test_undone_rolls_come_back(self):
+        """Test that undone rolls are handed out again, oldest first."""
+        self.log.record([Event(ROLL, "W", dice=(3, 1))])
+        self.log.record([Event(END_TURN, "W")])
+        self.log.record([Event(ROLL, "B", dice=(6, 5))])
+        self.assertIsNone(self.log.take_roll())
+        for _ in range(3):
+            self.log.undo()
+        self.log.redo()
+        # The first roll was redone, so only the second one is left
+        self.assertEqual(self.log.take_roll(), (6, 5))
+        self.assertIsNone(self.log.take_roll())
+
+        self.log.undo()
+        self.log.record([Event(END_TURN, "W")])
+        self.assertEqual(self.log.take_roll(), (3, 1))
+
+    def test_join(self):
+        """Test that a joined event is undone with the action before it."""
+        self.log.record([Event(ROLL, "W", dice=(3, 1))])
+        self.log.record([Event(END_TURN, "W")], join=True)
+        self.assertEqual(self.log.actions, 1)
+        self.log.undo()
+        self.assertEqual(self.log.state, start_state())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+"""Tests for the binary game records."""
+
+import io
+import random
+import unittest
+
+from engine.game_record import (
+    GameRecordWriter,
+    decode_turn,
+    encode_turn,
+    read_games,
+    read_header,
+    read_turns,
+)
+from engine.movegen import legal_plays
+from engine.position import from_board, initial_position
+from engine.selfplay import HeadlessGame
+from test.test_shots import shot_position
+
+
+def random_games(count: int, seed: int = 0):
+    """Play quick games with a random policy."""
+    rng = random.Random(seed)
+
+    def policy(position, color, roll):
+        return rng.choice(legal_plays(position, color, roll))[0]
+
+    games = []
+    for index in range(count):
+        random.seed(seed + index)
+        games.append(HeadlessGame(max_turns=60).play(policy))
+    return games
+
+
+class TestTurnEncoding(unittest.TestCase):
+    """Tests for encode_turn() and decode_turn()."""
+
+    def test_round_trip(self):
+        """Test plays of both colors, bar entries and doubles."""
+        cases = [
+            ("W", (3, 1), ((7, 4), (5, 4))),
+            ("B", (6, 5), ((0, 6), (6, 11))),
+            ("W", (2, 2), ((24, 22), (22, 20), (5, 3), (5, 3))),
+            ("B", (4, 1), ((-1, 3), (3, 4))),
+            ("W", (5, 5), ()),
+        ]
+        for color, roll, play in cases:
+            data = encode_turn(color, roll, play)
+            self.assertEqual(len(data), 1 + len(play))
+            self.assertEqual(decode_turn(color, data), (roll, play))
+
+    def test_bear_off(self):
+        """Test bearing off with exact and larger dice."""
+        for color, roll, play in [
+            ("W", (6, 2), ((3, -1), (1, -1))),
+            ("B", (6, 3), ((20, 24), (22, 24))),
+        ]:
+            self.assertEqual(decode_turn(color, encode_turn(color, roll, play)), (roll, play))
+
+    def test_invalid_turns(self):
+        """Test plays that cannot be encoded."""
+        with self.assertRaises(ValueError):
+            encode_turn("W", (3, 1), ((10, 5),))
+        with self.assertRaises(ValueError):
+            encode_turn("W", (1, 1), ((5, 4),) * 5)
+
+
+class TestRecords(unittest.TestCase):
+    """Tests for writing and reading whole streams."""
+
+    def setUp(self):
+        """Record a few random games."""
+        self.games = random_games(5)
+        self.buffer = io.BytesIO()
+        writer = GameRecordWriter(self.buffer, seed=99)
+        for index, game in enumerate(self.games):
+            writer.write_game(game, seed=index)
+        self.assertEqual(writer.games, 5)
+        self.data = self.buffer.getvalue()
+
+    def test_games_round_trip(self):
+        """Test that every game is read back exactly."""
+        stream = io.BytesIO(self.data)
+        self.assertEqual(read_header(io.BytesIO(self.data)), 99)
+        games = list(read_games(stream))
+        self.assertEqual(len(games), len(self.games))
+        for index, (read, game) in enumerate(zip(games, self.games)):
+            self.assertEqual(read.seed, index)
+            self.assertEqual(read.start, initial_position())
+            self.assertEqual(read.first, "W")
+            self.assertEqual(read.winner, game.winner)
+            self.assertEqual([roll for roll, _ in read.turns], [tuple(r) for r in game.rolls])
+            self.assertEqual([play for _, play in read.turns], list(game.plays))
+
+    def test_compact(self):
+        """Test the size: one byte per roll and per checker moved."""
+        turns = sum(len(game.plays) for game in self.games)
+        moves = sum(len(play) for game in self.games for play in game.plays)
+        self.assertEqual(len(self.data), 14 + 5 * (10 + 2) + turns + moves)
+
+    def test_read_turns_is_lazy(self):
+        """Test boards and plays of the turn generator."""
+        turns = read_turns(io.BytesIO(self.data))
+        board, roll, play = next(turns)
+        self.assertEqual(from_board(board), initial_position())
+        self.assertEqual(roll, tuple(self.games[0].rolls[0]))
+        self.assertEqual(play, self.games[0].plays[0])
+
+        positions = [p for game in self.games for p in game.positions[:-1]]
+        rest = [from_board(board) for board, _, _ in turns]
+        self.assertEqual(rest, positions[1:])
+
+    def test_custom_start_and_black_first(self):
+        """Test a game from a set position with Black on roll."""
+        start = shot_position({5: 2}, {20: 2})
+        buffer = io.BytesIO()
+        writer = GameRecordWriter(buffer)
+        writer.begin_game(seed=3, start=start, first="B")
+        writer.add_turn((4, 1), ((20, 24), (20, 21)))
+        writer.add_turn((6, 5), ((5, -1), (5, 0)))
+        writer.end_game()
+        game = next(read_games(io.BytesIO(buffer.getvalue())))
+        self.assertEqual(game.start, start)
+        self.assertEqual(game.first, "B")
+        self.assertEqual(game.winner, "")
+        self.assertEqual(game.turns[1], ((6, 5), ((5, -1), (5, 0))))
+
+    def test_writer_misuse(self):
+        """Test the writer's call order checks."""
+        writer = GameRecordWriter(io.BytesIO())
+        with self.assertRaises(RuntimeError):
+            writer.add_turn((1, 2), ())
+        with self.assertRaises(RuntimeError):
+            writer.end_game()
+        writer.begin_game()
+        with self.assertRaises(RuntimeError):
+            writer.begin_game()
+
+    def test_context_manager_closes(self):
+        """Test that the writer closes its stream."""
+        stream = io.BytesIO()
+        with GameRecordWriter(stream) as writer:
+            writer.begin_game()
+            writer.end_game("W")
+        self.assertTrue(stream.closed)
+
+    def test_bad_streams(self):
+        """Test truncated and foreign data."""
+        with self.assertRaises(ValueError):
+            list(read_games(io.BytesIO(b"NOPE" + bytes(10))))
+        with self.assertRaises(ValueError):
+            list(read_games(io.BytesIO(self.data[:-1])))
+        with self.assertRaises(ValueError):
+            list(read_games(io.BytesIO(self.data[:20])))
+
+
+if __name__ == "__main__":
+    unittest.main()
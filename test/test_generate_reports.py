@@ -0,0 +1,98 @@
+"""Tests for the performance part of generate_reports.py."""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import generate_reports
+from generate_reports import (
+    IMPROVED,
+    NEW,
+    REGRESSION,
+    UNCHANGED,
+    compare,
+    main,
+    performance_report,
+)
+
+
+def result(rate: float, stdev: float = 1.0) -> dict:
+    """Benchmark fields as written by the harness."""
+    return {"ops_per_sec": rate, "best_ops_per_sec": rate, "stdev_percent": stdev}
+
+
+class TestCompare(unittest.TestCase):
+    """Tests for compare() and performance_report()."""
+
+    def test_statuses(self):
+        """Test regressions, improvements, noise and new benchmarks."""
+        baseline = {"a": result(1000), "b": result(1000), "c": result(1000, 15.0)}
+        current = {"a": result(800), "b": result(1200), "c": result(800, 10.0), "d": result(5)}
+        rows = compare(current, baseline, noise_threshold=10.0)
+        self.assertEqual(
+            [row.status for row in rows], [REGRESSION, IMPROVED, UNCHANGED, NEW]
+        )
+        self.assertAlmostEqual(rows[0].delta_percent, -20.0)
+        # The spread of both runs widens the threshold
+        self.assertEqual(rows[2].threshold, 25.0)
+
+    def test_report(self):
+        """Test the markdown table and its summary."""
+        rows = compare({"a": result(800), "d": result(5)}, {"a": result(1000)})
+        report = performance_report(rows)
+        self.assertIn("**1 regression(s):** a", report)
+        self.assertIn("| a | 1,000 | 800 | -20.0% | ±10.0% | **REGRESSION** |", report)
+        self.assertIn("| d | - | 5 | - |", report)
+        self.assertIn("No regressions.", performance_report(rows[1:]))
+
+
+class TestMain(unittest.TestCase):
+    """Tests for main() in a scratch directory."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.directory.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+
+    def run_main(self, rates, *args):
+        """Run main() with fixed benchmark results."""
+        results = {name: result(rate) for name, rate in rates.items()}
+        with patch.object(generate_reports, "run_benchmarks", return_value=results):
+            return main(list(args))
+
+    def test_first_run_sets_baseline(self):
+        """Test that the first run is the baseline and the history grows."""
+        self.assertEqual(self.run_main({"a": 1000}), 0)
+        self.assertEqual(self.run_main({"a": 500}, "--fail-on-regression"), 1)
+        with open("benchmark_history.jsonl", encoding="utf-8") as file:
+            self.assertEqual(len(file.readlines()), 2)
+        with open("benchmark_baseline.json", encoding="utf-8") as file:
+            self.assertEqual(json.load(file)["results"]["a"]["ops_per_sec"], 1000)
+        with open("REPORTS.md", encoding="utf-8") as file:
+            report = file.read()
+        self.assertIn("## Coverage Report", report)
+        self.assertIn("**REGRESSION**", report)
+
+    def test_update_baseline(self):
+        """Test that --update-baseline replaces the baseline."""
+        self.run_main({"a": 1000})
+        self.run_main({"a": 500}, "--update-baseline")
+        self.assertEqual(self.run_main({"a": 500}, "--fail-on-regression"), 0)
+
+    def test_skip_benchmarks(self):
+        """Test that the performance section can be left out."""
+        with patch.object(generate_reports, "run_benchmarks") as mock_run:
+            self.assertEqual(main(["--skip-benchmarks"]), 0)
+        mock_run.assert_not_called()
+        with open("REPORTS.md", encoding="utf-8") as file:
+            self.assertNotIn("Performance", file.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
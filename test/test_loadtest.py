@@ -0,0 +1,128 @@
+"""Tests for the game server load generator."""
+
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from server.loadtest import (
+    LoadClient,
+    candidate_moves,
+    main,
+    measure_memory,
+    parse_state,
+    percentile,
+    run_load,
+)
+from server.server import GameServer
+
+START = (
+    "turn=W rolled=1 dice=3,1 bar=0,0 off=0,0 "
+    "points=-2,0,0,0,0,5,0,3,0,0,0,5,-5,0,0,0,-3,0,-5,0,0,0,0,2"
+)
+
+
+class TestHelpers(unittest.TestCase):
+    """Tests for the pure helpers."""
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.50), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile(values, 1.0), 100)
+        self.assertEqual(percentile([7], 0.95), 7)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+    def test_parse_state(self):
+        """Test splitting a state line."""
+        state = parse_state(START)
+        self.assertEqual(state["turn"], "W")
+        self.assertEqual(state["dice"], "3,1")
+        self.assertEqual(len(state["points"].split(",")), 24)
+
+    def test_candidate_moves(self):
+        """Test that candidates follow direction and avoid made points."""
+        moves = candidate_moves(parse_state(START))
+        self.assertIn("move 5 4", moves)
+        self.assertIn("move 5 2", moves)
+        self.assertIn("move 23 22", moves)
+        # 23 - 3 = 20 is open, 11 - 1 = 10 is open, 7 - 1 = 6 is open
+        self.assertIn("move 23 20", moves)
+        # Black holds the 0 point with two checkers
+        self.assertNotIn("move 1 0", moves)
+        for move in moves:
+            _, source, target = move.split()
+            self.assertLess(int(target), int(source))
+
+    def test_candidate_moves_from_bar(self):
+        """Test that checkers on the bar are entered first."""
+        state = parse_state(START.replace("bar=0,0", "bar=0,1").replace("turn=W", "turn=B"))
+        self.assertEqual(candidate_moves(state), ["move bar 0", "move bar 2"])
+
+
+class TestLoad(unittest.IsolatedAsyncioTestCase):
+    """Tests against an in-process server."""
+
+    async def asyncSetUp(self):
+        """Start a server on a free port."""
+        self.server = GameServer()
+        listener = await self.server.start_tcp("127.0.0.1", 0)
+        self.port = listener.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        """Stop the server."""
+        await self.server.close()
+
+    async def test_run_load(self):
+        """Test a small load run and its report."""
+        results = await run_load("127.0.0.1", self.port, 6, 3, turns=3, seed=1)
+        self.assertEqual(results["sessions"], 6)
+        self.assertEqual(results["failed_sessions"], 0)
+        self.assertGreater(results["commands"], 6 * 3 * 2)
+        self.assertGreater(results["sessions_per_second"], 0)
+        latency = results["latency_ms"]
+        self.assertLessEqual(latency["p50"], latency["p95"])
+        self.assertLessEqual(latency["p95"], latency["p99"])
+        self.assertLessEqual(latency["p99"], latency["max"])
+        self.assertEqual(len(self.server.tables), 6)
+
+    async def test_client_plays_both_sides(self):
+        """Test that a session moves checkers and passes the turn."""
+        client = LoadClient([])
+        await client.connect("127.0.0.1", self.port)
+        await client.play(random.Random(3), turns=2)
+        ok, lines = await client.command("state")
+        self.assertTrue(ok)
+        self.assertIn("turn=W", lines[0])
+        await client.close()
+        self.assertEqual(len(client.latencies), client.commands)
+
+    async def test_measure_memory(self):
+        """Test the memory probe on this very process."""
+        memory = await measure_memory("127.0.0.1", self.port, os.getpid(), 4)
+        self.assertEqual(memory["sessions"], 4)
+        if memory["server_rss_before_bytes"] is not None:
+            self.assertIsNotNone(memory["memory_per_session_bytes"])
+
+
+class TestMain(unittest.TestCase):
+    """Test the command line run with its own server process."""
+
+    def test_main_writes_json(self):
+        """Test a tiny run end to end."""
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "load.json")
+            results = main(
+                ["--sessions", "4", "--concurrency", "2", "--turns", "2", "--output", output]
+            )
+            with open(output, encoding="utf-8") as stream:
+                written = json.load(stream)
+        self.assertEqual(written["sessions"], 4)
+        self.assertEqual(written["latency_ms"], results["latency_ms"])
+        self.assertEqual(written["memory"]["sessions"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+"""Tests for the match transcript import."""
+
+import io
+import unittest
+
+from core.board import Board
+from engine.matfile import (
+    STANDARD_START,
+    GameText,
+    TranscriptError,
+    apply_notation,
+    game_boards,
+    parse_moves,
+    read_games,
+    replay_game,
+    split_games,
+)
+from engine.position import flip
+from engine.position_id import encode_position_id
+
+SAMPLE = """; [Site "test"]
+ 3 point match
+
+ Game 1
+ Alice : 0                          Bob : 0
+  1)                             52: 13/8 13/11
+  2) 31: 8/5 6/5                 63: 24/18 13/10
+  3) 64: 13/7* 13/9              Doubles => 2
+  4)  Takes                      44: bar/21 13/9(2) 6/2
+  5)  Doubles => 4               Drops
+  6)  Wins 2 points
+
+ Game 2
+ Alice : 2                          Bob : 0
+  1) 65: 24/13                   11: 8/7(2) 6/5(2)
+"""
+
+
+class TestNotation(unittest.TestCase):
+    """Tests for parse_moves() and apply_notation()."""
+
+    def test_parse_moves(self):
+        """Test plain, hitting, combined, bar, off and repeated moves."""
+        self.assertEqual(parse_moves("13/9 6/5*"), [[12, 8], [5, 4]])
+        self.assertEqual(parse_moves("24/18*/13"), [[23, 17, 12]])
+        self.assertEqual(parse_moves("bar/20 25/22"), [[24, 19], [24, 21]])
+        self.assertEqual(parse_moves("6/off 5/0"), [[5, -1], [4, -1]])
+        self.assertEqual(parse_moves("8/4(2)"), [[7, 3], [7, 3]])
+        self.assertEqual(parse_moves(""), [])
+
+    def test_invalid_moves(self):
+        """Test that unreadable moves raise TranscriptError."""
+        for bad in ["13-9", "26/20", "13/", "abc"]:
+            with self.assertRaises(TranscriptError):
+                parse_moves(bad)
+
+    def test_standard_start(self):
+        """Test that the start is the standard, mirror-symmetric one."""
+        self.assertEqual(encode_position_id(STANDARD_START, "W"), "4HPwATDgc/ABMA")
+        self.assertEqual(flip(STANDARD_START), STANDARD_START)
+
+    def test_black_uses_its_own_numbers(self):
+        """Test that Black's 13-point is board index 11."""
+        result = apply_notation(STANDARD_START, "B", "13/8")
+        self.assertEqual(result[11], -4)
+        self.assertEqual(result[16], -4)
+
+    def test_hit(self):
+        """Test that landing on a blot sends it to the bar."""
+        position = apply_notation(STANDARD_START, "B", "24/18")
+        result = apply_notation(position, "W", "13/7*")
+        self.assertEqual(result[6], 1)
+        self.assertEqual(result[25], 1)
+
+    def test_blocked(self):
+        """Test that moves to a held point or from an empty one fail."""
+        with self.assertRaises(TranscriptError):
+            apply_notation(STANDARD_START, "W", "13/12")
+        with self.assertRaises(TranscriptError):
+            apply_notation(STANDARD_START, "W", "10/5")
+
+
+class TestReplay(unittest.TestCase):
+    """Tests for split_games() and replay_game()."""
+
+    def test_split_games(self):
+        """Test that games are split with their match length."""
+        texts = list(split_games(io.StringIO(SAMPLE)))
+        self.assertEqual([text.number for text in texts], [1, 2])
+        self.assertTrue(all(text.match_length == 3 for text in texts))
+
+    def test_split_is_lazy(self):
+        """Test that the first game is yielded before the rest is read."""
+
+        def lines():
+            yield " Game 1\n"
+            yield " A : 0     B : 0\n"
+            yield " Game 2\n"
+            raise AssertionError("read too far")
+
+        self.assertEqual(next(split_games(lines())).number, 1)
+
+    def test_replay(self):
+        """Test the plays, cube actions and result of a game."""
+        game = next(read_games(io.StringIO(SAMPLE)))
+        self.assertEqual(game.players, ("Alice", "Bob"))
+        self.assertEqual(game.error, "")
+        self.assertEqual([turn.color for turn in game.turns], ["B", "W", "B", "W", "B"])
+        self.assertEqual(game.turns[1].play, ((7, 4), (5, 4)))
+        self.assertEqual(len(game.positions), len(game.turns) + 1)
+        self.assertEqual((game.winner, game.points), ("W", 2))
+
+    def test_combined_move(self):
+        """Test a checker moved with both dice written as one move."""
+        games = list(read_games(io.StringIO(SAMPLE)))
+        self.assertEqual(games[1].score, (2, 0))
+        self.assertEqual(games[1].turns[0].play, ((23, 17), (17, 12)))
+
+    def test_illegal_play(self):
+        """Test that a play not using the roll is rejected."""
+        lines = [" A : 0     B : 0", "  1) 31: 8/5"]
+        with self.assertRaises(TranscriptError):
+            replay_game(GameText(1, 0, lines))
+        lines = [" A : 0     B : 0", "  1) 31: 8/2"]
+        with self.assertRaises(TranscriptError):
+            replay_game(GameText(1, 0, lines))
+
+    def test_errors_are_reported(self):
+        """Test that invalid games carry their error unless strict."""
+        text = " Game 1\n A : 0     B : 0\n  1) 31: 8/5\n"
+        game = next(read_games(io.StringIO(text)))
+        self.assertIn("illegal play", game.error)
+        with self.assertRaises(TranscriptError):
+            list(read_games(io.StringIO(text), strict=True))
+
+    def test_process_pool(self):
+        """Test that a worker pool gives the same games in order."""
+        local = list(read_games(io.StringIO(SAMPLE)))
+        pooled = list(read_games(io.StringIO(SAMPLE), workers=2))
+        self.assertEqual(pooled, local)
+
+    def test_game_boards(self):
+        """Test that every position is available as a Board."""
+        game = next(read_games(io.StringIO(SAMPLE)))
+        boards = list(game_boards(game))
+        self.assertEqual(len(boards), len(game.positions))
+        self.assertIsInstance(boards[-1], Board)
+
+
+if __name__ == "__main__":
+    unittest.main()
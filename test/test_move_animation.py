@@ -0,0 +1,61 @@
+"""
+Unit tests for pygame_ui/move_animation.py
+"""
+
+import unittest
+from unittest.mock import MagicMock
+
+from engine.position import initial_position
+from pygame_ui.move_animation import MoveAnimation, lift_checker
+
+
+class TestLiftChecker(unittest.TestCase):
+    """Tests for lift_checker()."""
+
+    def test_points(self):
+        """Test lifting from a point for both colors."""
+        position = initial_position()
+        self.assertEqual(lift_checker(position, "W", 23)[23], position[23] - 1)
+        self.assertEqual(lift_checker(position, "B", 0)[0], position[0] + 1)
+
+    def test_bar(self):
+        """Test lifting from the bar."""
+        position = list(initial_position())
+        position[24] = 1
+        position[25] = 2
+        self.assertEqual(lift_checker(tuple(position), "W", 24)[24], 0)
+        self.assertEqual(lift_checker(tuple(position), "B", -1)[25], 1)
+
+
+class TestMoveAnimation(unittest.TestCase):
+    """Tests for MoveAnimation."""
+
+    def test_slide(self):
+        """Test that the checker goes from start to end in the given frames."""
+        animation = MoveAnimation("W", (0, 0), (100, 50), frames=4)
+        self.assertEqual(animation.position, (0, 0))
+        self.assertFalse(animation.finished)
+
+        previous = 0.0
+        for _ in range(3):
+            self.assertFalse(animation.step())
+            self.assertGreater(animation.position[0], previous)
+            previous = animation.position[0]
+        self.assertTrue(animation.step())
+        self.assertEqual(animation.position, (100, 50))
+        # Extra steps keep it landed
+        self.assertTrue(animation.step())
+        self.assertEqual(animation.frame, 4)
+
+    def test_draw(self):
+        """Test that drawing goes through the renderer."""
+        renderer = MagicMock()
+        surface = MagicMock()
+        animation = MoveAnimation("B", (10, 10), (20, 10), frames=0)
+        self.assertEqual(animation.frames, 1)
+        animation.draw(surface, renderer)
+        renderer.draw_checker.assert_called_once_with(surface, 10, 10, "B")
+
+
+if __name__ == "__main__":
+    unittest.main()
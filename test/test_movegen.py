@@ -0,0 +1,175 @@
+"""Tests for the compact position helpers and the legal play generator."""
+
+import unittest
+
+from core.board import Board
+from engine.movegen import (
+    DISTINCT_ROLLS,
+    apply_play,
+    can_play_all,
+    expand_roll,
+    legal_plays,
+)
+from engine.position import (
+    flip,
+    from_board,
+    initial_position,
+    pip_counts,
+    to_board,
+    winner,
+)
+
+
+def empty_position() -> list:
+    """Get an empty 28-slot position as a mutable list."""
+    return [0] * 28
+
+
+class TestPosition(unittest.TestCase):
+    """Tests for engine.position."""
+
+    def test_from_board_initial(self):
+        """Test that the reset board converts to signed counts."""
+        position = from_board(Board())
+        self.assertEqual(position[23], 2)
+        self.assertEqual(position[0], -2)
+        self.assertEqual(position[11], 5)
+        self.assertEqual(position[12], -5)
+        self.assertEqual(len(position), 28)
+
+    def test_round_trip(self):
+        """Test that to_board() and from_board() are inverses."""
+        board = Board()
+        board.bar["B"] = 1
+        board.points[0] = ["B"]
+        position = from_board(board)
+        self.assertEqual(from_board(to_board(position)), position)
+
+    def test_flip_is_symmetric(self):
+        """Test that flipping the start position gives the same position."""
+        position = initial_position()
+        self.assertEqual(flip(position), position)
+        self.assertEqual(flip(flip(position)), position)
+
+    def test_pip_counts_and_winner(self):
+        """Test pip counts and the winner check."""
+        self.assertEqual(pip_counts(initial_position()), (162, 162))
+        position = empty_position()
+        position[26] = 15
+        self.assertEqual(winner(tuple(position)), "W")
+        self.assertEqual(winner(initial_position()), "")
+
+
+class TestLegalPlays(unittest.TestCase):
+    """Tests for engine.movegen.legal_plays."""
+
+    def test_expand_roll(self):
+        """Test that doubles are played four times."""
+        self.assertEqual(expand_roll((3, 3)), (3, 3, 3, 3))
+        self.assertEqual(expand_roll((5, 2)), (5, 2))
+
+    def test_distinct_rolls_cover_36(self):
+        """Test that the distinct rolls weigh 36 in total, doubles once."""
+        self.assertEqual(len(DISTINCT_ROLLS), 21)
+        self.assertEqual(sum(weight for _, weight in DISTINCT_ROLLS), 36)
+        for (die1, die2), weight in DISTINCT_ROLLS:
+            self.assertLessEqual(die1, die2)
+            self.assertEqual(weight, 1 if die1 == die2 else 2)
+
+    def test_opening_roll_counts(self):
+        """Test the number of distinct plays from the start position."""
+        start = initial_position()
+        self.assertEqual(len(legal_plays(start, "W", (3, 1))), 20)
+        self.assertEqual(len(legal_plays(start, "B", (3, 1))), 20)
+
+    def test_plays_use_both_dice(self):
+        """Test that every play uses both dice when possible."""
+        for play, _ in legal_plays(initial_position(), "W", (6, 5)):
+            self.assertEqual(len(play), 2)
+
+    def test_white_moves_down_black_moves_up(self):
+        """Test the direction of movement for each color."""
+        for play, _ in legal_plays(initial_position(), "W", (4, 2)):
+            for src, dst in play:
+                self.assertLess(dst, src)
+        for play, _ in legal_plays(initial_position(), "B", (4, 2)):
+            for src, dst in play:
+                self.assertGreater(dst, src)
+
+    def test_must_enter_from_bar(self):
+        """Test that a checker on the bar has to enter first."""
+        position = list(initial_position())
+        position[23] = 1
+        position[24] = 1
+        for play, _ in legal_plays(tuple(position), "W", (6, 1)):
+            self.assertEqual(play[0][0], 24)
+
+    def test_closed_board_has_no_move(self):
+        """Test that a closed board gives only the empty play."""
+        position = empty_position()
+        for point in range(18, 24):
+            position[point] = -2
+        position[24] = 1
+        position[5] = 14
+        candidates = legal_plays(tuple(position), "W", (6, 5))
+        self.assertEqual(candidates, [((), tuple(position))])
+
+    def test_hit_sends_blot_to_bar(self):
+        """Test that hitting a blot puts it on the bar."""
+        position = empty_position()
+        position[10] = 1
+        position[7] = -1
+        position[5] = 14
+        position[12] = -14
+        results = [
+            result
+            for play, result in legal_plays(tuple(position), "W", (3, 1))
+            if (10, 7) in play
+        ]
+        self.assertTrue(results)
+        self.assertTrue(all(result[25] == 1 for result in results))
+
+    def test_must_play_larger_die(self):
+        """Test that the larger die is played when only one can be used."""
+        position = empty_position()
+        position[8] = 1
+        position[5] = 14
+        for point in (7, 4, 1):
+            position[point] = -2
+        position[12] = -3
+        candidates = legal_plays(tuple(position), "W", (6, 1))
+        self.assertEqual([play for play, _ in candidates], [((8, 2),)])
+
+    def test_can_play_all(self):
+        """Test the early exit check against the generated plays."""
+        position = empty_position()
+        position[8] = 1
+        position[5] = 14
+        for point in (7, 4, 1):
+            position[point] = -2
+        position[12] = -3
+        self.assertFalse(can_play_all(tuple(position), "W", (6, 1)))
+        self.assertTrue(can_play_all(tuple(position), "W", (6,)))
+        self.assertTrue(can_play_all(initial_position(), "B", (6, 6, 6, 6)))
+        self.assertTrue(can_play_all(initial_position(), "W", ()))
+
+    def test_bear_off_with_higher_die(self):
+        """Test bearing off the last checker with a larger die."""
+        position = empty_position()
+        position[2] = 1
+        position[26] = 14
+        position[12] = -15
+        candidates = legal_plays(tuple(position), "W", (6, 5))
+        self.assertEqual(len(candidates), 1)
+        self.assertEqual(candidates[0][1][26], 15)
+
+    def test_apply_play_matches_generator(self):
+        """Test that apply_play() reproduces the generated positions."""
+        start = initial_position()
+        for color in ("W", "B"):
+            for play, result in legal_plays(start, color, (5, 5)):
+                self.assertEqual(apply_play(start, color, play), result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""Tests for the NumPy neural network evaluator."""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from engine.movegen import legal_plays
+from engine.neural import (
+    INPUT_SIZE,
+    NeuralEvaluator,
+    NeuralNet,
+    encode_positions,
+)
+from engine.position import initial_position
+
+
+class TestEncoding(unittest.TestCase):
+    """Tests for the TD-Gammon style encoding."""
+
+    def test_shape_and_units(self):
+        """Test the truncated unary encoding of the start position."""
+        features = encode_positions([initial_position()], "W")
+        self.assertEqual(features.shape, (1, INPUT_SIZE))
+        # White has 5 checkers on point 5: units 1, 1, 1, (5 - 3) / 2
+        np.testing.assert_allclose(features[0, 20:24], [1, 1, 1, 1])
+        # Black has 2 checkers on point 0
+        np.testing.assert_allclose(features[0, 96:100], [1, 1, 0, 0])
+        np.testing.assert_allclose(features[0, 196:198], [1, 0])
+
+    def test_turn_units(self):
+        """Test the side to move units for Black."""
+        features = encode_positions([initial_position()], "B")
+        np.testing.assert_allclose(features[0, 196:198], [0, 1])
+
+
+class TestNeuralNet(unittest.TestCase):
+    """Tests for NeuralNet."""
+
+    def setUp(self):
+        """Create a small seeded network."""
+        self.net = NeuralNet(hidden=8, seed=3)
+
+    def test_forward_is_batched(self):
+        """Test that a batch gives the same values as single evaluations."""
+        positions = [result for _, result in legal_plays(initial_position(), "W", (6, 4))]
+        batch = self.net.forward(encode_positions(positions, "B"))
+        single = [self.net.forward(encode_positions([p], "B"))[0] for p in positions]
+        np.testing.assert_allclose(batch, single, rtol=1e-5)
+        self.assertTrue(np.all((batch > 0) & (batch < 1)))
+
+    def test_gradients_match_finite_differences(self):
+        """Test the analytic gradient against a numerical one."""
+        features = encode_positions([initial_position()], "W").astype(np.float64)
+        self.net.set_weights(self.net.get_weights().astype(np.float64))
+        output, grads = self.net.gradients(features)
+        weights = self.net.get_weights().astype(np.float64)
+        for index in (20 * 8 + 3, INPUT_SIZE * 8 + 2, self.net.size - 5, self.net.size - 1):
+            shifted = weights.copy()
+            shifted[index] += 1e-6
+            other = NeuralNet(hidden=8)
+            other.set_weights(shifted)
+            other.w1 = other.w1.astype(np.float64)
+            numeric = (other.forward(features)[0] - output[0]) / 1e-6
+            self.assertAlmostEqual(numeric, grads[0, index], places=3)
+
+    def test_set_weights_wrong_size(self):
+        """Test that a wrong sized vector is rejected."""
+        with self.assertRaises(ValueError):
+            self.net.set_weights(np.zeros(3))
+
+    def test_save_and_load(self):
+        """Test saving and loading weights."""
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "net.npz")
+            self.net.save(path)
+            loaded = NeuralNet.load(path)
+        np.testing.assert_array_equal(loaded.get_weights(), self.net.get_weights())
+
+
+class TestNeuralEvaluator(unittest.TestCase):
+    """Tests for NeuralEvaluator."""
+
+    def setUp(self):
+        """Create an evaluator."""
+        self.evaluator = NeuralEvaluator(NeuralNet(hidden=8, seed=5))
+
+    def test_rank_plays_sorted(self):
+        """Test that ranked plays are sorted by equity."""
+        ranked = self.evaluator.rank_plays(initial_position(), "B", (5, 3))
+        equities = [equity for _, _, equity in ranked]
+        self.assertEqual(equities, sorted(equities, reverse=True))
+        self.assertEqual(self.evaluator.best_play(initial_position(), "B", (5, 3)), ranked[0][0])
+
+    def test_finished_game_is_exact(self):
+        """Test that finished games get exact probabilities."""
+        position = [0] * 28
+        position[26] = 15
+        position[12] = -15
+        probs = self.evaluator.win_probabilities([tuple(position)], "B")
+        self.assertEqual(probs[0], 1.0)
+        self.assertEqual(self.evaluator.equities([tuple(position)], "B", "B")[0], -1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+"""Tests for the opening book and the Bot that uses it."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from engine.bot import Bot
+from engine.engine import Engine
+from engine.movegen import DISTINCT_ROLLS, apply_play, legal_plays
+from engine.neural import NeuralEvaluator, NeuralNet
+from engine.opening_book import (
+    OpeningBook,
+    build_book,
+    pack_entry,
+    read_entries,
+    unpack_entry,
+    write_book,
+)
+from engine.position import initial_position, position_hash
+
+
+class TestBookFormat(unittest.TestCase):
+    """Tests for the book file format."""
+
+    def test_pack_round_trip(self):
+        """Test that entries survive packing, including bar and off."""
+        play = ((24, 20), (5, -1), (3, 0))
+        data = pack_entry((123456789, 0x35), play)
+        self.assertEqual(len(data), 18)
+        self.assertEqual(unpack_entry(data), ((123456789, 0x35), play))
+
+    def test_write_and_read(self):
+        """Test writing a book and reading it back lazily."""
+        entries = {(1, 0x12): ((7, 6), (6, 4)), (2, 0x66): ()}
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "book.bin")
+            write_book(path, entries, source=42)
+            book = OpeningBook(path)
+            self.assertIsNone(book._entries)  # pylint: disable=protected-access
+            self.assertEqual(book.entries, entries)
+            self.assertEqual(book.source, 42)
+
+    def test_bad_header(self):
+        """Test that other files are rejected."""
+        with self.assertRaises(ValueError):
+            list(read_entries(b"NOPE\x02\x00" + bytes(12)))
+
+    def test_missing_file_is_empty(self):
+        """Test that a missing file gives an empty book."""
+        self.assertEqual(len(OpeningBook("/nonexistent/book.bin")), 0)
+
+
+class TestBookSource(unittest.TestCase):
+    """Tests for the network a book is tied to."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Build a one-ply book with a small network."""
+        cls.net = NeuralNet(hidden=4, seed=0)
+        cls.engine = Engine(NeuralEvaluator(cls.net))
+        cls.folder = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        cls.path = os.path.join(cls.folder.name, "book.bin")
+        write_book(cls.path, build_book(cls.engine, depth=1), cls.net.fingerprint())
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the book."""
+        cls.folder.cleanup()
+
+    def test_every_opening_roll_is_legal(self):
+        """Test that the book has a legal play for every first roll."""
+        book = OpeningBook(self.path)
+        start = initial_position()
+        for roll, _ in DISTINCT_ROLLS:
+            play = book.lookup(start, "W", roll)
+            legal = [candidate for candidate, _ in legal_plays(start, "W", roll)]
+            self.assertIn(play, legal)
+            self.assertEqual(book.lookup(start, "W", roll[::-1]), play)
+
+    def test_source_is_recorded(self):
+        """Test that the book knows which network built it."""
+        book = OpeningBook(self.path)
+        self.assertEqual(book.source, self.net.fingerprint())
+        self.assertTrue(book.matches(self.engine))
+        self.assertTrue(book.matches(NeuralEvaluator(NeuralNet(hidden=4, seed=0))))
+        self.assertFalse(book.matches(Engine(NeuralEvaluator(NeuralNet(hidden=4, seed=1)))))
+        self.assertFalse(book.matches(MagicMock()))
+
+    def test_empty_book_matches_nothing(self):
+        """Test that a missing book has no source."""
+        book = OpeningBook("/nonexistent/book.bin")
+        self.assertIsNone(book.source)
+        self.assertFalse(book.matches(self.engine))
+
+    def test_shipped_book_matches_default_engine(self):
+        """Test that the shipped book was built with the default network."""
+        book = OpeningBook.default()
+        self.assertTrue(book.matches(Engine()))
+        start = initial_position()
+        for roll, _ in DISTINCT_ROLLS:
+            legal = [candidate for candidate, _ in legal_plays(start, "W", roll)]
+            self.assertIn(book.lookup(start, "W", roll), legal)
+
+    def test_fingerprint(self):
+        """Test that the fingerprint follows the weights."""
+        net = NeuralNet(hidden=4, seed=0)
+        self.assertEqual(net.fingerprint(), self.net.fingerprint())
+        self.assertNotEqual(net.fingerprint(), NeuralNet(hidden=4, seed=1).fingerprint())
+        self.assertNotEqual(net.fingerprint(), NeuralNet(hidden=5, seed=0).fingerprint())
+
+    def test_position_hash_is_stable(self):
+        """Test that the hash depends on the side to move."""
+        start = initial_position()
+        self.assertEqual(position_hash(start, "W"), position_hash(start, "W"))
+        self.assertNotEqual(position_hash(start, "W"), position_hash(start, "B"))
+
+    def test_bot_uses_book_of_its_network(self):
+        """Test that book positions never search with the book's own network."""
+        bot = Bot(self.engine, OpeningBook(self.path))
+        with patch.object(self.engine, "best_play") as best_play:
+            play = bot(initial_position(), "W", (3, 1))
+        best_play.assert_not_called()
+        self.assertEqual(bot.book_hits, 1)
+        self.assertTrue(play)
+
+    def test_book_agrees_with_its_engine(self):
+        """Test that the book play is the engine's own choice."""
+        start = initial_position()
+        book_play = Bot(self.engine, OpeningBook(self.path)).choose_play(start, "W", (6, 4))
+        engine_play = self.engine.best_play(start, "W", (6, 4))
+        self.assertEqual(
+            apply_play(start, "W", book_play), apply_play(start, "W", engine_play)
+        )
+
+    def test_bot_ignores_book_of_other_network(self):
+        """Test that a book built with other weights is not followed."""
+        engine = MagicMock()
+        engine.best_play.return_value = ((5, 4),)
+        bot = Bot(engine, OpeningBook(self.path))
+        self.assertEqual(bot.choose_play(initial_position(), "W", (1, 2)), ((5, 4),))
+        self.assertEqual(bot.book_hits, 0)
+        other = Engine(NeuralEvaluator(NeuralNet(hidden=4, seed=1)))
+        bot = Bot(other, OpeningBook(self.path))
+        bot.choose_play(initial_position(), "W", (3, 1))
+        self.assertEqual(bot.book_hits, 0)
+
+    def test_bot_notices_new_weights(self):
+        """Test that the book is dropped once the engine's weights change."""
+        net = NeuralNet(hidden=4, seed=0)
+        bot = Bot(Engine(NeuralEvaluator(net)), OpeningBook(self.path))
+        bot.choose_play(initial_position(), "W", (3, 1))
+        self.assertEqual(bot.book_hits, 1)
+        net.set_weights(NeuralNet(hidden=4, seed=1).get_weights())
+        bot.choose_play(initial_position(), "W", (3, 1))
+        self.assertEqual(bot.book_hits, 1)
+
+
+class TestBuildBook(unittest.TestCase):
+    """Tests for build_book."""
+
+    def test_depths(self):
+        """Test the number of entries per depth."""
+        engine = Engine(NeuralEvaluator(NeuralNet(hidden=4, seed=0)))
+        self.assertEqual(len(build_book(engine, depth=1)), 21)
+        # Replies are stored once per distinct position after the first play
+        replies = len(build_book(engine, depth=2)) - 21
+        self.assertGreater(replies, 0)
+        self.assertEqual(replies % 21, 0)
+
+
+class TestBot(unittest.TestCase):
+    """Tests for Bot."""
+
+    def test_falls_back_to_engine(self):
+        """Test that unknown positions are searched."""
+        engine = MagicMock()
+        engine.best_play.return_value = ((5, 4),)
+        bot = Bot(engine, OpeningBook("/nonexistent/book.bin"))
+        self.assertEqual(bot.choose_play(initial_position(), "W", (1, 2)), ((5, 4),))
+        self.assertEqual(bot.book_hits, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
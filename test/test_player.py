@@ -83,5 +83,11 @@ class TestPlayer(unittest.TestCase):
         self.assertTrue(self.player.is_point_secure())
 
 
+    def test_slots(self):
+        """Test that players have a fixed layout and no instance dict."""
+        self.assertFalse(hasattr(self.player, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.player.extra = 1
+
 if __name__ == "__main__":
     unittest.main()
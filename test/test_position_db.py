@@ -0,0 +1,120 @@
+"""Tests for the SQLite position store."""
+
+import os
+import tempfile
+import threading
+import unittest
+
+from engine.position import initial_position
+from engine.position_db import ConnectionPool, PositionDB, PositionStats
+from test.test_game_record import random_games
+from test.test_shots import shot_position
+
+
+class TestPositionDB(unittest.TestCase):
+    """Tests for PositionDB."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "positions.db")
+        self.db = PositionDB(self.path, batch_size=10)
+
+    def tearDown(self):
+        self.db.close()
+        self.directory.cleanup()
+
+    def test_wal_mode(self):
+        """Test that the database runs in WAL mode."""
+        with self.db.pool.connection() as connection:
+            mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+    def test_counts(self):
+        """Test that occurrences and results add up."""
+        start = initial_position()
+        self.db.record(start, "W", "W")
+        self.db.record(start, "W", "B")
+        self.db.record(start, "W")
+        self.db.flush()
+        self.assertEqual(self.db.lookup(start, "W"), PositionStats(3, 1, 1, None, None))
+        self.assertIsNone(self.db.lookup(start, "B"))
+
+    def test_reads_see_flushed_data_only(self):
+        """Test that buffered records are written by flush()."""
+        start = initial_position()
+        self.db.record(start, "W")
+        self.assertIsNone(self.db.lookup(start, "W"))
+        self.assertEqual(self.db.flush(), 1)
+        self.assertEqual(self.db.flush(), 0)
+        self.assertEqual(self.db.lookup(start, "W").seen, 1)
+
+    def test_batches_flush_themselves(self):
+        """Test that a full batch is written without an explicit flush."""
+        for point in range(10):
+            self.db.record(shot_position({point: 1}, {23: 1}), "W")
+        self.assertEqual(len(self.db), 10)
+
+    def test_equity_cache(self):
+        """Test that equities are stored, replaced and kept with counts."""
+        position = shot_position({5: 2}, {18: 2})
+        self.db.record(position, "W", "W")
+        self.db.cache_equity(position, "W", 0.25, "0-ply")
+        self.db.flush()
+        self.db.cache_equity(position, "W", 0.5, "rollout")
+        self.db.flush()
+        self.assertEqual(self.db.cached_equity(position, "W"), 0.5)
+        self.assertEqual(self.db.lookup(position, "W"), PositionStats(1, 1, 0, 0.5, "rollout"))
+        self.assertIsNone(self.db.cached_equity(position, "B"))
+
+    def test_persistence(self):
+        """Test that a reopened database keeps every game position."""
+        game = random_games(1, seed=4)[0]
+        self.db.record_game(game)
+        self.db.close()
+        self.db = PositionDB(self.path)
+        distinct = set(zip(game.positions, game.turns))
+        self.assertEqual(len(self.db), len(distinct))
+        stats = self.db.lookup(game.positions[0], game.turns[0])
+        self.assertGreaterEqual(stats.seen, 1)
+
+    def test_threaded_readers(self):
+        """Test lookups from several threads while the main thread writes."""
+        start = initial_position()
+        self.db.record(start, "W")
+        self.db.flush()
+        errors = []
+
+        def read():
+            try:
+                for _ in range(50):
+                    if self.db.lookup(start, "W") is None:
+                        errors.append("missing")
+            except Exception as error:  # pylint: disable=broad-except
+                errors.append(error)
+
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for point in range(40):
+            self.db.record(shot_position({point % 24: 1}, {23: 1}), "B")
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Tests for ConnectionPool."""
+
+    def test_reuses_connections(self):
+        """Test that released connections are handed out again."""
+        with tempfile.TemporaryDirectory() as directory:
+            pool = ConnectionPool(os.path.join(directory, "pool.db"), size=1)
+            with pool.connection() as first:
+                pass
+            with pool.connection() as second:
+                self.assertIs(first, second)
+            pool.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""Tests for the GNU Backgammon position and match IDs."""
+
+import unittest
+
+from core.board import Board
+from engine.position import from_board, initial_position
+from engine.position_id import (
+    CENTERED,
+    GAME_OVER,
+    MatchState,
+    board_from_position_id,
+    board_position_id,
+    decode_match_id,
+    decode_position_id,
+    encode_match_id,
+    encode_position_id,
+    position_key,
+)
+from test.test_game_record import random_games
+from test.test_shots import shot_position
+
+# Standard starting position: midpoints on each side's 13-point
+STANDARD_START = shot_position({5: 5, 7: 3, 12: 5, 23: 2}, {0: 2, 11: 5, 16: 3, 18: 5})
+
+
+class TestPositionId(unittest.TestCase):
+    """Tests for the position ID."""
+
+    def test_standard_start(self):
+        """Test the well known ID of the standard starting position."""
+        for turn in "WB":
+            self.assertEqual(encode_position_id(STANDARD_START, turn), "4HPwATDgc/ABMA")
+            self.assertEqual(decode_position_id("4HPwATDgc/ABMA", turn), STANDARD_START)
+
+    def test_key_size(self):
+        """Test that keys are 10 bytes and IDs 14 characters."""
+        self.assertEqual(len(position_key(initial_position(), "W")), 10)
+        self.assertEqual(len(encode_position_id(initial_position(), "W")), 14)
+
+    def test_side_on_roll_matters(self):
+        """Test that the side on roll changes the ID of an uneven position."""
+        position = shot_position({5: 2, 3: 1}, {20: 4}, white_bar=1)
+        white = encode_position_id(position, "W")
+        black = encode_position_id(position, "B")
+        self.assertNotEqual(white, black)
+        self.assertEqual(decode_position_id(white, "W"), position)
+        self.assertEqual(decode_position_id(black, "B"), position)
+
+    def test_round_trip_games(self):
+        """Test every position of a few random games."""
+        for game in random_games(5, seed=3):
+            for position, turn in zip(game.positions, game.turns):
+                position_id = encode_position_id(position, turn)
+                self.assertEqual(decode_position_id(position_id, turn), position)
+
+    def test_board_round_trip(self):
+        """Test encoding and decoding through core.board.Board."""
+        board = Board()
+        position_id = board_position_id(board, "W")
+        self.assertEqual(position_id, encode_position_id(initial_position(), "W"))
+        rebuilt = board_from_position_id(position_id, "W")
+        self.assertEqual(from_board(rebuilt), from_board(board))
+
+    def test_invalid_ids(self):
+        """Test that malformed IDs raise ValueError."""
+        for bad in ["", "4HPwATDgc/ABM", "4HPwATDgc/AB!A", "//////////////"]:
+            with self.assertRaises(ValueError):
+                decode_position_id(bad, "W")
+
+
+class TestMatchId(unittest.TestCase):
+    """Tests for the match ID."""
+
+    def test_known_id(self):
+        """Test a money game with Black on roll and a centered cube."""
+        state = MatchState(on_roll="B", turn="B")
+        self.assertEqual(encode_match_id(state), "cAkAAAAAAAAA")
+        self.assertEqual(decode_match_id("cAkAAAAAAAAA"), state)
+
+    def test_round_trip(self):
+        """Test that every field survives a round trip."""
+        state = MatchState(
+            cube=8,
+            cube_owner=1,
+            on_roll="W",
+            crawford=True,
+            game_state=GAME_OVER,
+            turn="B",
+            double_offered=True,
+            resignation=2,
+            dice=(6, 3),
+            match_length=7,
+            score=(4, 6),
+        )
+        match_id = encode_match_id(state)
+        self.assertEqual(len(match_id), 12)
+        self.assertEqual(decode_match_id(match_id), state)
+
+    def test_invalid_state(self):
+        """Test out of range fields and malformed IDs."""
+        with self.assertRaises(ValueError):
+            encode_match_id(MatchState(cube=3))
+        with self.assertRaises(ValueError):
+            encode_match_id(MatchState(dice=(8, 1)))
+        with self.assertRaises(ValueError):
+            decode_match_id("cAkA")
+        self.assertEqual(MatchState().cube_owner, CENTERED)
+
+
+if __name__ == "__main__":
+    unittest.main()
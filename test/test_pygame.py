@@ -1,8 +1,13 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import MagicMock, patch
 
 # We import the real Config, pygame (for constants), and the game file
 from config import Config
+from core.board import Board
+from core.Dice import Dice
+from engine.game_log import END_TURN, ROLL, Event, GameLog
 import pygame
 import PygameUI
 from PygameUI import GameUI, is_valid_direction, get_entry_point_for_dice
@@ -269,6 +274,14 @@ class TestGameUI(unittest.TestCase):
             self.game.handle_keydown(pygame.K_ESCAPE)  # pylint: disable=no-member
             self.assertFalse(self.game.running)
 
+    def test_handle_keydown_toggles_danger(self):
+        """Tests that 'd' toggles the danger overlay."""
+        self.assertFalse(self.game.show_danger)
+        self.game.handle_keydown(pygame.K_d)  # pylint: disable=no-member
+        self.assertTrue(self.game.show_danger)
+        self.game.handle_keydown(pygame.K_d)  # pylint: disable=no-member
+        self.assertFalse(self.game.show_danger)
+
     # --- Action Method Tests ---
 
     def test_do_roll_dice_success(self):
@@ -748,6 +761,294 @@ class TestGameUI(unittest.TestCase):
         # 2 calls per circle (fill + outline)
         self.assertEqual(self.mock_draw_circle.call_count, (3 + 1) * 2)
 
+    def test_render_danger_overlay(self):
+        """Tests that the overlay is drawn only when enabled."""
+        with patch.object(self.game.danger_overlay, "draw") as mock_draw:
+            self.game.render()
+            mock_draw.assert_not_called()
+
+            self.game.show_danger = True
+            self.game.render()
+            mock_draw.assert_called_once_with(
+                self.game.screen, self.mock_board.board, "W"
+            )
+
+    # --- Undo/Redo Tests ---
+
+    def use_real_board(self):
+        """Plays on a real Board, with set_turn updating the mock."""
+        self.mock_board.board = Board()
+
+        def set_turn(player, dice_values):
+            self.mock_board.current_player = player
+            self.mock_board.dice_values = dice_values
+
+        self.mock_board.set_turn.side_effect = set_turn
+        self.game.log = GameLog(self.game.snapshot())
+
+    def test_handle_keydown_undo_redo(self):
+        """Tests that 'u' undoes and 'y' redoes."""
+        with patch.object(self.game, "do_undo") as mock_undo, patch.object(
+            self.game, "do_redo"
+        ) as mock_redo:
+            self.game.handle_keydown(pygame.K_u)  # pylint: disable=no-member
+            self.game.handle_keydown(pygame.K_y)  # pylint: disable=no-member
+            mock_undo.assert_called_once()
+            mock_redo.assert_called_once()
+
+    def test_undo_redo_roll(self):
+        """Tests taking back a roll and playing it again."""
+        self.use_real_board()
+        self.game.do_roll_dice()
+
+        self.game.do_undo()
+        self.assertFalse(self.game.dice_rolled)
+        self.assertEqual(self.mock_board.dice_values, [])
+
+        self.game.do_redo()
+        self.assertTrue(self.game.dice_rolled)
+        self.assertEqual(self.mock_board.dice_values, [3, 4])
+        self.assertEqual((self.game.moves_made, self.game.max_moves_this_turn), (0, 2))
+
+    def test_roll_after_undo_replays_dice(self):
+        """Tests that undoing a roll cannot be used to roll again."""
+        self.use_real_board()
+        self.game.do_roll_dice()
+        self.game.do_undo()
+        self.mock_board.roll_dice.reset_mock()
+
+        self.game.do_roll_dice()
+        self.mock_board.roll_dice.assert_not_called()
+        self.assertTrue(self.game.dice_rolled)
+        self.assertEqual(self.mock_board.dice_values, [3, 4])
+
+    def test_undo_move_and_turn_together(self):
+        """Tests that the last move and its end of turn are one step."""
+        self.use_real_board()
+        self.game.do_roll_dice()
+        self.mock_board.dice_values = [3]
+        self.mock_board.move_checker.side_effect = (
+            lambda src, dst: self.mock_board.board.move_checker(src, dst, "W")
+        )
+        self.game.selected_point = 7
+        self.mock_interaction.get_clicked_point.return_value = 4
+        self.game.handle_normal_move((0, 0))
+        self.mock_board.switch_player.assert_called_once()
+
+        self.game.do_undo()
+        self.assertEqual(self.mock_board.current_player, "W")
+        self.assertEqual(self.mock_board.board.points[7], ["W"] * 3)
+        self.assertEqual(self.mock_board.board.points[4], [])
+
+    def test_undo_skips_computer_turn(self):
+        """Tests that undo goes back past the computer's actions."""
+        self.use_real_board()
+        self.game.computer = MagicMock(color="B")
+        self.game.log.record([Event(ROLL, "W", dice=(3, 4))])
+        self.game.log.record([Event(END_TURN, "W")], join=True)
+        self.game.log.record([Event(ROLL, "B", dice=(6, 1))])
+        self.mock_board.current_player = "B"
+
+        self.game.do_undo()
+        self.assertEqual(self.mock_board.current_player, "W")
+        self.assertFalse(self.game.log.can_undo())
+        self.game.computer.cancel.assert_called()
+
+    # --- Save/Load Tests ---
+
+    def test_handle_keydown_save_load(self):
+        """Tests that 's' saves and 'l' loads."""
+        with patch.object(self.game, "do_save") as mock_save, patch.object(
+            self.game, "do_load"
+        ) as mock_load:
+            self.game.handle_keydown(pygame.K_s)  # pylint: disable=no-member
+            self.game.handle_keydown(pygame.K_l)  # pylint: disable=no-member
+            mock_save.assert_called_once()
+            mock_load.assert_called_once()
+
+    def test_save_and_load(self):
+        """Tests resuming a rolled turn from a saved file."""
+        self.use_real_board()
+        self.mock_board.dice = Dice()
+        self.game.do_roll_dice()
+        self.mock_board.dice_values = [4]
+        self.mock_board.board.points[4] = ["W"]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "game.sav")
+            self.game.do_save(path)
+            self.use_real_board()
+            self.game.dice_rolled = False
+            self.game.do_load(path)
+
+        self.assertEqual(self.mock_board.board.points[4], ["W"])
+        self.assertEqual(self.mock_board.dice_values, [4])
+        self.assertTrue(self.game.dice_rolled)
+        self.assertEqual((self.game.moves_made, self.game.max_moves_this_turn), (1, 2))
+        self.assertFalse(self.game.log.can_undo())
+
+    def test_load_missing_file(self):
+        """Tests that a missing file leaves the game as it is."""
+        self.use_real_board()
+        with patch("builtins.print") as mock_print:
+            self.game.do_load(os.path.join(tempfile.gettempdir(), "missing", "game.sav"))
+        self.assertIn("Could not load", mock_print.call_args[0][0])
+        self.mock_board.set_turn.assert_not_called()
+
+    # --- Replay Tests ---
+
+    def test_replay_current_game(self):
+        """Tests reviewing the game with 'v', stepping and going back to it."""
+        self.use_real_board()
+        self.game.do_roll_dice()
+        with patch("PygameUI.ReplayViewer") as mock_viewer:
+            viewer = mock_viewer.return_value
+            viewer.state = self.game.log.state_after(0)
+            self.game.handle_keydown(pygame.K_v)  # pylint: disable=no-member
+            mock_viewer.assert_called_once_with(self.game.log)
+            self.assertFalse(self.game.dice_rolled)
+
+            self.game.handle_keydown(pygame.K_RIGHT)  # pylint: disable=no-member
+            viewer.step.assert_called_once_with(1)
+            self.game.handle_keydown(pygame.K_SPACE)  # pylint: disable=no-member
+            viewer.toggle_play.assert_called_once()
+            self.mock_board.roll_dice.assert_called_once()
+
+            self.game.handle_keydown(pygame.K_ESCAPE)  # pylint: disable=no-member
+        self.assertIsNone(self.game.replay)
+        self.assertTrue(self.game.running)
+        self.assertTrue(self.game.dice_rolled)
+
+    def test_replay_blocks_board_and_plays(self):
+        """Tests that the board ignores clicks and playback updates it."""
+        self.use_real_board()
+        self.game.replay = MagicMock()
+        self.game.replay.handle_event.return_value = False
+        with patch.object(self.game, "handle_mouse_click") as mock_click:
+            self.game.handle_event(
+                MagicMock(type=pygame.MOUSEBUTTONDOWN, pos=(0, 0))  # pylint: disable=no-member
+            )
+            mock_click.assert_not_called()
+
+        self.game.replay.update.return_value = True
+        self.game.replay.state = self.game.log.state
+        with patch("pygame.time.get_ticks", return_value=500), patch.object(
+            self.game, "restore"
+        ) as mock_restore:
+            self.game.update()
+            mock_restore.assert_called_once_with(self.game.log.state)
+
+    # --- Computer Opponent Tests ---
+
+    def test_toggle_computer(self):
+        """Tests switching the computer opponent on and off with 'c'."""
+        with patch("PygameUI.ComputerPlayer") as mock_player_cls:
+            self.game.handle_keydown(pygame.K_c)  # pylint: disable=no-member
+            mock_player_cls.assert_called_once_with("B")
+            computer = mock_player_cls.return_value
+            self.assertIs(self.game.computer, computer)
+
+            self.game.handle_keydown(pygame.K_c)  # pylint: disable=no-member
+            computer.stop.assert_called_once()
+            self.assertIsNone(self.game.computer)
+
+    def test_input_ignored_on_computer_turn(self):
+        """Tests that the human cannot act during the computer's turn."""
+        self.game.computer = MagicMock(color="B")
+        self.mock_board.current_player = "B"
+        self.assertTrue(self.game.is_computer_turn())
+
+        with patch.object(self.game, "do_roll_dice") as mock_roll, patch.object(
+            self.game, "handle_mouse_click"
+        ) as mock_click:
+            self.game.handle_keydown(pygame.K_SPACE)  # pylint: disable=no-member
+            self.game.handle_event(
+                MagicMock(type=pygame.MOUSEBUTTONDOWN, pos=(1, 1))  # pylint: disable=no-member
+            )
+            mock_roll.assert_not_called()
+            mock_click.assert_not_called()
+
+        self.mock_board.current_player = "W"
+        self.assertFalse(self.game.is_computer_turn())
+
+    def test_computer_turn_is_animated(self):
+        """Tests the whole computer turn: roll, poll, animate, apply."""
+        board = Board()
+        self.mock_board.board = board
+        self.mock_board.current_player = "B"
+        self.mock_board.dice_values = [6, 1]
+        computer = MagicMock(color="B", thinking=False)
+        computer.poll.return_value = None
+        self.game.computer = computer
+
+        # First frame: roll and ask the worker
+        self.game.update()
+        self.mock_board.roll_dice.assert_called_once()
+        computer.request_play.assert_called_once_with(board, [6, 1])
+
+        # Waiting frames do nothing
+        computer.thinking = True
+        self.game.update()
+        self.assertIsNone(self.game.animation)
+
+        # The play arrives: the first checker is lifted and starts sliding
+        computer.poll.return_value = ((0, 6), (0, 1))
+        self.game.update()
+        self.assertIsNotNone(self.game.animation)
+        self.assertEqual(len(board.points[0]), 1)
+        self.assertEqual(self.game.computer_moves, [(0, 6), (0, 1)])
+
+        with patch.object(self.game, "do_next_turn") as mock_next:
+            for _ in range(200):
+                self.game.update()
+                if mock_next.called:
+                    break
+            mock_next.assert_called_once()
+
+        self.assertEqual(board.points[0], [])
+        self.assertEqual(board.points[6], ["B"])
+        self.assertEqual(board.points[1], ["B"])
+        self.assertEqual(self.game.moves_made, 2)
+        self.assertIsNone(self.game.animation)
+
+    def test_computer_without_moves_passes(self):
+        """Tests that an empty play ends the computer's turn."""
+        self.mock_board.current_player = "B"
+        self.game.dice_rolled = True
+        self.game.computer = MagicMock(color="B", thinking=True)
+        self.game.computer.poll.return_value = ()
+        with patch.object(self.game, "do_next_turn") as mock_next:
+            self.game.update_computer()
+            mock_next.assert_called_once()
+
+    def test_reset_cancels_computer(self):
+        """Tests that a reset drops the pending play and animation."""
+        self.game.computer = MagicMock(color="B")
+        self.game.computer_moves = [(0, 3)]
+        self.game.animation = MagicMock()
+        self.game.do_reset()
+        self.game.computer.cancel.assert_called_once()
+        self.assertEqual(self.game.computer_moves, [])
+        self.assertIsNone(self.game.animation)
+
+    def test_place_center(self):
+        """Tests the screen positions of bar, off and points."""
+        renderer = self.game.checker_renderer
+        self.assertEqual(self.game.place_center(24, "W", 0), renderer.bar_center("W"))
+        self.assertEqual(self.game.place_center(-1, "B", 0), renderer.bar_center("B"))
+        rect = self.game.bear_off_rect_w
+        self.assertEqual(self.game.place_center(-1, "W", 0), (rect.centerx, rect.centery))
+        self.assertEqual(
+            self.game.place_center(5, "B", 2), renderer.checker_center(5, 2)
+        )
+
+    def test_render_animation(self):
+        """Tests that a moving checker is drawn."""
+        self.game.animation = MagicMock()
+        self.game.render()
+        self.game.animation.draw.assert_called_once_with(
+            self.game.screen, self.game.checker_renderer
+        )
+
     def test_render_all_dice_used(self):
         """Tests the 'All dice used!' message."""
         self.game.dice_rolled = True
@@ -781,6 +1082,15 @@ class TestMainFunction(unittest.TestCase):
         # Check that game.run() was called once on the instance
         mock_game_instance.run.assert_called_once_with()
 
+    @patch("PygameUI.load_replay")
+    @patch("PygameUI.GameUI")
+    def test_main_replay(self, mock_game_cls, mock_load):
+        """Tests that --replay opens a recorded game before running."""
+        PygameUI.main(["--replay", "games.bggr", "--game", "2"])
+        mock_load.assert_called_once_with("games.bggr", 2)
+        mock_game_cls.return_value.open_replay.assert_called_once_with(mock_load.return_value)
+        mock_game_cls.return_value.run.assert_called_once_with()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,102 @@
+"""Tests for the pip count based race evaluator."""
+
+import unittest
+
+from engine.position import WHITE_OFF, flip, initial_position
+from engine.race import (
+    WASTAGE_BY_CHECKERS,
+    RaceEvaluator,
+    effective_pip_count,
+    keith_count,
+    race_win_probability,
+    white_pips,
+)
+
+
+def race_position() -> tuple:
+    """A race: White in its home board, Black in its own."""
+    position = [0] * 28
+    position[0] = 3
+    position[3] = 4
+    position[5] = 4
+    position[26] = 4
+    position[18] = -5
+    position[20] = -5
+    position[27] = 5
+    return tuple(position)
+
+
+class TestCounts(unittest.TestCase):
+    """Tests for the pip count helpers."""
+
+    def test_white_pips(self):
+        """Test the White pip count of the start position."""
+        self.assertEqual(white_pips(initial_position()), 162)
+
+    def test_keith_count(self):
+        """Test the Keith count penalties."""
+        # 3*1 + 4*4 + 4*6 = 43 pips, +4 for two extra on the 1 point,
+        # +1 for the empty 5 point
+        self.assertEqual(keith_count(race_position(), "W"), 48)
+
+    def test_keith_count_black_is_mirrored(self):
+        """Test that Black is counted on the mirrored board."""
+        position = race_position()
+        self.assertEqual(keith_count(position, "B"), keith_count(flip(position), "W"))
+
+    def test_keith_count_penalises_sooner(self):
+        """Test that two checkers on the 1 point cost Keith pips but not EPC pips."""
+        position = [0] * 28
+        position[0] = 2
+        position[WHITE_OFF] = 13
+        position = tuple(position)
+        self.assertEqual(keith_count(position, "W"), 2 + 2 + 3)
+        self.assertEqual(effective_pip_count(position, "W"), 2 + WASTAGE_BY_CHECKERS[2])
+
+    def test_effective_pip_count_black_is_mirrored(self):
+        """Test that Black is counted on the mirrored board."""
+        position = race_position()
+        self.assertEqual(
+            effective_pip_count(position, "B"), effective_pip_count(flip(position), "W")
+        )
+
+    def test_effective_pip_count(self):
+        """Test that the EPC adds wastage to the pip count."""
+        epc = effective_pip_count(race_position(), "W")
+        self.assertGreater(epc, 43)
+        finished = list(race_position())
+        finished[26] = 15
+        self.assertEqual(effective_pip_count(tuple(finished), "W"), 0.0)
+
+
+class TestRaceProbability(unittest.TestCase):
+    """Tests for race_win_probability and RaceEvaluator."""
+
+    def test_even_race_favours_side_on_roll(self):
+        """Test that the side on roll is the favourite in an even race."""
+        self.assertGreater(race_win_probability(100, 100), 0.5)
+
+    def test_bigger_lead_is_better(self):
+        """Test that the probability grows with the lead."""
+        self.assertGreater(race_win_probability(90, 100), race_win_probability(100, 100))
+        self.assertLess(race_win_probability(120, 100), 0.5)
+
+    def test_evaluator_turn_symmetry(self):
+        """Test that mirroring the position mirrors the result."""
+        evaluator = RaceEvaluator()
+        position = race_position()
+        white = evaluator.win_probability(position, "W")
+        black = evaluator.win_probability(flip(position), "B")
+        self.assertAlmostEqual(white, 1.0 - black)
+
+    def test_batch_and_finished_games(self):
+        """Test batch evaluation and exact results for finished games."""
+        finished = list(race_position())
+        finished[27] = 15
+        probs = RaceEvaluator().win_probabilities([race_position(), tuple(finished)], "W")
+        self.assertTrue(0.0 < probs[0] < 1.0)
+        self.assertEqual(probs[1], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+Unit tests for pygame_ui/replay_viewer.py
+"""
+
+import io
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pygame
+
+from engine.game_log import apply_event
+from engine.game_record import GameRecordWriter
+from engine.matfile import read_games
+from pygame_ui.replay_viewer import ReplayViewer, load_replay, record_turns
+from test.test_game_record import random_games
+from test.test_matfile import SAMPLE
+
+# pylint: disable=no-member
+
+
+def mouse(kind: int, x: int) -> pygame.event.Event:
+    """Mouse event at height 740, on the default slider."""
+    return pygame.event.Event(kind, pos=(x, 740), button=1)
+
+
+class TestLoadReplay(unittest.TestCase):
+    """Tests for record_turns() and load_replay()."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_game_record(self):
+        """Test that every ply of a record shows the position after it."""
+        games = random_games(2, seed=3)
+        path = os.path.join(self.directory.name, "games.bggr")
+        with GameRecordWriter(open(path, "wb")) as writer:
+            for game in games:
+                writer.write_game(game)
+
+        log = load_replay(path, game=1, keyframe_interval=4)
+        result = games[1]
+        self.assertEqual(log.actions, len(result.plays))
+        for ply in (0, 1, len(result.plays) // 2, len(result.plays)):
+            self.assertEqual(log.state_after(ply).position, result.positions[ply])
+        state = log.state_after(1)
+        self.assertEqual((state.turn, state.roll), (result.turns[0], result.rolls[0]))
+        with self.assertRaises(ValueError):
+            load_replay(path, game=2)
+
+    def test_transcript(self):
+        """Test a game of a .mat transcript."""
+        path = os.path.join(self.directory.name, "match.mat")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(SAMPLE)
+        transcript = next(read_games(io.StringIO(SAMPLE)))
+        log = load_replay(path)
+        self.assertEqual(log.state.position, transcript.positions[-1])
+
+    def test_end_of_turn_joins_next_ply(self):
+        """Test that one ply is one action and keeps its dice on show."""
+        log = record_turns(
+            random_games(1, seed=5)[0].positions[0],
+            "W",
+            [("W", (3, 1), ((7, 4), (5, 4))), ("B", (6, 5), ())],
+        )
+        self.assertEqual(log.actions, 2)
+        self.assertEqual(log.state_after(1).roll, (3, 1))
+        self.assertEqual(log.state_after(2).turn, "B")
+        state = log.state_after(0)
+        for event in log.events:
+            state = apply_event(state, event)
+        self.assertEqual(state, log.state)
+
+
+class TestReplayViewer(unittest.TestCase):
+    """Tests for ReplayViewer."""
+
+    def setUp(self):
+        game = random_games(1, seed=7)[0]
+        turns = list(zip(game.turns, game.rolls, game.plays))
+        self.log = record_turns(game.positions[0], game.turns[0], turns)
+        self.viewer = ReplayViewer(self.log, plies_per_second=10)
+
+    def test_step_and_seek(self):
+        """Test steps and seeks, clamped to the game."""
+        self.assertEqual(self.viewer.step(1), self.log.state_after(1))
+        self.viewer.step(-5)
+        self.assertEqual(self.viewer.ply, 0)
+        self.viewer.seek(10**6)
+        self.assertEqual(self.viewer.ply, self.viewer.plies)
+        self.assertEqual(self.viewer.state, self.log.state)
+
+    def test_playback(self):
+        """Test that playing advances one ply per interval and stops at the end."""
+        self.viewer.toggle_play()
+        self.assertFalse(self.viewer.update(0))
+        self.assertFalse(self.viewer.update(50))
+        self.assertTrue(self.viewer.update(100))
+        self.assertEqual(self.viewer.ply, 1)
+        self.viewer.seek(self.viewer.plies - 1)
+        self.assertTrue(self.viewer.update(200))
+        self.assertFalse(self.viewer.playing)
+        self.viewer.toggle_play()
+        self.assertEqual(self.viewer.ply, 0)
+
+    def test_slider(self):
+        """Test that clicks and drags on the slider seek."""
+        rect = self.viewer.rect
+        self.assertTrue(self.viewer.handle_event(mouse(pygame.MOUSEBUTTONDOWN, rect.right - 1)))
+        self.assertEqual(self.viewer.ply, self.viewer.ply_at(rect.right - 1))
+        self.assertEqual(self.viewer.ply_at(rect.right + 50), self.viewer.plies)
+        self.viewer.handle_event(mouse(pygame.MOUSEMOTION, rect.centerx))
+        self.assertEqual(self.viewer.ply, round(self.viewer.plies / 2))
+        self.viewer.handle_event(mouse(pygame.MOUSEBUTTONUP, rect.centerx))
+        self.assertFalse(self.viewer.handle_event(mouse(pygame.MOUSEMOTION, rect.left)))
+        self.assertFalse(self.viewer.handle_event(mouse(pygame.MOUSEBUTTONDOWN, 900)))
+
+    @patch("pygame_ui.replay_viewer.pygame.draw.circle")
+    @patch("pygame_ui.replay_viewer.pygame.draw.rect")
+    def test_draw(self, mock_rect, mock_circle):
+        """Test the track, the handle and the counter."""
+        surface = MagicMock()
+        font = MagicMock()
+        self.viewer.seek(3)
+        self.viewer.draw(surface, font)
+        mock_rect.assert_called_once()
+        mock_circle.assert_called_once()
+        self.assertIn(f"ply 3/{self.viewer.plies}", font.render.call_args[0][0])
+
+
+if __name__ == "__main__":
+    unittest.main()
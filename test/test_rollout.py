@@ -0,0 +1,130 @@
+"""Tests for the Monte Carlo rollout engine."""
+
+import unittest
+
+from engine.engine import Engine
+from engine.movegen import legal_plays
+from engine.neural import NeuralEvaluator, NeuralNet
+from engine.position import initial_position
+from engine.rollout import (
+    ORDERED_ROLLS,
+    RolloutEngine,
+    RolloutResult,
+    _separated,
+    run_trial,
+    stratified_roll,
+)
+
+
+def late_race() -> tuple:
+    """A short race that finishes in a few turns."""
+    position = [0] * 28
+    position[2] = 2
+    position[1] = 1
+    position[26] = 12
+    position[21] = -2
+    position[22] = -1
+    position[27] = 12
+    return tuple(position)
+
+
+class TestStratifiedRolls(unittest.TestCase):
+    """Tests for stratified_roll."""
+
+    def test_each_block_covers_all_rolls(self):
+        """Test that 36 trials see every first and second roll once."""
+        for block in range(3):
+            trials = range(block * 36, block * 36 + 36)
+            first = sorted(stratified_roll(trial, 0) for trial in trials)
+            second = sorted(stratified_roll(trial, 1) for trial in trials)
+            self.assertEqual(first, sorted(ORDERED_ROLLS))
+            self.assertEqual(second, sorted(ORDERED_ROLLS))
+
+    def test_pairs_are_unique(self):
+        """Test that 1296 trials cover every pair of opening rolls."""
+        pairs = {(stratified_roll(t, 0), stratified_roll(t, 1)) for t in range(1296)}
+        self.assertEqual(len(pairs), 1296)
+
+
+class TestRunTrial(unittest.TestCase):
+    """Tests for run_trial."""
+
+    def setUp(self):
+        """Create an evaluator."""
+        self.evaluator = Engine(NeuralEvaluator(NeuralNet(hidden=4, seed=1)))
+
+    def test_outcome_values(self):
+        """Test that raw outcomes are wins or losses."""
+        raw, _ = run_trial(self.evaluator, late_race(), "B", "W", 0, 0, 2)
+        self.assertIn(raw, (1.0, -1.0))
+
+    def test_luck_averages_to_zero_over_a_stratum(self):
+        """Test that the control variate has zero mean over the 36 first rolls."""
+        results = [
+            run_trial(self.evaluator, late_race(), "B", "W", trial, 3, 1)
+            for trial in range(36)
+        ]
+        raw = sum(r for r, _ in results) / 36
+        adjusted = sum(a for _, a in results) / 36
+        self.assertAlmostEqual(raw, adjusted, places=9)
+
+
+class TestRolloutEngine(unittest.TestCase):
+    """Tests for RolloutEngine."""
+
+    def test_separated(self):
+        """Test the interval separation check."""
+        best = RolloutResult((), 0.5, 0.1, 36)
+        close = RolloutResult((), 0.45, 0.1, 36)
+        far = RolloutResult((), 0.0, 0.1, 36)
+        self.assertTrue(_separated([best, far]))
+        self.assertFalse(_separated([best, close]))
+        self.assertTrue(_separated([best]))
+
+    def test_rollout_in_process(self):
+        """Test a small rollout without worker processes."""
+        engine = RolloutEngine(NeuralNet(hidden=4, seed=2), workers=0, luck_turns=1)
+        results = engine.rollout(late_race(), "W", (2, 1), max_trials=8)
+        plays = {play for play, _ in legal_plays(late_race(), "W", (2, 1))}
+        self.assertEqual({result.play for result in results}, plays)
+        equities = [result.equity for result in results]
+        self.assertEqual(equities, sorted(equities, reverse=True))
+        self.assertTrue(all(result.trials == 8 for result in results))
+
+    def test_rollout_needs_trials(self):
+        """Test that a rollout without trials is rejected."""
+        engine = RolloutEngine(NeuralNet(hidden=4, seed=2), workers=0)
+        for trials in (0, -1):
+            with self.assertRaises(ValueError):
+                engine.rollout(late_race(), "W", (2, 1), max_trials=trials)
+
+    def test_rollout_with_pool_matches_in_process(self):
+        """Test that the process pool gives the same numbers."""
+        net = NeuralNet(hidden=4, seed=2)
+        position = initial_position()
+        plays = [play for play, _ in legal_plays(position, "W", (6, 5))][:2]
+        inline = RolloutEngine(net, workers=0, luck_turns=0).rollout(
+            position, "W", (6, 5), plays, max_trials=2
+        )
+        pooled = RolloutEngine(net, workers=2, luck_turns=0).rollout(
+            position, "W", (6, 5), plays, max_trials=2
+        )
+        self.assertEqual(inline, pooled)
+
+    def test_early_stop(self):
+        """Test that a clear decision stops after the first block."""
+        position = [0] * 28
+        position[1] = 1
+        position[0] = 1
+        position[26] = 13
+        position[23] = -1
+        position[27] = 14
+        engine = RolloutEngine(NeuralNet(hidden=4, seed=2), workers=0, luck_turns=0)
+        results = engine.rollout(tuple(position), "W", (2, 1), min_trials=4, max_trials=72)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0].equity, 1.0)
+        self.assertEqual(results[1].equity, -1.0)
+        self.assertEqual(results[0].trials, 36)
+
+if __name__ == "__main__":
+    unittest.main()
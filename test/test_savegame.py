@@ -0,0 +1,120 @@
+"""Tests for the compact saved game format."""
+
+import os
+import random
+import tempfile
+import unittest
+
+from cli.CLI import GameStateManager
+from core.BackgammonGame import Game
+from core.dice_stream import DiceStream
+from core.savegame import SavedGame, StreamPosition, capture, decode, encode, restore
+
+
+class TestSavedGame(unittest.TestCase):
+    """Tests for capture(), encode() and decode()."""
+
+    def setUp(self):
+        self.game = Game()
+        self.game.board.bar["B"] = 1
+        self.game.board.borne_off["W"] = 2
+        self.game.board.points[12] = ["B"] * 4
+
+    def test_round_trip(self):
+        """Test that every field survives encoding."""
+        self.game.dice.set_mock_rolls([(3, 1), (6, 6), (2, 5)])
+        self.game.dice.roll()
+        saved = capture(self.game.board, self.game.dice, "B", True, (3, 1), (1,))
+        self.assertEqual(decode(encode(saved)), saved._replace(mock_rolls=[(3, 1), (6, 6), (2, 5)]))
+        self.assertEqual(saved.points[12], -4)
+        self.assertEqual(saved.mock_index, 1)
+
+    def test_compact(self):
+        """Test the size of a game without random state."""
+        saved = capture(self.game.board, self.game.dice, "W")
+        self.assertEqual(len(encode(saved)), 42)
+
+    def test_rng_state(self):
+        """Test that the random module state is saved on request."""
+        random.seed(7)
+        saved = decode(encode(capture(self.game.board, self.game.dice, "W", rng_state=True)))
+        expected = [random.random() for _ in range(3)]
+        random.seed(99)
+        random.setstate(saved.rng_state)
+        self.assertEqual([random.random() for _ in range(3)], expected)
+
+    def test_dice_stream(self):
+        """Test that a game rolling from a stream goes on with the same rolls."""
+        for seed in (7, -3, 2**70):
+            self.game.dice.set_source(DiceStream(seed, block_size=8))
+            for _ in range(11):
+                self.game.dice.roll()
+            saved = decode(encode(capture(self.game.board, self.game.dice, "W")))
+            self.assertEqual(saved.dice_source, StreamPosition(seed, 8, 11))
+            expected = [self.game.dice.roll() for _ in range(5)]
+
+            other = Game()
+            restore(saved, other.board, other.dice)
+            self.assertEqual([other.dice.roll() for _ in range(5)], expected)
+
+    def test_unsaved_source_is_refused(self):
+        """Test that dice rolling from a plain iterator cannot be saved."""
+        self.game.dice.set_source(iter([(1, 2)]))
+        with self.assertRaises(ValueError):
+            capture(self.game.board, self.game.dice, "W")
+
+    def test_restore_detaches_source(self):
+        """Test that a game saved without a source rolls from random again."""
+        saved = capture(self.game.board, self.game.dice, "W")
+        self.game.dice.set_source(DiceStream(1))
+        restore(saved, self.game.board, self.game.dice)
+        self.assertIsNone(self.game.dice.source)
+
+    def test_invalid_data(self):
+        """Test that foreign, newer and truncated data is refused."""
+        data = encode(capture(self.game.board, self.game.dice, "W"))
+        for bad in (b"XXXX" + data[4:], data[:4] + b"\x09" + data[5:], data[:20]):
+            with self.assertRaises(ValueError):
+                decode(bad)
+
+    def test_default_fields(self):
+        """Test that a game with no turn state decodes to the defaults."""
+        saved = decode(encode(capture(self.game.board, self.game.dice, "W")))
+        self.assertIsInstance(saved, SavedGame)
+        self.assertEqual((saved.mock_rolls, saved.has_rolled, saved.remaining), (None, False, ()))
+
+
+class TestGameSaveLoad(unittest.TestCase):
+    """Tests for Game.save() and Game.load()."""
+
+    def test_save_and_load(self):
+        """Test a game and its turn state through a file."""
+        game = Game()
+        game.switch_player()
+        game.dice.set_mock_rolls([(4, 2), (5, 5)])
+        manager = GameStateManager(game)
+        manager.set_roll(game.roll_dice())
+        manager.use_die(4)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "game.sav")
+            game.save(path, manager)
+            loaded_manager = GameStateManager(Game())
+            loaded = Game.load(path, loaded_manager)
+
+        self.assertIs(loaded_manager.game, loaded)
+        self.assertEqual(loaded.get_board(), game.get_board())
+        self.assertEqual(loaded.current_player, "black")
+        self.assertEqual(loaded.dice.get_values(), (4, 2))
+        self.assertEqual(loaded_manager.get_remaining(), [2])
+        self.assertEqual(loaded_manager.original_roll, [4, 2])
+        self.assertTrue(loaded_manager.has_rolled)
+        self.assertEqual(loaded.dice.roll(), (5, 5))
+
+    def test_load_missing_file(self):
+        """Test that a missing file raises OSError."""
+        with self.assertRaises(OSError):
+            Game.load(os.path.join(tempfile.gettempdir(), "missing", "game.sav"))
+
+
+if __name__ == "__main__":
+    unittest.main()
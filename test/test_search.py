@@ -0,0 +1,143 @@
+"""Tests for the iterative deepening search."""
+
+import threading
+import unittest
+
+from engine.engine import Engine
+from engine.movegen import DISTINCT_ROLLS, legal_plays
+from engine.position import initial_position, winner
+from engine.search import BackgroundSearch, PositionValue, Searcher
+from test.test_shots import shot_position
+
+
+class TestSearcher(unittest.TestCase):
+    """Tests for Searcher."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Share one engine, building it is the slow part."""
+        cls.engine = Engine()
+
+    def test_depth_one_is_static_ranking(self):
+        """Test that without time the static ranking is returned."""
+        searcher = Searcher(self.engine)
+        result = searcher.search(initial_position(), "W", (3, 1), budget=0.0)
+        self.assertEqual(result.depth, 1)
+        self.assertFalse(result.cancelled)
+        self.assertEqual(
+            result.plays, self.engine.rank_plays(initial_position(), "W", (3, 1))
+        )
+
+    def test_depth_two_averages_replies(self):
+        """Test the second ply against a direct computation."""
+        searcher = Searcher(self.engine, max_depth=2, width=2)
+        position = initial_position()
+        result = searcher.search(position, "B", (6, 5), budget=60.0)
+        self.assertEqual(result.depth, 2)
+
+        static = self.engine.rank_plays(position, "B", (6, 5))
+        # Only the searched plays are returned, all scored at depth 2
+        self.assertEqual(len(result.plays), 2)
+        self.assertEqual(
+            {play for play, _, _ in result.plays[:2]},
+            {play for play, _, _ in static[:2]},
+        )
+        play, after, equity = result.plays[0]
+        total = 0.0
+        for roll, weight in DISTINCT_ROLLS:
+            replies = self.engine.rank_plays(after, "W", roll)
+            # Black's equity after White's best reply
+            total -= weight * replies[0][2]
+        self.assertAlmostEqual(equity, total / 36.0)
+        self.assertIn(play, [candidate for candidate, _, _ in static[:2]])
+
+    def test_single_play_is_not_searched(self):
+        """Test that a forced play returns at once."""
+        searcher = Searcher(self.engine)
+        position = shot_position({0: 15}, {23: 15})
+        self.assertEqual(len(legal_plays(position, "W", (6, 6))), 1)
+        result = searcher.search(position, "W", (6, 6), budget=60.0)
+        self.assertEqual(result.depth, 1)
+
+    def test_cancel(self):
+        """Test that a cancelled search keeps its static ranking."""
+        cancel = threading.Event()
+        cancel.set()
+        searcher = Searcher(self.engine)
+        result = searcher.search(initial_position(), "W", (6, 4), 60.0, cancel)
+        self.assertEqual(result.depth, 1)
+        self.assertTrue(result.cancelled)
+
+    def test_remaining_dice(self):
+        """Test a search for the dice left in a started turn."""
+        searcher = Searcher(self.engine)
+        result = searcher.search(initial_position(), "W", [4], budget=0.0)
+        self.assertTrue(all(len(play) == 1 for play, _, _ in result.plays))
+
+    def test_evaluate(self):
+        """Test position evaluation for both sides."""
+        searcher = Searcher(self.engine, max_depth=2)
+        white = searcher.evaluate(initial_position(), "W", budget=60.0)
+        self.assertIsInstance(white, PositionValue)
+        self.assertEqual(white.depth, 1)
+        self.assertAlmostEqual(white.win_probability, (white.equity + 1) / 2)
+
+        quick = searcher.evaluate(initial_position(), "B", budget=0.0)
+        self.assertEqual(quick.depth, 0)
+        self.assertAlmostEqual(
+            quick.equity,
+            float(self.engine.equities([initial_position()], "B", "B")[0]),
+        )
+
+    def test_evaluate_finished_game(self):
+        """Test that finished games are exact at every depth."""
+        searcher = Searcher(self.engine)
+        position = shot_position({}, {23: 15})
+        self.assertEqual(winner(position), "W")
+        for turn in ("W", "B"):
+            value = searcher.evaluate(position, turn, budget=60.0)
+            expected = 1.0 if turn == "W" else -1.0
+            self.assertEqual(value.equity, expected, turn)
+
+
+class TestBackgroundSearch(unittest.TestCase):
+    """Tests for BackgroundSearch."""
+
+    def test_result_and_callback(self):
+        """Test that the result is returned and passed to on_done."""
+        seen = []
+        done = threading.Event()
+
+        def record(result):
+            seen.append(result)
+            done.set()
+
+        search = BackgroundSearch(
+            lambda value, cancel: value * 2, 21, on_done=record
+        )
+        self.assertEqual(search.result(timeout=5), 42)
+        self.assertTrue(search.done())
+        self.assertTrue(done.wait(5))
+        self.assertEqual(seen, [42])
+
+    def test_cancel(self):
+        """Test that cancel() reaches the search through its event."""
+        search = BackgroundSearch(lambda cancel: cancel.wait(5))
+        self.assertIsNone(search.result(timeout=0.01))
+        self.assertFalse(search.done())
+        search.cancel()
+        self.assertTrue(search.result(timeout=5))
+
+    def test_error(self):
+        """Test that errors are raised by result()."""
+
+        def fail(cancel):
+            raise ValueError("bad position")
+
+        search = BackgroundSearch(fail)
+        with self.assertRaises(ValueError):
+            search.result(timeout=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
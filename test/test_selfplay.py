@@ -0,0 +1,56 @@
+"""Tests for the headless game loop."""
+
+import random
+import unittest
+
+from core.BackgammonGame import Game
+from engine.movegen import legal_plays
+from engine.position import from_board, pip_counts
+from engine.selfplay import HeadlessGame
+
+
+def first_play(position, color, roll):
+    """Policy that always takes the first legal play."""
+    return legal_plays(position, color, roll)[0][0]
+
+
+class TestHeadlessGame(unittest.TestCase):
+    """Tests for HeadlessGame."""
+
+    def setUp(self):
+        """Seed the global dice."""
+        random.seed(7)
+
+    def test_game_finishes_with_a_winner(self):
+        """Test that a game is played to the end."""
+        result = HeadlessGame().play(first_play)
+        self.assertIn(result.winner, ("W", "B"))
+        self.assertEqual(len(result.positions), len(result.turns) + 1)
+        self.assertEqual(len(result.rolls), len(result.plays))
+
+    def test_board_is_written_back(self):
+        """Test that the final position ends up on the Game's board."""
+        game = Game()
+        result = HeadlessGame(game).play(first_play)
+        self.assertEqual(from_board(game.board), result.positions[-1])
+        self.assertEqual(game.board.borne_off[result.winner], 15)
+        self.assertEqual(game.get_current_player_color(), result.winner)
+
+    def test_turns_alternate(self):
+        """Test that the sides alternate every turn."""
+        result = HeadlessGame().play(first_play)
+        for previous, current in zip(result.turns, result.turns[1:]):
+            self.assertNotEqual(previous, current)
+
+    def test_mock_dice_are_used(self):
+        """Test that the loop rolls the Game's own dice."""
+        game = Game()
+        game.dice.set_mock_rolls([(6, 5)])
+        result = HeadlessGame(game, max_turns=1).play(first_play)
+        self.assertEqual(result.rolls, [(6, 5)])
+        self.assertEqual(result.winner, "")
+        self.assertEqual(pip_counts(result.positions[-1])[0], 162 - 11)
+
+
+if __name__ == "__main__":
+    unittest.main()
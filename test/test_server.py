@@ -0,0 +1,359 @@
+"""Tests for the asyncio game server and its tables."""
+
+import asyncio
+import os
+import tempfile
+import unittest
+
+from server.autosave import Autosave
+from server.server import MAX_LINE_LENGTH, GameServer, Session, encode_reply
+from server.table import Table
+
+
+class FakeClock:
+    """Clock advanced by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTable(unittest.TestCase):
+    """Tests for Table."""
+
+    def setUp(self):
+        """Create a table."""
+        self.table = Table("1", now=0.0)
+
+    def test_roll_and_state(self):
+        """Test a roll and the state line."""
+        self.assertEqual(
+            self.table.state(),
+            "turn=W rolled=0 dice= bar=0,0 off=0,0 "
+            "points=-2,0,0,0,0,5,0,3,0,0,0,5,-5,0,0,0,-3,0,-5,0,0,0,0,2",
+        )
+        ok, lines = self.table.execute("roll", now=5.0)
+        self.assertTrue(ok)
+        self.assertTrue(any("Rolled" in line for line in lines))
+        self.assertIn("rolled=1", self.table.state())
+        self.assertEqual(self.table.last_active, 5.0)
+
+    def test_failed_command(self):
+        """Test that CLI errors are reported as failures."""
+        ok, lines = self.table.execute("move 1 2")
+        self.assertFalse(ok)
+        self.assertIn("roll", lines[0])
+
+    def test_engine_commands_are_not_served(self):
+        """Test that slow and unknown commands are refused."""
+        for line in ("hint", "analyze", "fly"):
+            ok, lines = self.table.execute(line)
+            self.assertFalse(ok)
+            self.assertTrue(lines[0].startswith("Unknown command"))
+
+    def test_to_bytes(self):
+        """Test that a table is rebuilt with its game and turn state."""
+        self.table.execute("roll")
+        table = Table.from_bytes("7", self.table.to_bytes(), now=1.0)
+        self.assertEqual(table.state(), self.table.state())
+        self.assertEqual(table.last_active, 1.0)
+        self.assertFalse(table.cli.log.can_undo())
+
+    def test_board(self):
+        """Test the rendered board."""
+        lines = self.table.board()
+        self.assertEqual(lines[0], "Current Board:")
+        self.assertFalse(self.table.is_over())
+
+
+class TestDispatch(unittest.TestCase):
+    """Tests for GameServer.dispatch() without sockets."""
+
+    def setUp(self):
+        """Create a server with a fake clock."""
+        self.clock = FakeClock()
+        self.server = GameServer(idle_timeout=10.0, max_tables=2, clock=self.clock)
+        self.session = Session()
+
+    def test_table_commands(self):
+        """Test new, join, leave and tables."""
+        self.assertEqual(
+            self.server.dispatch(self.session, "new"), (True, ["table 1"], True)
+        )
+        other = Session()
+        self.assertEqual(self.server.dispatch(other, "join 1"), (True, ["table 1"], True))
+        self.assertEqual(self.server.tables["1"].clients, 2)
+
+        ok, lines, _ = self.server.dispatch(self.session, "tables")
+        self.assertTrue(ok)
+        self.assertEqual(lines, ["tables=1 sessions=0"])
+
+        self.assertTrue(self.server.dispatch(other, "LEAVE")[0])
+        self.assertEqual(self.server.tables["1"].clients, 1)
+        self.assertFalse(self.server.dispatch(other, "leave")[0])
+        self.assertFalse(self.server.dispatch(other, "join 9")[0])
+        self.assertFalse(self.server.dispatch(other, "join")[0])
+
+    def test_game_commands_need_a_table(self):
+        """Test game commands before sitting down."""
+        ok, lines, keep_open = self.server.dispatch(self.session, "roll")
+        self.assertFalse(ok)
+        self.assertTrue(keep_open)
+        self.assertIn("new", lines[0])
+
+    def test_game_commands(self):
+        """Test that game commands reach the table's CLI."""
+        self.server.dispatch(self.session, "new")
+        self.assertTrue(self.server.dispatch(self.session, "roll")[0])
+        self.assertFalse(self.server.dispatch(self.session, "roll")[0])
+        ok, lines, _ = self.server.dispatch(self.session, "state")
+        self.assertTrue(ok)
+        self.assertTrue(lines[0].startswith("turn=W rolled=1"))
+        self.assertTrue(self.server.dispatch(self.session, "skip")[0])
+        self.assertIn("turn=B", self.server.dispatch(self.session, "state")[1][0])
+        self.assertEqual(self.server.dispatch(self.session, "board")[1][0], "Current Board:")
+
+    def test_game_over(self):
+        """Test that the end of the game is announced."""
+        self.server.dispatch(self.session, "new")
+        self.session.table.cli.game.board.borne_off["B"] = 15
+        _, lines, _ = self.server.dispatch(self.session, "help")
+        self.assertEqual(lines[-1], "Game over: B wins")
+
+    def test_quit(self):
+        """Test that quit closes the connection."""
+        self.assertEqual(self.server.dispatch(self.session, "quit")[2], False)
+
+    def test_max_tables(self):
+        """Test that the server refuses tables beyond its limit."""
+        self.server.dispatch(Session(), "new")
+        self.server.dispatch(Session(), "new")
+        ok, lines, _ = self.server.dispatch(self.session, "new")
+        self.assertFalse(ok)
+        self.assertEqual(lines, ["Server is full"])
+
+    def test_evict_idle(self):
+        """Test that only empty tables idle for too long are evicted."""
+        self.server.dispatch(self.session, "new")
+        self.server.dispatch(Session(), "new")
+        self.server.dispatch(Session(), "leave")
+        self.clock.now = 5.0
+        self.server.dispatch(self.session, "roll")
+        self.clock.now = 20.0
+        # Table 2 is empty and idle, table 1 still has its player
+        self.assertEqual(self.server.evict_idle(), [])
+        self.server.tables["2"].clients = 0
+        self.assertEqual(self.server.evict_idle(), ["2"])
+        self.server.dispatch(self.session, "leave")
+        self.assertEqual(self.server.evict_idle(now=29.0), [])
+        self.assertEqual(self.server.evict_idle(now=30.0), ["1"])
+        self.assertEqual(self.server.evicted, 2)
+
+    def test_save_and_load_tables(self):
+        """Test that a new server restores the games of every table."""
+        self.server.dispatch(self.session, "new")
+        self.server.dispatch(self.session, "roll")
+        self.server.dispatch(Session(), "new")
+        states = {table_id: table.state() for table_id, table in self.server.tables.items()}
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tables.bin")
+            self.assertEqual(self.server.save_tables(path), 2)
+            restored = GameServer(max_tables=3, clock=self.clock)
+            self.assertEqual(restored.load_tables(path), 2)
+        self.assertEqual(
+            {table_id: table.state() for table_id, table in restored.tables.items()}, states
+        )
+        self.assertEqual(restored.tables["1"].clients, 0)
+        self.assertEqual(restored.create_table().table_id, "3")
+
+    def test_autosave_recovery(self):
+        """Test that tables journaled by autosave survive a crash."""
+        with tempfile.TemporaryDirectory() as directory:
+            autosave = Autosave(directory, commit_interval=0.0)
+            self.server = GameServer(10.0, max_tables=3, clock=self.clock, autosave=autosave)
+            self.server.dispatch(self.session, "new")
+            self.server.dispatch(self.session, "roll")
+            self.server.dispatch(Session(), "new")
+            self.server.dispatch(Session(), "new")
+            self.server.tables["3"].clients = 0
+            self.clock.now = 20.0
+            self.server.evict_idle()
+            states = {table_id: table.state() for table_id, table in self.server.tables.items()}
+            autosave.flush(timeout=5)
+
+            recovered = GameServer(max_tables=3, clock=self.clock, autosave=Autosave(directory))
+            self.assertEqual(recovered.recover_tables(), 2)
+            recovered.autosave.close()
+            autosave.close()
+        self.assertEqual(
+            {table_id: table.state() for table_id, table in recovered.tables.items()}, states
+        )
+        self.assertEqual(recovered.create_table().table_id, "3")
+
+    def test_journals_win_over_state_file(self):
+        """Test that moves after a clean shutdown survive a later crash."""
+        with tempfile.TemporaryDirectory() as directory:
+            state_file = os.path.join(directory, "tables.bin")
+            journals = os.path.join(directory, "journals")
+            first = Autosave(journals, commit_interval=0.0)
+            self.server = GameServer(10.0, max_tables=3, clock=self.clock, autosave=first)
+            self.server.dispatch(self.session, "new")
+            self.server.tables["1"].cli.game.dice.set_mock_rolls([(3, 1)])
+            self.server.dispatch(self.session, "roll")
+            saved = self.server.tables["1"].state()
+            # Clean shutdown
+            self.server.save_tables(state_file)
+            first.close()
+
+            second = Autosave(journals, commit_interval=0.0)
+            restarted = GameServer(10.0, max_tables=3, clock=self.clock, autosave=second)
+            self.assertEqual(restarted.restore_tables(state_file), 1)
+            session = Session()
+            restarted.dispatch(session, "join 1")
+            restarted.dispatch(session, "move 7 4")
+            state = restarted.tables["1"].state()
+            self.assertNotEqual(state, saved)
+            # Crash: the state file is not written again
+            second.flush(timeout=5)
+
+            third = Autosave(journals)
+            recovered = GameServer(max_tables=3, clock=self.clock, autosave=third)
+            self.assertEqual(recovered.restore_tables(state_file), 1)
+            third.close()
+            second.close()
+        self.assertEqual(recovered.tables["1"].state(), state)
+
+    def test_load_invalid_tables(self):
+        """Test that a file that is not a table file is refused."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tables.bin")
+            with open(path, "wb") as file:
+                file.write(b"BGST\x01\x05\x00\x00\x00")
+            with self.assertRaises(ValueError):
+                self.server.load_tables(path)
+        self.assertEqual(self.server.tables, {})
+
+
+class TestEncodeReply(unittest.TestCase):
+    """Tests for encode_reply()."""
+
+    def test_framing(self):
+        """Test the status line, dot stuffing and terminator."""
+        self.assertEqual(encode_reply(True, []), b"OK\n.\n")
+        self.assertEqual(
+            encode_reply(False, ["bad", ".hidden"]), b"ERR\nbad\n..hidden\n.\n"
+        )
+
+
+async def read_reply(reader: asyncio.StreamReader):
+    """Read one framed reply."""
+    status = (await reader.readline()).decode().strip()
+    lines = []
+    while True:
+        line = (await reader.readline()).decode().rstrip("\n")
+        if line == ".":
+            return status, lines
+        lines.append(line[1:] if line.startswith("..") else line)
+
+
+class TestServerSockets(unittest.IsolatedAsyncioTestCase):
+    """End to end tests over real sockets."""
+
+    async def asyncSetUp(self):
+        """Start a server on a free TCP port."""
+        self.server = GameServer(idle_timeout=5.0, sweep_interval=0.05)
+        listener = await self.server.start_tcp("127.0.0.1", 0)
+        self.port = listener.sockets[0].getsockname()[1]
+        self.writers = []
+
+    async def asyncTearDown(self):
+        """Close every client, then stop the server."""
+        for writer in self.writers:
+            writer.close()
+            await writer.wait_closed()
+        await self.server.close()
+
+    async def connect(self):
+        """Open a client and read the welcome reply."""
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        self.writers.append(writer)
+        status, lines = await read_reply(reader)
+        self.assertEqual(status, "OK")
+        self.assertTrue(lines[0].startswith("Welcome"))
+        return reader, writer
+
+    async def command(self, reader, writer, line):
+        """Send a command and read its reply."""
+        writer.write(line.encode() + b"\n")
+        await writer.drain()
+        return await read_reply(reader)
+
+    async def test_two_tables(self):
+        """Test concurrent clients at separate and shared tables."""
+        first = await self.connect()
+        second = await self.connect()
+        self.assertEqual(await self.command(*first, "new"), ("OK", ["table 1"]))
+        self.assertEqual(await self.command(*second, "new"), ("OK", ["table 2"]))
+
+        status, _ = await self.command(*first, "roll")
+        self.assertEqual(status, "OK")
+        _, state = await self.command(*second, "state")
+        self.assertIn("rolled=0", state[0])
+
+        self.assertEqual(await self.command(*second, "join 1"), ("OK", ["table 1"]))
+        _, state = await self.command(*second, "state")
+        self.assertIn("rolled=1", state[0])
+        status, _ = await self.command(*second, "roll")
+        self.assertEqual(status, "ERR")
+        _, counts = await self.command(*first, "tables")
+        self.assertEqual(counts, ["tables=2 sessions=2"])
+
+        self.assertEqual((await self.command(*first, "quit"))[0], "OK")
+        self.assertEqual(await first[0].read(), b"")
+
+    async def test_idle_connection_and_table_are_evicted(self):
+        """Test that silent clients are closed and their tables removed."""
+        self.server.idle_timeout = 0.1
+        reader, writer = await self.connect()
+        await self.command(reader, writer, "new")
+        status, lines = await asyncio.wait_for(read_reply(reader), 5)
+        self.assertEqual((status, lines), ("ERR", ["Idle timeout, closing"]))
+        self.assertEqual(await reader.read(), b"")
+        for _ in range(100):
+            if not self.server.tables:
+                break
+            await asyncio.sleep(0.02)
+        self.assertEqual(self.server.tables, {})
+        self.assertEqual(self.server.sessions, 0)
+
+    async def test_overlong_line_closes_session(self):
+        """Test that a line over the limit gets an error and a close."""
+        reader, writer = await self.connect()
+        await self.command(reader, writer, "new")
+        writer.write(b"x" * (MAX_LINE_LENGTH * 2) + b"\n")
+        await writer.drain()
+        status, lines = await asyncio.wait_for(read_reply(reader), 5)
+        self.assertEqual((status, lines), ("ERR", ["Line too long, closing"]))
+        self.assertEqual(await reader.read(), b"")
+        for _ in range(100):
+            if not self.server.sessions:
+                break
+            await asyncio.sleep(0.02)
+        self.assertEqual(self.server.sessions, 0)
+
+    async def test_unix_socket(self):
+        """Test serving on a Unix socket."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bg.sock")
+            await self.server.start_unix(path)
+            reader, writer = await asyncio.open_unix_connection(path)
+            self.writers.append(writer)
+            status, _ = await read_reply(reader)
+            self.assertEqual(status, "OK")
+            self.assertEqual(await self.command(reader, writer, "new"), ("OK", ["table 1"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""Tests for the hitting-shot calculator."""
+
+import unittest
+
+from core.board import Board
+from engine.position import initial_position, to_board
+from engine.movegen import DISTINCT_ROLLS, legal_plays
+from engine.shots import PATHS, blot_shots, board_blot_shots, total_shots
+
+
+def shot_position(white: dict, black: dict, white_bar: int = 0) -> tuple:
+    """Build a position from {point: count} maps; the rest is borne off."""
+    position = [0] * 28
+    for point, count in white.items():
+        position[point] = count
+    for point, count in black.items():
+        position[point] = -count
+    position[24] = white_bar
+    position[26] = 15 - sum(white.values()) - white_bar
+    position[27] = 15 - sum(black.values())
+    return tuple(position)
+
+
+class TestTables(unittest.TestCase):
+    """Tests for the precomputed tables."""
+
+    def test_paths(self):
+        """Test that every listed path adds up to its distance."""
+        for distance, entries in enumerate(PATHS):
+            for index, paths in entries:
+                (die1, die2), _ = DISTINCT_ROLLS[index]
+                for stops, dice in paths:
+                    self.assertEqual(len(stops), dice - 1)
+                    if die1 == die2:
+                        self.assertEqual(die1 * dice, distance)
+        self.assertEqual(PATHS[0], [])
+
+
+class TestBlotShots(unittest.TestCase):
+    """Tests for blot_shots() and total_shots()."""
+
+    def test_open_board_distances(self):
+        """Test the classic shot counts on an open board."""
+        expected = {1: 11, 2: 12, 4: 15, 6: 17, 7: 6, 8: 6, 12: 3, 16: 1, 20: 1}
+        for distance, shots in expected.items():
+            position = shot_position({distance: 1}, {0: 1})
+            self.assertEqual(blot_shots(position, "B"), {0: shots}, distance)
+
+    def test_blocked_combinations(self):
+        """Test that points in the way remove combination shots."""
+        # 6 away from 10: 2-2 must land on 8 and 3-3 on 7
+        position = shot_position({10: 1}, {4: 1, 7: 2, 8: 2})
+        self.assertEqual(blot_shots(position, "B"), {4: 15})
+
+    def test_out_of_reach(self):
+        """Test a blot behind every attacker."""
+        position = shot_position({2: 2}, {5: 1})
+        self.assertEqual(blot_shots(position, "B"), {5: 0})
+
+    def test_bar_entry(self):
+        """Test that checkers on the bar limit the shots."""
+        # One on the bar: it may hit directly or with the other die after
+        # entering.
+        position = shot_position({}, {20: 1}, white_bar=1)
+        self.assertEqual(blot_shots(position, "B"), {20: 15})
+        # Two on the bar: only one die is left to the entering checker
+        position = shot_position({}, {20: 1}, white_bar=2)
+        self.assertEqual(blot_shots(position, "B"), {20: 12})
+
+    def test_bar_blocks_board_hitters(self):
+        """Test that a board checker cannot hit while another has to enter."""
+        position = shot_position({6: 2}, {0: 1, 18: 2}, white_bar=1)
+        # The checker on the bar must enter with the other die, so 5-1 and
+        # 4-2 no longer hit and 6-6 cannot enter at all. The ten other 6s
+        # hit, and so do 3-3 and 2-2 after entering.
+        shots = blot_shots(position, "B")[0]
+        free = blot_shots(shot_position({6: 2}, {0: 1, 18: 2}), "B")[0]
+        self.assertLess(shots, free)
+        self.assertEqual(shots, 12)
+
+    def test_white_blots(self):
+        """Test that White blots are attacked by Black moving upwards."""
+        position = shot_position({10: 1}, {4: 1})
+        self.assertEqual(blot_shots(position, "W"), {10: 17})
+        self.assertEqual(blot_shots(position, "B"), {4: 17})
+
+    def test_hit_must_be_a_legal_play(self):
+        """Test that a hit that leaves a die unplayable is not counted."""
+        position = shot_position(
+            {0: 3, 1: 10, 15: 1, 20: 1},
+            {9: 2, 11: 1, 13: 2, 16: 1, 18: 2, 21: 1, 22: 3, 23: 3},
+        )
+        # 4-2 hits on 11 with 15/11, but the 2 cannot be played after it,
+        # while 20/16*/14 plays both dice: only plays using both are legal
+        hitting = [
+            result for _, result in legal_plays(position, "W", (4, 2)) if result[11] >= 0
+        ]
+        self.assertEqual(hitting, [])
+        self.assertEqual(blot_shots(position, "B"), {11: 14, 16: 13, 21: 0})
+
+    def test_total_shots(self):
+        """Test that a roll hitting two blots is counted once."""
+        position = shot_position({12: 1}, {6: 1, 11: 1})
+        shots = blot_shots(position, "B")
+        self.assertEqual(shots, {6: 17, 11: 11})
+        self.assertLess(total_shots(position, "B"), shots[6] + shots[11])
+        self.assertGreaterEqual(total_shots(position, "B"), shots[6])
+
+    def test_no_blots(self):
+        """Test the starting position."""
+        self.assertEqual(blot_shots(initial_position(), "W"), {})
+        self.assertEqual(total_shots(initial_position(), "B"), 0)
+
+    def test_board_blot_shots(self):
+        """Test the Board wrapper."""
+        position = shot_position({10: 1}, {4: 1})
+        board = to_board(position, Board())
+        self.assertEqual(board_blot_shots(board, "B"), {4: 17})
+
+
+if __name__ == "__main__":
+    unittest.main()
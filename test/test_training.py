@@ -0,0 +1,83 @@
+"""Tests for the TD(lambda) training pipeline."""
+
+import multiprocessing
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from engine.neural import NeuralNet, encode_array
+from engine.position import initial_position
+from engine.training import SharedWeights, TDTrainer, TrainingStats
+
+
+class TestSharedWeights(unittest.TestCase):
+    """Tests for SharedWeights."""
+
+    def test_publish_and_read(self):
+        """Test that published weights can be read back by name."""
+        lock = multiprocessing.Lock()
+        owner = SharedWeights(4)
+        try:
+            self.assertEqual(owner.version(), 0)
+            owner.publish(np.arange(4, dtype=np.float32), lock)
+            reader = SharedWeights(4, name=owner.name)
+            version, weights = reader.read(lock)
+            reader.close()
+            self.assertEqual(version, 1)
+            np.testing.assert_array_equal(weights, [0, 1, 2, 3])
+        finally:
+            owner.close()
+
+
+class TestTrainingStats(unittest.TestCase):
+    """Tests for TrainingStats."""
+
+    def test_rates(self):
+        """Test the throughput figures."""
+        stats = TrainingStats(games=10, positions=500, elapsed=2.0)
+        self.assertEqual(stats.games_per_hour, 18000.0)
+        self.assertEqual(stats.positions_per_second, 250.0)
+        self.assertIn("games/hour", stats.summary())
+        self.assertEqual(TrainingStats(0, 0, 0.0).games_per_hour, 0.0)
+
+
+class TestTDTrainer(unittest.TestCase):
+    """Tests for TDTrainer."""
+
+    def setUp(self):
+        """Create a small learner."""
+        self.trainer = TDTrainer(NeuralNet(hidden=6, seed=2), alpha=0.5)
+        self.trainer.log = lambda message: None
+
+    def test_update_moves_towards_outcome(self):
+        """Test that a won game raises the value of its positions."""
+        positions = np.asarray([initial_position()] * 3, dtype=np.int8)
+        white_to_move = np.asarray([True, False, True])
+        features = encode_array(positions.astype(np.int16), white_to_move)
+        before = self.trainer.net.forward(features)[-1]
+        self.trainer.train_on_game(positions, white_to_move, "W")
+        after = self.trainer.net.forward(features)[-1]
+        self.assertGreater(after, before)
+        self.assertEqual(self.trainer.games, 1)
+        self.assertEqual(self.trainer.positions, 3)
+
+    def test_checkpoint_disabled(self):
+        """Test that no file is written without a checkpoint folder."""
+        self.assertIsNone(self.trainer.checkpoint())
+
+    def test_run_with_workers(self):
+        """Test a short run with worker processes and checkpoints."""
+        with tempfile.TemporaryDirectory() as folder:
+            self.trainer.checkpoint_dir = folder
+            stats = self.trainer.run(4, workers=2, publish_every=2, checkpoint_every=2)
+            files = os.listdir(folder)
+        self.assertEqual(stats.games, 4)
+        self.assertGreater(stats.positions, 0)
+        self.assertIn("latest.npz", files)
+        self.assertIn("weights_00000002.npz", files)
+
+
+if __name__ == "__main__":
+    unittest.main()